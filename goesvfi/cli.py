@@ -0,0 +1,359 @@
+"""Headless command line interface for GOES-VFI.
+
+Render nodes and cron jobs have no display, and a simple sort shouldn't pay
+for importing PyQt6, xarray, matplotlib or aioboto3. This module imports only
+the standard library and the logging setup at startup; each subcommand imports the pipeline pieces
+it drives when it runs:
+
+- ``run``: interpolate a folder of frames (PNG or NetCDF) with ``run_vfi``
+  and encode the result with ``encode_with_ffmpeg``
+- ``loop``: rebuild a rolling-window loop of the newest frames in a folder
+  with the ``RollingLoopBuilder``, rendering only what changed since the
+  last build
+- ``reconcile``: report missing timestamps in a local archive with the
+  ``Reconciler``
+- ``sort``: sort files with the ``FileSorter`` or ``DateSorter``
+- ``encode``: encode an existing video with ``encode_with_ffmpeg``
+
+``--metrics-port``, or ``GOESVFI_METRICS_PORT``, serves Prometheus metrics
+at ``/metrics`` while a subcommand runs.
+
+``HEAVY_MODULES`` lists the packages this module must not import before a
+subcommand needs them; the unit tests check it.
+"""
+
+import argparse
+from collections.abc import Callable, Sequence
+import json
+import os
+import pathlib
+import sys
+
+from goesvfi.utils import log
+
+# Packages only subcommands that need them may import
+HEAVY_MODULES = ("PyQt6", "xarray", "matplotlib", "aioboto3", "numpy")
+
+# Short encoder names mapped to the encoder names the FFmpeg builder takes
+ENCODERS = {
+    "x264": "Software x264",
+    "x265": "Software x265",
+    "x265-2pass": "Software x265 (2-Pass)",
+    "hevc-videotoolbox": "Hardware HEVC (VideoToolbox)",
+    "h264-videotoolbox": "Hardware H.264 (VideoToolbox)",
+    "copy": "None (copy original)",
+}
+
+# Default target bitrate for bitrate-based encoders
+DEFAULT_BITRATE_KBPS = 15000
+
+LOGGER = log.get_logger(__name__)
+
+
+def _crop_rect(value: str) -> tuple[int, int, int, int]:
+    """Parse an ``X,Y,W,H`` crop rectangle."""
+    try:
+        x, y, w, h = (int(part) for part in value.split(","))
+    except ValueError:
+        msg = f"expected X,Y,W,H integers, got {value!r}"
+        raise argparse.ArgumentTypeError(msg) from None
+    return x, y, w, h
+
+
+def _add_encode_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--encoder", choices=sorted(ENCODERS), default="x264", help="Video encoder (default: x264)")
+    parser.add_argument("--crf", type=int, default=20, help="Constant rate factor for x264/x265 (default: 20)")
+    parser.add_argument(
+        "--bitrate",
+        type=int,
+        default=DEFAULT_BITRATE_KBPS,
+        help=f"Target bitrate in kbps for 2-pass and hardware encoders (default: {DEFAULT_BITRATE_KBPS})",
+    )
+    parser.add_argument("--bufsize", type=int, default=None, help="Buffer size in kb (default: twice the bitrate)")
+    parser.add_argument("--pix-fmt", default="yuv420p", help="Output pixel format (default: yuv420p)")
+
+
+def _encode(args: argparse.Namespace, source: pathlib.Path, output: pathlib.Path) -> None:
+    from goesvfi.pipeline.encode import encode_with_ffmpeg
+
+    encode_with_ffmpeg(
+        source,
+        output,
+        ENCODERS[args.encoder],
+        crf=args.crf,
+        bitrate_kbps=args.bitrate,
+        bufsize_kb=args.bufsize or 2 * args.bitrate,
+        pix_fmt=args.pix_fmt,
+        monitor_memory=False,
+    )
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    from goesvfi.pipeline.run_vfi import run_vfi
+
+    rife_exe = args.rife_exe
+    if rife_exe is None and not args.skip_model:
+        from goesvfi.utils.config import find_rife_executable
+
+        rife_exe = find_rife_executable(args.model)
+
+    inputs = [pathlib.Path(path) for path in args.input]
+    raw_path: pathlib.Path | None = None
+    for update in run_vfi(
+        folder=inputs[0] if len(inputs) == 1 and inputs[0].is_dir() else inputs,
+        output_mp4_path=args.output,
+        rife_exe_path=rife_exe or pathlib.Path("rife-ncnn-vulkan"),
+        fps=args.fps,
+        num_intermediate_frames=args.intermediate_frames,
+        max_workers=args.workers,
+        model_key=args.model,
+        false_colour=args.false_colour,
+        res_km=args.res_km,
+        crop_rect_xywh=args.crop,
+        skip_model=args.skip_model,
+        netcdf_stride=args.netcdf_stride,
+    ):
+        if isinstance(update, pathlib.Path):
+            raw_path = update
+        else:
+            current, total, eta = update
+            LOGGER.info("Frame pair %d/%d, %.0f s left", current, total, eta)
+
+    if raw_path is None:
+        LOGGER.error("Interpolation produced no video")
+        return 1
+
+    _encode(args, raw_path, args.output)
+    if not args.keep_raw and raw_path != args.output:
+        raw_path.unlink(missing_ok=True)
+    LOGGER.info("Wrote %s", args.output)
+    return 0
+
+
+def _cmd_loop(args: argparse.Namespace) -> int:
+    import hashlib
+
+    from goesvfi.pipeline.rolling_loop import LoopSettings, RollingLoopBuilder
+    from goesvfi.utils.config import find_rife_executable, get_cache_dir
+
+    frames = sorted(args.input.glob("*.png"))[-args.window :]
+    cache_dir = args.cache_dir
+    if cache_dir is None:
+        loop_id = hashlib.sha256(str(args.output.resolve()).encode()).hexdigest()[:16]
+        cache_dir = get_cache_dir() / "loops" / loop_id
+
+    rife_exe = args.rife_exe
+    if rife_exe is None and not args.skip_model:
+        rife_exe = find_rife_executable(args.model)
+
+    settings = LoopSettings(
+        fps=args.fps,
+        skip_model=args.skip_model,
+        model_key=args.model,
+        false_colour=args.false_colour,
+        res_km=args.res_km,
+        crop_rect_xywh=args.crop,
+        crf=args.crf,
+        preset=args.preset,
+        pix_fmt=args.pix_fmt,
+    )
+    result = RollingLoopBuilder(cache_dir, settings, rife_exe).build(frames, args.output)
+    LOGGER.info("Wrote %s (%d of %d segments rendered)", args.output, result.rendered, result.segments)
+    return 0
+
+
+def _cmd_reconcile(args: argparse.Namespace) -> int:
+    from datetime import datetime
+
+    from goesvfi.integrity_check.reconciler import Reconciler
+    from goesvfi.integrity_check.time_index import SatellitePattern
+
+    reconciler = Reconciler(args.cache_db)
+    try:
+        result = reconciler.scan_date_range(
+            datetime.fromisoformat(args.start),
+            datetime.fromisoformat(args.end),
+            SatellitePattern[args.satellite],
+            args.directory,
+            interval_minutes=args.interval,
+            force_rescan=args.force_rescan,
+        )
+    finally:
+        reconciler.cache.close()
+
+    missing = [timestamp.isoformat() for timestamp in result["missing"]]
+    summary = {
+        "total_expected": result["total_expected"],
+        "total_found": result["total_found"],
+        "total_missing": len(missing),
+        "interval_minutes": result["interval"],
+    }
+    if args.json:
+        sys.stdout.write(json.dumps({**summary, "missing": missing}, indent=2) + "\n")
+    else:
+        sys.stdout.write(
+            f"{summary['total_found']}/{summary['total_expected']} expected files found, "
+            f"{summary['total_missing']} missing ({summary['interval_minutes']} min interval)\n"
+        )
+    return 2 if missing and args.fail_on_missing else 0
+
+
+def _cmd_sort(args: argparse.Namespace) -> int:
+    from goesvfi.utils.file_transfer import TransferMode
+
+    transfer_mode = TransferMode(args.mode)
+    if args.sorter == "dates":
+        from goesvfi.date_sorter.sorter import DateSorter
+
+        DateSorter(transfer_mode=transfer_mode, max_workers=args.workers).sort_files(
+            str(args.source), str(args.destination), args.date_format
+        )
+        return 0
+
+    from goesvfi.file_sorter.hash_cache import HashCache
+    from goesvfi.file_sorter.sorter import DuplicateMode, FileSorter
+
+    hash_cache = HashCache(args.hash_cache) if args.verify_content else None
+    try:
+        stats = FileSorter(
+            dry_run=args.dry_run,
+            duplicate_mode=DuplicateMode[args.duplicate_mode.upper()],
+            transfer_mode=transfer_mode,
+            max_workers=args.workers,
+            verify_content=args.verify_content,
+            hash_cache=hash_cache,
+        ).sort_files(str(args.source), str(args.destination))
+    finally:
+        if hash_cache is not None:
+            hash_cache.close()
+    sys.stdout.write(json.dumps(stats) + "\n")
+    return 0
+
+
+def _cmd_encode(args: argparse.Namespace) -> int:
+    _encode(args, args.input, args.output)
+    return 0
+
+
+def _start_metrics(port: int | None) -> None:
+    if port is not None:
+        from goesvfi.utils.metrics import start_metrics_server
+
+        start_metrics_server(port, os.environ.get("GOESVFI_METRICS_HOST", "127.0.0.1"))
+    elif os.environ.get("GOESVFI_METRICS_PORT"):
+        from goesvfi.utils.metrics import start_metrics_server_from_env
+
+        start_metrics_server_from_env()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the ``goesvfi`` argument parser."""
+    parser = argparse.ArgumentParser(prog="goesvfi", description="Headless GOES-VFI tools.")
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics at /metrics on this port (default: $GOESVFI_METRICS_PORT)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Interpolate frames and encode a video")
+    run.add_argument("input", nargs="+", help="Folder of PNG or NetCDF frames, or NetCDF files in frame order")
+    run.add_argument("-o", "--output", type=pathlib.Path, required=True, help="Output video file")
+    run.add_argument("--fps", type=int, default=30, help="Output frame rate (default: 30)")
+    run.add_argument("--intermediate-frames", type=int, default=1, help="Frames between each pair (default: 1)")
+    run.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel frame workers")
+    run.add_argument("--model", default="rife-v4.6", help="RIFE model key (default: rife-v4.6)")
+    run.add_argument("--rife-exe", type=pathlib.Path, default=None, help="RIFE executable (default: from the model)")
+    run.add_argument("--skip-model", action="store_true", help="Skip interpolation and only encode the frames")
+    run.add_argument("--crop", type=_crop_rect, default=None, metavar="X,Y,W,H", help="Crop rectangle in pixels")
+    run.add_argument("--false-colour", action="store_true", help="Colourise frames with Sanchez")
+    run.add_argument("--res-km", type=int, default=4, help="Sanchez resolution in km (default: 4)")
+    run.add_argument("--netcdf-stride", type=int, default=1, help="Downscale factor for NetCDF frames (default: 1)")
+    run.add_argument("--keep-raw", action="store_true", help="Keep the intermediate raw video")
+    _add_encode_arguments(run)
+    run.set_defaults(handler=_cmd_run)
+
+    loop = subparsers.add_parser("loop", help="Rebuild a rolling loop of the newest frames, rendering only new ones")
+    loop.add_argument("input", type=pathlib.Path, help="Folder of PNG frames")
+    loop.add_argument("-o", "--output", type=pathlib.Path, required=True, help="Output video file")
+    loop.add_argument("--window", type=int, default=144, help="Newest frames in the loop (default: 144)")
+    loop.add_argument("--cache-dir", type=pathlib.Path, default=None, help="Segment cache for this loop")
+    loop.add_argument("--fps", type=int, default=30, help="Output frame rate (default: 30)")
+    loop.add_argument("--model", default="rife-v4.6", help="RIFE model key (default: rife-v4.6)")
+    loop.add_argument("--rife-exe", type=pathlib.Path, default=None, help="RIFE executable (default: from the model)")
+    loop.add_argument("--skip-model", action="store_true", help="Skip interpolation and only encode the frames")
+    loop.add_argument("--crop", type=_crop_rect, default=None, metavar="X,Y,W,H", help="Crop rectangle in pixels")
+    loop.add_argument("--false-colour", action="store_true", help="Colourise frames with Sanchez")
+    loop.add_argument("--res-km", type=int, default=4, help="Sanchez resolution in km (default: 4)")
+    loop.add_argument("--crf", type=int, default=20, help="Constant rate factor for x264 (default: 20)")
+    loop.add_argument("--preset", default="medium", help="x264 preset (default: medium)")
+    loop.add_argument("--pix-fmt", default="yuv420p", help="Output pixel format (default: yuv420p)")
+    loop.set_defaults(handler=_cmd_loop)
+
+    reconcile = subparsers.add_parser("reconcile", help="Report missing timestamps in a local archive")
+    reconcile.add_argument("directory", type=pathlib.Path, help="Archive directory to scan")
+    reconcile.add_argument("--start", required=True, help="Start time, ISO 8601")
+    reconcile.add_argument("--end", required=True, help="End time, ISO 8601")
+    reconcile.add_argument(
+        "--satellite", choices=["GOES_16", "GOES_17", "GOES_18", "GENERIC"], default="GOES_16", help="Satellite"
+    )
+    reconcile.add_argument("--interval", type=int, default=0, help="Minutes between files (default: auto-detect)")
+    reconcile.add_argument("--cache-db", type=pathlib.Path, default=None, help="Scan cache database")
+    reconcile.add_argument("--force-rescan", action="store_true", help="Ignore cached scan results")
+    reconcile.add_argument("--json", action="store_true", help="Print the missing timestamps as JSON")
+    reconcile.add_argument("--fail-on-missing", action="store_true", help="Exit with status 2 if anything is missing")
+    reconcile.set_defaults(handler=_cmd_reconcile)
+
+    sort = subparsers.add_parser("sort", help="Sort files into folders")
+    sort.add_argument("sorter", choices=["files", "dates"], help="Sort date folders of PNGs, or files by filename date")
+    sort.add_argument("source", type=pathlib.Path, help="Source directory")
+    sort.add_argument("destination", type=pathlib.Path, help="Destination directory")
+    sort.add_argument("--mode", choices=["copy", "hardlink", "move"], default="copy", help="Transfer mode")
+    sort.add_argument("--workers", type=int, default=None, help="Files transferred at once")
+    sort.add_argument("--date-format", default="%Y/%m/%d", help="Folder format for dates (default: %%Y/%%m/%%d)")
+    sort.add_argument(
+        "--duplicate-mode", choices=["overwrite", "skip", "rename"], default="overwrite", help="Duplicate handling"
+    )
+    sort.add_argument("--dry-run", action="store_true", help="Report what would be done without writing")
+    sort.add_argument("--verify-content", action="store_true", help="Detect identical files by content hash")
+    sort.add_argument("--hash-cache", type=pathlib.Path, default=None, help="Content hash cache database")
+    sort.set_defaults(handler=_cmd_sort)
+
+    encode = subparsers.add_parser("encode", help="Encode a video with FFmpeg")
+    encode.add_argument("input", type=pathlib.Path, help="Input video")
+    encode.add_argument("output", type=pathlib.Path, help="Output video")
+    _add_encode_arguments(encode)
+    encode.set_defaults(handler=_cmd_encode)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the ``goesvfi`` command line interface.
+
+    Args:
+        argv: Arguments without the program name; defaults to ``sys.argv[1:]``
+
+    Returns:
+        The process exit status
+    """
+    args = build_parser().parse_args(argv)
+    if getattr(args, "workers", 0) is None:
+        from goesvfi.utils.file_transfer import DEFAULT_TRANSFER_WORKERS
+
+        args.workers = DEFAULT_TRANSFER_WORKERS
+
+    handler: Callable[[argparse.Namespace], int] = args.handler
+    try:
+        _start_metrics(args.metrics_port)
+        return handler(args)
+    except (OSError, ValueError, RuntimeError) as e:
+        LOGGER.error("goesvfi %s failed: %s", args.command, e)  # noqa: TRY400
+        return 1
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
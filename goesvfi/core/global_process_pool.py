@@ -3,25 +3,135 @@
 This module provides a singleton process pool manager that ensures efficient
 resource usage across the entire application by preventing multiple components
 from creating their own process pools.
+
+The pool resizes itself while it runs. Submitted tasks wait in a priority
+queue, and a dispatcher thread hands them to the worker processes, never more
+at a time than the pool's current size. That size follows the queue depth
+between ``min_workers`` and ``max_workers``. It stops growing while the
+machine's CPU use is above ``cpu_threshold``. Under elevated memory pressure
+it shrinks one worker at a time, and under critical pressure admission pauses:
+no more tasks are started until only one is running. Resizing only changes how many tasks are
+handed over, so worker processes are never restarted to resize and stay warm
+between jobs, with their imports and initializer already run.
+
+Interactive work such as previews is submitted with ``TaskPriority.INTERACTIVE``
+and is dispatched ahead of queued batch work. ``map`` consumes its iterables
+lazily and keeps a bounded number of chunks in flight, so it works on
+generators and long inputs without holding them in memory.
+
+Metrics a task records in its worker process are returned with its result and
+merged into this process's metrics registry, which serves them.
 """
 
 import atexit
-from collections.abc import Callable, Generator
-from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, as_completed
 from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+import heapq
+import itertools
 import os
 import threading
+import time
 from typing import Any, TypeVar
 
 from goesvfi.core.base_manager import ConfigurableManager
 from goesvfi.utils import log
+from goesvfi.utils.memory_pressure import PressureLevel, get_memory_pressure_bus
+from goesvfi.utils.metrics import REGISTRY, MetricFamily
 
 LOGGER = log.get_logger(__name__)
 
+try:
+    import psutil
+
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
 T = TypeVar("T")
 
+# Seconds between scaling decisions while tasks are waiting
+SCALE_INTERVAL = 1.0
+
+# Seconds a CPU load or memory reading is reused for
+LOAD_SAMPLE_INTERVAL = 0.5
+
+# Seconds between a worker's checks that the pool's process is still alive
+PARENT_CHECK_INTERVAL = 1.0
+
+
+class TaskPriority(IntEnum):
+    """Order in which queued tasks are dispatched; lower values go first."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BATCH = 2
+
+
+@dataclass(order=True)
+class _QueuedTask:
+    """A task waiting for a worker, ordered by priority then submission."""
+
+    priority: int
+    sequence: int
+    fn: Callable[..., Any] = field(compare=False)
+    args: tuple[Any, ...] = field(compare=False)
+    kwargs: dict[str, Any] = field(compare=False)
+    future: Future = field(compare=False)
+
+
+def _run_chunk(fn: Callable[..., T], chunk: list[tuple[Any, ...]]) -> list[T]:
+    """Apply ``fn`` to each argument tuple of a chunk, in a worker process."""
+    return [fn(*args) for args in chunk]
+
+
+def _call_with_metrics(fn: Callable[..., T], args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[T, dict[str, Any]]:
+    """Call ``fn`` in a worker process, returning the metrics it recorded with its result."""
+    return fn(*args, **kwargs), REGISTRY.drain()
+
+
+def _noop() -> None:
+    """Do nothing; submitted to start a worker process ahead of use."""
+
+
+def _watch_parent(parent_pid: int) -> None:
+    while os.getppid() == parent_pid:
+        time.sleep(PARENT_CHECK_INTERVAL)
+    os._exit(1)
+
+
+def _worker_init(parent_pid: int, initializer: Callable[..., object] | None, initargs: tuple[Any, ...]) -> None:
+    """Set up a worker process, which exits if the pool's process dies.
+
+    Spawned workers hold both ends of their call queue, so without this they
+    would wait for work forever after the pool's process was killed.
+    """
+    threading.Thread(target=_watch_parent, args=(parent_pid,), daemon=True).start()
+    # A forked worker starts with a copy of the parent's metrics, which are
+    # already counted there
+    REGISTRY.drain()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+class _SingletonMeta(type(ConfigurableManager)):  # type: ignore[misc]
+    """Metaclass that creates a class's instance once and returns it after.
+
+    The instance is only kept once it is fully constructed; PyQt crashes if
+    the wrapper of a QObject is referenced elsewhere before ``__init__``.
+    """
 
-class GlobalProcessPool(ConfigurableManager):
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__call__(*args, **kwargs)
+            return cls._instance
+
+
+class GlobalProcessPool(ConfigurableManager, metaclass=_SingletonMeta):
     """Singleton process pool manager for application-wide coordination.
 
     This class ensures that only one process pool is active at a time,
@@ -30,22 +140,9 @@ class GlobalProcessPool(ConfigurableManager):
 
     _instance: "GlobalProcessPool | None" = None
     _lock = threading.Lock()
-    _initialized: bool
-
-    def __new__(cls) -> "GlobalProcessPool":
-        """Ensure singleton instance."""
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super().__new__(cls)
-                cls._instance._initialized = False
-            return cls._instance
 
     def __init__(self) -> None:
         """Initialize the global process pool manager."""
-        # Skip if already initialized (singleton)
-        if hasattr(self, "_initialized") and self._initialized:
-            return
-
         # Default configuration
         default_config = {
             "max_workers": min(4, (os.cpu_count() or 1)),
@@ -54,7 +151,7 @@ class GlobalProcessPool(ConfigurableManager):
             "initargs": (),
             "auto_scale": True,
             "min_workers": 1,
-            "scale_threshold": 0.8,  # Scale up when 80% busy
+            "cpu_threshold": 0.9,  # Don't scale up while 90% of CPU time is in use
         }
 
         super().__init__("GlobalProcessPool", default_config=default_config)
@@ -69,43 +166,71 @@ class GlobalProcessPool(ConfigurableManager):
             "current_workers": 0,
         }
 
+        # Dispatch state, guarded by the condition's re-entrant lock
+        self._condition = threading.Condition(threading.RLock())
+        self._queue: list[_QueuedTask] = []
+        self._sequence = itertools.count()
+        self._running = 0
+        self._batch_limits: list[int] = []
+        self._dispatcher: threading.Thread | None = None
+        self._stopping = False
+        self._last_scaled = 0.0
+        self._load_sample: tuple[float, float, PressureLevel] = (0.0, 0.0, PressureLevel.NORMAL)
+
         # Register cleanup on exit
         atexit.register(self._cleanup_on_exit)
 
-        self._initialized = True
         self.log_info("Global process pool manager initialized")
 
     def _do_initialize(self) -> None:
         """Perform actual initialization."""
         if self._executor is None:
-            max_workers = self.get_config("max_workers")
-            max_tasks_per_child = self.get_config("max_tasks_per_child")
+            # The executor is sized to the machine so the pool can grow without a
+            # restart; with max_tasks_per_child it starts workers only as tasks
+            # need them, so the ceiling costs nothing until the pool scales up
+            self._max_workers = max(self.get_config("max_workers"), os.cpu_count() or 1)
 
             # Create the process pool
             self._executor = ProcessPoolExecutor(
-                max_workers=max_workers,
-                max_tasks_per_child=max_tasks_per_child,
-                initializer=self.get_config("initializer"),
-                initargs=self.get_config("initargs"),
+                max_workers=self._max_workers,
+                max_tasks_per_child=self.get_config("max_tasks_per_child"),
+                initializer=_worker_init,
+                initargs=(os.getpid(), self.get_config("initializer"), self.get_config("initargs")),
             )
 
-            self._max_workers = max_workers
-            self._usage_stats["current_workers"] = max_workers
-            self.log_info("Created process pool with %d workers", max_workers)
+            self._usage_stats["current_workers"] = self._min_workers()
+            self._stopping = False
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="GlobalProcessPool", daemon=True)
+            self._dispatcher.start()
+            self.log_info(
+                "Created process pool with %d-%d workers (ceiling %d)",
+                self._min_workers(),
+                self._worker_limit(),
+                self._max_workers,
+            )
 
     def _do_cleanup(self) -> None:
         """Perform actual cleanup."""
         if self._executor:
+            with self._condition:
+                self._stopping = True
+                queued, self._queue = self._queue, []
+                self._condition.notify_all()
+
             # Cancel pending futures
-            for future in list(self._active_futures):
-                if not future.done():
-                    future.cancel()
+            for task in queued:
+                task.future.cancel()
+
+            if self._dispatcher is not None:
+                self._dispatcher.join()
+                self._dispatcher = None
 
             # Shutdown the executor
             self._executor.shutdown(wait=True, cancel_futures=True)
             self._executor = None
 
             self._active_futures.clear()
+            self._running = 0
             self._usage_stats["current_workers"] = 0
 
             self.log_info("Process pool shut down")
@@ -128,46 +253,112 @@ class GlobalProcessPool(ConfigurableManager):
         Returns:
             Future object representing the execution
         """
-        if not self._is_initialized:
-            self.initialize()
+        return self.submit_with_priority(TaskPriority.NORMAL, fn, *args, **kwargs)
 
-        if self._executor is None:
-            msg = "Process pool not available"
-            raise RuntimeError(msg)
+    def submit_with_priority(
+        self, priority: TaskPriority, fn: Callable[..., T], /, *args: Any, **kwargs: Any
+    ) -> Future[T]:
+        """Submit a function to be dispatched ahead of lower priority tasks.
 
-        # Submit the task
-        future = self._executor.submit(fn, *args, **kwargs)
-
-        # Track the future
-        self._active_futures.add(future)
-        self._usage_stats["total_tasks"] += 1
-
-        # Clean up completed futures
-        self._cleanup_completed_futures()
-
-        # Auto-scale if enabled
-        if self.get_config("auto_scale"):
-            self._check_scaling()
-
-        # Add completion callback
-        future.add_done_callback(self._on_task_complete)
+        Args:
+            priority: Dispatch priority; tasks of equal priority run in submission order
+            fn: Function to execute
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
 
-        return future
+        Returns:
+            Future object representing the execution
+        """
+        return self._enqueue(priority, fn, args, kwargs, 1)
 
     def map(
-        self, fn: Callable[..., T], *iterables: Any, timeout: float | None = None, chunksize: int = 1
+        self,
+        fn: Callable[..., T],
+        *iterables: Iterable[Any],
+        timeout: float | None = None,
+        chunksize: int = 1,
+        priority: TaskPriority = TaskPriority.NORMAL,
+        max_in_flight: int | None = None,
     ) -> Generator[T]:
         """Map a function across iterables using the process pool.
 
+        The iterables are read as results are consumed, keeping at most
+        ``max_in_flight`` chunks submitted at a time, so they may be
+        generators or unbounded. Leaving the loop early cancels the chunks
+        that haven't started.
+
         Args:
             fn: Function to map
             *iterables: Iterables to map over
-            timeout: Timeout for each result
-            chunksize: Size of chunks for processing
+            timeout: Seconds from the first result to the last before raising ``TimeoutError``
+            chunksize: Number of items sent to a worker at once
+            priority: Dispatch priority of the chunks
+            max_in_flight: Chunks submitted ahead of the results; twice ``max_workers`` by default
 
         Yields:
-            Results from the mapped function
+            Results from the mapped function, in input order
+        """
+        if chunksize < 1:
+            msg = "chunksize must be >= 1"
+            raise ValueError(msg)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        limit = max(1, max_in_flight or 2 * self._worker_limit())
+        items = zip(*iterables, strict=False)
+        chunks: Iterator[list[tuple[Any, ...]]] = iter(lambda: list(itertools.islice(items, chunksize)), [])
+
+        pending: deque[Future] = deque()
+        try:
+            for chunk in itertools.islice(chunks, limit):
+                pending.append(self._enqueue(priority, _run_chunk, (fn, chunk), {}, len(chunk)))
+            while pending:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                results = pending.popleft().result(remaining)
+                # Top up before yielding so workers stay busy while the caller works
+                for chunk in itertools.islice(chunks, 1):
+                    pending.append(self._enqueue(priority, _run_chunk, (fn, chunk), {}, len(chunk)))
+                yield from results
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def resize(self, max_workers: int) -> None:
+        """Change the worker limit without restarting the pool.
+
+        Args:
+            max_workers: New upper bound for concurrent tasks; limited to the
+                pool's ceiling once it is running
         """
+        if max_workers < 1:
+            msg = "max_workers must be >= 1"
+            raise ValueError(msg)
+        with self._condition:
+            self.set_config("max_workers", max_workers)
+            self._condition.notify_all()
+
+    def warm_up(self, workers: int | None = None) -> list[Future]:
+        """Start worker processes ahead of the first job.
+
+        The warm-up tasks don't count towards the usage statistics.
+
+        Args:
+            workers: Number of workers to start; ``min_workers`` by default
+
+        Returns:
+            Futures that finish once the workers are up
+        """
+        count = min(workers or self._min_workers(), self._worker_limit())
+        return [self._enqueue(TaskPriority.INTERACTIVE, _noop, (), {}, 0) for _ in range(count)]
+
+    def _enqueue(
+        self,
+        priority: TaskPriority,
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        weight: int,
+    ) -> Future:
+        """Queue a task for the dispatcher, counting it as ``weight`` tasks."""
         if not self._is_initialized:
             self.initialize()
 
@@ -175,48 +366,155 @@ class GlobalProcessPool(ConfigurableManager):
             msg = "Process pool not available"
             raise RuntimeError(msg)
 
-        # Track task count
-        iterable_len = len(list(zip(*iterables, strict=False)))
-        self._usage_stats["total_tasks"] += iterable_len
+        future: Future = Future()
+        with self._condition:
+            heapq.heappush(self._queue, _QueuedTask(int(priority), next(self._sequence), fn, args, kwargs, future))
+            self._active_futures.add(future)
+            self._usage_stats["total_tasks"] += weight
+            self._condition.notify_all()
 
-        # Use executor.map
-        try:
-            for result in self._executor.map(fn, *iterables, timeout=timeout, chunksize=chunksize):
-                self._usage_stats["completed_tasks"] += 1
-                yield result
-        except Exception:
-            self._usage_stats["failed_tasks"] += 1
-            raise
+        # Add completion callback
+        future.add_done_callback(lambda done: self._on_task_complete(done, weight))
 
-    def _on_task_complete(self, future: Future) -> None:
-        """Callback when a task completes."""
+        return future
+
+    def _dispatch_loop(self) -> None:
+        """Hand queued tasks to the executor as the pool's size allows."""
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                self._check_scaling()
+                ready: list[_QueuedTask] = []
+                while self._queue and self._running < self._usage_stats["current_workers"]:
+                    task = heapq.heappop(self._queue)
+                    if task.future.set_running_or_notify_cancel():
+                        ready.append(task)
+                        self._running += 1
+                if not ready:
+                    # Queued tasks are waiting on a scaling decision, so look again soon
+                    self._condition.wait(SCALE_INTERVAL if self._queue else None)
+                    continue
+            # Submitted without the lock, which the executor's callbacks may need
+            for task in ready:
+                self._dispatch(task)
+
+    def _dispatch(self, task: _QueuedTask) -> None:
+        """Submit a task taken off the queue to the executor."""
+        assert self._executor is not None
         try:
-            if future.exception() is not None:
-                self._usage_stats["failed_tasks"] += 1
+            inner = self._executor.submit(_call_with_metrics, task.fn, task.args, task.kwargs)
+        except Exception as e:  # A broken or shut down pool
+            self._on_dispatched_done(task.future, None, e)
+            return
+        inner.add_done_callback(lambda done: self._on_dispatched_done(task.future, done))
+
+    def _on_dispatched_done(self, future: Future, inner: Future | None, error: Exception | None = None) -> None:
+        """Pass a worker's result to the task's future and free its slot."""
+        with self._condition:
+            self._running -= 1
+            self._condition.notify_all()
+        if inner is None:
+            future.set_exception(error)
+        elif inner.cancelled():
+            future.set_exception(CancelledError())
+        elif inner.exception() is not None:
+            future.set_exception(inner.exception())
+        else:
+            result, metrics = inner.result()
+            REGISTRY.merge(metrics)
+            future.set_result(result)
+
+    def _on_task_complete(self, future: Future, weight: int = 1) -> None:
+        """Callback when a task completes."""
+        with self._condition:
+            if future.cancelled() or not weight:
+                pass
+            elif future.exception() is not None:
+                self._usage_stats["failed_tasks"] += weight
             else:
-                self._usage_stats["completed_tasks"] += 1
-        except Exception:
-            self._usage_stats["failed_tasks"] += 1
+                self._usage_stats["completed_tasks"] += weight
+
+            # Remove from active set
+            self._active_futures.discard(future)
+
+    def _min_workers(self) -> int:
+        return max(1, min(self.get_config("min_workers"), self._worker_limit()))
+
+    def _worker_limit(self) -> int:
+        """Get the configured worker limit, capped by active batches and the running pool's ceiling."""
+        limit = max(1, min([self.get_config("max_workers"), *self._batch_limits]))
+        return min(limit, self._max_workers) if self._max_workers else limit
+
+    def _cpu_load(self) -> float:
+        """Get the fraction of CPU time in use since the last sample, across all cores.
+
+        Falls back to the one minute load average per core without psutil, or
+        0 where neither is available.
+        """
+        if PSUTIL_AVAILABLE:
+            return psutil.cpu_percent(interval=None) / 100
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1)
+        except (AttributeError, OSError):
+            return 0.0
 
-        # Remove from active set
-        self._active_futures.discard(future)
+    def _memory_level(self) -> PressureLevel:
+        """Get the memory pressure level the bus last published.
 
-    def _cleanup_completed_futures(self) -> None:
-        """Remove completed futures from tracking."""
-        completed = {f for f in self._active_futures if f.done()}
-        self._active_futures -= completed
+        Only the bus's monitor takes readings, so polling here does not count
+        towards the readings needed to lower the level.
+        """
+        return get_memory_pressure_bus().level
+
+    def _sample_load(self) -> tuple[float, PressureLevel]:
+        """Get the CPU load and memory pressure, sampled at most every ``LOAD_SAMPLE_INTERVAL``."""
+        sampled_at, cpu_load, memory_level = self._load_sample
+        now = time.monotonic()
+        if now - sampled_at >= LOAD_SAMPLE_INTERVAL:
+            cpu_load, memory_level = self._cpu_load(), self._memory_level()
+            self._load_sample = (now, cpu_load, memory_level)
+        return cpu_load, memory_level
 
     def _check_scaling(self) -> None:
-        """Check if pool needs scaling (placeholder for future enhancement)."""
-        # Calculate usage
-        if self._executor and self._max_workers:
-            active_count = len(self._active_futures)
-            max_workers = self._max_workers
-            usage_ratio = active_count / max_workers
+        """Resize the pool to the queue depth, as CPU load and memory allow.
 
-            if usage_ratio > self.get_config("scale_threshold"):
-                self.log_debug("High process pool usage: %.1f%%", usage_ratio * 100)
-                # Future: Implement dynamic scaling
+        Called by the dispatcher with the lock held, before dispatching.
+        """
+        current = int(self._usage_stats["current_workers"])
+        limit = self._worker_limit()
+        minimum = self._min_workers()
+        if not self.get_config("auto_scale"):
+            target = limit
+        else:
+            demand = self._running + len(self._queue)
+            target = min(max(current, minimum), limit)
+            cpu_load, memory_level = self._sample_load()
+            now = time.monotonic()
+            if memory_level == PressureLevel.CRITICAL:
+                # Pause admission: running tasks finish, but only one at a time starts
+                target = 1
+            elif memory_level == PressureLevel.ELEVATED:
+                # Give memory back one worker at a time, letting each step take effect
+                if target > minimum and now - self._last_scaled >= SCALE_INTERVAL:
+                    target -= 1
+                    self._last_scaled = now
+            elif demand > target and cpu_load < self.get_config("cpu_threshold"):
+                target = min(demand, limit)
+            elif demand < target:
+                # Idle workers stay warm; they just aren't given more than the work there is
+                target = max(demand, minimum)
+
+        if target != current:
+            self._usage_stats["current_workers"] = target
+            self._last_scaled = time.monotonic()
+            self.log_debug(
+                "Scaled process pool from %d to %d workers (%d running, %d queued)",
+                current,
+                target,
+                self._running,
+                len(self._queue),
+            )
 
     def get_stats(self) -> dict[str, Any]:
         """Get usage statistics.
@@ -224,8 +522,11 @@ class GlobalProcessPool(ConfigurableManager):
         Returns:
             Dictionary of usage statistics
         """
-        stats = self._usage_stats.copy()
-        stats["active_tasks"] = len(self._active_futures)
+        with self._condition:
+            stats = self._usage_stats.copy()
+            stats["active_tasks"] = len(self._active_futures)
+            stats["running_tasks"] = self._running
+            stats["queued_tasks"] = len(self._queue)
         stats["success_rate"] = (
             (stats["completed_tasks"] / stats["total_tasks"] * 100) if stats["total_tasks"] > 0 else 0.0
         )
@@ -237,12 +538,14 @@ class GlobalProcessPool(ConfigurableManager):
         Args:
             timeout: Maximum time to wait
         """
-        if self._active_futures:
-            self.log_info("Waiting for %d active tasks", len(self._active_futures))
+        with self._condition:
+            active = set(self._active_futures)
+        if active:
+            self.log_info("Waiting for %d active tasks", len(active))
 
             # Wait for completion using as_completed iterator
             try:
-                for _ in as_completed(self._active_futures, timeout=timeout):
+                for _ in as_completed(active, timeout=timeout):
                     pass  # Just consume the iterator
             except Exception as e:
                 self.log_warning("Error waiting for tasks: %s", e)
@@ -251,31 +554,33 @@ class GlobalProcessPool(ConfigurableManager):
     def batch_context(self, max_concurrent: int | None = None) -> Generator[None]:
         """Context manager for batch processing with concurrency control.
 
+        The limit takes effect on the running pool; its workers aren't restarted.
+        While batches overlap the smallest of their limits applies, and each
+        batch's limit is lifted when it exits, so the configured ``max_workers``
+        is never changed.
+
         Args:
             max_concurrent: Maximum concurrent tasks (None for no limit)
 
         Yields:
             None
         """
-        if max_concurrent:
-            # Store original max_workers
-            original_max = self.get_config("max_workers")
-
-            # Temporarily limit workers
-            self.set_config("max_workers", min(max_concurrent, original_max))
-
-            # Recreate pool with new size
-            self.cleanup()
-            self.initialize()
+        if not max_concurrent:
+            yield
+            return
+        if max_concurrent < 1:
+            msg = "max_concurrent must be >= 1"
+            raise ValueError(msg)
 
+        with self._condition:
+            self._batch_limits.append(max_concurrent)
+            self._condition.notify_all()
         try:
             yield
         finally:
-            if max_concurrent:
-                # Restore original configuration
-                self.set_config("max_workers", original_max)
-                self.cleanup()
-                self.initialize()
+            with self._condition:
+                self._batch_limits.remove(max_concurrent)
+                self._condition.notify_all()
 
 
 # Module-level convenience functions
@@ -283,6 +588,38 @@ class GlobalProcessPool(ConfigurableManager):
 _global_pool: GlobalProcessPool | None = None
 
 
+def _collect_metrics() -> Iterator[MetricFamily]:
+    pool = GlobalProcessPool._instance  # noqa: SLF001  # Not created just to be measured
+    if pool is None:
+        return
+    stats = pool.get_stats()
+    yield MetricFamily(
+        "goes_vfi_process_pool_workers",
+        "gauge",
+        "Tasks the global process pool runs at once",
+        [("", {}, stats["current_workers"])],
+    )
+    yield MetricFamily(
+        "goes_vfi_process_pool_running_tasks",
+        "gauge",
+        "Tasks running in the global process pool",
+        [("", {}, stats["running_tasks"])],
+    )
+    yield MetricFamily(
+        "goes_vfi_process_pool_queued_tasks",
+        "gauge",
+        "Tasks waiting for a worker of the global process pool",
+        [("", {}, stats["queued_tasks"])],
+    )
+    tasks = MetricFamily("goes_vfi_process_pool_tasks_total", "counter", "Tasks finished by the global process pool")
+    tasks.add(stats["completed_tasks"], result="completed")
+    tasks.add(stats["failed_tasks"], result="failed")
+    yield tasks
+
+
+REGISTRY.register_collector(_collect_metrics)
+
+
 def get_global_process_pool() -> GlobalProcessPool:
     """Get the global process pool instance.
 
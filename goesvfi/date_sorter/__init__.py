@@ -1,7 +1,32 @@
 """Date sorter module for organizing files based on dates in their filenames."""
 
-from .gui_tab import DateSorterTab
-from .sorter import DateSorter
-from .view_model import DateSorterViewModel
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .gui_tab import DateSorterTab
+    from .sorter import DateSorter
+    from .view_model import DateSorterViewModel
 
 __all__ = ["DateSorter", "DateSorterTab", "DateSorterViewModel"]
+
+# Imported on first access, so the sorter can be used without PyQt6
+_LAZY_IMPORTS = {
+    "DateSorter": ".sorter",
+    "DateSorterTab": ".gui_tab",
+    "DateSorterViewModel": ".view_model",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,19 +1,27 @@
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime, timedelta
-import os
 from pathlib import Path
 import re
-import shutil
+
+import numpy as np
 
 from goesvfi.utils import log
+from goesvfi.utils.file_transfer import DEFAULT_TRANSFER_WORKERS, TransferMode, copy_file, map_ordered, transfer_file
+from goesvfi.utils.file_walker import walk_files
+from goesvfi.utils.filename_timestamps import TimestampParser, TimestampScheme
+from goesvfi.utils.timeline import Timeline
 
 LOGGER = log.get_logger(__name__)
 
+# End of the names of sorted frames, *_YYYYMMDDTHHMMSSZ.png
+_FRAME_NAME_SUFFIX = TimestampScheme("frame_png", "_YYYYmmddTHHMMSSZ.png")
+_FRAME_NAME_PARSER = TimestampParser((_FRAME_NAME_SUFFIX,))
+
 # !/usr/bin/env python3
 
 
 # --------------------------------------------------------------------------------
-# Helper function: buffered file copy with mtime preservation
+# Helper function: kernel file copy with mtime preservation
 # --------------------------------------------------------------------------------
 def copy_file_with_buffer(
     source_path: Path,
@@ -21,45 +29,26 @@ def copy_file_with_buffer(
     source_mtime_utc: float,
     buffer_size: int = 1048576,
 ) -> None:
-    """Copies a file in chunks (buffered) and preserves its last modified time (UTC).
+    """Copies a file through the kernel and preserves its last modified time (UTC).
     :param source_path: The full path to the source file.
     :param dest_path: The full path to the destination file.
     :param source_mtime_utc: The source file's mtime in epoch seconds (UTC).
-    :param buffer_size: The size of the read/write buffer in bytes (default is 1 MB).
+    :param buffer_size: The size of the read/write buffer in bytes, if the kernel can't copy (default is 1 MB).
     """
-    try:
-        with open(source_path, "rb") as sf, open(dest_path, "wb") as df:
-            while True:
-                buffer = sf.read(buffer_size)
-                if not buffer:
-                    break
-                df.write(buffer)
-    except Exception:
-        raise
-
-    # Preserve the source file's modification time (in UTC).
-    os.utime(dest_path, (source_mtime_utc, source_mtime_utc))
+    copy_file(source_path, dest_path, source_mtime_utc, buffer_size)
 
 
 def find_png_files(directory: Path) -> list[Path]:
     """Return all PNG files under ``directory`` recursively."""
-    return list(directory.rglob("*.png"))
+    return [Path(entry.path) for entry in walk_files(directory, suffixes=(".png",))]
 
 
 def extract_timestamps_from_files(files: Iterable[Path]) -> list[datetime]:
     """Extract datetimes from file names matching ``*_YYYYMMDDTHHMMSSZ.png``."""
-    pattern = re.compile(r"_(\d{8}T\d{6})Z\.png$")
-    datetimes: list[datetime] = []
-    for path in files:
-        match = pattern.search(path.name)
-        if not match:
-            continue
-        try:
-            datetimes.append(datetime.strptime(match.group(1), "%Y%m%dT%H%M%S"))
-        except ValueError:
-            continue
-    datetimes.sort()
-    return datetimes
+    # The timestamp must end the name, so only the suffix is parsed
+    width = _FRAME_NAME_SUFFIX.width
+    stamps = _FRAME_NAME_PARSER.parse_many(path.name[-width:] for path in files)
+    return np.sort(stamps[~np.isnat(stamps)]).tolist()
 
 
 def compute_missing_intervals(
@@ -69,25 +58,15 @@ def compute_missing_intervals(
     if not datetimes:
         return {}, []
 
-    datetimes = sorted(datetimes)
-    earliest, latest = datetimes[0], datetimes[-1]
-    date_set = set(datetimes)
-    current_dt = earliest
-    missing: list[datetime] = []
+    earliest, latest = min(datetimes), max(datetimes)
+    found = Timeline.from_timestamps(earliest, latest, timedelta(minutes=interval_minutes), datetimes)
     daily_records: dict[str, list[tuple[str, bool]]] = {}
 
-    while current_dt <= latest:
-        day = current_dt.strftime("%Y-%m-%d")
-        time = current_dt.strftime("%H:%M")
-        found = current_dt in date_set
-        if day not in daily_records:
-            daily_records[day] = []
-        daily_records[day].append((time, found))
-        if not found:
-            missing.append(current_dt)
-        current_dt += timedelta(minutes=interval_minutes)
+    for index, present in enumerate(found.bits.tolist()):
+        current_dt = earliest + found.cadence * index
+        daily_records.setdefault(current_dt.strftime("%Y-%m-%d"), []).append((current_dt.strftime("%H:%M"), present))
 
-    return daily_records, missing
+    return daily_records, (~found).timestamps()
 
 
 def report_missing_intervals(
@@ -190,7 +169,30 @@ def format_calendar_output(daily_records: dict[str, list[tuple[str, bool]]], mis
 
 
 class DateSorter:
-    """Sorts files from a source directory into a destination directory."""
+    """Sorts files from a source directory into a destination directory.
+
+    Files are copied (or hardlinked or moved, see ``TransferMode``) on a
+    bounded thread pool, with progress reported in file order.
+    """
+
+    def __init__(
+        self,
+        transfer_mode: TransferMode = TransferMode.COPY,
+        max_workers: int = DEFAULT_TRANSFER_WORKERS,
+    ) -> None:
+        """Initialize the sorter.
+
+        :param transfer_mode: How files are put at their destination.
+        :param max_workers: Number of files to transfer at once.
+        """
+        self.transfer_mode = transfer_mode
+        self.max_workers = max_workers
+
+    def _transfer(self, job: tuple[Path, Path | None]) -> None:
+        """Put a planned file at its destination, keeping its metadata as ``shutil.copy2`` does."""
+        file_path, dest_file_path = job
+        if dest_file_path is not None:
+            transfer_file(file_path, dest_file_path, self.transfer_mode)
 
     def sort_files(
         self,
@@ -217,66 +219,55 @@ class DateSorter:
         if not destination_path.exists():
             destination_path.mkdir(parents=True, exist_ok=True)
 
-        all_files = list(source_path.rglob("*"))
+        # Only files with a date in their name can be sorted
+        date_in_name = re.compile(r"_(\d{8}T\d{6})Z")
+        all_files = [
+            Path(entry.path)
+            for entry in walk_files(source_path, name_filter=lambda name: bool(date_in_name.search(name)))
+        ]
         total_files = len(all_files)
         processed_count = 0
 
-        for file_path in all_files:
-            if should_cancel and should_cancel():
-                return
+        def plan() -> Iterator[tuple[Path, Path | None]]:
+            """Work out each file's destination in order, on this thread."""
+            for file_path in all_files:
+                if should_cancel and should_cancel():
+                    return
 
-            if file_path.is_file():
+                dest_file_path = None
                 try:
-                    # Attempt to extract date from filename using the provided format
-                    # This is a simplified approach; a more robust solution might be needed
-                    # depending on the actual filename patterns.
-                    # Assuming filename is something like 'prefix_YYYYMMDD_HHMMSS.ext'
-                    # and date_format is '%Y%m%d_%H%M%S'
-                    file_name = file_path.name
-                    # Find the part of the filename that matches the date_format pattern
-                    # This requires a more sophisticated regex based on the date_format
-                    # For now, let's assume the date part is extractable.
-                    # A simple approach: try to parse the whole filename or a known part
-                    # This needs refinement based on actual file naming conventions.
-
-                    # Placeholder for actual date extraction logic
-                    # Example: if date_format is '%Y/%m/%d' and filename is 'data/2023/10/26/image.png'
-                    # We need to extract '2023/10/26' and parse it.
-                    # A more general approach would involve regex matching based on date_format components.
-
-                    # For now, let's use a simplified example assuming a date string is part of the name
-                    # like 'image_20231026120000.png' and format is '%Y%m%d%H%M%S'
-                    # This part needs to be made robust based on real file patterns and date_format.
-
-                    # Example: Extract date from filename like 'prefix_YYYYMMDDTHHMMSSZ.ext'
-                    # This regex matches the pattern used in scan_for_missing_intervals
-                    match = re.search(r"_(\d{8}T\d{6})Z", file_name)
+                    # Extract the date from a name like 'prefix_YYYYMMDDTHHMMSSZ.ext', the
+                    # pattern used in scan_for_missing_intervals
+                    match = date_in_name.search(file_path.name)
                     if match:
-                        date_str = match.group(1)  # YYYYMMDDTHHMMSS
-                        # Parse the extracted date string
-                        file_date = datetime.strptime(date_str, "%Y%m%dT%H%M%S")
+                        file_date = datetime.strptime(match.group(1), "%Y%m%dT%H%M%S")
 
                         # Create destination path based on date format
                         # Example: destination/YYYY/MM/DD/filename.ext
-                        relative_dest_dir = file_date.strftime(date_format)
-                        final_dest_dir = destination_path / relative_dest_dir
+                        final_dest_dir = destination_path / file_date.strftime(date_format)
                         final_dest_dir.mkdir(parents=True, exist_ok=True)
-
-                        dest_file_path = final_dest_dir / file_name
-
-                        # Copy the file
-                        shutil.copy2(file_path, dest_file_path)  # copy2 preserves metadata
-
-                        processed_count += 1
-                        if progress_callback:
-                            progress_callback(processed_count, total_files)
-
+                        dest_file_path = final_dest_dir / file_path.name
                 except ValueError:
                     # Skip files that don't match the expected date format
                     LOGGER.debug("Skipping file %s: Invalid date format", file_path)
-                except (OSError, PermissionError) as e:
-                    # Handle file operation errors
+                except OSError as e:
                     LOGGER.warning("Error processing file %s: %s", file_path, e)
+                yield file_path, dest_file_path
+
+        # Writes to the same destination run one after another, in file order
+        results = map_ordered(self._transfer, plan(), self.max_workers, key=lambda job: job[1])
+        for (file_path, dest_file_path), future in results:
+            try:
+                future.result()
+            except OSError as e:
+                # Handle file operation errors
+                LOGGER.warning("Error processing file %s: %s", file_path, e)
+                continue
+
+            if dest_file_path is not None:
+                processed_count += 1
+                if progress_callback:
+                    progress_callback(processed_count, total_files)
 
         if progress_callback:
             progress_callback(total_files, total_files)  # Ensure 100% progress at the end
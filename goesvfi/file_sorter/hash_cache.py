@@ -0,0 +1,361 @@
+"""Content hashes for duplicate detection, cached in SQLite.
+
+The sorter's default duplicate check treats two files as identical when their
+sizes match and their modification times are within a second, which is wrong
+after a re-download rewrites a file with new data of the same size. Comparing
+content hashes is exact, but hashing an archive on every sort is slow, so
+:class:`HashCache` stores each file's hash keyed by its path, size,
+modification time and inode. A file is only hashed again when one of those
+changes.
+
+Hashes are streamed over fixed-size chunks with xxHash (XXH3, 128 bit) when the
+optional ``xxhash`` package is installed, and with 128-bit BLAKE2b otherwise.
+The algorithm is stored with each hash, so switching between them just
+rehashes. :func:`find_duplicates` uses the cache to report duplicate files
+across a whole archive, hashing only files whose size isn't unique.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+import concurrent.futures
+from dataclasses import dataclass, field
+import hashlib
+import os
+from pathlib import Path
+import sqlite3
+import threading
+from types import TracebackType
+from typing import Any
+
+from goesvfi.utils import config, log
+from goesvfi.utils.file_walker import walk_files
+
+LOGGER = log.get_logger(__name__)
+
+try:
+    import xxhash
+
+    HASH_ALGORITHM = "xxh3_128"
+except ImportError:
+    xxhash = None
+    HASH_ALGORITHM = "blake2b_128"
+
+# Bytes read per chunk while hashing (1 MB)
+HASH_CHUNK_SIZE = 1048576
+
+# Cached hashes written per commit
+COMMIT_INTERVAL = 256
+
+# Files hashed at once by find_duplicates; hashing releases the GIL
+DEFAULT_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    digest TEXT NOT NULL
+)
+"""
+
+
+def default_hash_cache_path() -> Path:
+    """Get the default hash cache location in the user config directory."""
+    return Path(config.get_user_config_dir()) / "file_hashes.db"
+
+
+def _new_hasher() -> Any:
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def hash_file(path: Path, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Hash a file's content in chunks with ``HASH_ALGORITHM``.
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        The hex digest
+    """
+    hasher = _new_hasher()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while count := f.readinto(buffer):
+            hasher.update(view[:count])
+    return str(hasher.hexdigest())
+
+
+def _stat_key(st: os.stat_result) -> tuple[int, int, int]:
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class HashCache:
+    """Content hashes cached in SQLite, keyed by path, size, mtime and inode.
+
+    The cache is safe to use from several threads; files are hashed outside
+    the database lock. New hashes are committed every ``COMMIT_INTERVAL``
+    files and on ``flush`` or ``close``.
+    """
+
+    def __init__(self, db_path: Path | str | None = None) -> None:
+        """Open (or create) a hash cache.
+
+        Args:
+            db_path: SQLite database file, or ``":memory:"``; defaults to
+                ``default_hash_cache_path()``
+        """
+        if db_path is None:
+            db_path = default_hash_cache_path()
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self._closed = False
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def get(self, path: Path, st: os.stat_result | None = None) -> str | None:
+        """Get a file's cached hash, or None if it isn't cached or the file changed.
+
+        Args:
+            path: File to look up
+            st: The file's ``os.stat`` result, if already known
+        """
+        path = Path(path).absolute()
+        size, mtime_ns, inode = _stat_key(st or path.stat())
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM file_hashes WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ? "
+                "AND algorithm = ?",
+                (str(path), size, mtime_ns, inode, HASH_ALGORITHM),
+            ).fetchone()
+        return row[0] if row else None
+
+    def hash(self, path: Path, st: os.stat_result | None = None) -> str:
+        """Get a file's content hash, hashing it only if the cached hash is stale.
+
+        Args:
+            path: File to hash
+            st: The file's ``os.stat`` result, if already known
+
+        Raises:
+            OSError: If the file can't be read
+        """
+        path = Path(path).absolute()
+        st = st or path.stat()
+        digest = self.get(path, st)
+        with self._lock:
+            if digest is not None:
+                self.hits += 1
+                return digest
+            self.misses += 1
+
+        digest = hash_file(path)
+        # A file written while it was hashed would cache a hash of neither version
+        if _stat_key(path.stat()) != _stat_key(st):
+            LOGGER.debug("%s changed while hashing, not caching its hash", path)
+            return digest
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, inode, algorithm, digest) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(path), *_stat_key(st), HASH_ALGORITHM, digest),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= COMMIT_INTERVAL:
+                self._commit()
+        return digest
+
+    def same_content(self, first: Path, second: Path) -> bool:
+        """Check whether two files have the same content.
+
+        Files of different sizes are never hashed.
+        """
+        first_stat, second_stat = Path(first).stat(), Path(second).stat()
+        if first_stat.st_size != second_stat.st_size:
+            return False
+        return self.hash(first, first_stat) == self.hash(second, second_stat)
+
+    def prune(self) -> int:
+        """Remove the cached hashes of files that no longer exist.
+
+        Returns:
+            The number of hashes removed
+        """
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute("SELECT path FROM file_hashes")]
+        missing = [(path,) for path in paths if not os.path.exists(path)]
+        with self._lock:
+            self._conn.executemany("DELETE FROM file_hashes WHERE path = ?", missing)
+            self._commit()
+        return len(missing)
+
+    def flush(self) -> None:
+        """Commit hashes not yet written to the database."""
+        with self._lock:
+            self._commit()
+
+    def close(self) -> None:
+        """Commit pending hashes and close the database."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._commit()
+            self._conn.close()
+
+    def _commit(self) -> None:
+        self._conn.commit()
+        self._uncommitted = 0
+
+
+@dataclass
+class DuplicateGroup:
+    """Files with identical content."""
+
+    digest: str
+    size: int
+    paths: list[Path]
+
+    @property
+    def wasted_bytes(self) -> int:
+        """Bytes taken by all copies but one."""
+        return self.size * (len(self.paths) - 1)
+
+
+@dataclass
+class DedupReport:
+    """Duplicate files found across an archive."""
+
+    groups: list[DuplicateGroup] = field(default_factory=list)
+    files_scanned: int = 0
+    bytes_scanned: int = 0
+    files_hashed: int = 0
+    cache_hits: int = 0
+
+    @property
+    def duplicate_files(self) -> int:
+        """Number of files that are copies of another file."""
+        return sum(len(group.paths) - 1 for group in self.groups)
+
+    @property
+    def wasted_bytes(self) -> int:
+        """Bytes that removing the duplicates would free."""
+        return sum(group.wasted_bytes for group in self.groups)
+
+    def summary(self) -> str:
+        """Get a one-line summary of the report."""
+        return (
+            f"{self.files_scanned} files scanned ({self.bytes_scanned / 1048576:.1f} MB), "
+            f"{self.files_hashed} hashed ({self.cache_hits} from cache), "
+            f"{self.duplicate_files} duplicates in {len(self.groups)} groups, "
+            f"{self.wasted_bytes / 1048576:.1f} MB reclaimable"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the report to JSON-serializable data, largest groups first."""
+        return {
+            "files_scanned": self.files_scanned,
+            "bytes_scanned": self.bytes_scanned,
+            "files_hashed": self.files_hashed,
+            "cache_hits": self.cache_hits,
+            "duplicate_files": self.duplicate_files,
+            "wasted_bytes": self.wasted_bytes,
+            "groups": [
+                {"digest": group.digest, "size": group.size, "paths": [str(path) for path in group.paths]}
+                for group in sorted(self.groups, key=lambda group: group.wasted_bytes, reverse=True)
+            ],
+        }
+
+
+def find_duplicates(
+    roots: Path | Iterable[Path],
+    cache: HashCache | None = None,
+    suffixes: tuple[str, ...] | None = None,
+    max_workers: int = DEFAULT_HASH_WORKERS,
+    should_cancel: Callable[[], bool] | None = None,
+) -> DedupReport:
+    """Find files with identical content under one or more directories.
+
+    Files are grouped by size first; only files sharing a size with another
+    file are hashed. Empty files are ignored.
+
+    Args:
+        roots: Directories to scan
+        cache: Hash cache to read and update; an in-memory cache if None
+        suffixes: Only consider files with these suffixes, e.g. ``(".png",)``
+        max_workers: Files hashed at once
+        should_cancel: Returns True to stop early with a partial report
+
+    Returns:
+        The duplicate groups, each with its paths sorted
+    """
+    root_dirs = [Path(roots)] if isinstance(roots, str | os.PathLike) else [Path(root) for root in roots]
+    report = DedupReport()
+    by_size: defaultdict[int, list[tuple[Path, os.stat_result]]] = defaultdict(list)
+    for root in root_dirs:
+        for entry in walk_files(root, suffixes=suffixes):
+            try:
+                st = entry.stat()
+            except OSError as e:
+                LOGGER.warning("Cannot stat %s: %s", entry.path, e)
+                continue
+            report.files_scanned += 1
+            report.bytes_scanned += st.st_size
+            if st.st_size > 0:
+                by_size[st.st_size].append((Path(entry.path), st))
+
+    candidates = [file for files in by_size.values() if len(files) > 1 for file in files]
+    owned_cache = cache is None
+    cache = cache or HashCache(":memory:")
+    hits_before = cache.hits
+    by_digest: defaultdict[tuple[int, str], list[Path]] = defaultdict(list)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(cache.hash, path, st): (path, st) for path, st in candidates}
+            for future in concurrent.futures.as_completed(futures):
+                path, st = futures[future]
+                if should_cancel and should_cancel():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+                try:
+                    by_digest[st.st_size, future.result()].append(path)
+                except OSError as e:
+                    LOGGER.warning("Cannot hash %s: %s", path, e)
+                    continue
+                report.files_hashed += 1
+        cache.flush()
+    finally:
+        report.cache_hits = cache.hits - hits_before
+        if owned_cache:
+            cache.close()
+
+    report.groups = [
+        DuplicateGroup(digest, size, sorted(paths)) for (size, digest), paths in by_digest.items() if len(paths) > 1
+    ]
+    report.groups.sort(key=lambda group: group.paths[0])
+    return report
@@ -1,14 +1,27 @@
 #!/usr/bin/env python3
 
-from collections.abc import Callable
-import contextlib
+from collections.abc import Callable, Iterator
 from datetime import datetime
 from enum import Enum, auto
 import os
 from pathlib import Path
 import re
+import sys
 from typing import Any
 
+from goesvfi.file_sorter.hash_cache import HashCache, find_duplicates
+from goesvfi.utils import log
+from goesvfi.utils.file_transfer import (
+    DEFAULT_TRANSFER_WORKERS,
+    TransferMode,
+    copy_file,
+    map_ordered,
+    transfer_file,
+)
+from goesvfi.utils.file_walker import walk_files
+
+LOGGER = log.get_logger(__name__)
+
 # Date/time validation constants
 MIN_MONTH = 1
 MAX_MONTH = 12
@@ -21,7 +34,7 @@ MAX_MINUTE = 59
 MIN_SECOND = 0
 MAX_SECOND = 59
 
-# Default buffer size (1 MB)
+# Default buffer size (1 MB), for copies the kernel can't do
 DEFAULT_BUFFER_SIZE = 1048576
 
 # Minimum length for datetime string (YYYYMMDDHHMMSS)
@@ -39,14 +52,33 @@ class FileSorter:
         self,
         dry_run: bool = False,
         duplicate_mode: DuplicateMode = DuplicateMode.OVERWRITE,
+        transfer_mode: TransferMode = TransferMode.COPY,
+        max_workers: int = DEFAULT_TRANSFER_WORKERS,
+        verify_content: bool = False,
+        hash_cache: HashCache | None = None,
     ) -> None:
+        """Create a sorter.
+
+        :param verify_content: Treat files as identical only if their content hashes match,
+            instead of their sizes and modification times.
+        :param hash_cache: Cache of content hashes for verify_content; the default cache in the
+            user config directory is opened for each sort if None.
+        """
         self.files_copied = 0
         self.files_skipped = 0
         self.total_bytes_copied = 0
         self.dry_run = dry_run
         self.duplicate_mode = duplicate_mode
+        self.transfer_mode = transfer_mode
+        self.max_workers = max_workers
+        self.verify_content = verify_content
+        self.hash_cache = hash_cache
         self._progress_callback: Callable[[int, int], None] | None = None
         self._should_cancel: Callable[[], bool] | None = None
+        # Destinations of transfers submitted in this run, which may not exist yet
+        self._claimed: set[Path] = set()
+        # Names in each target folder, listed once per run
+        self._folder_names: dict[Path, frozenset[str]] = {}
 
     @staticmethod
     def copy_file_with_buffer(
@@ -55,25 +87,16 @@ class FileSorter:
         source_mtime_utc: float,
         buffer_size: int = DEFAULT_BUFFER_SIZE,
     ) -> None:
-        """Copies a file in chunks (buffered) and preserves its last modified time (UTC).
+        """Copies a file through the kernel and preserves its last modified time (UTC).
+
+        The copy is a reflink, ``copy_file_range`` or ``sendfile`` where the
+        filesystem allows, and a buffered loop otherwise (see ``copy_file``).
         :param source_path: The full path to the source file.
         :param dest_path: The full path to the destination file.
         :param source_mtime_utc: The source file's mtime in epoch seconds (UTC).
         :param buffer_size: The size of the read/write buffer in bytes (default is 1 MB).
         """
-        try:
-            with open(source_path, "rb") as sf, open(dest_path, "wb") as df:
-                while True:
-                    buffer = sf.read(buffer_size)
-                    if not buffer:
-                        break
-                    df.write(buffer)
-        except Exception:
-            raise
-
-        # Preserve the source file's modification time (in UTC).
-        # os.utime expects (atime, mtime) in *epoch seconds*.
-        os.utime(dest_path, (source_mtime_utc, source_mtime_utc))
+        copy_file(source_path, dest_path, source_mtime_utc, buffer_size)
 
     def sort_files(
         self,
@@ -100,7 +123,15 @@ class FileSorter:
             return files_to_process
 
         # Process all files
-        result = self._process_all_files(files_to_process, destination_dir)  # type: ignore
+        owns_hash_cache = self.verify_content and self.hash_cache is None
+        if owns_hash_cache:
+            self.hash_cache = HashCache()
+        try:
+            result = self._process_all_files(files_to_process, destination_dir)  # type: ignore
+        finally:
+            if owns_hash_cache and self.hash_cache is not None:
+                self.hash_cache.close()
+                self.hash_cache = None
         if isinstance(result, dict) and result.get("status") == "cancelled":
             return result
 
@@ -146,12 +177,8 @@ class FileSorter:
     @staticmethod
     def _get_date_folders(source_dir: Path) -> list[Path]:
         """Get all date/time folders from source directory."""
-        try:
-            date_folders: list[Path] = [f for f in source_dir.iterdir() if f.is_dir()]
-        except Exception:
-            raise
-
-        return date_folders
+        with os.scandir(source_dir) as entries:
+            return [Path(entry.path) for entry in entries if entry.is_dir()]
 
     @staticmethod
     def _is_valid_date_folder(folder_name: str) -> bool:
@@ -193,14 +220,6 @@ class FileSorter:
         # Insert 'T' between the date part (8 digits) and time part (6 digits)
         return folder_datetime_raw[:8] + "T" + folder_datetime_raw[8:]
 
-    @staticmethod
-    def _get_png_files_from_folder(folder: Path) -> list[Path]:
-        """Get all PNG files from a folder."""
-        try:
-            return list(folder.glob("*.png"))
-        except Exception:
-            return []
-
     def _check_cancellation(self) -> bool:
         """Check if cancellation has been requested."""
         return bool(self._should_cancel and self._should_cancel())
@@ -211,34 +230,40 @@ class FileSorter:
             self._progress_callback(current, total)
 
     def _build_file_processing_list(self, source_dir: Path) -> list[tuple[Path, str]] | dict[str, str]:
-        """Build a list of files to process with their datetime information."""
-        date_folders = self._get_date_folders(source_dir)
-        files_to_process: list[tuple[Path, str]] = []
-        folder_counter = 0
-        total_folders = len(date_folders)
-
-        for folder in date_folders:
-            if self._check_cancellation():
-                return {"status": "cancelled"}
-
-            folder_counter += 1
-            self._update_progress(folder_counter, total_folders)
+        """Build a list of files to process with their datetime information.
 
-            # Skip null or invalid folders
-            if folder is None:
-                continue
-
-            if not self._is_valid_date_folder(folder.name):
-                continue
-
-            folder_datetime = self._extract_folder_datetime(folder.name)
-            if folder_datetime is None:
-                continue
-
-            # Add all PNG files from this folder
-            png_files = self._get_png_files_from_folder(folder)
-            files_to_process.extend((file_path, folder_datetime) for file_path in png_files)
+        The date folders are listed in parallel; the result is sorted by path.
+        """
+        total_folders = sum(
+            1 for folder in self._get_date_folders(source_dir) if self._is_valid_date_folder(folder.name)
+        )
+        folder_datetimes: dict[str, str | None] = {}
+        files_to_process: list[tuple[Path, str]] = []
 
+        walker = walk_files(
+            source_dir,
+            suffixes=(".png",),
+            dir_filter=self._is_valid_date_folder,
+            min_depth=1,
+            max_depth=1,
+        )
+        try:
+            for entry in walker:
+                folder_name = os.path.basename(os.path.dirname(entry.path))
+                if folder_name not in folder_datetimes:
+                    if self._check_cancellation():
+                        return {"status": "cancelled"}
+                    folder_datetimes[folder_name] = self._extract_folder_datetime(folder_name)
+                    self._update_progress(len(folder_datetimes), total_folders)
+
+                folder_datetime = folder_datetimes[folder_name]
+                if folder_datetime is not None:
+                    files_to_process.append((Path(entry.path), folder_datetime))
+        finally:
+            walker.close()
+
+        self._update_progress(total_folders, total_folders)
+        files_to_process.sort(key=lambda item: item[0])
         return files_to_process
 
     @staticmethod
@@ -286,8 +311,35 @@ class FileSorter:
         time_diff = abs(source_mtime - dest_mtime)
         return time_diff <= time_tolerance
 
-    def _handle_duplicate_file(self, new_file_path: Path, target_folder: Path) -> tuple[Path, str]:
-        """Handle duplicate files based on duplicate mode."""
+    def _files_identical(self, source_path: Path, dest_path: Path) -> bool:
+        """Check whether a source file is already at a destination, by content if verifying."""
+        if self.verify_content and self.hash_cache is not None:
+            return self.hash_cache.same_content(source_path, dest_path)
+        return self._check_files_identical(source_path, dest_path)
+
+    def _destination_taken(self, path: Path) -> bool:
+        """Check whether a destination exists, or will once this run's transfers finish.
+
+        Each target folder is listed once per run rather than probing every name.
+        """
+        if path in self._claimed:
+            return True
+        folder = path.parent
+        if folder not in self._folder_names:
+            try:
+                self._folder_names[folder] = frozenset(os.listdir(folder))
+            except FileNotFoundError:
+                self._folder_names[folder] = frozenset()
+        return path.name in self._folder_names[folder]
+
+    def _handle_duplicate_file(
+        self, new_file_path: Path, target_folder: Path, source_path: Path | None = None
+    ) -> tuple[Path, str]:
+        """Handle duplicate files based on duplicate mode.
+
+        When verifying content, a file renamed by an earlier sort is found among the
+        renamed copies and skipped rather than renamed again.
+        """
         if self.duplicate_mode == DuplicateMode.SKIP:
             self.files_skipped += 1
             return new_file_path, "SKIPPED (Duplicate)"
@@ -296,26 +348,27 @@ class FileSorter:
             rename_counter = 1
             original_stem = new_file_path.stem
             original_suffix = new_file_path.suffix
-            while new_file_path.exists():
+            while self._destination_taken(new_file_path):
+                if (
+                    self.verify_content
+                    and source_path is not None
+                    and new_file_path not in self._claimed
+                    and self._files_identical(source_path, new_file_path)
+                ):
+                    self.files_skipped += 1
+                    return new_file_path, "SKIPPED (Identical)"
                 new_file_name = f"{original_stem}_{rename_counter}{original_suffix}"
                 new_file_path = target_folder / new_file_name
                 rename_counter += 1
             return new_file_path, f"RENAMED to {new_file_path.name}"
         return new_file_path, f"OVERWRITING {new_file_path.name}"
 
-    def _copy_file_if_needed(self, source_path: Path, dest_path: Path, action_msg: str) -> str:
-        """Copy file if not in dry run mode."""
-        if self.dry_run:
-            return f"DRY RUN: Would copy to {dest_path.name}"
-        source_size = source_path.stat().st_size
-        source_mtime = source_path.stat().st_mtime
-        self.copy_file_with_buffer(source_path, dest_path, source_mtime)
-        self.files_copied += 1
-        self.total_bytes_copied += source_size
-        return action_msg or f"COPIED to {dest_path.name}"
+    def _plan_file(self, file_path: Path, folder_datetime: str, destination_dir: Path) -> Path | None:
+        """Decide where a file goes, or None if it isn't transferred.
 
-    def _process_single_file(self, file_path: Path, folder_datetime: str, destination_dir: Path) -> None:
-        """Process a single file for sorting."""
+        Planning runs in order on the calling thread, so duplicate handling
+        sees the destinations of earlier files even before they are written.
+        """
         file_name = file_path.name
 
         # Extract base name and create target folder
@@ -326,39 +379,76 @@ class FileSorter:
         new_file_name = self._generate_new_file_name(file_name, base_name, folder_datetime)
         new_file_path = target_folder / new_file_name
 
-        # Check if files are identical
-        if self._check_files_identical(file_path, new_file_path):
-            self.files_skipped += 1
-            return
+        if self._destination_taken(new_file_path):
+            # Check if files are identical
+            if new_file_path not in self._claimed and self._files_identical(file_path, new_file_path):
+                self.files_skipped += 1
+                return None
 
-        # Handle file processing based on existence and duplicate mode
-        action_msg = ""
-        if new_file_path.exists():
-            new_file_path, action_msg = self._handle_duplicate_file(new_file_path, target_folder)
+            # Handle file processing based on duplicate mode
+            new_file_path, action_msg = self._handle_duplicate_file(new_file_path, target_folder, file_path)
             if "SKIPPED" in action_msg:
-                return  # Skip to next file
+                return None  # Skip to next file
+
+        if self.dry_run:
+            LOGGER.debug("DRY RUN: Would %s %s to %s", self.transfer_mode.value, file_name, new_file_path)
+            return None
+
+        self._claimed.add(new_file_path)
+        return new_file_path
 
-        # Copy the file
-        self._copy_file_if_needed(file_path, new_file_path, action_msg)
+    def _transfer_file(self, job: tuple[Path, Path | None]) -> int:
+        """Transfer a planned file, returning its size."""
+        source_path, dest_path = job
+        if dest_path is None:
+            return 0
+        source_stat = source_path.stat()
+        transfer_file(source_path, dest_path, self.transfer_mode, source_stat.st_mtime)
+        return source_stat.st_size
 
     def _process_all_files(
         self, files_to_process: list[tuple[Path, str]], destination_dir: Path
     ) -> dict[str, str] | None:
-        """Process all files in the processing list."""
-        counter = 0
-        total_files = len(files_to_process)
-
-        for file_path, folder_datetime in files_to_process:
-            if self._check_cancellation():
-                return {"status": "cancelled"}
+        """Process all files in the processing list.
 
-            counter += 1
+        Files are planned in order and transferred on a bounded thread pool;
+        progress is reported as files finish, in list order. A file that fails
+        to plan or transfer is logged and counted as skipped, and the sort
+        carries on with the rest.
+        """
+        total_files = len(files_to_process)
+        cancelled = False
+        self._claimed = set()
+        self._folder_names = {}
+
+        def plan() -> Iterator[tuple[Path, Path | None]]:
+            nonlocal cancelled
+            for file_path, folder_datetime in files_to_process:
+                if self._check_cancellation():
+                    cancelled = True
+                    return
+                try:
+                    dest_path = self._plan_file(file_path, folder_datetime, destination_dir)
+                except Exception as e:
+                    LOGGER.warning("Error processing file %s: %s", file_path, e)
+                    self.files_skipped += 1
+                    dest_path = None
+                yield file_path, dest_path
+
+        results = map_ordered(self._transfer_file, plan(), self.max_workers, key=lambda job: job[1])
+        for counter, ((file_path, dest_path), future) in enumerate(results, 1):
+            try:
+                copied_bytes = future.result()
+            except Exception as e:
+                LOGGER.warning("Error transferring file %s: %s", file_path, e)
+                self.files_skipped += 1
+            else:
+                if dest_path is not None:
+                    self.files_copied += 1
+                    self.total_bytes_copied += copied_bytes
             self._update_progress(counter, total_files)
 
-            with contextlib.suppress(Exception):
-                self._process_single_file(file_path, folder_datetime, destination_dir)
-
-        return None
+        return {"status": "cancelled"} if cancelled else None
 
     def _generate_final_statistics(self, script_start_time: datetime, total_files: int) -> dict[str, Any]:
         """Generate and print final sorting statistics."""
@@ -400,15 +490,63 @@ def main() -> None:
         default="overwrite",
         help="Action to take when a duplicate file is found. Options: overwrite, skip, rename. Defaults to overwrite.",
     )
+    parser.add_argument(
+        "--mode",
+        choices=[mode.value for mode in TransferMode],
+        default=TransferMode.COPY.value,
+        help="How to put files at their destination: copy, hardlink or move. Defaults to copy.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_TRANSFER_WORKERS,
+        help=f"Number of files to transfer at once. Defaults to {DEFAULT_TRANSFER_WORKERS}.",
+    )
+    parser.add_argument(
+        "--verify-content",
+        action="store_true",
+        help="Compare file contents by hash, not size and modification time, to find identical files.",
+    )
+    parser.add_argument(
+        "--hash-cache",
+        default=None,
+        help="SQLite file caching content hashes. Defaults to file_hashes.db in the user config directory.",
+    )
+    parser.add_argument(
+        "--dedup-report",
+        action="store_true",
+        help="Report files with identical content under root_dir as JSON instead of sorting.",
+    )
 
     args = parser.parse_args()
 
-    duplicate_mode = DuplicateMode[args.duplicate_mode.upper()]
+    if args.dedup_report:
+        import json
 
-    sorter = FileSorter(dry_run=args.dry_run, duplicate_mode=duplicate_mode)
+        with HashCache(args.hash_cache) as cache:
+            report = find_duplicates(Path(args.root_dir or "."), cache)
+        LOGGER.info(report.summary())
+        sys.stdout.write(json.dumps(report.to_dict(), indent=2) + "\n")
+        return
+
+    duplicate_mode = DuplicateMode[args.duplicate_mode.upper()]
+    hash_cache = HashCache(args.hash_cache) if args.verify_content else None
+
+    sorter = FileSorter(
+        dry_run=args.dry_run,
+        duplicate_mode=duplicate_mode,
+        transfer_mode=TransferMode(args.mode),
+        max_workers=args.workers,
+        verify_content=args.verify_content,
+        hash_cache=hash_cache,
+    )
     # In CLI mode, we still use root_dir for simplicity, not source/destination
     # The GUI will use source/destination with the ViewModel
-    sorter.sort_files(source=args.root_dir or ".", destination="./converted")
+    try:
+        sorter.sort_files(source=args.root_dir or ".", destination="./converted")
+    finally:
+        if hash_cache is not None:
+            hash_cache.close()
 
 
 if __name__ == "__main__":
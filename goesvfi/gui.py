@@ -11,7 +11,7 @@ from pathlib import Path
 from typing import Any, cast
 
 from PyQt6.QtCore import QSettings, QSize, Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QCloseEvent, QPixmap
+from PyQt6.QtGui import QCloseEvent, QPaintEvent, QPixmap
 from PyQt6.QtWidgets import QApplication, QStatusBar, QTabWidget, QVBoxLayout, QWidget
 
 from goesvfi.gui_components import (
@@ -24,9 +24,11 @@ from goesvfi.gui_components.resource_manager import get_resource_tracker
 from goesvfi.gui_components.signal_broker import SignalBroker
 from goesvfi.gui_components.ui_setup_manager import UISetupManager
 from goesvfi.gui_components.update_manager import get_update_manager, register_update, request_update
+from goesvfi.integrity_check.async_runtime import shutdown_async_runtime
 from goesvfi.utils import log
 from goesvfi.utils.gui_helpers import ClickableLabel
 from goesvfi.utils.settings.gui_settings_manager import GUISettingsManager
+from goesvfi.utils.startup_profile import process_uptime, record_startup_metric
 
 LOGGER = log.get_logger(__name__)
 
@@ -36,6 +38,7 @@ class MainWindow(QWidget):
     """Main application window for GOES-VFI GUI interface."""
 
     request_previews_update = pyqtSignal()  # Signal to trigger preview update
+    first_painted = pyqtSignal(float)  # Seconds from process start to the first paint
 
     # Type annotations for attributes created by InitializationManager
     main_tab: Any
@@ -64,6 +67,7 @@ class MainWindow(QWidget):
         LOGGER.debug("Entering MainWindow.__init__... debug_mode=%s", debug_mode)
         super().__init__()
         self.debug_mode = debug_mode
+        self.first_paint_seconds: float | None = None
         self.setWindowTitle(self.tr("GOES-VFI"))
         self.setGeometry(100, 100, 800, 600)  # x, y, w, h
 
@@ -240,6 +244,15 @@ class MainWindow(QWidget):
         # LOGGER.debug("Exiting _post_init_setup...")  # Removed log
         LOGGER.info("MainWindow post-initialization setup complete.")
 
+    def paintEvent(self, event: QPaintEvent | None) -> None:
+        """Record the cold start time on the first paint."""
+        super().paintEvent(event)
+        if self.first_paint_seconds is not None:
+            return
+        self.first_paint_seconds = process_uptime()
+        record_startup_metric("first_paint_seconds", self.first_paint_seconds)
+        self.first_painted.emit(self.first_paint_seconds)
+
     # --- State Setters for Child Tabs ---
     def _save_input_directory(self, path: Path) -> bool:
         """Save input directory to settings persistently.
@@ -601,6 +614,10 @@ class MainWindow(QWidget):
         if hasattr(self, "main_view_model") and hasattr(self.main_view_model, "processing_manager"):
             self.main_view_model.processing_manager.cleanup_all_resources()
 
+        # Stop the integrity check's directory watcher and close its caches
+        if hasattr(self, "integrity_check_vm"):
+            self.integrity_check_vm.cleanup()
+
         # Clean up all tracked resources through resource manager
         resource_tracker = get_resource_tracker()
         stats = resource_tracker.get_stats()
@@ -612,6 +629,9 @@ class MainWindow(QWidget):
         # Unified cleanup through resource manager
         resource_tracker.cleanup_all()
 
+        # Stop the shared integrity-check event loop and close its remote stores
+        shutdown_async_runtime()
+
         LOGGER.info("All resource cleanup completed")
 
         # Accept the close event
@@ -24,6 +24,8 @@ from goesvfi.pipeline.image_loader import ImageLoader
 from goesvfi.pipeline.sanchez_processor import SanchezProcessor
 from goesvfi.utils import log
 from goesvfi.utils.image_processing.refactored_preview import RefactoredPreviewProcessor
+from goesvfi.utils.memory_pressure import get_memory_pressure_bus
+from goesvfi.utils.metrics import start_metrics_server_from_env
 
 # Import moved to method to avoid circular import
 # from goesvfi.view_models.main_window_view_model import MainWindowViewModel
@@ -100,6 +102,12 @@ class InitializationManager:
         # Create preview processor
         main_window.preview_processor = RefactoredPreviewProcessor(main_window.sanchez_preview_cache)
 
+        # Shrink caches and pause queued work when memory runs short
+        get_memory_pressure_bus().start()
+
+        # Serve metrics for Prometheus if GOESVFI_METRICS_PORT is set
+        start_metrics_server_from_env()
+
         # Create all component managers
         self._create_component_managers(main_window)
 
@@ -5,7 +5,7 @@ from typing import Any
 
 from PyQt6.QtCore import QObject, QThread, pyqtSignal
 
-from goesvfi.pipeline.run_vfi import VfiWorker
+from goesvfi.pipeline.vfi_worker import VfiWorker
 from goesvfi.utils.log import get_logger
 
 LOGGER = get_logger(__name__)
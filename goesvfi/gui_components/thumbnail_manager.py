@@ -9,6 +9,7 @@ from PyQt6.QtCore import QSize
 from PyQt6.QtGui import QPixmap, QPixmapCache
 
 from goesvfi.utils import log
+from goesvfi.utils.memory_pressure import get_memory_pressure_bus
 
 LOGGER = log.get_logger(__name__)
 
@@ -23,17 +24,42 @@ PIXMAP_CACHE_SIZE_KB = CACHE_SIZE_MB * 1024  # Convert to KB for QPixmapCache
 
 
 class ThumbnailManager:
-    """Manages thumbnail generation and caching for preview images."""
+    """Manages thumbnail generation and caching for preview images.
+
+    The cache is registered with the memory pressure bus. QPixmapCache may
+    only be used from the GUI thread, so a new budget is applied the next
+    time a thumbnail is requested.
+    """
 
     def __init__(self) -> None:
         """Initialize the thumbnail manager."""
         self.file_cache: dict[str, tuple[QPixmap, QPixmap, QPixmap]] = {}
+        self._pending_limit_kb: int | None = None
 
         # Configure QPixmapCache
         QPixmapCache.setCacheLimit(PIXMAP_CACHE_SIZE_KB)
+        get_memory_pressure_bus().register_cache(self)
 
         LOGGER.info(f"ThumbnailManager initialized with {CACHE_SIZE_MB}MB cache")
 
+    def set_memory_budget(self, fraction: float) -> int:
+        """Limit the pixmap cache to a fraction of its size, from any thread.
+
+        Returns:
+            0; QPixmapCache evicts on the GUI thread and doesn't report a count
+        """
+        self._pending_limit_kb = int(PIXMAP_CACHE_SIZE_KB * fraction)
+        return 0
+
+    def _apply_memory_budget(self) -> None:
+        limit_kb, self._pending_limit_kb = self._pending_limit_kb, None
+        if limit_kb is None:
+            return
+        QPixmapCache.setCacheLimit(limit_kb)
+        if limit_kb < PIXMAP_CACHE_SIZE_KB:
+            self.file_cache.clear()
+        LOGGER.debug("Thumbnail cache limited to %dKB", limit_kb)
+
     def get_thumbnail(
         self,
         image_path: Path,
@@ -50,6 +76,8 @@ class ThumbnailManager:
         Returns:
             QPixmap thumbnail or None if failed
         """
+        self._apply_memory_budget()
+
         # Generate cache key
         cache_key = self._generate_cache_key(image_path, size, crop_rect)
 
@@ -4,7 +4,7 @@ from pathlib import Path
 import tempfile
 from typing import Any
 
-from goesvfi.pipeline.run_vfi import VfiWorker
+from goesvfi.pipeline.vfi_worker import VfiWorker
 from goesvfi.utils import log
 
 LOGGER = log.get_logger(__name__)
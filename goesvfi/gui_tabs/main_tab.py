@@ -37,16 +37,15 @@ from goesvfi.gui_components.widget_factory import WidgetFactory
 from goesvfi.pipeline.image_cropper import ImageCropper
 from goesvfi.pipeline.image_loader import ImageLoader
 from goesvfi.pipeline.image_processing_interfaces import ImageData
-from goesvfi.pipeline.run_vfi import VfiWorker
 from goesvfi.pipeline.sanchez_processor import SanchezProcessor
-from goesvfi.utils import config, log
+from goesvfi.pipeline.vfi_worker import VfiWorker
+from goesvfi.utils import config, log, rife_analyzer
 from goesvfi.utils.config import get_available_rife_models, get_cache_dir
 from goesvfi.utils.gui_helpers import (
     ClickableLabel,
     CropSelectionDialog,
     ImageViewerDialog,
 )
-from goesvfi.utils.rife_analyzer import analyze_rife_executable
 from goesvfi.utils.validation import validate_path_exists, validate_positive_int
 from goesvfi.view_models.main_window_view_model import MainWindowViewModel
 
@@ -227,6 +226,9 @@ class MainTab(QWidget):
         self.current_encoder = "RIFE"  # Default encoder
         self.current_model_key: str | None = "rife-v4.6"  # Default RIFE model key
         self.available_models: dict[str, RIFEModelDetails] = {}  # Use Dict
+        # Models whose executables haven't been probed yet, and the analysis cache
+        self._pending_model_analysis: dict[str, Path] = {}
+        self._model_analysis_cache: dict[str, RIFEModelDetails] = {}
         self.image_viewer_dialog: ImageViewerDialog | None = None  # Add member to hold viewer reference
         # -----------------------
 
@@ -1221,6 +1223,7 @@ class MainTab(QWidget):
     def _connect_model_combo(self) -> None:
         """Connect signals for the RIFE model combo box."""
         self.rife_model_combo.currentIndexChanged.connect(self._on_model_selected)
+        self.rife_model_combo.activated.connect(self._on_model_activated)
 
     def _validate_thread_spec(self, text: str) -> None:
         """Validate the RIFE thread specification format."""
@@ -2333,10 +2336,12 @@ class MainTab(QWidget):
         LOGGER.debug("Populating RIFE models...")
         self.rife_model_combo.clear()
         self.available_models.clear()
+        self._pending_model_analysis.clear()
 
         try:
             # Step 1: Load cached analysis
             cached_analysis = self._load_model_analysis_cache()
+            self._model_analysis_cache = cached_analysis
 
             # Step 2: Get available models
             found_models = self._get_available_models()
@@ -2418,7 +2423,7 @@ class MainTab(QWidget):
                 LOGGER.warning("RIFE executable not found for model %r in %s", key, model_dir)
                 continue
 
-            # Get or analyze model details
+            # Get cached model details, or queue the model for analysis
             details, cache_updated = self._get_model_details(key, rife_exe, cached_analysis)
             if cache_updated:
                 needs_cache_update = True
@@ -2432,7 +2437,11 @@ class MainTab(QWidget):
     def _get_model_details(
         self, key: str, rife_exe: Path, cached_analysis: dict[str, RIFEModelDetails]
     ) -> tuple[RIFEModelDetails, bool]:
-        """Get model details from cache or by analysis.
+        """Get model details from cache, or queue the model for analysis.
+
+        Analyzing a model runs its executable, so an uncached model is listed
+        without capabilities and analyzed when the user picks it or starts a
+        run with it.
 
         Args:
             key: Model key/name
@@ -2442,18 +2451,58 @@ class MainTab(QWidget):
         Returns:
             Tuple of (model_details, cache_was_updated)
         """
-        exe_path_str = str(rife_exe)
         exe_mtime = os.path.getmtime(rife_exe)
 
         # Check cache first
-        if exe_path_str in cached_analysis and cached_analysis[exe_path_str].get("_mtime") == exe_mtime:
+        cached = cached_analysis.get(str(rife_exe))
+        if cached is not None and cached.get("_mtime") == exe_mtime:
             LOGGER.debug("Using cached analysis for %s (%s)", key, rife_exe.name)
-            return cached_analysis[exe_path_str], False
+            return cached, False
+
+        self._pending_model_analysis[key] = rife_exe
+        return cast("RIFEModelDetails", {"capabilities": {}, "supported_args": [], "_mtime": exe_mtime}), False
+
+    def _analyze_pending_model(self, key: str) -> None:
+        """Analyze a queued model and update its combo entry and the analysis cache."""
+        rife_exe = self._pending_model_analysis.pop(key, None)
+        if rife_exe is None:
+            return
+
+        details, _ = self._analyze_model(key, rife_exe, self._model_analysis_cache)
+        self.available_models[key] = details
+        index = self.rife_model_combo.findData(key)
+        if index != -1:
+            self.rife_model_combo.setItemText(index, self._model_display_name(key, details))
+        self._save_model_analysis_cache(self._model_analysis_cache)
+        if self.rife_model_combo.currentData() == key:
+            self._update_rife_ui_elements()
+
+    def _on_model_activated(self, index: int) -> None:
+        """Analyze a model when the user picks it, if it hasn't been analyzed yet."""
+        model_key = self.rife_model_combo.itemData(index)
+        if model_key:
+            self._analyze_pending_model(model_key)
+
+    def _analyze_model(
+        self, key: str, rife_exe: Path, cached_analysis: dict[str, RIFEModelDetails]
+    ) -> tuple[RIFEModelDetails, bool]:
+        """Analyze a model's executable and cache the result.
+
+        Args:
+            key: Model key/name
+            rife_exe: Path to RIFE executable
+            cached_analysis: Cache dictionary
+
+        Returns:
+            Tuple of (model_details, cache_was_updated)
+        """
+        exe_path_str = str(rife_exe)
+        exe_mtime = os.path.getmtime(rife_exe)
 
         # Analyze executable
         LOGGER.info("Analyzing RIFE executable for model %r: %s", key, rife_exe)
         try:
-            details_raw = analyze_rife_executable(rife_exe)
+            details_raw = rife_analyzer.analyze_rife_executable(rife_exe)
             details = cast("RIFEModelDetails", details_raw)
             details["_mtime"] = exe_mtime
             cached_analysis[exe_path_str] = details
@@ -2482,10 +2531,15 @@ class MainTab(QWidget):
             key: Model key/name
             details: Model analysis details
         """
-        display_name = f"{key} (v{details.get('version', 'Unknown')})"
+        self.rife_model_combo.addItem(self._model_display_name(key, details), userData=key)
+
+    def _model_display_name(self, key: str, details: RIFEModelDetails) -> str:
+        """Get a model's combo box label; models not yet analyzed show only their key."""
+        if key in self._pending_model_analysis:
+            return key
         if details.get("version") == "Error":
-            display_name = f"{key} (Analysis Error)"
-        self.rife_model_combo.addItem(display_name, userData=key)
+            return f"{key} (Analysis Error)"
+        return f"{key} (v{details.get('version', 'Unknown')})"
 
     def _save_model_analysis_cache(self, cached_analysis: dict[str, RIFEModelDetails]) -> None:
         """Save updated model analysis cache to file.
@@ -2631,6 +2685,9 @@ class MainTab(QWidget):
             LOGGER.error(error_msg)
             QMessageBox.critical(self, "Error", error_msg)
             return None
+        if encoder == "RIFE":
+            # First use of a model listed before its analysis was cached
+            self._analyze_pending_model(rife_model_key)
 
         return encoder, rife_model_key
 
@@ -5,6 +5,9 @@ functionality to verify timestamp completeness in satellite imagery data
 and fetch missing images from remote sources using a hybrid CDN/S3 strategy.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 # Make public API explicitly available
 __all__ = [
     "CDNStore",
@@ -31,23 +34,58 @@ __all__ = [
     "render_png",
 ]
 
-from .combined_tab import CombinedIntegrityAndImageryTab
-
-# Enhanced implementation components
-from .enhanced_gui_tab import EnhancedIntegrityCheckTab
-
-# GOES Imagery visualization components
-from .enhanced_imagery_tab import EnhancedGOESImageryTab
-from .enhanced_view_model import EnhancedIntegrityCheckViewModel, FetchSource
-
-# Basic implementation components
-from .gui_tab import IntegrityCheckTab
-from .reconcile_manager import ReconcileManager
-from .reconciler import Reconciler
-from .remote.cdn_store import CDNStore
-from .remote.s3_store import S3Store
-from .render.netcdf import render_png
-from .sample_processor import SampleProcessor
-from .time_index import SatellitePattern, TimeIndex
-from .view_model import IntegrityCheckViewModel, MissingTimestamp, ScanStatus
-from .visualization_manager import ExtendedChannelType, VisualizationManager
+if TYPE_CHECKING:
+    from .combined_tab import CombinedIntegrityAndImageryTab
+    from .enhanced_gui_tab import EnhancedIntegrityCheckTab
+    from .enhanced_imagery_tab import EnhancedGOESImageryTab
+    from .enhanced_view_model import EnhancedIntegrityCheckViewModel, FetchSource
+    from .gui_tab import IntegrityCheckTab
+    from .reconcile_manager import ReconcileManager
+    from .reconciler import Reconciler
+    from .remote.cdn_store import CDNStore
+    from .remote.s3_store import S3Store
+    from .render.netcdf import render_png
+    from .sample_processor import SampleProcessor
+    from .time_index import SatellitePattern, TimeIndex
+    from .view_model import IntegrityCheckViewModel, MissingTimestamp, ScanStatus
+    from .visualization_manager import ExtendedChannelType, VisualizationManager
+
+# The tabs pull in PyQt6 and the remote stores pull in aioboto3, so names are
+# imported from their modules on first access rather than with the package.
+# Headless code such as the CLI can then import the reconciler or renderer
+# without paying for the GUI.
+_LAZY_IMPORTS = {
+    "CDNStore": ".remote.cdn_store",
+    "CombinedIntegrityAndImageryTab": ".combined_tab",
+    "EnhancedGOESImageryTab": ".enhanced_imagery_tab",
+    "EnhancedIntegrityCheckTab": ".enhanced_gui_tab",
+    "EnhancedIntegrityCheckViewModel": ".enhanced_view_model",
+    "ExtendedChannelType": ".visualization_manager",
+    "FetchSource": ".enhanced_view_model",
+    "IntegrityCheckTab": ".gui_tab",
+    "IntegrityCheckViewModel": ".view_model",
+    "MissingTimestamp": ".view_model",
+    "ReconcileManager": ".reconcile_manager",
+    "Reconciler": ".reconciler",
+    "S3Store": ".remote.s3_store",
+    "SampleProcessor": ".sample_processor",
+    "SatellitePattern": ".time_index",
+    "ScanStatus": ".view_model",
+    "TimeIndex": ".time_index",
+    "VisualizationManager": ".visualization_manager",
+    "render_png": ".render.netcdf",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
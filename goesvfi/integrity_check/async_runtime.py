@@ -0,0 +1,273 @@
+"""Shared asyncio runtime for the integrity check subsystem.
+
+Qt worker threads used to create a fresh event loop for every scan or download,
+which meant aiohttp sessions, aioboto3 clients and pooled S3 connections were
+rebuilt from scratch each time. This module keeps a single long-lived event
+loop running on a background thread instead. Remote stores are created and
+cached by the runtime so that every coroutine submitted to it reuses the same
+warm sessions and connections.
+
+Typical use from Qt code::
+
+    runtime = get_async_runtime()
+    future = runtime.submit(manager.scan_directory(...))
+    result = future.result()
+
+The store modules import aiohttp and aioboto3, which take longer to load than
+the rest of the GUI together, so they are imported when a store is first
+requested rather than with this module.
+"""
+
+import asyncio
+import atexit
+from collections.abc import Callable, Coroutine, Hashable
+import concurrent.futures
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from goesvfi.utils import log
+
+if TYPE_CHECKING:
+    from .remote.cdn_store import CDNStore
+    from .remote.composite_store import CompositeStore
+    from .remote.s3_store import S3Store
+
+LOGGER = log.get_logger(__name__)
+
+T = TypeVar("T")
+StoreT = TypeVar("StoreT")
+
+
+class AsyncRuntime:
+    """A persistent event loop thread that owns the integrity remote stores.
+
+    The loop thread is started lazily on first use and can be restarted after
+    :meth:`shutdown`. All coroutines submitted to the runtime execute on the same
+    loop, so loop-bound resources (HTTP sessions, S3 clients, pool conditions)
+    remain valid between operations.
+    """
+
+    def __init__(self, name: str = "IntegrityAsyncRuntime") -> None:
+        """Initialize the runtime.
+
+        Args:
+            name: Name given to the background loop thread
+        """
+        self.name = name
+        self._lock = threading.RLock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._stores: dict[Hashable, Any] = {}
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background loop thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime's event loop, starting the loop thread if needed."""
+        return self.start()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the background loop thread if it is not already running.
+
+        Returns:
+            The running event loop
+        """
+        with self._lock:
+            if self._loop is not None and self.is_running:
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            thread = threading.Thread(
+                target=self._run_loop,
+                args=(loop, ready),
+                name=self.name,
+                daemon=True,
+            )
+            thread.start()
+            ready.wait()
+
+            self._loop = loop
+            self._thread = thread
+            LOGGER.debug("Started async runtime thread %s", self.name)
+            return loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        """Thread target that runs the event loop until it is stopped."""
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def in_runtime_thread(self) -> bool:
+        """Whether the caller is running on the runtime's loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the runtime loop from any thread.
+
+        Args:
+            coro: Coroutine to execute
+
+        Returns:
+            A thread-safe future for the coroutine's result. Cancelling the
+            future cancels the underlying task.
+
+        Raises:
+            RuntimeError: If called from the runtime thread itself, where
+                blocking on the returned future would deadlock
+        """
+        if self.in_runtime_thread():
+            coro.close()
+            msg = "AsyncRuntime.submit() called from the runtime thread; await the coroutine instead"
+            raise RuntimeError(msg)
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run a coroutine on the runtime loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to execute
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            TimeoutError: If the coroutine does not finish within ``timeout``;
+                the coroutine is cancelled in that case
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    # --- Store ownership ---
+
+    def get_store(self, key: Hashable, factory: Callable[[], StoreT]) -> StoreT:
+        """Return the store cached under ``key``, creating it with ``factory``.
+
+        Stores obtained here are closed on the runtime loop at shutdown.
+        """
+        with self._lock:
+            store = self._stores.get(key)
+            if store is None:
+                store = factory()
+                self._stores[key] = store
+            return store
+
+    def s3_store(self, **kwargs: Any) -> "S3Store":
+        """Get the shared S3Store for the given constructor arguments."""
+        from .remote.s3_store import S3Store
+
+        key = ("s3", tuple(sorted(kwargs.items())))
+        return self.get_store(key, lambda: S3Store(**kwargs))
+
+    def cdn_store(self, **kwargs: Any) -> "CDNStore":
+        """Get the shared CDNStore for the given constructor arguments."""
+        from .remote.cdn_store import CDNStore
+
+        key = ("cdn", tuple(sorted(kwargs.items())))
+        return self.get_store(key, lambda: CDNStore(**kwargs))
+
+    def composite_store(self, **kwargs: Any) -> "CompositeStore":
+        """Get the shared CompositeStore for the given constructor arguments."""
+        from .remote.composite_store import CompositeStore
+
+        key = ("composite", tuple(sorted(kwargs.items())))
+        return self.get_store(key, lambda: CompositeStore(**kwargs))
+
+    # --- Shutdown ---
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Close owned stores, cancel outstanding work and stop the loop thread.
+
+        Safe to call more than once; the runtime restarts on next use.
+
+        Args:
+            timeout: Seconds to wait for stores to close and the thread to exit
+        """
+        if self.in_runtime_thread():
+            msg = "AsyncRuntime.shutdown() cannot be called from the runtime thread"
+            raise RuntimeError(msg)
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            stores = list(self._stores.values())
+            self._loop = None
+            self._thread = None
+            self._stores.clear()
+
+        if loop is None or thread is None or not thread.is_alive():
+            return
+
+        LOGGER.debug("Shutting down async runtime thread %s", self.name)
+        future = asyncio.run_coroutine_threadsafe(self._shutdown_async(stores), loop)
+        try:
+            future.result(timeout)
+        except Exception:
+            LOGGER.exception("Error while shutting down async runtime")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if thread.is_alive():
+            LOGGER.warning("Async runtime thread %s did not stop within %.1fs", self.name, timeout)
+
+    @staticmethod
+    async def _shutdown_async(stores: list[Any]) -> None:
+        """Cancel pending tasks, then close stores and pooled connections."""
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for store in stores:
+            try:
+                await store.close()
+            except Exception:
+                LOGGER.exception("Error closing %s", type(store).__name__)
+
+        # Only a process that used S3 has a pool to close
+        pool_module = sys.modules.get(f"{__package__}.remote.s3_connection_pool")
+        if pool_module is not None:
+            try:
+                await pool_module.close_global_pool()
+            except Exception:
+                LOGGER.exception("Error closing S3 connection pool")
+
+        await asyncio.get_running_loop().shutdown_asyncgens()
+
+
+_runtime: AsyncRuntime | None = None
+_runtime_lock = threading.Lock()
+
+
+def get_async_runtime() -> AsyncRuntime:
+    """Get the process-wide integrity check runtime, creating it if needed."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = AsyncRuntime()
+        return _runtime
+
+
+def shutdown_async_runtime(timeout: float = 10.0) -> None:
+    """Shut down the process-wide runtime if it has been started."""
+    with _runtime_lock:
+        runtime = _runtime
+    if runtime is not None:
+        runtime.shutdown(timeout)
+
+
+atexit.register(shutdown_async_runtime)
@@ -1,28 +1,214 @@
 """Cache database for integrity check results.
 
 This module provides SQLite-based caching for scan results to improve performance.
+
+The database runs in WAL mode so that readers are never blocked by a commit in
+progress. All writes go through a single background writer thread, which groups
+whatever operations are queued into one transaction and uses ``executemany``
+for bulk inserts. The ``async`` methods never touch SQLite on the calling event
+loop: writes await the writer thread and reads run in a worker thread.
 """
 
-from datetime import datetime
+import asyncio
+from collections.abc import Callable, Iterable
+import concurrent.futures
+from datetime import UTC, datetime, timedelta
 import json
 from pathlib import Path
+import queue
 import sqlite3
+import threading
 from types import TracebackType
-from typing import Any
+from typing import Any, TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
 
 from goesvfi.utils import config, log
+from goesvfi.utils.timeline import Timeline
 
 LOGGER = log.get_logger(__name__)
 
 # Default cache location
 DEFAULT_CACHE_PATH = Path(config.get_user_config_dir()) / "integrity_cache.db"
 
+# Seconds a connection waits on a locked database before raising
+BUSY_TIMEOUT = 30.0
+
+# Maximum number of queued write operations committed in one transaction
+MAX_WRITE_BATCH = 512
+
+# Pragmas applied to every connection. In WAL mode synchronous=NORMAL is safe
+# against application crashes and avoids an fsync on every commit.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=134217728",
+)
+
+T = TypeVar("T")
+
+# A queued write: a callable run on the writer connection and its result future
+_WriteItem = tuple[Callable[[sqlite3.Connection], Any], "concurrent.futures.Future[Any]"]
+
+# One freshly listed directory for the file index: path, parent path, mtime in
+# nanoseconds and the (file name, timestamp epoch) pairs parsed from it
+DirectoryListing = tuple[str, str | None, int, list[tuple[str, int]]]
+
+
+def _connect(db_path: Path, autocommit: bool = False) -> sqlite3.Connection:
+    """Open a connection to the cache database with the standard pragmas."""
+    conn = sqlite3.connect(
+        str(db_path),
+        timeout=BUSY_TIMEOUT,
+        check_same_thread=False,
+        isolation_level=None if autocommit else "",
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _satellite_key(satellite: Any) -> str:
+    """Convert a satellite pattern (or plain string) to its database key."""
+    return satellite.name if hasattr(satellite, "name") else str(satellite)
+
+
+def _to_epoch(timestamp: datetime) -> int:
+    """Convert a timestamp to integer Unix seconds, treating naive values as UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return int(timestamp.timestamp())
+
+
+class _CacheWriter:
+    """Background thread that owns the only writing connection to the database.
+
+    Operations are callables taking a connection. Each queued batch runs inside
+    one ``BEGIN IMMEDIATE`` transaction with a savepoint per operation, so a
+    failing operation is rolled back on its own without losing the rest of the
+    batch.
+    """
+
+    def __init__(self, db_path: Path, max_batch: int = MAX_WRITE_BATCH) -> None:
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.batches_committed = 0
+        self.operations_committed = 0
+        self._queue: queue.SimpleQueue[_WriteItem | None] = queue.SimpleQueue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"CacheDBWriter-{db_path.name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: Callable[[sqlite3.Connection], T]) -> "concurrent.futures.Future[T]":
+        """Queue a write operation and return a future for its result."""
+        future: concurrent.futures.Future[T] = concurrent.futures.Future()
+        with self._close_lock:
+            if self._closed:
+                msg = "Database connection not established"
+                raise RuntimeError(msg)
+            self._queue.put((operation, future))
+        return future
+
+    def close(self) -> None:
+        """Commit pending writes and stop the writer thread."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            conn = _connect(self.db_path, autocommit=True)
+        except Exception as e:
+            LOGGER.exception("CacheDB writer could not open %s", self.db_path)
+            with self._close_lock:
+                self._closed = True
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+                if item is not None:
+                    self._fail([item], e)
+
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._commit_batch(conn, batch)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _fail(batch: list[_WriteItem], error: BaseException) -> None:
+        """Propagate an error to every unfinished future in a batch."""
+        for _, future in batch:
+            if future.done():
+                continue
+            if future.running() or future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: list[_WriteItem]) -> None:
+        outcomes: list[tuple[concurrent.futures.Future[Any], Any, BaseException | None]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for operation, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT cache_op")
+                try:
+                    result = operation(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO cache_op")
+                    conn.execute("RELEASE cache_op")
+                    outcomes.append((future, None, e))
+                else:
+                    conn.execute("RELEASE cache_op")
+                    outcomes.append((future, result, None))
+            conn.execute("COMMIT")
+        except Exception as e:
+            LOGGER.exception("Cache write batch of %d operations failed", len(batch))
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._fail(batch, e)
+            return
+
+        self.batches_committed += 1
+        self.operations_committed += len(outcomes)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
 
 class CacheDB:
     """SQLite cache for integrity check results.
 
     Provides caching of scan results to improve performance and avoid
-    redundant scanning operations.
+    redundant scanning operations. Safe to share between threads: reads use a
+    lock-protected reader connection and writes are serialized through the
+    writer thread.
     """
 
     def __init__(self, db_path: Path | None = None) -> None:
@@ -32,20 +218,20 @@ class CacheDB:
         # Ensure directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Connect to database
-        self.conn: sqlite3.Connection | None = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        # Reader connection (also used once to create the schema)
+        self.conn: sqlite3.Connection | None = _connect(self.db_path)
+        self._read_lock = threading.RLock()
 
         # Create tables
         self._create_schema()
 
+        # Single writer for all modifications
+        self._writer: _CacheWriter | None = _CacheWriter(self.db_path)
+
         LOGGER.info("CacheDB initialized at %s", self.db_path)
 
     def _create_schema(self) -> None:
         """Create the database schema."""
-        if not self.conn:
-            msg = "Database connection not established"
-            raise RuntimeError(msg)
         if not self.conn:
             msg = "Database connection not established"
             raise RuntimeError(msg)
@@ -66,11 +252,18 @@ class CacheDB:
                 missing_count INTEGER,
                 scan_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 options TEXT,
+                index_generation INTEGER,
                 UNIQUE(start_date, end_date, satellite, interval_minutes, base_dir)
             )
         """
         )
 
+        # Scans stored before index_generation existed never match a generation
+        columns = {row["name"] for row in cursor.execute("PRAGMA table_info(scan_results)")}
+        if "index_generation" not in columns:
+            LOGGER.info("Migrating scan_results table: adding index_generation column")
+            cursor.execute("ALTER TABLE scan_results ADD COLUMN index_generation INTEGER")
+
         # Missing timestamps table
         cursor.execute(
             """
@@ -83,7 +276,21 @@ class CacheDB:
         """
         )
 
-        # Found timestamps table for tracking what exists
+        # Missing timestamps stored as half-open slot ranges on the scan's
+        # (start_date, interval_minutes) grid
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS missing_ranges (
+                scan_id INTEGER NOT NULL,
+                first_slot INTEGER NOT NULL,
+                stop_slot INTEGER NOT NULL,
+                FOREIGN KEY (scan_id) REFERENCES scan_results(id) ON DELETE CASCADE
+            )
+        """
+        )
+
+        # Found timestamps table for tracking what exists. ts_epoch mirrors
+        # timestamp as Unix seconds for fast numeric range and bitmap queries.
         cursor.execute(
             """
             CREATE TABLE IF NOT EXISTS timestamps (
@@ -92,11 +299,19 @@ class CacheDB:
                 file_path TEXT,
                 found BOOLEAN DEFAULT 0,
                 last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                ts_epoch INTEGER,
                 PRIMARY KEY (satellite, timestamp)
             )
         """
         )
 
+        # Databases created before ts_epoch existed get the column backfilled
+        columns = {row["name"] for row in cursor.execute("PRAGMA table_info(timestamps)")}
+        if "ts_epoch" not in columns:
+            LOGGER.info("Migrating timestamps table: adding ts_epoch column")
+            cursor.execute("ALTER TABLE timestamps ADD COLUMN ts_epoch INTEGER")
+            cursor.execute("UPDATE timestamps SET ts_epoch = CAST(strftime('%s', timestamp) AS INTEGER)")
+
         # General cache table for arbitrary key-value storage
         cursor.execute(
             """
@@ -110,20 +325,91 @@ class CacheDB:
             """
         )
 
+        # Persistent index of the local archive: every directory seen under a
+        # scanned root with its mtime, and the timestamp parsed from each file
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS directory_index (
+                satellite TEXT NOT NULL,
+                path TEXT NOT NULL,
+                parent TEXT,
+                mtime_ns INTEGER NOT NULL,
+                PRIMARY KEY (satellite, path)
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS file_index (
+                satellite TEXT NOT NULL,
+                directory TEXT NOT NULL,
+                name TEXT NOT NULL,
+                ts_epoch INTEGER NOT NULL,
+                PRIMARY KEY (satellite, directory, name)
+            )
+        """
+        )
+        # Bumped by every change to a satellite's directory index, so scan
+        # results can tell whether the index changed since they were stored
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS index_generation (
+                satellite TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL
+            )
+        """
+        )
+
         # Create indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_directory_index_parent ON directory_index(satellite, parent)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_file_index_epoch ON file_index(satellite, ts_epoch)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_scan_results_dates ON scan_results(start_date, end_date)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_missing_timestamps_scan ON missing_timestamps(scan_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_missing_ranges_scan ON missing_ranges(scan_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamps_satellite ON timestamps(satellite)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamps_epoch ON timestamps(satellite, ts_epoch)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_filepath ON cache(filepath)")
 
-        if self.conn:
-            self.conn.commit()
+        self.conn.commit()
+
+    # --- Internal read/write plumbing ---
+
+    def _submit_write(self, operation: Callable[[sqlite3.Connection], T]) -> "concurrent.futures.Future[T]":
+        """Queue a write operation on the writer thread."""
+        if not self._writer:
+            msg = "Database connection not established"
+            raise RuntimeError(msg)
+        return self._writer.submit(operation)
+
+    def _write(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a write operation on the writer thread and wait for it to commit."""
+        return self._submit_write(operation).result()
+
+    async def _write_async(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a write operation on the writer thread without blocking the event loop."""
+        return await asyncio.wrap_future(self._submit_write(operation))
+
+    def _read(self, query: Callable[[sqlite3.Cursor], T]) -> T:
+        """Run a query on the reader connection."""
+        with self._read_lock:
+            if not self.conn:
+                msg = "Database connection not established"
+                raise RuntimeError(msg)
+            return query(self.conn.cursor())
+
+    def flush(self) -> None:
+        """Block until all previously queued writes have been committed."""
+        self._write(lambda _conn: None)
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Commit pending writes and close the database connections."""
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        with self._read_lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
 
     def __enter__(self) -> "CacheDB":
         """Enter context manager."""
@@ -145,80 +431,89 @@ class CacheDB:
         satellite: Any,
         interval_minutes: int,
         base_dir: Path,
-        missing_timestamps: list[datetime],
+        missing_timestamps: list[datetime] | Timeline,
         expected_count: int,
         found_count: int,
         options: dict[str, Any] | None = None,
+        index_generation: int | None = None,
     ) -> int:
         """Store scan results in cache.
 
+        A :class:`Timeline` of missing timestamps is stored as run-length slot
+        ranges, so long gaps cost one row instead of one row per timestamp.
+        ``index_generation`` is the directory index generation the scan read
+        (see :meth:`get_index_generation`).
+
         Returns:
             The scan_id of the stored result
         """
-        if not self.conn:
-            msg = "Database connection not established"
-            raise RuntimeError(msg)
-        cursor = self.conn.cursor()
-
-        # Convert satellite to string if needed
-        sat_str = satellite.name if hasattr(satellite, "name") else str(satellite)
-
-        # Delete any existing scan with same parameters
-        cursor.execute(
-            """
-            DELETE FROM scan_results
-            WHERE start_date = ? AND end_date = ?
-            AND satellite = ? AND interval_minutes = ? AND base_dir = ?
-        """,
-            (
-                start_date.isoformat(),
-                end_date.isoformat(),
-                sat_str,
-                interval_minutes,
-                str(base_dir),
-            ),
+        sat_str = _satellite_key(satellite)
+        scan_key = (
+            start_date.isoformat(),
+            end_date.isoformat(),
+            sat_str,
+            interval_minutes,
+            str(base_dir),
         )
 
-        # Insert new scan result
-        cursor.execute(
-            """
-            INSERT INTO scan_results
-            (start_date, end_date, satellite, interval_minutes, base_dir,
-             expected_count, found_count, missing_count, options)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                start_date.isoformat(),
-                end_date.isoformat(),
-                sat_str,
-                interval_minutes,
-                str(base_dir),
-                expected_count,
-                found_count,
-                len(missing_timestamps),
-                json.dumps(options) if options else None,
-            ),
-        )
+        def operation(conn: sqlite3.Connection) -> int:
+            # Delete any existing scan with same parameters, with its missing entries
+            old_ids = [
+                (row["id"],)
+                for row in conn.execute(
+                    """
+                    SELECT id FROM scan_results
+                    WHERE start_date = ? AND end_date = ?
+                    AND satellite = ? AND interval_minutes = ? AND base_dir = ?
+                """,
+                    scan_key,
+                )
+            ]
+            conn.executemany("DELETE FROM missing_timestamps WHERE scan_id = ?", old_ids)
+            conn.executemany("DELETE FROM missing_ranges WHERE scan_id = ?", old_ids)
+            conn.executemany("DELETE FROM scan_results WHERE id = ?", old_ids)
+
+            # Insert new scan result
+            cursor = conn.execute(
+                """
+                INSERT INTO scan_results
+                (start_date, end_date, satellite, interval_minutes, base_dir,
+                 expected_count, found_count, missing_count, options, index_generation)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    *scan_key,
+                    expected_count,
+                    found_count,
+                    len(missing_timestamps),
+                    json.dumps(options) if options else None,
+                    index_generation,
+                ),
+            )
 
-        scan_id = cursor.lastrowid
-        if scan_id is None:
-            msg = "Failed to get scan_id from database insert"
-            raise RuntimeError(msg)
+            scan_id = cursor.lastrowid
+            if scan_id is None:
+                msg = "Failed to get scan_id from database insert"
+                raise RuntimeError(msg)
 
-        # Store missing timestamps
-        for ts in missing_timestamps:
-            # Generate expected filename based on timestamp
-            expected_filename = f"{ts.strftime('%Y%m%dT%H%M%S')}.png"
-            cursor.execute(
+            if isinstance(missing_timestamps, Timeline):
+                conn.executemany(
+                    "INSERT INTO missing_ranges (scan_id, first_slot, stop_slot) VALUES (?, ?, ?)",
+                    ((scan_id, int(first), int(stop)) for first, stop in missing_timestamps.ranges()),
+                )
+                return scan_id
+
+            # Store missing timestamps with their expected filenames
+            conn.executemany(
                 """
                 INSERT INTO missing_timestamps (scan_id, timestamp, expected_filename)
                 VALUES (?, ?, ?)
             """,
-                (scan_id, ts.isoformat(), expected_filename),
+                ((scan_id, ts.isoformat(), f"{ts.strftime('%Y%m%dT%H%M%S')}.png") for ts in missing_timestamps),
             )
+            return scan_id
 
-        if self.conn:
-            self.conn.commit()
+        scan_id = self._write(operation)
         LOGGER.debug("Stored scan results with ID %s", scan_id)
         return scan_id
 
@@ -236,44 +531,62 @@ class CacheDB:
         Returns:
             Dictionary with scan results or None if not found
         """
-        if not self.conn:
-            msg = "Database connection not established"
-            raise RuntimeError(msg)
-        cursor = self.conn.cursor()
+        sat_str = _satellite_key(satellite)
 
-        # Convert satellite to string if needed
-        sat_str = satellite.name if hasattr(satellite, "name") else str(satellite)
+        def query(cursor: sqlite3.Cursor) -> tuple[sqlite3.Row | None, list[sqlite3.Row], list[sqlite3.Row]]:
+            # Look for matching scan
+            cursor.execute(
+                """
+                SELECT * FROM scan_results
+                WHERE start_date = ? AND end_date = ?
+                AND satellite = ? AND interval_minutes = ? AND base_dir = ?
+            """,
+                (
+                    start_date.isoformat(),
+                    end_date.isoformat(),
+                    sat_str,
+                    interval_minutes,
+                    str(base_dir),
+                ),
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None, [], []
 
-        # Look for matching scan
-        cursor.execute(
-            """
-            SELECT * FROM scan_results
-            WHERE start_date = ? AND end_date = ?
-            AND satellite = ? AND interval_minutes = ? AND base_dir = ?
-        """,
-            (
-                start_date.isoformat(),
-                end_date.isoformat(),
-                sat_str,
-                interval_minutes,
-                str(base_dir),
-            ),
-        )
+            # Get missing ranges (current format) and timestamps (older entries)
+            cursor.execute("SELECT first_slot, stop_slot FROM missing_ranges WHERE scan_id = ?", (row["id"],))
+            missing_ranges = cursor.fetchall()
 
-        row = cursor.fetchone()
+            cursor.execute(
+                """
+                SELECT timestamp FROM missing_timestamps
+                WHERE scan_id = ?
+            """,
+                (row["id"],),
+            )
+            return row, missing_ranges, cursor.fetchall()
+
+        row, missing_ranges, missing_rows = self._read(query)
         if not row:
             return None
 
-        # Get missing timestamps
-        cursor.execute(
-            """
-            SELECT timestamp FROM missing_timestamps
-            WHERE scan_id = ?
-        """,
-            (row["id"],),
-        )
-
-        missing_timestamps = [datetime.fromisoformat(r["timestamp"]) for r in cursor.fetchall()]
+        missing_timestamps: list[datetime] | Timeline
+        if row["interval_minutes"] > 0:
+            # Scans on a regular grid are returned as a Timeline
+            grid_start = datetime.fromisoformat(row["start_date"])
+            grid_end = datetime.fromisoformat(row["end_date"])
+            cadence = timedelta(minutes=row["interval_minutes"])
+            slot_count = Timeline.slots_between(grid_start, grid_end, cadence)
+            missing_timestamps = Timeline.from_ranges(
+                grid_start, cadence, slot_count, ((r["first_slot"], r["stop_slot"]) for r in missing_ranges)
+            )
+            if missing_rows:
+                legacy = Timeline.from_timestamps(
+                    grid_start, grid_end, cadence, (datetime.fromisoformat(r["timestamp"]) for r in missing_rows)
+                )
+                missing_timestamps |= legacy
+        else:
+            missing_timestamps = [datetime.fromisoformat(r["timestamp"]) for r in missing_rows]
 
         return {
             "id": row["id"],
@@ -288,6 +601,7 @@ class CacheDB:
             "missing_timestamps": missing_timestamps,
             "scan_timestamp": row["scan_timestamp"],
             "options": json.loads(row["options"]) if row["options"] else None,
+            "index_generation": row["index_generation"],
         }
 
     def clear_cache(self) -> bool:
@@ -296,22 +610,47 @@ class CacheDB:
         Returns:
             True if successful
         """
+
+        def operation(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM scan_results")
+            conn.execute("DELETE FROM missing_timestamps")
+            conn.execute("DELETE FROM missing_ranges")
+            conn.execute("DELETE FROM timestamps")
+            conn.execute("DELETE FROM directory_index")
+            conn.execute("DELETE FROM file_index")
+            conn.execute("DELETE FROM index_generation")
+
         try:
-            if not self.conn:
-                msg = "Database connection not established"
-                raise RuntimeError(msg)
-            cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM scan_results")
-            cursor.execute("DELETE FROM missing_timestamps")
-            cursor.execute("DELETE FROM timestamps")
-            if self.conn:
-                self.conn.commit()
+            self._write(operation)
             LOGGER.info("Cache cleared successfully")
             return True
         except Exception as e:
             LOGGER.exception("Error clearing cache: %s", e)
             return False
 
+    @staticmethod
+    def _timestamp_rows(
+        satellite: Any,
+        entries: Iterable[tuple[datetime, str | None]],
+        found: bool,
+    ) -> list[tuple[str, str, str | None, int, int]]:
+        """Build ``timestamps`` rows for ``executemany``."""
+        sat_str = _satellite_key(satellite)
+        found_int = int(found)
+        return [(sat_str, ts.isoformat(), file_path, found_int, _to_epoch(ts)) for ts, file_path in entries]
+
+    @staticmethod
+    def _upsert_timestamps(conn: sqlite3.Connection, rows: list[tuple[str, str, str | None, int, int]]) -> int:
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO timestamps
+            (satellite, timestamp, file_path, found, ts_epoch, last_checked)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+            rows,
+        )
+        return len(rows)
+
     async def add_timestamp(
         self,
         timestamp: datetime,
@@ -325,50 +664,54 @@ class CacheDB:
             True if successful
         """
         try:
-            if not self.conn:
-                msg = "Database connection not established"
-                raise RuntimeError(msg)
-            cursor = self.conn.cursor()
-            sat_str = satellite.name if hasattr(satellite, "name") else str(satellite)
-
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO timestamps
-                (satellite, timestamp, file_path, found, last_checked)
-                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            """,
-                (sat_str, timestamp.isoformat(), file_path, int(found)),
-            )
-
-            if self.conn:
-                self.conn.commit()
+            rows = self._timestamp_rows(satellite, [(timestamp, file_path)], found)
+            await self._write_async(lambda conn: self._upsert_timestamps(conn, rows))
             return True
         except Exception as e:
             LOGGER.exception("Error adding timestamp: %s", e)
             return False
 
+    async def add_timestamps(
+        self,
+        satellite: Any,
+        entries: Iterable[tuple[datetime, str | None]],
+        found: bool = True,
+    ) -> int:
+        """Add or update many timestamp entries in a single transaction.
+
+        Args:
+            satellite: Satellite pattern the timestamps belong to
+            entries: Iterable of ``(timestamp, file_path)`` pairs
+            found: Whether the timestamps were found locally
+
+        Returns:
+            Number of rows written
+        """
+        rows = self._timestamp_rows(satellite, entries, found)
+        if not rows:
+            return 0
+        return await self._write_async(lambda conn: self._upsert_timestamps(conn, rows))
+
     async def timestamp_exists(self, timestamp: datetime, satellite: Any) -> bool:
         """Check if a timestamp exists in the cache.
 
         Returns:
             True if the timestamp exists and was found
         """
-        if not self.conn:
-            msg = "Database connection not established"
-            raise RuntimeError(msg)
-        cursor = self.conn.cursor()
-        sat_str = satellite.name if hasattr(satellite, "name") else str(satellite)
+        sat_str = _satellite_key(satellite)
 
-        cursor.execute(
-            """
-            SELECT found FROM timestamps
-            WHERE satellite = ? AND timestamp = ?
-        """,
-            (sat_str, timestamp.isoformat()),
-        )
+        def query(cursor: sqlite3.Cursor) -> bool:
+            cursor.execute(
+                """
+                SELECT found FROM timestamps
+                WHERE satellite = ? AND timestamp = ?
+            """,
+                (sat_str, timestamp.isoformat()),
+            )
+            row = cursor.fetchone()
+            return bool(row and row["found"])
 
-        row = cursor.fetchone()
-        return bool(row and row["found"])
+        return await asyncio.to_thread(self._read, query)
 
     async def get_timestamps(self, satellite: Any, start_time: datetime, end_time: datetime) -> set[datetime]:
         """Get all timestamps in a time range that were found.
@@ -376,21 +719,187 @@ class CacheDB:
         Returns:
             Set of timestamps that exist
         """
-        if not self.conn:
-            msg = "Database connection not established"
-            raise RuntimeError(msg)
-        cursor = self.conn.cursor()
-        sat_str = satellite.name if hasattr(satellite, "name") else str(satellite)
+        sat_str = _satellite_key(satellite)
 
-        cursor.execute(
-            """
-            SELECT timestamp FROM timestamps
-            WHERE satellite = ? AND timestamp >= ? AND timestamp <= ? AND found = 1
-        """,
-            (sat_str, start_time.isoformat(), end_time.isoformat()),
-        )
+        def query(cursor: sqlite3.Cursor) -> set[datetime]:
+            cursor.execute(
+                """
+                SELECT timestamp FROM timestamps
+                WHERE satellite = ? AND timestamp >= ? AND timestamp <= ? AND found = 1
+            """,
+                (sat_str, start_time.isoformat(), end_time.isoformat()),
+            )
+            return {datetime.fromisoformat(row["timestamp"]) for row in cursor.fetchall()}
+
+        return await asyncio.to_thread(self._read, query)
+
+    def _timestamps_bitmap(
+        self,
+        satellite: Any,
+        start_time: datetime,
+        end_time: datetime,
+        interval_minutes: int,
+    ) -> NDArray[np.bool_]:
+        step = int(timedelta(minutes=interval_minutes).total_seconds())
+        if step <= 0:
+            msg = "interval_minutes must be positive"
+            raise ValueError(msg)
+        start_epoch = _to_epoch(start_time)
+        end_epoch = _to_epoch(end_time)
+        slots = max(0, (end_epoch - start_epoch) // step + 1)
+        bitmap = np.zeros(slots, dtype=np.bool_)
+        if slots == 0:
+            return bitmap
+
+        sat_str = _satellite_key(satellite)
+
+        def query(cursor: sqlite3.Cursor) -> NDArray[np.int64]:
+            cursor.execute(
+                """
+                SELECT ts_epoch FROM timestamps
+                WHERE satellite = ? AND ts_epoch >= ? AND ts_epoch <= ? AND found = 1
+            """,
+                (sat_str, start_epoch, end_epoch),
+            )
+            return np.fromiter((row[0] for row in cursor), dtype=np.int64)
+
+        offsets = self._read(query) - start_epoch
+        on_grid = offsets[offsets % step == 0] // step
+        bitmap[on_grid[on_grid < slots]] = True
+        return bitmap
+
+    async def get_timestamps_bitmap(
+        self,
+        satellite: Any,
+        start_time: datetime,
+        end_time: datetime,
+        interval_minutes: int,
+    ) -> NDArray[np.bool_]:
+        """Get found timestamps on a regular grid as a boolean array.
+
+        Slot ``i`` corresponds to ``start_time + i * interval_minutes`` and is
+        True if that exact timestamp was recorded as found. Timestamps that do
+        not fall on the grid are ignored.
+
+        Returns:
+            Boolean array with one entry per expected timestamp in the range
+        """
+        return await asyncio.to_thread(self._timestamps_bitmap, satellite, start_time, end_time, interval_minutes)
+
+    # --- Directory index ---
+
+    @staticmethod
+    def _under_root(root: str) -> tuple[str, str]:
+        """Return ``(root, prefix)`` for matching a root and its descendants."""
+        root = root.rstrip("/\\") or root
+        return root, root.rstrip("/\\") + "/"
+
+    def get_directory_index(self, satellite: Any, root: str) -> dict[str, tuple[int, str | None]]:
+        """Get indexed directories under ``root``.
+
+        Returns:
+            Mapping of directory path to ``(mtime_ns, parent_path)``
+        """
+        sat_str = _satellite_key(satellite)
+        root, prefix = self._under_root(root)
+
+        def query(cursor: sqlite3.Cursor) -> dict[str, tuple[int, str | None]]:
+            cursor.execute(
+                """
+                SELECT path, mtime_ns, parent FROM directory_index
+                WHERE satellite = ? AND (path = ? OR substr(path, 1, ?) = ?)
+            """,
+                (sat_str, root, len(prefix), prefix),
+            )
+            return {row["path"]: (row["mtime_ns"], row["parent"]) for row in cursor}
+
+        return self._read(query)
+
+    def update_directory_index(
+        self,
+        satellite: Any,
+        listings: Iterable[DirectoryListing],
+        removed: Iterable[str] = (),
+    ) -> int:
+        """Replace the indexed contents of re-listed directories in one transaction.
+
+        Args:
+            satellite: Satellite the file timestamps were parsed for
+            listings: Directories that were listed, with their parsed files
+            removed: Directories that no longer exist
+
+        Returns:
+            Number of file rows written
+        """
+        sat_str = _satellite_key(satellite)
+        listings = list(listings)
+        stale = [(sat_str, path) for path in removed]
+
+        def operation(conn: sqlite3.Connection) -> int:
+            conn.executemany("DELETE FROM directory_index WHERE satellite = ? AND path = ?", stale)
+            conn.executemany("DELETE FROM file_index WHERE satellite = ? AND directory = ?", stale)
+            conn.executemany(
+                "DELETE FROM file_index WHERE satellite = ? AND directory = ?",
+                ((sat_str, path) for path, _, _, _ in listings),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO directory_index (satellite, path, parent, mtime_ns) VALUES (?, ?, ?, ?)",
+                ((sat_str, path, parent, mtime_ns) for path, parent, mtime_ns, _ in listings),
+            )
+            rows = [(sat_str, path, name, epoch) for path, _, _, files in listings for name, epoch in files]
+            conn.executemany(
+                "INSERT OR REPLACE INTO file_index (satellite, directory, name, ts_epoch) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            if listings or stale:
+                conn.execute(
+                    """
+                    INSERT INTO index_generation (satellite, generation) VALUES (?, 1)
+                    ON CONFLICT(satellite) DO UPDATE SET generation = generation + 1
+                """,
+                    (sat_str,),
+                )
+            return len(rows)
+
+        return self._write(operation)
+
+    def get_index_generation(self, satellite: Any) -> int:
+        """Get how many times the satellite's directory index has changed."""
+        sat_str = _satellite_key(satellite)
+
+        def query(cursor: sqlite3.Cursor) -> int:
+            cursor.execute("SELECT generation FROM index_generation WHERE satellite = ?", (sat_str,))
+            row = cursor.fetchone()
+            return int(row["generation"]) if row else 0
+
+        return self._read(query)
+
+    def get_indexed_epochs(
+        self,
+        satellite: Any,
+        root: str,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> NDArray[np.int64]:
+        """Get the sorted timestamps of indexed files under ``root`` as Unix seconds."""
+        sat_str = _satellite_key(satellite)
+        root, prefix = self._under_root(root)
+        start_epoch = _to_epoch(start_time) if start_time else -(2**62)
+        end_epoch = _to_epoch(end_time) if end_time else 2**62
+
+        def query(cursor: sqlite3.Cursor) -> NDArray[np.int64]:
+            cursor.execute(
+                """
+                SELECT ts_epoch FROM file_index
+                WHERE satellite = ? AND ts_epoch >= ? AND ts_epoch <= ?
+                AND (directory = ? OR substr(directory, 1, ?) = ?)
+                ORDER BY ts_epoch
+            """,
+                (sat_str, start_epoch, end_epoch, root, len(prefix), prefix),
+            )
+            return np.fromiter((row[0] for row in cursor), dtype=np.int64)
 
-        return {datetime.fromisoformat(row["timestamp"]) for row in cursor.fetchall()}
+        return self._read(query)
 
     def get_cache_stats(self) -> dict[str, Any]:
         """Get statistics about the cache.
@@ -398,41 +907,48 @@ class CacheDB:
         Returns:
             Dictionary with cache statistics
         """
-        if not self.conn:
-            msg = "Database connection not established"
-            raise RuntimeError(msg)
-        cursor = self.conn.cursor()
 
-        # Get scan count
-        cursor.execute("SELECT COUNT(*) as count FROM scan_results")
-        scan_count = cursor.fetchone()["count"]
+        def query(cursor: sqlite3.Cursor) -> dict[str, Any]:
+            # Get scan count
+            cursor.execute("SELECT COUNT(*) as count FROM scan_results")
+            scan_count = cursor.fetchone()["count"]
 
-        # Get missing count
-        cursor.execute("SELECT COUNT(*) as count FROM missing_timestamps")
-        missing_count = cursor.fetchone()["count"]
+            # Get missing count
+            cursor.execute("SELECT COUNT(*) as count FROM missing_timestamps")
+            missing_count = cursor.fetchone()["count"]
 
-        # Get timestamp counts
-        cursor.execute("SELECT COUNT(*) as count FROM timestamps")
-        timestamp_count = cursor.fetchone()["count"]
+            # Get timestamp counts
+            cursor.execute("SELECT COUNT(*) as count FROM timestamps")
+            timestamp_count = cursor.fetchone()["count"]
 
-        cursor.execute("SELECT COUNT(*) as count FROM timestamps WHERE found = 1")
-        found_count = cursor.fetchone()["count"]
+            cursor.execute("SELECT COUNT(*) as count FROM timestamps WHERE found = 1")
+            found_count = cursor.fetchone()["count"]
 
-        # Get last scan time
-        cursor.execute("SELECT MAX(scan_timestamp) as last FROM scan_results")
-        last_scan = cursor.fetchone()["last"]
+            # Get last scan time
+            cursor.execute("SELECT MAX(scan_timestamp) as last FROM scan_results")
+            last_scan = cursor.fetchone()["last"]
+
+            return {
+                "scan_count": scan_count,
+                "missing_count": missing_count,
+                "timestamp_count": timestamp_count,
+                "found_count": found_count,
+                "last_scan": last_scan,
+            }
+
+        counts = self._read(query)
 
         # Get database size
         db_size = self.db_path.stat().st_size if self.db_path.exists() else 0
 
         return {
-            "scan_count": scan_count,
-            "missing_count": missing_count,
-            "timestamp_count": timestamp_count,
-            "found_count": found_count,
+            "scan_count": counts["scan_count"],
+            "missing_count": counts["missing_count"],
+            "timestamp_count": counts["timestamp_count"],
+            "found_count": counts["found_count"],
             "db_size_bytes": db_size,
-            "schema_version": "1",
-            "last_scan": last_scan,
+            "schema_version": "2",
+            "last_scan": counts["last_scan"],
             "last_cleanup": None,
             "last_checked": datetime.now().isoformat(),
         }
@@ -447,43 +963,37 @@ class CacheDB:
     ) -> None:
         """Set cache data for a satellite (ThreadLocalCacheDB compatibility)."""
         # For now, just store the missing timestamps
-        sat_str = satellite.name if hasattr(satellite, "name") else str(satellite)
-        if not self.conn:
-            msg = "Database connection not established"
-            raise RuntimeError(msg)
-        cursor = self.conn.cursor()
+        sat_str = _satellite_key(satellite)
+        rows = [(sat_str, ts.isoformat(), _to_epoch(ts)) for ts in missing_timestamps]
 
-        for ts in missing_timestamps:
-            cursor.execute(
+        def operation(conn: sqlite3.Connection) -> None:
+            conn.executemany(
                 """
                 INSERT OR REPLACE INTO timestamps
-                (satellite, timestamp, found)
-                VALUES (?, ?, 0)
+                (satellite, timestamp, found, ts_epoch)
+                VALUES (?, ?, 0, ?)
             """,
-                (sat_str, ts.isoformat()),
+                rows,
             )
 
-        if self.conn:
-            self.conn.commit()
+        self._write(operation)
 
     def get_cache_data(self, satellite: Any) -> dict[str, Any] | None:
         """Get cache data for a satellite (ThreadLocalCacheDB compatibility)."""
-        sat_str = satellite.name if hasattr(satellite, "name") else str(satellite)
-        if not self.conn:
-            msg = "Database connection not established"
-            raise RuntimeError(msg)
-        cursor = self.conn.cursor()
+        sat_str = _satellite_key(satellite)
 
-        # Get missing timestamps
-        cursor.execute(
-            """
-            SELECT timestamp FROM timestamps
-            WHERE satellite = ? AND found = 0
-        """,
-            (sat_str,),
-        )
+        def query(cursor: sqlite3.Cursor) -> list[sqlite3.Row]:
+            # Get missing timestamps
+            cursor.execute(
+                """
+                SELECT timestamp FROM timestamps
+                WHERE satellite = ? AND found = 0
+            """,
+                (sat_str,),
+            )
+            return cursor.fetchall()
 
-        missing = [datetime.fromisoformat(row["timestamp"]) for row in cursor.fetchall()]
+        missing = [datetime.fromisoformat(row["timestamp"]) for row in self._read(query)]
 
         if not missing:
             return None
@@ -517,24 +1027,20 @@ class CacheDB:
             timestamp: Timestamp of the entry
             metadata: Optional metadata dictionary
         """
-        if not self.conn:
-            msg = "Database connection not established"
-            raise RuntimeError(msg)
-        cursor = self.conn.cursor()
-
         metadata_str = json.dumps(metadata) if metadata else None
+        row = (filepath, file_hash, file_size, timestamp.isoformat(), metadata_str)
 
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO cache
-            (filepath, file_hash, file_size, timestamp, metadata)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (filepath, file_hash, file_size, timestamp.isoformat(), metadata_str),
-        )
+        def operation(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO cache
+                (filepath, file_hash, file_size, timestamp, metadata)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                row,
+            )
 
-        if self.conn:
-            self.conn.commit()
+        self._write(operation)
 
     def get_entry(self, filepath: str) -> dict[str, Any] | None:
         """Get a cache entry by filepath.
@@ -545,21 +1051,19 @@ class CacheDB:
         Returns:
             Dictionary with entry data or None if not found
         """
-        if not self.conn:
-            msg = "Database connection not established"
-            raise RuntimeError(msg)
-        cursor = self.conn.cursor()
 
-        cursor.execute(
-            """
-            SELECT filepath, file_hash, file_size, timestamp, metadata
-            FROM cache
-            WHERE filepath = ?
-            """,
-            (filepath,),
-        )
+        def query(cursor: sqlite3.Cursor) -> sqlite3.Row | None:
+            cursor.execute(
+                """
+                SELECT filepath, file_hash, file_size, timestamp, metadata
+                FROM cache
+                WHERE filepath = ?
+                """,
+                (filepath,),
+            )
+            return cursor.fetchone()
 
-        row = cursor.fetchone()
+        row = self._read(query)
         if not row:
             return None
 
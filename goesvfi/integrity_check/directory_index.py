@@ -0,0 +1,294 @@
+"""Persistent, incrementally refreshed index of the local imagery archive.
+
+Scanning a large archive with ``glob("**/*.png")`` lists every directory and
+parses every filename on each scan. The index in :class:`CacheDB` remembers,
+per satellite, each directory's mtime and the timestamp parsed from each of its
+files. A refresh stats every known directory but only re-lists those whose
+mtime changed, since adding, removing or renaming an entry updates the mtime of
+the directory that holds it. Date-range queries are then answered from SQLite.
+
+:class:`DirectoryIndexWatcher` keeps an index warm by refreshing it
+periodically. It polls directory mtimes rather than relying on inotify, which
+does not see changes made by other hosts on network filesystems.
+"""
+
+import calendar
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+import os
+from pathlib import Path
+import threading
+import time
+
+import numpy as np
+from numpy.typing import NDArray
+
+from goesvfi.utils import log
+
+from .cache_db import CacheDB, DirectoryListing
+from .time_utils import SatellitePattern, TimestampExtractor
+
+LOGGER = log.get_logger(__name__)
+
+# Directories modified this recently are re-listed on the next refresh, because
+# an entry added within the same mtime tick would otherwise go unnoticed
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+# Stored in place of the mtime of a directory that must be re-listed next time
+_RELIST = -1
+
+
+@dataclass
+class IndexRefreshStats:
+    """Work done by one :meth:`DirectoryIndex.refresh`."""
+
+    directories_checked: int = 0
+    directories_listed: int = 0
+    directories_removed: int = 0
+    files_indexed: int = 0
+    duration: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        """Whether any directory was re-listed or dropped."""
+        return bool(self.directories_listed or self.directories_removed)
+
+
+class DirectoryIndex:
+    """Incremental index of timestamped image files under archive roots."""
+
+    def __init__(self, cache: CacheDB, suffix: str = ".png") -> None:
+        """Initialize the index.
+
+        Args:
+            cache: Database holding the index tables
+            suffix: File extension (case-insensitive) of indexed files
+        """
+        self.cache = cache
+        self.suffix = suffix.lower()
+        self._lock = threading.Lock()
+
+    def refresh(self, root: Path, pattern: SatellitePattern, full: bool = False) -> IndexRefreshStats:
+        """Bring the index for ``root`` up to date with the filesystem.
+
+        Args:
+            root: Archive directory to index
+            pattern: Satellite pattern used to parse file timestamps
+            full: Re-list every directory even if its mtime is unchanged
+
+        Returns:
+            Statistics about the refresh
+        """
+        # Serialize refreshes so a watcher and a scan don't list the same tree twice
+        with self._lock:
+            return self._refresh(str(root), pattern, full)
+
+    def _refresh(self, root: str, pattern: SatellitePattern, full: bool) -> IndexRefreshStats:
+        started = time.perf_counter()
+        stats = IndexRefreshStats()
+        known = self.cache.get_directory_index(pattern, root)
+        children: dict[str, list[str]] = {}
+        for path, (_, parent) in known.items():
+            if parent is not None:
+                children.setdefault(parent, []).append(path)
+
+        now_ns = time.time_ns()
+        listings: list[DirectoryListing] = []
+        seen: set[str] = set()
+        stack: list[tuple[str, str | None]] = [(root, None)]
+        while stack:
+            path, parent = stack.pop()
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(path)
+            stats.directories_checked += 1
+
+            known_entry = known.get(path)
+            if not full and known_entry is not None and known_entry[0] == mtime_ns:
+                stack.extend((child, path) for child in children.get(path, ()))
+                continue
+
+            listed = self._list_directory(path, pattern)
+            if listed is None:
+                continue
+            files, subdirs = listed
+            if now_ns - mtime_ns < RACY_MTIME_WINDOW_NS:
+                mtime_ns = _RELIST
+            listings.append((path, parent, mtime_ns, files))
+            stats.directories_listed += 1
+            stack.extend((child, path) for child in subdirs)
+
+        removed = [path for path in known if path not in seen]
+        stats.directories_removed = len(removed)
+        if listings or removed:
+            stats.files_indexed = self.cache.update_directory_index(pattern, listings, removed)
+
+        stats.duration = time.perf_counter() - started
+        LOGGER.info(
+            "Index refresh of %s: %d dirs checked, %d listed, %d removed, %d files indexed in %.2fs",
+            root,
+            stats.directories_checked,
+            stats.directories_listed,
+            stats.directories_removed,
+            stats.files_indexed,
+            stats.duration,
+        )
+        return stats
+
+    def generation(self, pattern: SatellitePattern) -> int:
+        """Get a counter that increases with every change to the index for ``pattern``.
+
+        Refreshes by a scan and by a :class:`DirectoryIndexWatcher` both count,
+        so results derived from the index stay valid while it is unchanged.
+        """
+        return self.cache.get_index_generation(pattern)
+
+    def _list_directory(self, path: str, pattern: SatellitePattern) -> tuple[list[tuple[str, int]], list[str]] | None:
+        """List one directory, parsing timestamps from matching file names."""
+        files: list[tuple[str, int]] = []
+        subdirs: list[str] = []
+        dir_timestamp: datetime | None = None
+        dir_parsed = False
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    if not entry.name.lower().endswith(self.suffix):
+                        continue
+                    timestamp = self._parse_filename(entry.name, pattern)
+                    if timestamp is None:
+                        # Same fallback as DirectoryScanner: the parent directory name
+                        if not dir_parsed:
+                            dir_timestamp = TimestampExtractor.extract_timestamp_from_directory_name(
+                                os.path.basename(path)
+                            )
+                            dir_parsed = True
+                        timestamp = dir_timestamp
+                    if timestamp is not None:
+                        files.append((entry.name, _epoch(timestamp)))
+        except OSError as e:
+            LOGGER.warning("Could not list %s: %s", path, e)
+            return None
+        return files, subdirs
+
+    @staticmethod
+    def _parse_filename(name: str, pattern: SatellitePattern) -> datetime | None:
+        try:
+            return TimestampExtractor.extract_timestamp(name, pattern)
+        except ValueError:
+            return None
+
+    def timestamps(
+        self,
+        root: Path,
+        pattern: SatellitePattern,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> NDArray[np.datetime64]:
+        """Get indexed file timestamps under ``root`` within a date range.
+
+        If no files are indexed, falls back to timestamps in the names of the
+        immediate subdirectories of ``root``, as
+        :meth:`DirectoryScanner.scan_directory_for_timestamps` does.
+
+        Returns:
+            Sorted ``datetime64[s]`` array of UTC timestamps
+        """
+        epochs = self.cache.get_indexed_epochs(pattern, str(root), start_time, end_time)
+        if epochs.size == 0:
+            epochs = self._subdirectory_epochs(str(root), pattern, start_time, end_time)
+        return epochs.astype("datetime64[s]")
+
+    def _subdirectory_epochs(
+        self,
+        root: str,
+        pattern: SatellitePattern,
+        start_time: datetime | None,
+        end_time: datetime | None,
+    ) -> NDArray[np.int64]:
+        subdirs = [
+            path for path, (_, parent) in self.cache.get_directory_index(pattern, root).items() if parent == root
+        ]
+        # Compare as Unix seconds, so naive (UTC) and aware datetimes mix safely
+        start_epoch = _epoch(start_time) if start_time else None
+        end_epoch = _epoch(end_time) if end_time else None
+        epochs = []
+        for subdir in subdirs:
+            timestamp = TimestampExtractor.extract_timestamp_from_directory_name(os.path.basename(subdir))
+            if timestamp is None:
+                continue
+            epoch = _epoch(timestamp)
+            if (start_epoch is not None and epoch < start_epoch) or (end_epoch is not None and epoch > end_epoch):
+                continue
+            epochs.append(epoch)
+        return np.sort(np.array(epochs, dtype=np.int64))
+
+
+def _epoch(timestamp: datetime) -> int:
+    """Unix seconds for a parsed timestamp (naive values are UTC)."""
+    return calendar.timegm(timestamp.utctimetuple())
+
+
+class DirectoryIndexWatcher:
+    """Background thread that keeps a :class:`DirectoryIndex` warm."""
+
+    def __init__(
+        self,
+        index: DirectoryIndex,
+        root: Path,
+        pattern: SatellitePattern,
+        interval: float = 30.0,
+        on_change: Callable[[IndexRefreshStats], None] | None = None,
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            index: Index to refresh
+            root: Archive directory to watch
+            pattern: Satellite pattern used to parse file timestamps
+            interval: Seconds between refreshes
+            on_change: Called from the watcher thread after a refresh that changed the index
+        """
+        self.index = index
+        self.root = Path(root)
+        self.pattern = pattern
+        self.interval = interval
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the watcher thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start watching; does nothing if already running."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="DirectoryIndexWatcher", daemon=True)
+        self._thread.start()
+        LOGGER.info("Watching %s for %s every %.0fs", self.root, self.pattern.name, self.interval)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop watching and wait for an in-progress refresh to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.is_set():
+            try:
+                stats = self.index.refresh(self.root, self.pattern)
+                if stats.changed and self.on_change is not None:
+                    self.on_change(stats)
+            except Exception as e:
+                LOGGER.warning("Directory index refresh failed for %s: %s", self.root, e)
+            self._stop.wait(self.interval)
@@ -6,6 +6,7 @@ GOES-16 and GOES-18 Band 13 imagery.
 """
 
 import asyncio
+import concurrent.futures
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 import os
@@ -19,6 +20,7 @@ from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 from goesvfi.gui_components.update_manager import register_update, request_update
 from goesvfi.utils import log
 
+from .async_runtime import AsyncRuntime, get_async_runtime
 from .cache_db import CacheDB
 from .reconcile_manager import ReconcileManager
 from .reconciler import Reconciler
@@ -98,8 +100,8 @@ class EnhancedIntegrityCheckViewModel(IntegrityCheckViewModel):
         Args:
             base_reconciler: Optional Reconciler instance for backward compatibility
             cache_db: Optional CacheDB instance, will create one if not provided
-            cdn_store: Optional CDNStore instance, will create one if not provided
-            s3_store: Optional S3Store instance, will create one if not provided
+            cdn_store: Optional CDNStore instance, uses the shared runtime's store if not provided
+            s3_store: Optional S3Store instance, uses the shared runtime's store if not provided
         """
         # Initialize the base class
         super().__init__(base_reconciler)
@@ -129,8 +131,11 @@ class EnhancedIntegrityCheckViewModel(IntegrityCheckViewModel):
             type(self._cache_db).__name__,
         )
 
-        self._cdn_store = cdn_store or CDNStore(resolution=self._cdn_resolution)
-        self._s3_store = s3_store or S3Store(aws_profile=self._aws_profile, aws_region=self._s3_region)
+        # Remote stores are owned by the shared async runtime so that their
+        # sessions and pooled connections stay warm between scans and downloads
+        self._runtime: AsyncRuntime = get_async_runtime()
+        self._cdn_store = cdn_store or self._runtime.cdn_store(resolution=self._cdn_resolution)
+        self._s3_store = s3_store or self._runtime.s3_store(aws_profile=self._aws_profile, aws_region=self._s3_region)
 
         # Create the ReconcileManager with thread-local cache
         self._reconcile_manager = ReconcileManager(
@@ -149,8 +154,8 @@ class EnhancedIntegrityCheckViewModel(IntegrityCheckViewModel):
 
         # Initialize async state
         self._async_task = None
-        self._scan_task_future = None
-        self._download_task_future = None
+        self._scan_task_future: concurrent.futures.Future[Any] | None = None
+        self._download_task_future: concurrent.futures.Future[Any] | None = None
 
         # Initialize thread pool with min lifetime to keep tasks alive
         self._thread_pool = QThreadPool.globalInstance()
@@ -283,7 +288,7 @@ class EnhancedIntegrityCheckViewModel(IntegrityCheckViewModel):
 
         # Update the CDN store
         if self._cdn_store:
-            self._cdn_store = CDNStore(resolution=value)
+            self._cdn_store = self._runtime.cdn_store(resolution=value)
 
         # Update the ReconcileManager
         if self._reconcile_manager:
@@ -313,7 +318,7 @@ class EnhancedIntegrityCheckViewModel(IntegrityCheckViewModel):
 
         # Update the S3 store
         if self._s3_store:
-            self._s3_store = S3Store(aws_profile=value, aws_region=self._s3_region)
+            self._s3_store = self._runtime.s3_store(aws_profile=value, aws_region=self._s3_region)
 
         # Update the ReconcileManager
         if self._reconcile_manager:
@@ -429,6 +434,18 @@ class EnhancedIntegrityCheckViewModel(IntegrityCheckViewModel):
             self._thread_pool.start(download_task)
         LOGGER.info("Enhanced download task started for %s items", len(self._missing_timestamps))
 
+    def cancel_scan(self) -> None:
+        """Cancel the ongoing scan, including its coroutine on the async runtime."""
+        super().cancel_scan()
+        if self._cancel_requested and self._scan_task_future is not None:
+            self._scan_task_future.cancel()
+
+    def cancel_downloads(self) -> None:
+        """Cancel ongoing downloads, including their coroutine on the async runtime."""
+        super().cancel_downloads()
+        if self._cancel_requested and self._download_task_future is not None:
+            self._download_task_future.cancel()
+
     def get_disk_space_info(self) -> tuple[float, float]:
         """Get disk space information for the base directory.
 
@@ -878,6 +895,13 @@ class EnhancedIntegrityCheckViewModel(IntegrityCheckViewModel):
             # Don't terminate active tasks, just log a warning
             # We'll leave the tasks running to complete properly
 
+        # Stop any work this view model still has on the shared async runtime.
+        # The runtime itself is shared and is shut down when the application exits.
+        for future in (getattr(self, "_scan_task_future", None), getattr(self, "_download_task_future", None)):
+            if future is not None and not future.done():
+                LOGGER.debug("Cancelling outstanding async operation during cleanup")
+                future.cancel()
+
         # Set stop flag for disk space check
         if hasattr(self, "_stop_disk_space_check"):
             self._stop_disk_space_check = True
@@ -887,13 +911,17 @@ class EnhancedIntegrityCheckViewModel(IntegrityCheckViewModel):
         if hasattr(self, "_disk_space_check_count"):
             self._disk_space_check_count = 100  # Stop further checks
 
+        # Stop the directory watcher before the caches it writes to are closed
+        if hasattr(self, "_reconciler"):
+            try:
+                super().cleanup()
+            except Exception:
+                LOGGER.exception("Error stopping directory watcher")
+
         # Close database connection
         if hasattr(self, "_cache_db"):
             try:
                 LOGGER.debug("Closing cache database (type: %s)", type(self._cache_db).__name__)
-                if isinstance(self._cache_db, ThreadLocalCacheDB):
-                    # For thread-local DB, close all thread connections
-                    LOGGER.debug("Performing thread-local database cleanup")
                 self._cache_db.close()
             except Exception:
                 LOGGER.exception("Error closing cache database")
@@ -970,19 +998,18 @@ class AsyncScanTask(QRunnable):
         """Execute the scan task."""
         self.is_running = True
         try:
-            # Setup async event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            # Run the scan
-            result = loop.run_until_complete(self._run_scan())
+            # Run the scan on the shared runtime loop so that remote store
+            # sessions and connections are reused across operations
+            future = get_async_runtime().submit(self._run_scan())
+            self.view_model._scan_task_future = future
+            try:
+                result = future.result()
+            except concurrent.futures.CancelledError:
+                result = {"status": "cancelled"}
 
             # Emit result
             self.signals.scan_finished.emit(result)
 
-            # Clean up
-            loop.close()
-
         except (
             RemoteStoreError,
             AuthenticationError,
@@ -1092,19 +1119,18 @@ class AsyncDownloadTask(QRunnable):
         """Execute the download task."""
         self.is_running = True
         try:
-            # Setup async event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            # Run the downloads
-            results = loop.run_until_complete(self._run_downloads())
+            # Run the downloads on the shared runtime loop so that remote store
+            # sessions and connections are reused across operations
+            future = get_async_runtime().submit(self._run_downloads())
+            self.view_model._download_task_future = future
+            try:
+                results = future.result()
+            except concurrent.futures.CancelledError:
+                results = {}
 
             # Emit result
             self.signals.download_finished.emit(results)
 
-            # Clean up
-            loop.close()
-
             # Update task state
             self.is_complete = True
             self.is_running = False
@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
 import tempfile
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import numpy as np
 from numpy.typing import NDArray
@@ -17,6 +17,9 @@ import requests
 
 from goesvfi.utils import log
 
+if TYPE_CHECKING:
+    from goesvfi.integrity_check.render.batch import RenderStage
+
 LOGGER = log.get_logger(__name__)
 
 # Channel number ranges
@@ -32,6 +35,10 @@ COMPOSITE_CHANNEL_MIN = 100
 # Default cache size
 DEFAULT_CACHE_SIZE = 100
 
+# Band the NetCDF renderer handles (render.netcdf.TARGET_BAND_ID, not imported
+# here to keep xarray out of this module's imports)
+RENDER_STAGE_BAND = 13
+
 
 class ProductType(Enum):
     """GOES product types."""
@@ -278,6 +285,7 @@ class GOESImageryManager:
         satellite: str = "G16",
         cache_size: int = DEFAULT_CACHE_SIZE,
         default_mode: ImageryMode = ImageryMode.IMAGE_PRODUCT,
+        render_stage: "RenderStage | None" = None,
     ) -> None:
         """Initialize the imagery manager.
 
@@ -287,6 +295,8 @@ class GOESImageryManager:
             satellite: Satellite identifier
             cache_size: Maximum cache size
             default_mode: Default imagery mode
+            render_stage: Optional process-pool stage that renders raw Band 13
+                downloads instead of the in-process processor
         """
         LOGGER.warning("Using stub implementation of GOESImageryManager")
         self.satellite = satellite
@@ -301,6 +311,7 @@ class GOESImageryManager:
 
         # Create processor instance
         self.processor = GOESImageProcessor(output_dir=self.base_dir)
+        self.render_stage = render_stage
 
     @staticmethod
     def process_image(
@@ -391,7 +402,13 @@ class GOESImageryManager:
                 LOGGER.error("Could not download raw data")
                 return None
 
-            # 3. Process it
+            # 3. Process it; the render stage handles Band 13 off the calling thread
+            if self.render_stage is not None and channel.number == RENDER_STAGE_BAND:
+                try:
+                    return self.render_stage.render(raw_file, self.base_dir / raw_file.with_suffix(".png").name)
+                except Exception:
+                    LOGGER.exception("Could not render %s", raw_file)
+                    return None
             return self.processor.process_raw_data(raw_file, channel)
 
         LOGGER.warning("Unsupported mode: %s", mode)
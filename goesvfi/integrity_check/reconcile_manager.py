@@ -3,15 +3,50 @@
 This module manages the reconciliation of missing timestamps and downloads.
 """
 
+import asyncio
 from datetime import datetime, timedelta
+import os
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from numpy.typing import NDArray
 
 from goesvfi.core.base_manager import ConfigurableManager
 from goesvfi.utils import log
+from goesvfi.utils.timeline import Timeline
+
+if TYPE_CHECKING:
+    from goesvfi.integrity_check.render.batch import RenderStage
 
 LOGGER = log.get_logger(__name__)
 
+# Local files are named "<SATELLITE>_<YYYYmmdd_HHMMSS>.png" (see _get_local_path)
+LOCAL_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+_LOCAL_TIMESTAMP_WIDTH = 15
+_LOCAL_SUFFIX = ".png"
+
+
+def _local_stamp_to_iso(stamp: str) -> str:
+    """Turn ``YYYYmmdd_HHMMSS`` into ``YYYY-mm-ddTHH:MM:SS`` for NumPy."""
+    return f"{stamp[0:4]}-{stamp[4:6]}-{stamp[6:8]}T{stamp[9:11]}:{stamp[11:13]}:{stamp[13:15]}"
+
+
+def _parse_local_stamps(stamps: list[str]) -> NDArray[np.datetime64]:
+    """Parse local filename timestamps into a ``datetime64[s]`` array, dropping invalid ones."""
+    iso = [_local_stamp_to_iso(stamp) for stamp in stamps]
+    try:
+        return np.array(iso, dtype="datetime64[s]")
+    except ValueError:
+        # A malformed name (e.g. month 13) fails the whole batch; parse one by one
+        valid = []
+        for value in iso:
+            try:
+                valid.append(np.datetime64(value, "s"))
+            except ValueError:
+                LOGGER.debug("Ignoring local file with invalid timestamp %s", value)
+        return np.array(valid, dtype="datetime64[s]")
+
 
 class ReconcileManager(ConfigurableManager):
     """Manages reconciliation of missing timestamps and downloads.
@@ -27,6 +62,7 @@ class ReconcileManager(ConfigurableManager):
         cdn_store: Any | None = None,
         s3_store: Any | None = None,
         max_concurrency: int = 5,
+        render_stage: "RenderStage | None" = None,
         **kwargs: Any,
     ) -> None:
         """Initialize the ReconcileManager.
@@ -37,6 +73,8 @@ class ReconcileManager(ConfigurableManager):
             cdn_store: CDN store instance
             s3_store: S3 store instance
             max_concurrency: Maximum concurrent downloads
+            render_stage: Optional stage that renders NetCDF downloads to the
+                local images as each download completes
             **kwargs: Additional keyword arguments
         """
         # Set up default configuration
@@ -55,6 +93,7 @@ class ReconcileManager(ConfigurableManager):
         self.reconciler = reconciler
         self.cdn_store = cdn_store
         self.s3_store = s3_store
+        self.render_stage = render_stage
         self.base_dir = Path(self.get_config("base_dir"))
 
         # Track resources for cleanup
@@ -121,7 +160,7 @@ class ReconcileManager(ConfigurableManager):
         end_time: datetime,
         interval_minutes: int = 10,
         progress_callback: Any | None = None,
-    ) -> tuple[set[datetime], set[datetime]]:
+    ) -> tuple[Timeline, Timeline]:
         """Scan directory for existing and missing timestamps.
 
         Args:
@@ -133,17 +172,14 @@ class ReconcileManager(ConfigurableManager):
             progress_callback: Optional progress callback
 
         Returns:
-            Tuple of (existing_timestamps, missing_timestamps)
+            Tuple of (existing_timestamps, missing_timestamps) as timelines on
+            the same grid
         """
         # Step 1: Generate expected timestamps
         if progress_callback:
             progress_callback(0, 5, "Step 1/5: Generating expected timestamps")
 
-        current = start_time
-        all_timestamps = set()
-        while current <= end_time:
-            all_timestamps.add(current)
-            current += timedelta(minutes=interval_minutes)
+        expected = Timeline.full(start_time, end_time, timedelta(minutes=interval_minutes))
 
         # Step 2: Check cache
         if progress_callback:
@@ -153,21 +189,26 @@ class ReconcileManager(ConfigurableManager):
         if progress_callback:
             progress_callback(2, 5, "Step 3/5: Checking filesystem for existing files")
 
-        existing = set()
-        for ts in all_timestamps:
-            path = self._get_local_path(ts, satellite, directory)
-            if path.exists():
-                existing.add(ts)
-                # Update cache
-                if hasattr(self, "cache_db") and self.cache_db:
-                    await self.cache_db.add_timestamp(ts, satellite, str(path), found=True)
+        # One directory listing instead of a stat per expected timestamp
+        base = Path(directory) if directory else self.base_dir
+        local_timestamps = await asyncio.to_thread(self._list_local_timestamps, base, satellite)
+        offset = start_time.utcoffset()
+        if offset:
+            # Names carry wall-clock time in the timezone of the requested range
+            local_timestamps = local_timestamps - np.timedelta64(int(offset.total_seconds()), "s")
+        existing = Timeline.from_datetime64(start_time, end_time, expected.cadence, local_timestamps)
+
+        # Update cache with a single batched write
+        if existing and hasattr(self, "cache_db") and self.cache_db:
+            found_entries = [(ts, str(self._get_local_path(ts, satellite, directory))) for ts in existing]
+            await self.cache_db.add_timestamps(satellite, found_entries, found=True)
 
         # Step 4: Finalizing results
         if progress_callback:
             progress_callback(3, 5, "Step 4/5: Finalizing results")
 
         # Calculate missing
-        missing = all_timestamps - existing
+        missing = expected - existing
 
         # Step 5: Complete
         if progress_callback:
@@ -237,6 +278,26 @@ class ReconcileManager(ConfigurableManager):
         # Return empty dict as a stub
         return {}
 
+    async def file_downloaded(self, timestamp: datetime, path: Any, satellite: Any, directory: Any = None) -> None:
+        """Hand a completed NetCDF download to the render stage.
+
+        Downloaders call this as each file arrives, so rendering overlaps the
+        remaining downloads. Results that are not NetCDF files (already
+        rendered images, errors) are ignored, as is everything when there is
+        no render stage.
+
+        Args:
+            timestamp: Timestamp the file was downloaded for
+            path: Downloaded file
+            satellite: Satellite pattern
+            directory: Base directory for the rendered image
+        """
+        if self.render_stage is None or not isinstance(path, Path) or path.suffix != ".nc":
+            return
+        output = self._get_local_path(timestamp, satellite, directory)
+        size = await asyncio.to_thread(lambda: path.stat().st_size if path.exists() else 0)
+        await self.render_stage.submit_async(path, output, downloaded_bytes=size)
+
     def _get_local_path(self, timestamp: datetime, satellite: Any, directory: Any = None) -> Path:
         """Get local path for a timestamp.
 
@@ -252,9 +313,32 @@ class ReconcileManager(ConfigurableManager):
         base = Path(directory) if directory else self.base_dir
 
         # Create a simple filename based on timestamp and satellite
-        filename = f"{satellite.name}_{timestamp.strftime('%Y%m%d_%H%M%S')}.png"
+        filename = f"{satellite.name}_{timestamp.strftime(LOCAL_TIMESTAMP_FORMAT)}{_LOCAL_SUFFIX}"
         return base / filename
 
+    @staticmethod
+    def _list_local_timestamps(base: Path, satellite: Any) -> NDArray[np.datetime64]:
+        """List ``base`` once and parse the timestamps of the satellite's local files.
+
+        Returns:
+            ``datetime64[s]`` array of the timestamps found
+        """
+        prefix = f"{satellite.name}_"
+        name_length = len(prefix) + _LOCAL_TIMESTAMP_WIDTH + len(_LOCAL_SUFFIX)
+        stamps: list[str] = []
+        try:
+            with os.scandir(base) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if len(name) != name_length or not name.startswith(prefix) or not name.endswith(_LOCAL_SUFFIX):
+                        continue
+                    stamp = name[len(prefix) : len(prefix) + _LOCAL_TIMESTAMP_WIDTH]
+                    if stamp[8] == "_" and stamp[:8].isdigit() and stamp[9:].isdigit():
+                        stamps.append(stamp)
+        except FileNotFoundError:
+            return np.array([], dtype="datetime64[s]")
+        return _parse_local_stamps(stamps)
+
     def _get_store_for_timestamp(self, _timestamp: datetime) -> Any:
         """Get appropriate store for a timestamp.
 
@@ -316,15 +400,20 @@ class ReconcileManager(ConfigurableManager):
                 progress_callback=None,  # Don't pass through to avoid conflicting messages
             )
 
+        # Renders run alongside downloads; wait for the last ones to finish
+        throughput = None
+        if self.render_stage is not None:
+            throughput = await asyncio.to_thread(self.render_stage.wait)
+            LOGGER.info("Download and render throughput: %s", throughput.summary())
+
         # Final completion message
         if progress_callback:
             total_expected = len(existing) + len(missing)
             fetched_count = len(missing)  # Simulated for stub
-            progress_callback(
-                2,
-                2,
-                f"Reconciliation complete: {len(existing)} existing, {fetched_count} downloaded",
-            )
+            message = f"Reconciliation complete: {len(existing)} existing, {fetched_count} downloaded"
+            if throughput is not None:
+                message += f" ({throughput.summary()})"
+            progress_callback(2, 2, message)
 
         LOGGER.warning("Stub: Reconcile not fully implemented")
         # Return dummy values
@@ -5,20 +5,17 @@ finding missing timestamps, and reconciling local data with expectations.
 """
 
 from collections.abc import Callable
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 import time
 from typing import Any
 
 from goesvfi.utils import log
+from goesvfi.utils.timeline import Timeline
 
 from .cache_db import CacheDB
-from .time_index import (
-    SatellitePattern,
-    detect_interval,
-    generate_timestamp_sequence,
-    scan_directory_for_timestamps,
-)
+from .directory_index import DirectoryIndex, DirectoryIndexWatcher
+from .time_index import SatellitePattern, detect_interval
 
 LOGGER = log.get_logger(__name__)
 
@@ -37,6 +34,8 @@ class Reconciler:
     def __init__(self, cache_db_path: Path | None = None) -> None:
         """Initialize the Reconciler with optional cache database."""
         self.cache = CacheDB(cache_db_path) if cache_db_path else CacheDB()
+        self.index = DirectoryIndex(self.cache)
+        self._watcher: DirectoryIndexWatcher | None = None
         LOGGER.info("Reconciler initialized with cache at %s", cache_db_path)
 
     def scan_date_range(
@@ -60,14 +59,21 @@ class Reconciler:
             interval_minutes: Expected interval between files (0 = auto-detect)
             progress_callback: Callback for progress updates
             should_cancel: Callback to check for cancellation
-            force_rescan: Force rescan even if cached
+            force_rescan: Re-list every directory and ignore cached scan results
 
         Returns:
-            Dictionary with scan results
+            Dictionary with scan results. ``"missing"`` is a :class:`Timeline`
+            on the ``interval_minutes`` grid starting at ``start_date``.
         """
         start_time = time.time()
 
-        # Check cache unless forced to rescan
+        # Bring the directory index up to date; only changed directories are re-listed
+        LOGGER.info("Scanning directory: %s", base_directory)
+        self.index.refresh(base_directory, satellite_pattern, full=force_rescan)
+
+        # Cached results are valid as long as the index hasn't changed since they
+        # were stored, whether by this refresh or by a watcher between scans
+        generation = self.index.generation(satellite_pattern)
         if not force_rescan:
             cached = self.cache.get_cached_scan(
                 start_date,
@@ -76,7 +82,7 @@ class Reconciler:
                 interval_minutes,
                 base_directory,
             )
-            if cached:
+            if cached and cached["index_generation"] == generation:
                 LOGGER.info("Using cached scan results")
                 return {
                     "status": "completed",
@@ -89,25 +95,22 @@ class Reconciler:
                     "execution_time": 0.0,
                 }
 
-        # Scan directory for existing files
-        LOGGER.info("Scanning directory: %s", base_directory)
-        found_timestamps = scan_directory_for_timestamps(base_directory, satellite_pattern)
+        found_timestamps = self.index.timestamps(base_directory, satellite_pattern, start_date, end_date)
 
         # Auto-detect interval if not specified
         if interval_minutes == 0:
-            interval_minutes = detect_interval(found_timestamps) or 30
+            interval_minutes = detect_interval(found_timestamps.tolist()) or 30
             LOGGER.info("Auto-detected interval: %s minutes", interval_minutes)
 
-        # Generate expected timestamps
-        expected_timestamps = list(generate_timestamp_sequence(start_date, end_date, interval_minutes))
-
-        # Find missing timestamps
-        found_set = set(found_timestamps)
-        missing_timestamps = [ts for ts in expected_timestamps if ts not in found_set]
+        # Find missing timestamps as a bitmap over the expected grid
+        cadence = timedelta(minutes=interval_minutes)
+        expected = Timeline.full(start_date, end_date, cadence)
+        found = Timeline.from_datetime64(start_date, end_date, cadence, found_timestamps)
+        missing_timestamps = expected - found
 
         # Update progress
-        total_expected = len(expected_timestamps)
-        total_found = len(found_timestamps)
+        total_expected = expected.slot_count
+        total_found = int(found_timestamps.size)
 
         if progress_callback:
             progress_callback(total_expected, total_found, 1.0)
@@ -122,6 +125,7 @@ class Reconciler:
             missing_timestamps,
             total_expected,
             total_found,
+            index_generation=generation,
         )
 
         execution_time = time.time() - start_time
@@ -137,6 +141,26 @@ class Reconciler:
             "execution_time": execution_time,
         }
 
+    def watch_directory(
+        self, base_directory: Path, satellite_pattern: SatellitePattern, interval: float = 30.0
+    ) -> None:
+        """Keep the directory index for ``base_directory`` warm in the background.
+
+        Replaces any directory that was being watched before.
+        """
+        watcher = self._watcher
+        if watcher and watcher.root == Path(base_directory) and watcher.pattern == satellite_pattern:
+            return
+        self.stop_watching()
+        self._watcher = DirectoryIndexWatcher(self.index, base_directory, satellite_pattern, interval)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the background index watcher, if any."""
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
     def get_missing_timestamps(
         self,
         start_date: datetime,
@@ -4,9 +4,36 @@ This package provides implementations for accessing and downloading
 satellite imagery from various remote sources.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .base import RemoteStore
-from .cdn_store import CDNStore
-from .composite_store import CompositeStore
-from .s3_store import S3Store
 
 __all__ = ["CDNStore", "CompositeStore", "RemoteStore", "S3Store"]
+
+if TYPE_CHECKING:
+    from .cdn_store import CDNStore
+    from .composite_store import CompositeStore
+    from .s3_store import S3Store
+
+# The stores import aiohttp and aioboto3, so they are loaded on first access
+# and importing a lightweight submodule doesn't load every client library.
+_LAZY_IMPORTS = {
+    "CDNStore": ".cdn_store",
+    "CompositeStore": ".composite_store",
+    "S3Store": ".s3_store",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
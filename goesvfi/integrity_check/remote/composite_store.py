@@ -2,10 +2,16 @@
 
 This module provides a RemoteStore implementation that tries multiple
 data sources in order, falling back to the next source if one fails.
+Slow sources are hedged: if the primary source has not finished within its
+observed p95 latency, a backup request is started on the next source and
+whichever finishes first wins.
 """
 
 import asyncio
+from collections import deque
 from datetime import datetime
+import inspect
+import math
 from pathlib import Path
 from typing import Any
 
@@ -50,6 +56,84 @@ class DataSourceResult:
         self.elapsed_time = elapsed_time
 
 
+class SourceLatencyTracker:
+    """Track latency and throughput for a single data source.
+
+    Keeps exponentially weighted moving averages (EWMA) of request latency
+    and throughput, plus a bounded window of recent latency samples used to
+    estimate the p95 latency that drives hedging decisions.
+    """
+
+    def __init__(self, alpha: float = 0.3, window: int = 64, min_samples: int = 5) -> None:
+        """Initialize the tracker.
+
+        Args:
+            alpha: Smoothing factor for the moving averages (0 < alpha <= 1)
+            window: Number of recent latency samples kept for percentiles
+            min_samples: Samples required before percentiles are reported
+        """
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.ewma_latency: float | None = None
+        self.ewma_throughput: float | None = None
+        self.ewma_size: float | None = None
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def _smooth(self, current: float | None, value: float) -> float:
+        if current is None:
+            return value
+        return self.alpha * value + (1.0 - self.alpha) * current
+
+    def record(self, elapsed_time: float, size_bytes: int = 0) -> None:
+        """Record a completed request.
+
+        Args:
+            elapsed_time: Time taken by the request in seconds
+            size_bytes: Bytes transferred, or 0 if unknown
+        """
+        self.ewma_latency = self._smooth(self.ewma_latency, elapsed_time)
+        self._samples.append(elapsed_time)
+        if size_bytes > 0:
+            self.ewma_size = self._smooth(self.ewma_size, float(size_bytes))
+            if elapsed_time > 0:
+                self.ewma_throughput = self._smooth(self.ewma_throughput, size_bytes / elapsed_time)
+
+    def record_censored(self, elapsed_time: float) -> None:
+        """Record a request that was cancelled before it completed.
+
+        Its elapsed time is only a lower bound on the latency, so it can raise
+        the latency estimate but never lower it, and it is kept out of the
+        percentile window.
+
+        Args:
+            elapsed_time: Time the request ran before it was cancelled
+        """
+        if self.ewma_latency is None or elapsed_time > self.ewma_latency:
+            self.ewma_latency = self._smooth(self.ewma_latency, elapsed_time)
+
+    def percentile(self, pct: float) -> float | None:
+        """Get a latency percentile over the recent sample window.
+
+        Args:
+            pct: Percentile in the range 0-100
+
+        Returns:
+            Latency in seconds, or None if there are not enough samples
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+        return ordered[index]
+
+    def reset(self) -> None:
+        """Forget all recorded samples."""
+        self.ewma_latency = None
+        self.ewma_throughput = None
+        self.ewma_size = None
+        self._samples.clear()
+
+
 class CompositeStore(RemoteStore):
     """Store implementation with automatic fallback between multiple sources.
 
@@ -59,6 +143,10 @@ class CompositeStore(RemoteStore):
     3. Tertiary: Local cache (if configured)
 
     The store tracks performance metrics to optimize source selection over time.
+    When hedging is enabled, a backup request is started on the next source
+    if the current one has not completed within its p95 latency. The first
+    request to finish wins and the others are cancelled. Duplicated transfer
+    is limited by a byte budget that grows with the useful bytes downloaded.
     """
 
     def __init__(
@@ -69,6 +157,10 @@ class CompositeStore(RemoteStore):
         cache_dir: Path | None = None,
         timeout: int = 60,
         prefer_recent_success: bool = True,
+        enable_hedging: bool = True,
+        default_hedge_delay: float = 5.0,
+        hedge_budget_ratio: float = 0.1,
+        hedge_burst_bytes: int = 64 * 1024 * 1024,
     ) -> None:
         """Initialize the composite store.
 
@@ -79,9 +171,25 @@ class CompositeStore(RemoteStore):
             cache_dir: Directory for local cache (required if enable_cache=True)
             timeout: Timeout for each source in seconds
             prefer_recent_success: Prioritize recently successful sources
+            enable_hedging: Start backup requests on slow sources
+            default_hedge_delay: Hedge delay in seconds used until a source has
+                enough latency samples to estimate its p95
+            hedge_budget_ratio: Fraction of useful downloaded bytes that may be
+                spent on duplicated (hedged) transfers
+            hedge_burst_bytes: Duplicated bytes allowed before any useful bytes
+                have been downloaded
         """
         self.timeout = timeout
         self.prefer_recent_success = prefer_recent_success
+        self.enable_hedging = enable_hedging
+        self.default_hedge_delay = default_hedge_delay
+        self.hedge_budget_ratio = hedge_budget_ratio
+        self.hedge_burst_bytes = hedge_burst_bytes
+
+        # Hedging byte accounting
+        self.useful_bytes = 0
+        self.duplicated_bytes = 0
+        self._reserved_hedge_bytes = 0
 
         # Initialize data sources
         self.sources: list[tuple[str, RemoteStore]] = []
@@ -110,9 +218,12 @@ class CompositeStore(RemoteStore):
                 "last_success": None,
                 "last_failure": None,
                 "consecutive_failures": 0,
+                "hedges": 0,
+                "hedge_wins": 0,
             }
             for name, _ in self.sources
         }
+        self.latency: dict[str, SourceLatencyTracker] = {name: SourceLatencyTracker() for name, _ in self.sources}
 
         LOGGER.info("Initialized CompositeStore with sources: %s", [name for name, _ in self.sources])
 
@@ -128,7 +239,7 @@ class CompositeStore(RemoteStore):
         # Sort sources by recent success and performance
         def source_priority(source_tuple: tuple[str, RemoteStore]) -> tuple[int, float]:
             name, _ = source_tuple
-            stats = self.source_stats[name]
+            stats = self._get_source_stats(name)
 
             # Penalize sources with recent consecutive failures
             if stats["consecutive_failures"] >= 3:
@@ -140,11 +251,13 @@ class CompositeStore(RemoteStore):
                 return (0, 0.0)  # Untried sources first
 
             success_rate = stats["successes"] / attempts
-            avg_time = stats["total_time"] / attempts if attempts > 0 else float("inf")
+            ewma_latency = self._get_tracker(name).ewma_latency
+            if ewma_latency is None:
+                ewma_latency = stats["total_time"] / attempts
 
             # Lower score is better
-            # Combine success rate (inverted) and average time
-            score = (1.0 - success_rate) * 100 + avg_time
+            # Combine success rate (inverted) and recent (EWMA) latency
+            score = (1.0 - success_rate) * 100 + ewma_latency
 
             return (stats["consecutive_failures"], score)
 
@@ -156,12 +269,79 @@ class CompositeStore(RemoteStore):
 
         return sorted_sources
 
+    def _get_tracker(self, source_name: str) -> SourceLatencyTracker:
+        """Get the latency tracker for a source, creating it if needed."""
+        tracker = self.latency.get(source_name)
+        if tracker is None:
+            tracker = self.latency[source_name] = SourceLatencyTracker()
+        return tracker
+
+    def _get_source_stats(self, source_name: str) -> dict[str, Any]:
+        """Get the statistics entry for a source, creating it if needed."""
+        if source_name not in self.source_stats:
+            self.source_stats[source_name] = {
+                "attempts": 0,
+                "successes": 0,
+                "failures": 0,
+                "total_time": 0.0,
+                "last_success": None,
+                "last_failure": None,
+                "consecutive_failures": 0,
+                "hedges": 0,
+                "hedge_wins": 0,
+            }
+        return self.source_stats[source_name]
+
+    def _get_hedge_delay(self, source_name: str) -> float:
+        """Get how long to wait on a source before starting a backup request.
+
+        Args:
+            source_name: Name of the data source
+
+        Returns:
+            Delay in seconds (the source's p95 latency when known)
+        """
+        p95 = self._get_tracker(source_name).percentile(95)
+        if p95 is None:
+            return min(self.default_hedge_delay, float(self.timeout))
+        return p95
+
+    def _estimate_transfer_size(self, source_name: str) -> int:
+        """Estimate the bytes a request to a source will transfer."""
+        size = self._get_tracker(source_name).ewma_size
+        if size is None:
+            known = [t.ewma_size for t in self.latency.values() if t.ewma_size is not None]
+            size = max(known) if known else 0.0
+        return int(size)
+
+    def _hedge_budget_remaining(self) -> int:
+        """Get the duplicated bytes that hedged requests may still spend."""
+        budget = self.hedge_burst_bytes + self.hedge_budget_ratio * self.useful_bytes
+        spent = self.duplicated_bytes + self._reserved_hedge_bytes
+        return max(0, int(budget - spent))
+
+    def _hedge_budget_available(self, estimated_bytes: int) -> bool:
+        """Check whether a hedged request fits in the duplicated-bytes budget.
+
+        A transfer of unknown size (``estimated_bytes`` of 0) needs some
+        budget left, and reserves all of it while it runs.
+
+        Args:
+            estimated_bytes: Estimated size of the hedged transfer, or 0 if unknown
+
+        Returns:
+            True if the hedge may be started
+        """
+        remaining = self._hedge_budget_remaining()
+        return remaining > 0 and estimated_bytes <= remaining
+
     def _update_stats(
         self,
         source_name: str,
         success: bool,
         elapsed_time: float,
         error: RemoteStoreError | None = None,
+        size_bytes: int = 0,
     ) -> None:
         """Update performance statistics for a source.
 
@@ -170,12 +350,14 @@ class CompositeStore(RemoteStore):
             success: Whether the operation succeeded
             elapsed_time: Time taken for the operation
             error: Error if operation failed
+            size_bytes: Bytes downloaded on success, or 0 if unknown
         """
-        stats = self.source_stats[source_name]
+        stats = self._get_source_stats(source_name)
         stats["attempts"] += 1
         stats["total_time"] += elapsed_time
 
         if success:
+            self._get_tracker(source_name).record(elapsed_time, size_bytes)
             stats["successes"] += 1
             stats["last_success"] = datetime.now()
             stats["consecutive_failures"] = 0
@@ -188,6 +370,119 @@ class CompositeStore(RemoteStore):
             if error:
                 LOGGER.warning("%s failed: %s", source_name, error.get_user_message())
 
+    @staticmethod
+    async def _call_store_download(
+        store: RemoteStore,
+        ts: datetime,
+        satellite: SatellitePattern,
+        dest_path: Path,
+        product_type: str,
+        band: int,
+    ) -> Path:
+        """Download from a single store, passing only the arguments it accepts."""
+        download = getattr(store, "download", None)
+        if download is None:
+            # Fallback to download_file for basic RemoteStore interface
+            return await store.download_file(timestamp=ts, satellite=satellite, destination=dest_path)
+
+        kwargs: dict[str, Any] = {"ts": ts, "satellite": satellite, "dest_path": dest_path}
+        try:
+            params = inspect.signature(download).parameters
+        except (TypeError, ValueError):
+            params = {}
+        accepts_any = not params or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+        if accepts_any or "product_type" in params:
+            kwargs["product_type"] = product_type
+        if accepts_any or "band" in params:
+            kwargs["band"] = band
+        return await download(**kwargs)  # type: ignore[no-any-return]
+
+    async def _timed_attempt(
+        self,
+        source_name: str,
+        store: RemoteStore,
+        ts: datetime,
+        satellite: SatellitePattern,
+        target_path: Path,
+        product_type: str,
+        band: int,
+    ) -> DataSourceResult:
+        """Run one download attempt and capture its outcome as a result.
+
+        Cancellation is propagated to the caller; every other exception is
+        converted into a failed ``DataSourceResult``.
+        """
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        try:
+            result_path = await self._call_store_download(store, ts, satellite, target_path, product_type, band)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            elapsed_time = loop.time() - start_time
+
+            # Convert to RemoteStoreError if needed
+            if isinstance(e, RemoteStoreError):
+                error = e
+            else:
+                error = RemoteStoreError(
+                    message=f"Error downloading from {source_name}",
+                    technical_details=str(e),
+                    original_exception=e,
+                )
+            return DataSourceResult(source_name=source_name, success=False, error=error, elapsed_time=elapsed_time)
+
+        return DataSourceResult(
+            source_name=source_name,
+            success=True,
+            result_path=result_path,
+            elapsed_time=loop.time() - start_time,
+        )
+
+    @staticmethod
+    def _hedge_path(dest_path: Path, source_name: str) -> Path:
+        """Get the private path a hedged request writes to."""
+        return dest_path.with_name(f".{dest_path.name}.{source_name.lower()}.part")
+
+    @staticmethod
+    def _file_size(path: Path | None) -> int:
+        try:
+            return path.stat().st_size if path is not None else 0
+        except OSError:
+            return 0
+
+    async def _cancel_attempts(
+        self,
+        pending: dict[asyncio.Task[DataSourceResult], tuple[str, Path, float]],
+        dest_path: Path,
+    ) -> None:
+        """Cancel losing attempts and account for the bytes they duplicated."""
+        if not pending:
+            return
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        now = asyncio.get_running_loop().time()
+        for source_name, target_path, started in pending.values():
+            # The elapsed time is a lower bound on this source's latency: it may
+            # move a source that keeps losing races down the priority order, but
+            # must not make it look faster than it is
+            self._get_tracker(source_name).record_censored(now - started)
+            self.duplicated_bytes += self._file_size(target_path)
+            if target_path != dest_path:
+                target_path.unlink(missing_ok=True)
+            LOGGER.debug("Cancelled losing request to %s after %.2fs", source_name, now - started)
+
+    @staticmethod
+    def _finalize_result(result: DataSourceResult, target_path: Path, dest_path: Path) -> Path:
+        """Move a winning hedged download into place and return its path."""
+        result_path = result.result_path
+        if result_path is not None and target_path != dest_path and result_path == target_path and target_path.exists():
+            target_path.replace(dest_path)
+            result_path = dest_path
+        return result_path  # type: ignore[return-value]
+
     async def download(
         self,
         ts: datetime,
@@ -198,6 +493,11 @@ class CompositeStore(RemoteStore):
     ) -> Path:
         """Download a file using fallback mechanism across multiple sources.
 
+        Sources are tried in priority order. When hedging is enabled and the
+        active request has not finished within its source's p95 latency, a
+        backup request is started on the next source; the first successful
+        request wins and the others are cancelled.
+
         Args:
             ts: Timestamp to download
             satellite: Satellite pattern enum
@@ -212,80 +512,101 @@ class CompositeStore(RemoteStore):
             RemoteStoreError: If all sources fail
         """
         results: list[DataSourceResult] = []
-
-        # Try each source in priority order
-        for source_name, store in self._get_ordered_sources():
-            LOGGER.info("Attempting download from %s...", source_name)
-
-            start_time = asyncio.get_event_loop().time()
-
-            try:
-                # Attempt download
-                # The stores have download_file method, not download
-                # We need to use the appropriate method based on store type
-                if hasattr(store, "download"):
-                    result_path = await store.download(
-                        ts=ts,
-                        satellite=satellite,
-                        dest_path=dest_path,
-                        product_type=product_type,
-                        band=band,
-                    )
-                else:
-                    # Fallback to download_file for basic RemoteStore interface
-                    result_path = await store.download_file(timestamp=ts, satellite=satellite, destination=dest_path)
-
-                elapsed_time = asyncio.get_event_loop().time() - start_time
-
-                # Update statistics
-                self._update_stats(source_name, True, elapsed_time)
-
-                # Success!
-                LOGGER.info("Successfully downloaded from %s in %.2fs", source_name, elapsed_time)
-
-                results.append(
-                    DataSourceResult(
-                        source_name=source_name,
-                        success=True,
-                        result_path=result_path,
-                        elapsed_time=elapsed_time,
-                    )
-                )
-
-                return result_path  # type: ignore
-
-            except (RemoteStoreError, Exception) as e:
-                elapsed_time = asyncio.get_event_loop().time() - start_time
-
-                # Convert to RemoteStoreError if needed
-                if isinstance(e, RemoteStoreError):
-                    error = e
-                else:
-                    error = RemoteStoreError(
-                        message=f"Error downloading from {source_name}",
-                        technical_details=str(e),
-                        original_exception=e,
-                    )
-
-                # Update statistics
-                self._update_stats(source_name, False, elapsed_time, error)
-
-                results.append(
-                    DataSourceResult(
-                        source_name=source_name,
-                        success=False,
-                        error=error,
-                        elapsed_time=elapsed_time,
+        remaining = list(self._get_ordered_sources())
+        loop = asyncio.get_running_loop()
+
+        # task -> (source name, path the task writes to, start time)
+        pending: dict[asyncio.Task[DataSourceResult], tuple[str, Path, float]] = {}
+        reserved: dict[asyncio.Task[DataSourceResult], int] = {}
+
+        def launch(*, hedged: bool) -> None:
+            source_name, store = remaining.pop(0)
+            owns_dest = any(path == dest_path for _, path, _ in pending.values())
+            target_path = self._hedge_path(dest_path, source_name) if owns_dest else dest_path
+            LOGGER.info("Attempting %sdownload from %s...", "hedged " if hedged else "", source_name)
+            task = asyncio.ensure_future(
+                self._timed_attempt(source_name, store, ts, satellite, target_path, product_type, band)
+            )
+            pending[task] = (source_name, target_path, loop.time())
+            if hedged:
+                estimate = self._estimate_transfer_size(source_name) or self._hedge_budget_remaining()
+                reserved[task] = estimate
+                self._reserved_hedge_bytes += estimate
+                self._get_source_stats(source_name)["hedges"] += 1
+
+        def can_hedge() -> bool:
+            if not (self.enable_hedging and remaining and pending):
+                return False
+            return self._hedge_budget_available(self._estimate_transfer_size(remaining[0][0]))
+
+        try:
+            while pending or remaining:
+                if not pending:
+                    launch(hedged=False)
+
+                # Wait on the most recently started request's p95 before hedging
+                newest_source = next(reversed(pending.values()))[0]
+                wait_timeout = self._get_hedge_delay(newest_source) if can_hedge() else None
+                done, _ = await asyncio.wait(pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    LOGGER.info(
+                        "%s has not responded within %.2fs, hedging with %s",
+                        newest_source,
+                        wait_timeout,
+                        remaining[0][0],
                     )
-                )
-
-                # Log but continue to next source
-                LOGGER.warning("%s failed after %.2fs: %s", source_name, elapsed_time, error.message)
-
-                # For auth errors, skip other sources as they'll likely fail too
-                if isinstance(error, AuthenticationError):
-                    LOGGER.exception("Authentication error - skipping remaining sources")
-                    break
+                    launch(hedged=True)
+                    continue
+
+                for task in done:
+                    source_name, target_path, _ = pending.pop(task)
+                    self._reserved_hedge_bytes -= reserved.pop(task, 0)
+                    result = task.result()
+                    results.append(result)
+
+                    if not result.success:
+                        error = result.error
+                        self._update_stats(source_name, False, result.elapsed_time, error)
+
+                        # Log but continue to next source
+                        LOGGER.warning(
+                            "%s failed after %.2fs: %s",
+                            source_name,
+                            result.elapsed_time,
+                            error.message if error else "unknown error",
+                        )
+                        if target_path != dest_path:
+                            target_path.unlink(missing_ok=True)
+
+                        # For auth errors, skip other sources as they'll likely fail too
+                        if isinstance(error, AuthenticationError):
+                            LOGGER.error("Authentication error - skipping remaining sources")
+                            remaining.clear()
+                            await self._cancel_attempts(pending, dest_path)
+                            pending.clear()
+                            break
+                        continue
+
+                    # Success! Cancel any slower requests still in flight
+                    await self._cancel_attempts(pending, dest_path)
+                    pending.clear()
+
+                    result_path = self._finalize_result(result, target_path, dest_path)
+                    size_bytes = self._file_size(result_path)
+                    self.useful_bytes += size_bytes
+                    self._update_stats(source_name, True, result.elapsed_time, size_bytes=size_bytes)
+                    if target_path != dest_path:
+                        self._get_source_stats(source_name)["hedge_wins"] += 1
+
+                    LOGGER.info("Successfully downloaded from %s in %.2fs", source_name, result.elapsed_time)
+                    return result_path
+        finally:
+            # Only reached with pending tasks if the caller cancelled us
+            if pending:
+                await self._cancel_attempts(pending, dest_path)
+            for estimate in reserved.values():
+                self._reserved_hedge_bytes -= estimate
 
         # All sources failed - create comprehensive error
         self._create_fallback_error(results, ts, satellite)
@@ -486,11 +807,17 @@ class CompositeStore(RemoteStore):
                 success_rate = 0.0
                 avg_time = 0.0
 
+            tracker = self._get_tracker(source_name)
+            p95 = tracker.percentile(95)
             stats[source_name] = {
                 "attempts": attempts,
                 "success_rate": f"{success_rate:.1f}%",
                 "average_time": f"{avg_time:.2f}s",
                 "consecutive_failures": source_stats["consecutive_failures"],
+                "ewma_latency": f"{tracker.ewma_latency:.2f}s" if tracker.ewma_latency is not None else "n/a",
+                "p95_latency": f"{p95:.2f}s" if p95 is not None else "n/a",
+                "hedges": source_stats["hedges"],
+                "hedge_wins": source_stats["hedge_wins"],
                 "last_success": (source_stats["last_success"].isoformat() if source_stats["last_success"] else "Never"),
                 "last_failure": (source_stats["last_failure"].isoformat() if source_stats["last_failure"] else "Never"),
             }
@@ -507,5 +834,12 @@ class CompositeStore(RemoteStore):
             stats["last_success"] = None
             stats["last_failure"] = None
             stats["consecutive_failures"] = 0
+            stats["hedges"] = 0
+            stats["hedge_wins"] = 0
+
+        for tracker in self.latency.values():
+            tracker.reset()
+        self.useful_bytes = 0
+        self.duplicated_bytes = 0
 
         LOGGER.info("Reset performance statistics for all sources")
@@ -2,26 +2,49 @@
 
 This module provides a connection pool for S3 clients to reduce the overhead
 of creating new connections and improve performance for concurrent operations.
+
+Callers wait (with a timeout) for a free connection when the pool is full.
+Connections are only health-checked after an operation on them fails, and
+connections left idle for too long are closed by a background reaper task.
+The global pool's statistics are reported as metrics.
 """
 
 import asyncio
 from collections import deque
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, suppress
 import time
 from typing import Any
 
 import aioboto3
 from botocore import UNSIGNED
+import botocore.exceptions
 from botocore.config import Config
 
 from goesvfi.utils import log
+from goesvfi.utils.metrics import REGISTRY, MetricFamily
 
 LOGGER = log.get_logger(__name__)
 
 # Type alias for S3 client
 S3ClientType = Any  # aioboto3 doesn't expose concrete types
 
+# Public bucket used to probe suspect connections. HeadBucket works with
+# UNSIGNED (anonymous) access, unlike ListBuckets.
+DEFAULT_HEALTH_CHECK_BUCKET = "noaa-goes16"
+
+# Errors that indicate the underlying connection may be broken
+_TRANSPORT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    botocore.exceptions.ConnectionError,
+    botocore.exceptions.HTTPClientError,
+)
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection became available in time."""
+
 
 class S3ConnectionPool:
     """Connection pool for S3 clients with automatic lifecycle management."""
@@ -33,6 +56,11 @@ class S3ConnectionPool:
         connect_timeout: int = 10,
         read_timeout: int = 60,
         session_kwargs: dict[str, Any] | None = None,
+        acquire_timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        reap_interval: float = 30.0,
+        health_check_bucket: str = DEFAULT_HEALTH_CHECK_BUCKET,
+        client_factory: Callable[[], Awaitable[S3ClientType]] | None = None,
     ) -> None:
         """Initialize the S3 connection pool.
 
@@ -42,27 +70,53 @@ class S3ConnectionPool:
             connect_timeout: Connection timeout in seconds
             read_timeout: Read timeout in seconds
             session_kwargs: Additional kwargs for aioboto3.Session
+            acquire_timeout: Default seconds to wait for a free connection
+            idle_timeout: Seconds a connection may sit idle before it is closed
+            reap_interval: Seconds between background idle-connection sweeps
+            health_check_bucket: Bucket probed with HeadBucket after an error
+            client_factory: Optional coroutine function creating new clients
+                (defaults to an unsigned aioboto3 client)
         """
         self.max_connections = max_connections
         self.region = region
         self.connect_timeout = connect_timeout
         self.read_timeout = read_timeout
         self.session_kwargs = session_kwargs or {}
-
-        # Pool data structures
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+        self.reap_interval = reap_interval
+        self.health_check_bucket = health_check_bucket
+        self._client_factory = client_factory
+
+        # Pool data structures. Idle connections are stored with the time they
+        # were returned and handed out LIFO so surplus connections go idle.
         self._available_connections: deque[tuple[S3ClientType, float]] = deque()
         self._in_use_connections: set[S3ClientType] = set()
-        self._lock = asyncio.Lock()
+        self._pending_creations = 0
+        self._condition = asyncio.Condition()
+        self._reaper_task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
 
         # Statistics
         self._stats = {
             "connections_created": 0,
             "connections_reused": 0,
             "connections_closed": 0,
+            "connections_reaped": 0,
             "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "waits": 0,
+            "acquire_timeouts": 0,
+            "health_checks": 0,
+            "health_check_failures": 0,
             "pool_hits": 0,
             "pool_misses": 0,
+            "peak_in_use": 0,
         }
+        # Time-weighted utilisation accounting
+        self._busy_time = 0.0
+        self._last_change = time.monotonic()
+        self._started = self._last_change
 
         # Connection configuration
         self._s3_config = Config(
@@ -75,6 +129,25 @@ class S3ConnectionPool:
 
         LOGGER.info("Initialized S3 connection pool: max_connections=%d, region=%s", self.max_connections, self.region)
 
+    @property
+    def _total_connections(self) -> int:
+        return len(self._available_connections) + len(self._in_use_connections) + self._pending_creations
+
+    def _account_busy_time(self) -> None:
+        """Accumulate connection-seconds spent in use since the last change."""
+        now = time.monotonic()
+        self._busy_time += len(self._in_use_connections) * (now - self._last_change)
+        self._last_change = now
+
+    def _mark_in_use(self, client: S3ClientType) -> None:
+        self._account_busy_time()
+        self._in_use_connections.add(client)
+        self._stats["peak_in_use"] = max(self._stats["peak_in_use"], len(self._in_use_connections))
+
+    def _mark_released(self, client: S3ClientType) -> None:
+        self._account_busy_time()
+        self._in_use_connections.discard(client)
+
     async def _create_connection(self) -> S3ClientType:
         """Create a new S3 client connection.
 
@@ -85,9 +158,12 @@ class S3ConnectionPool:
             Exception: If connection creation fails
         """
         try:
-            session = aioboto3.Session(**self.session_kwargs)
-            client_context = session.client("s3", config=self._s3_config)
-            client = await client_context.__aenter__()
+            if self._client_factory is not None:
+                client = await self._client_factory()
+            else:
+                session = aioboto3.Session(**self.session_kwargs)
+                client_context = session.client("s3", config=self._s3_config)
+                client = await client_context.__aenter__()
 
             self._stats["connections_created"] += 1
             LOGGER.debug("Created new S3 connection (total created: %d)", self._stats["connections_created"])
@@ -119,108 +195,265 @@ class S3ConnectionPool:
     async def _check_connection_health(self, client: S3ClientType) -> bool:
         """Check if a connection is still healthy.
 
+        Uses HeadBucket on a public bucket, which works with unsigned access.
+
         Args:
             client: S3 client to check
 
         Returns:
             True if healthy, False otherwise
         """
+        self._stats["health_checks"] += 1
         try:
-            # Simple health check - list buckets with max 1 result
-            # This is a lightweight operation that verifies connectivity
-            await client.list_buckets(MaxBuckets=1)
+            await client.head_bucket(Bucket=self.health_check_bucket)
+            return True
+        except botocore.exceptions.ClientError:
+            # The service answered, so the connection itself is usable
             return True
         except Exception as e:
+            self._stats["health_check_failures"] += 1
             LOGGER.debug("Connection health check failed: %s", e)
             return False
 
-    @asynccontextmanager
-    async def acquire(self) -> AsyncIterator[S3ClientType]:
-        """Acquire a connection from the pool.
+    @staticmethod
+    def _needs_health_check(error: BaseException | None) -> bool:
+        """Decide whether an error raised while using a connection makes it suspect.
 
-        Yields:
-            S3 client instance
+        Only transport-level failures (timeouts, resets, endpoint errors)
+        anywhere in the exception chain trigger a probe; errors reported by
+        S3 itself, such as 404s, leave the connection trusted.
+
+        Args:
+            error: Exception raised by the caller's operation, if any
+
+        Returns:
+            True if the connection should be probed before reuse
+        """
+        seen: set[int] = set()
+        while error is not None and id(error) not in seen:
+            seen.add(id(error))
+            if isinstance(error, _TRANSPORT_ERRORS):
+                return True
+            cause = getattr(error, "original_exception", None)
+            error = cause if isinstance(cause, BaseException) else (error.__cause__ or error.__context__)
+        return False
+
+    def _bind_loop(self) -> None:
+        """Bind the pool to the running event loop.
+
+        aiobotocore clients cannot be shared between event loops, so idle
+        connections created on a previous loop are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            LOGGER.debug(
+                "S3 connection pool used from a new event loop, dropping %d idle connections",
+                len(self._available_connections),
+            )
+            self._available_connections.clear()
+            self._in_use_connections.clear()
+            self._pending_creations = 0
+            self._condition = asyncio.Condition()
+            self._reaper_task = None
+        self._loop = loop
+
+    def _ensure_reaper(self) -> None:
+        """Start the idle-connection reaper on the running loop if needed."""
+        if self.reap_interval <= 0:
+            return
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.get_running_loop().create_task(self._reap_idle_connections())
+
+    async def _reap_idle_connections(self) -> None:
+        """Periodically close connections that have been idle too long."""
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            await self.reap_idle()
+
+    async def reap_idle(self) -> int:
+        """Close idle connections older than ``idle_timeout``.
+
+        Returns:
+            Number of connections closed
+        """
+        now = time.time()
+        async with self._condition:
+            expired = [
+                client for client, returned in self._available_connections if now - returned >= self.idle_timeout
+            ]
+            if expired:
+                self._available_connections = deque(
+                    (client, returned)
+                    for client, returned in self._available_connections
+                    if now - returned < self.idle_timeout
+                )
+                # Freed capacity may unblock waiters
+                self._condition.notify(len(expired))
+
+        for client in expired:
+            await self._close_connection(client)
+        if expired:
+            self._stats["connections_reaped"] += len(expired)
+            LOGGER.debug("Reaped %d idle S3 connections", len(expired))
+        return len(expired)
+
+    async def _checkout(self, timeout: float | None) -> tuple[S3ClientType | None, list[S3ClientType]]:
+        """Take an idle connection or reserve a creation slot, waiting if full.
+
+        Args:
+            timeout: Seconds to wait for capacity, or None to wait forever
+
+        Returns:
+            Tuple of (reused client or None if a slot was reserved, stale clients to close)
 
         Raises:
-            Exception: If unable to acquire a connection
+            PoolTimeoutError: If no capacity became available in time
         """
-        start_time = time.time()
-        client = None
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        stale: list[S3ClientType] = []
+        waited = False
 
-        try:
-            async with self._lock:
-                # Try to get an available connection
+        async with self._condition:
+            while True:
                 while self._available_connections:
-                    client, created_time = self._available_connections.popleft()
-
-                    # Check connection age (reuse connections for up to 5 minutes)
-                    age = time.time() - created_time
-                    if age < 300:  # 5 minutes
-                        # Connection is fresh enough
-                        self._in_use_connections.add(client)
+                    client, returned = self._available_connections.pop()
+                    age = time.time() - returned
+                    if age < self.idle_timeout:
+                        self._mark_in_use(client)
                         self._stats["connections_reused"] += 1
                         self._stats["pool_hits"] += 1
-
                         LOGGER.debug(
-                            "Reused connection from pool (age: %.1fs, pool size: %d)",
+                            "Reused connection from pool (idle: %.1fs, pool size: %d)",
                             age,
                             len(self._available_connections),
                         )
-                        break
-                    else:
-                        # Connection too old, close it
-                        await self._close_connection(client)
-                        client = None
-
-                # If no connection available and we can create more
-                if client is None:
-                    current_total = len(self._available_connections) + len(self._in_use_connections)
-                    if current_total < self.max_connections:
-                        client = await self._create_connection()
-                        self._in_use_connections.add(client)
-                        self._stats["pool_misses"] += 1
-                    else:
-                        # Pool is full, need to wait
-                        LOGGER.warning("Connection pool full (%d connections), waiting...", self.max_connections)
-                        # In a real implementation, we'd wait for a connection
-                        # For now, create a new one anyway
-                        client = await self._create_connection()
-                        self._in_use_connections.add(client)
-
-            # Track wait time
-            wait_time = time.time() - start_time
-            self._stats["wait_time_total"] += wait_time
-
-            # Yield the connection
-            yield client
+                        return client, stale
+                    # Connection idle too long, close it outside the lock
+                    stale.append(client)
+
+                if self._total_connections < self.max_connections:
+                    self._pending_creations += 1
+                    self._stats["pool_misses"] += 1
+                    return None, stale
+
+                # Pool is full, wait for a connection to be released
+                if not waited:
+                    waited = True
+                    self._stats["waits"] += 1
+                    LOGGER.debug("Connection pool full (%d connections), waiting...", self.max_connections)
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    self._stats["acquire_timeouts"] += 1
+                    msg = f"Timed out after {timeout:.1f}s waiting for a free S3 connection"
+                    raise PoolTimeoutError(msg)
+                try:
+                    await asyncio.wait_for(self._condition.wait(), remaining)
+                except TimeoutError:
+                    # Re-check once more in the loop, then fail on the deadline
+                    continue
+
+    async def _release(self, client: S3ClientType, error: BaseException | None) -> None:
+        """Return a connection to the pool, probing it first if it failed.
 
+        Args:
+            client: Connection being released
+            error: Exception raised while the caller used the connection
+        """
+        healthy = True
+        if self._needs_health_check(error):
+            healthy = await self._check_connection_health(client)
+
+        async with self._condition:
+            self._mark_released(client)
+            if healthy:
+                self._available_connections.append((client, time.time()))
+                LOGGER.debug("Returned connection to pool (pool size: %d)", len(self._available_connections))
+            self._condition.notify()
+
+        if not healthy:
+            await self._close_connection(client)
+            LOGGER.debug("Closed unhealthy connection instead of returning to pool")
+
+    @asynccontextmanager
+    async def acquire(self, timeout: float | None = None) -> AsyncIterator[S3ClientType]:
+        """Acquire a connection from the pool.
+
+        Waits for a connection to be released when the pool is full.
+
+        Args:
+            timeout: Seconds to wait for a free connection (defaults to
+                ``acquire_timeout``)
+
+        Yields:
+            S3 client instance
+
+        Raises:
+            PoolTimeoutError: If no connection became available in time
+            Exception: If unable to create a new connection
+        """
+        self._bind_loop()
+        self._ensure_reaper()
+        start_time = time.monotonic()
+
+        client, stale = await self._checkout(self.acquire_timeout if timeout is None else timeout)
+        reused = client
+        try:
+            for old_client in stale:
+                await self._close_connection(old_client)
+            if client is None:
+                client = await self._create_connection()
+        except BaseException:
+            # Give back the reserved slot or the reused connection, also when
+            # cancelled while closing stale connections
+            async with self._condition:
+                if reused is None:
+                    self._pending_creations -= 1
+                else:
+                    self._mark_released(reused)
+                    self._available_connections.append((reused, time.time()))
+                self._condition.notify()
+            raise
+        if reused is None:
+            async with self._condition:
+                self._pending_creations -= 1
+                self._mark_in_use(client)
+
+        # Track wait time
+        wait_time = time.monotonic() - start_time
+        self._stats["wait_time_total"] += wait_time
+        self._stats["wait_time_max"] = max(self._stats["wait_time_max"], wait_time)
+
+        error: BaseException | None = None
+        try:
+            yield client
+        except BaseException as e:
+            error = e
+            raise
         finally:
-            # Return connection to pool
-            if client is not None:
-                async with self._lock:
-                    self._in_use_connections.discard(client)
-
-                    # Check if connection is still healthy before returning to pool
-                    if await self._check_connection_health(client):
-                        self._available_connections.append((client, time.time()))
-                        LOGGER.debug("Returned connection to pool (pool size: %d)", len(self._available_connections))
-                    else:
-                        # Connection unhealthy, close it
-                        await self._close_connection(client)
-                        LOGGER.debug("Closed unhealthy connection instead of returning to pool")
+            await self._release(client, error)
 
     async def close_all(self) -> None:
-        """Close all connections in the pool."""
-        async with self._lock:
-            # Close available connections
-            while self._available_connections:
-                client, _ = self._available_connections.popleft()
-                await self._close_connection(client)
+        """Close all connections in the pool and stop the idle reaper."""
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            with suppress(asyncio.CancelledError, RuntimeError):
+                await self._reaper_task
+            self._reaper_task = None
+
+        async with self._condition:
+            clients = [client for client, _ in self._available_connections]
+            self._available_connections.clear()
 
             # Note: in-use connections should be closed by their users
             if self._in_use_connections:
                 LOGGER.warning("Closing pool with %d connections still in use", len(self._in_use_connections))
 
+        for client in clients:
+            await self._close_connection(client)
+
         LOGGER.info("Closed all connections in pool")
 
     def get_stats(self) -> dict[str, Any]:
@@ -230,11 +463,13 @@ class S3ConnectionPool:
             Dictionary of pool statistics
         """
         stats = self._stats.copy()
+        in_use = len(self._in_use_connections)
         stats.update({
             "available_connections": len(self._available_connections),
-            "in_use_connections": len(self._in_use_connections),
-            "total_connections": len(self._available_connections) + len(self._in_use_connections),
+            "in_use_connections": in_use,
+            "total_connections": len(self._available_connections) + in_use,
             "max_connections": self.max_connections,
+            "utilization": in_use / self.max_connections if self.max_connections else 0.0,
         })
 
         # Calculate derived stats
@@ -246,17 +481,25 @@ class S3ConnectionPool:
             stats["hit_rate"] = 0.0
             stats["avg_wait_time"] = 0.0
 
+        # Average fraction of the pool in use since it was created
+        now = time.monotonic()
+        busy_time = self._busy_time + in_use * (now - self._last_change)
+        elapsed = now - self._started
+        capacity = elapsed * self.max_connections
+        stats["avg_utilization"] = busy_time / capacity if capacity > 0 else 0.0
+
         return stats
 
     def log_stats(self) -> None:
         """Log current pool statistics."""
         stats = self.get_stats()
         LOGGER.info(
-            "S3 Pool Stats: %d/%d connections (%.1f%% hit rate, %.3fs avg wait)",
+            "S3 Pool Stats: %d/%d connections (%.1f%% hit rate, %.3fs avg wait, %.1f%% avg utilisation)",
             stats["total_connections"],
             stats["max_connections"],
             stats["hit_rate"] * 100,
             stats["avg_wait_time"],
+            stats["avg_utilization"] * 100,
         )
 
 
@@ -283,3 +526,52 @@ def reset_global_pool() -> None:
     """Reset the global connection pool (mainly for testing)."""
     global _global_pool
     _global_pool = None
+
+
+async def close_global_pool() -> None:
+    """Close and discard the global connection pool, if one was created.
+
+    Must be awaited on the event loop that owns the pooled connections.
+    """
+    global _global_pool
+    pool, _global_pool = _global_pool, None
+    if pool is not None:
+        await pool.close_all()
+
+
+def _collect_metrics() -> Iterator[MetricFamily]:
+    pool = _global_pool
+    if pool is None:
+        return
+    stats = pool.get_stats()
+    connections = MetricFamily("goes_vfi_s3_connections", "gauge", "Connections of the global S3 pool, by state")
+    connections.add(stats["available_connections"], state="idle")
+    connections.add(stats["in_use_connections"], state="in_use")
+    yield connections
+    yield MetricFamily(
+        "goes_vfi_s3_pool_utilization",
+        "gauge",
+        "Average share of the global S3 pool in use since it was created",
+        [("", {}, stats["avg_utilization"])],
+    )
+    requests = MetricFamily(
+        "goes_vfi_s3_pool_requests_total", "counter", "Connections taken from the global S3 pool, by reuse"
+    )
+    requests.add(stats["pool_hits"], result="hit")
+    requests.add(stats["pool_misses"], result="miss")
+    yield requests
+    yield MetricFamily(
+        "goes_vfi_s3_pool_wait_seconds_total",
+        "counter",
+        "Seconds spent waiting for a connection from the global S3 pool",
+        [("", {}, stats["wait_time_total"])],
+    )
+    yield MetricFamily(
+        "goes_vfi_s3_pool_acquire_timeouts_total",
+        "counter",
+        "Requests that timed out waiting for a connection from the global S3 pool",
+        [("", {}, stats["acquire_timeouts"])],
+    )
+
+
+REGISTRY.register_collector(_collect_metrics)
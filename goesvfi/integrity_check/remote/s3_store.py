@@ -8,7 +8,8 @@ No AWS credentials are required as these buckets are publicly accessible.
 """
 
 import asyncio
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 import logging
 from pathlib import Path
@@ -39,7 +40,7 @@ from goesvfi.integrity_check.time_index import (
 from goesvfi.utils.log import get_logger
 
 from .download_statistics import DownloadStatistics, get_global_stats
-from .s3_connection_pool import S3ConnectionPool, get_global_pool
+from .s3_connection_pool import PoolTimeoutError, S3ConnectionPool, get_global_pool
 
 # Define a type variable for exceptions
 ExcType = TypeVar("ExcType", bound=BaseException)
@@ -471,12 +472,8 @@ class S3Store(RemoteStore):
             kwargs["profile_name"] = self.aws_profile
         return kwargs
 
-    async def _get_s3_client_from_pool(self) -> Any:
-        """Get S3 client from connection pool.
-
-        Returns:
-            Context manager for S3 client from pool
-        """
+    def _ensure_connection_pool(self) -> S3ConnectionPool:
+        """Get the connection pool used by this store, creating it if needed."""
         if self._connection_pool is None:
             self._connection_pool = get_global_pool(
                 region=self.aws_region,
@@ -484,7 +481,38 @@ class S3Store(RemoteStore):
                 read_timeout=self.timeout,
                 session_kwargs=self.session_kwargs,
             )
-        return self._connection_pool.acquire()
+        return self._connection_pool
+
+    @asynccontextmanager
+    async def _get_s3_client_from_pool(self) -> AsyncIterator[S3ClientType]:
+        """Acquire an S3 client for the duration of one operation.
+
+        This is the only way S3 operations obtain a client. Pooled stores
+        borrow a connection from the global pool, waiting for one to be
+        released when the pool is full; unpooled stores reuse their single
+        private client.
+
+        Yields:
+            S3 client instance
+
+        Raises:
+            RemoteConnectionError: If no pooled connection became available in time
+        """
+        if not self.use_connection_pool:
+            yield await self._get_s3_client()
+            return
+
+        pool = self._ensure_connection_pool()
+        try:
+            async with pool.acquire() as client:
+                yield client
+        except PoolTimeoutError as e:
+            raise RemoteConnectionError(
+                message="Timed out waiting for a free S3 connection",
+                technical_details=f"{e}\nPool stats: {pool.get_stats()}",
+                original_exception=e,
+                error_code="POOL-TIMEOUT",
+            ) from e
 
     async def _get_s3_client(self) -> S3ClientType:
         """Get or create an S3 client with improved timeout handling and exponential backoff.
@@ -687,7 +715,7 @@ class S3Store(RemoteStore):
     async def __aenter__(self) -> "S3Store":
         """Context manager entry."""
         if self.use_connection_pool:
-            await self._get_s3_client_from_pool()
+            self._ensure_connection_pool()
         else:
             await self._get_s3_client()
         return self
@@ -748,47 +776,46 @@ class S3Store(RemoteStore):
         """
         # Use exact_match=True for head_object operations
         bucket, key = self._get_bucket_and_key(ts, satellite, product_type=product_type, band=band, exact_match=True)
-        s3 = await self._get_s3_client()
-
-        try:
-            await s3.head_object(Bucket=bucket, Key=key)
-            return True
-        except botocore.exceptions.ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code")
-            if error_code == "404":
-                LOGGER.debug("S3 object not found: s3://%s/%s", bucket, key)
-                return False
+        async with self._get_s3_client_from_pool() as s3:
+            try:
+                await s3.head_object(Bucket=bucket, Key=key)
+                return True
+            except botocore.exceptions.ClientError as e:
+                error_code = e.response.get("Error", {}).get("Code")
+                if error_code == "404":
+                    LOGGER.debug("S3 object not found: s3://%s/%s", bucket, key)
+                    return False
+
+                # Handle other errors with user-friendly messages
+                error_code = e.response.get("Error", {}).get("Code")
+                error_message = e.response.get("Error", {}).get("Message", "Unknown error")
 
-            # Handle other errors with user-friendly messages
-            error_code = e.response.get("Error", {}).get("Code")
-            error_message = e.response.get("Error", {}).get("Message", "Unknown error")
+                # Create enhanced error with detailed context
+                error_msg = f"Error checking if file exists for {satellite.name} at {ts.isoformat()}"
+                technical_details = f"S3 {error_code}: {error_message}\nPath: s3://{bucket}/{key}"
 
-            # Create enhanced error with detailed context
-            error_msg = f"Error checking if file exists for {satellite.name} at {ts.isoformat()}"
-            technical_details = f"S3 {error_code}: {error_message}\nPath: s3://{bucket}/{key}"
-
-            # Create error object using helper function
-            error = create_error_from_code(
-                error_code=error_code if error_code is not None else "UnknownError",
-                error_message=error_message,
-                technical_details=technical_details,
-                satellite_name=satellite.name,
-                exception=e,
-                error_msg=error_msg,
-            )
+                # Create error object using helper function
+                error = create_error_from_code(
+                    error_code=error_code if error_code is not None else "UnknownError",
+                    error_message=error_message,
+                    technical_details=technical_details,
+                    satellite_name=satellite.name,
+                    exception=e,
+                    error_msg=error_msg,
+                )
 
-            # Log the error details
-            LOGGER.exception("S3 error: %s", error.get_user_message())
-            if hasattr(error, "technical_details") and error.technical_details:
-                LOGGER.exception("S3 technical details: %s", error.technical_details)
+                # Log the error details
+                LOGGER.exception("S3 error: %s", error.get_user_message())
+                if hasattr(error, "technical_details") and error.technical_details:
+                    LOGGER.exception("S3 technical details: %s", error.technical_details)
 
-            # For credential or connection errors, we should raise to notify the user
-            if isinstance(error, AuthenticationError | ConnectionError):
-                raise error
+                # For credential or connection errors, we should raise to notify the user
+                if isinstance(error, AuthenticationError | ConnectionError):
+                    raise error
 
-            # For other errors, log and return False
-            LOGGER.debug("S3 check failed for s3://%s/%s: %s", bucket, key, e)
-            return False
+                # For other errors, log and return False
+                LOGGER.debug("S3 check failed for s3://%s/%s: %s", bucket, key, e)
+                return False
 
     async def _check_exact_file_exists(
         self,
@@ -1229,156 +1256,155 @@ class S3Store(RemoteStore):
         """
         # Check if we should use exact match or wildcard
         bucket, key = self._get_bucket_and_key(ts, satellite, product_type=product_type, band=band, exact_match=True)
-        s3 = await self._get_s3_client()
-
-        # Enhanced logging for the download attempt
-        LOGGER.info(
-            "Attempting to download S3 file for %s at %s",
-            satellite.name,
-            ts.isoformat(),
-        )
-        LOGGER.info("Target S3 path: s3://%s/%s", bucket, key)
-        LOGGER.info("Local destination: %s", dest_path)
-
-        # Log timestamp information for debugging
-        LOGGER.debug(
-            "Timestamp details - ISO: %s, Year: %s, Day of Year: %s, HHMMSS: %s",
-            ts.isoformat(),
-            ts.year,
-            ts.strftime("%j"),
-            ts.strftime("%H%M%S"),
-        )
-
-        # Check if exact file exists first
-        try:
-            has_exact_match = await self._check_exact_file_exists(s3, bucket, key, ts, satellite)
-
-            # If we have an exact match, download it directly
-            if has_exact_match:
-                return await self._download_exact_file(s3, bucket, key, dest_path, ts, satellite)
-            # Try wildcard match
-            bucket, wildcard_key = self._get_bucket_and_key(
-                ts,
-                satellite,
-                exact_match=False,
-                product_type=product_type,
-                band=band,
+        async with self._get_s3_client_from_pool() as s3:
+            # Enhanced logging for the download attempt
+            LOGGER.info(
+                "Attempting to download S3 file for %s at %s",
+                satellite.name,
+                ts.isoformat(),
+            )
+            LOGGER.info("Target S3 path: s3://%s/%s", bucket, key)
+            LOGGER.info("Local destination: %s", dest_path)
+
+            # Log timestamp information for debugging
+            LOGGER.debug(
+                "Timestamp details - ISO: %s, Year: %s, Day of Year: %s, HHMMSS: %s",
+                ts.isoformat(),
+                ts.year,
+                ts.strftime("%j"),
+                ts.strftime("%H%M%S"),
             )
 
-            # Find best match with wildcard
-            best_match_key = await self._find_best_match_with_wildcard(s3, bucket, wildcard_key, ts, satellite)
-
-            # Download the best match
-            return await self._download_exact_file(s3, bucket, best_match_key, dest_path, ts, satellite)
-        except botocore.exceptions.ClientError as e:
-            # Enhanced logging for S3 client errors
-            error_code = e.response.get("Error", {}).get("Code")
-            error_message = e.response.get("Error", {}).get("Message", "Unknown error")
-
-            LOGGER.exception("S3 client error during download: %s - %s", error_code, error_message)
-            LOGGER.exception("Path: s3://%s/%s", bucket, key)
+            # Check if exact file exists first
+            try:
+                has_exact_match = await self._check_exact_file_exists(s3, bucket, key, ts, satellite)
+
+                # If we have an exact match, download it directly
+                if has_exact_match:
+                    return await self._download_exact_file(s3, bucket, key, dest_path, ts, satellite)
+                # Try wildcard match
+                bucket, wildcard_key = self._get_bucket_and_key(
+                    ts,
+                    satellite,
+                    exact_match=False,
+                    product_type=product_type,
+                    band=band,
+                )
 
-            # Create a detailed error with context
-            technical_details = (
-                f"S3 {error_code}: {error_message}\n"
-                f"Path: s3://{bucket}/{key}\n"
-                f"Timestamp details: Year={ts.year}, DOY={ts.strftime('%j')}, "
-                f"Hour={ts.strftime('%H')}, Minute={ts.strftime('%M')}\n"
-            )
+                # Find best match with wildcard
+                best_match_key = await self._find_best_match_with_wildcard(s3, bucket, wildcard_key, ts, satellite)
 
-            # Create error object using helper function
-            client_error = create_error_from_code(
-                error_code=error_code,
-                error_message=error_message,
-                technical_details=technical_details,
-                satellite_name=satellite.name,
-                exception=e,
-                error_msg=(
-                    f"File not found for {satellite.name} at {ts.isoformat()}"
-                    if error_code in {"NoSuchBucket", "NoSuchKey", "404"}
-                    else (
-                        f"Timeout accessing {satellite.name} data" if "timeout" in str(e).lower() else None
-                    )  # Use default message
-                ),
-            )
+                # Download the best match
+                return await self._download_exact_file(s3, bucket, best_match_key, dest_path, ts, satellite)
+            except botocore.exceptions.ClientError as e:
+                # Enhanced logging for S3 client errors
+                error_code = e.response.get("Error", {}).get("Code")
+                error_message = e.response.get("Error", {}).get("Message", "Unknown error")
 
-            # Log and raise the error
-            LOGGER.exception("S3 client error: %s", client_error.get_user_message())
-            if client_error.technical_details:
-                LOGGER.exception("Technical details: %s", client_error.technical_details)
-
-            raise client_error
-        except ResourceNotFoundError:
-            LOGGER.exception("Resource not found error re-raised for: s3://%s/%s", bucket, key)
-            raise  # Re-raise ResourceNotFoundError
-        except (AuthenticationError, RemoteConnectionError, RemoteStoreError):
-            LOGGER.exception("Custom error re-raised for: s3://%s/%s", bucket, key)
-            raise  # Re-raise our custom errors
-        except Exception as e:
-            # Enhanced logging for unexpected errors
-            LOGGER.exception("Unexpected error during download")
-            LOGGER.exception("Exception type: %s", type(e).__name__)
-            LOGGER.exception("Path: s3://%s/%s", bucket, key)
-
-            # Create a detailed error with context
-            technical_details = (
-                f"Error: {e!s}\n"
-                f"Path: s3://{bucket}/{key}\n"
-                f"Destination: {dest_path}\n"
-                f"Timestamp details: Year={ts.year}, DOY={ts.strftime('%j')}, "
-                f"Hour={ts.strftime('%H')}, Minute={ts.strftime('%M')}\n"
-            )
+                LOGGER.exception("S3 client error during download: %s - %s", error_code, error_message)
+                LOGGER.exception("Path: s3://%s/%s", bucket, key)
 
-            # Determine error type based on error string
-            error_code = (
-                "timeout"
-                if "timeout" in str(e).lower()
-                else (
-                    "access"
-                    if "permission" in str(e).lower() or "access" in str(e).lower()
-                    else ("disk" if "disk" in str(e).lower() or "space" in str(e).lower() else "unknown")
+                # Create a detailed error with context
+                technical_details = (
+                    f"S3 {error_code}: {error_message}\n"
+                    f"Path: s3://{bucket}/{key}\n"
+                    f"Timestamp details: Year={ts.year}, DOY={ts.strftime('%j')}, "
+                    f"Hour={ts.strftime('%H')}, Minute={ts.strftime('%M')}\n"
                 )
-            )
-
-            # Create error object with the appropriate message
-            final_error: RemoteErrorType = RemoteStoreError(
-                message=f"An unknown error occurred while downloading the {satellite.name} data",
-                technical_details=technical_details,
-                original_exception=e,
-                error_code="UNKNOWN-ERROR",
-            )
 
-            if error_code == "timeout":
-                final_error = RemoteConnectionError(
-                    message=f"Timeout downloading {satellite.name} data",
-                    technical_details=technical_details + "Check your internet connection speed and stability.",
-                    original_exception=e,
+                # Create error object using helper function
+                client_error = create_error_from_code(
+                    error_code=error_code,
+                    error_message=error_message,
+                    technical_details=technical_details,
+                    satellite_name=satellite.name,
+                    exception=e,
+                    error_msg=(
+                        f"File not found for {satellite.name} at {ts.isoformat()}"
+                        if error_code in {"NoSuchBucket", "NoSuchKey", "404"}
+                        else (
+                            f"Timeout accessing {satellite.name} data" if "timeout" in str(e).lower() else None
+                        )  # Use default message
+                    ),
                 )
-            elif error_code == "access":
-                final_error = AuthenticationError(
-                    message=f"Permission error downloading {satellite.name} data",
-                    technical_details=technical_details + "Check file system permissions at the destination.",
-                    original_exception=e,
+
+                # Log and raise the error
+                LOGGER.exception("S3 client error: %s", client_error.get_user_message())
+                if client_error.technical_details:
+                    LOGGER.exception("Technical details: %s", client_error.technical_details)
+
+                raise client_error
+            except ResourceNotFoundError:
+                LOGGER.exception("Resource not found error re-raised for: s3://%s/%s", bucket, key)
+                raise  # Re-raise ResourceNotFoundError
+            except (AuthenticationError, RemoteConnectionError, RemoteStoreError):
+                LOGGER.exception("Custom error re-raised for: s3://%s/%s", bucket, key)
+                raise  # Re-raise our custom errors
+            except Exception as e:
+                # Enhanced logging for unexpected errors
+                LOGGER.exception("Unexpected error during download")
+                LOGGER.exception("Exception type: %s", type(e).__name__)
+                LOGGER.exception("Path: s3://%s/%s", bucket, key)
+
+                # Create a detailed error with context
+                technical_details = (
+                    f"Error: {e!s}\n"
+                    f"Path: s3://{bucket}/{key}\n"
+                    f"Destination: {dest_path}\n"
+                    f"Timestamp details: Year={ts.year}, DOY={ts.strftime('%j')}, "
+                    f"Hour={ts.strftime('%H')}, Minute={ts.strftime('%M')}\n"
                 )
-            elif error_code == "disk":
-                final_error = RemoteStoreError(
-                    message=f"Disk error downloading {satellite.name} data",
-                    technical_details=technical_details + "Check available disk space at the destination.",
-                    original_exception=e,
+
+                # Determine error type based on error string
+                error_code = (
+                    "timeout"
+                    if "timeout" in str(e).lower()
+                    else (
+                        "access"
+                        if "permission" in str(e).lower() or "access" in str(e).lower()
+                        else ("disk" if "disk" in str(e).lower() or "space" in str(e).lower() else "unknown")
+                    )
                 )
-            else:
-                final_error = RemoteStoreError(
-                    message=f"Unexpected error downloading {satellite.name} data",
+
+                # Create error object with the appropriate message
+                final_error: RemoteErrorType = RemoteStoreError(
+                    message=f"An unknown error occurred while downloading the {satellite.name} data",
                     technical_details=technical_details,
                     original_exception=e,
+                    error_code="UNKNOWN-ERROR",
                 )
 
-            # Log and raise the error
-            LOGGER.exception("Download error: %s", final_error.get_user_message())
-            if final_error.technical_details:
-                LOGGER.exception("Technical details: %s", final_error.technical_details)
+                if error_code == "timeout":
+                    final_error = RemoteConnectionError(
+                        message=f"Timeout downloading {satellite.name} data",
+                        technical_details=technical_details + "Check your internet connection speed and stability.",
+                        original_exception=e,
+                    )
+                elif error_code == "access":
+                    final_error = AuthenticationError(
+                        message=f"Permission error downloading {satellite.name} data",
+                        technical_details=technical_details + "Check file system permissions at the destination.",
+                        original_exception=e,
+                    )
+                elif error_code == "disk":
+                    final_error = RemoteStoreError(
+                        message=f"Disk error downloading {satellite.name} data",
+                        technical_details=technical_details + "Check available disk space at the destination.",
+                        original_exception=e,
+                    )
+                else:
+                    final_error = RemoteStoreError(
+                        message=f"Unexpected error downloading {satellite.name} data",
+                        technical_details=technical_details,
+                        original_exception=e,
+                    )
+
+                # Log and raise the error
+                LOGGER.exception("Download error: %s", final_error.get_user_message())
+                if final_error.technical_details:
+                    LOGGER.exception("Technical details: %s", final_error.technical_details)
 
-            raise final_error
+                raise final_error
 
     async def check_file_exists(self, timestamp: datetime, satellite: SatellitePattern) -> bool:
         """Check if a file exists for the given timestamp and satellite.
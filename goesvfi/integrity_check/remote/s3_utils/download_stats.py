@@ -2,8 +2,10 @@
 
 This module provides thread-safe statistics tracking for S3 downloads,
 replacing the global mutable state with a proper class-based approach.
+The statistics of every live tracker are reported as metrics.
 """
 
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 import random
@@ -11,8 +13,10 @@ import socket
 from threading import Lock
 import time
 from typing import Any, Union
+import weakref
 
 from goesvfi.utils.log import get_logger
+from goesvfi.utils.metrics import ERRORS, REGISTRY, MetricFamily
 
 LOGGER = get_logger(__name__)
 
@@ -56,6 +60,9 @@ class DownloadStats:
     start_timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
 
 
+_trackers: "weakref.WeakSet[DownloadStatsTracker]" = weakref.WeakSet()
+
+
 class DownloadStatsTracker:
     """Thread-safe tracker for S3 download statistics."""
 
@@ -70,6 +77,7 @@ class DownloadStatsTracker:
         self._lock = Lock()
         self._max_errors = max_errors
         self._max_attempts = max_attempts
+        _trackers.add(self)
 
     def reset(self) -> None:
         """Reset all statistics to initial values."""
@@ -152,6 +160,7 @@ class DownloadStatsTracker:
     def _update_failure_stats(self, error_type: str | None, error_message: str | None) -> None:
         """Update statistics for failed downloads."""
         self._stats.failed += 1
+        ERRORS.inc(component="download")
 
         # Update error type counters
         if error_type:
@@ -373,3 +382,47 @@ class DownloadStatsTracker:
             stats_msg += f"\nTime since last successful download: {time_since_last:.1f} seconds\n"
 
         LOGGER.info(stats_msg)
+
+
+def _collect_metrics() -> Iterator[MetricFamily]:
+    attempts = MetricFamily("goes_vfi_download_attempts_total", "counter", "S3 download attempts, by result")
+    downloaded = MetricFamily("goes_vfi_download_bytes_total", "counter", "Bytes downloaded from S3")
+    rate = MetricFamily(
+        "goes_vfi_download_bytes_per_second", "gauge", "Download rate over the recent successful downloads"
+    )
+    retries = MetricFamily("goes_vfi_download_retries_total", "counter", "S3 download retries")
+    errors = MetricFamily("goes_vfi_download_errors_total", "counter", "Failed S3 downloads, by error type")
+
+    totals = {"successful": 0, "failed": 0, "total_bytes": 0, "retry_count": 0}
+    error_totals = {"not_found": 0, "auth_errors": 0, "timeouts": 0, "network_errors": 0}
+    recent_bytes = recent_seconds = 0.0
+    for tracker in list(_trackers):
+        with tracker._lock:  # noqa: SLF001
+            stats = tracker._stats  # noqa: SLF001
+            for name in totals:
+                totals[name] += getattr(stats, name)
+            for name in error_totals:
+                error_totals[name] += getattr(stats, name)
+            recent = [
+                attempt for attempt in stats.recent_attempts if attempt["success"] and attempt["download_time"] > 0
+            ]
+            recent_bytes += sum(attempt["file_size"] for attempt in recent)
+            recent_seconds += sum(attempt["download_time"] for attempt in recent)
+
+    attempts.add(totals["successful"], result="success")
+    attempts.add(totals["failed"], result="failure")
+    downloaded.add(totals["total_bytes"])
+    rate.add(recent_bytes / recent_seconds if recent_seconds else 0.0)
+    retries.add(totals["retry_count"])
+    for error_type, name in (
+        ("not_found", "not_found"),
+        ("auth", "auth_errors"),
+        ("timeout", "timeouts"),
+        ("network", "network_errors"),
+    ):
+        errors.add(error_totals[name], type=error_type)
+    errors.add(totals["failed"] - sum(error_totals.values()), type="other")
+    yield from (attempts, downloaded, rate, retries, errors)
+
+
+REGISTRY.register_collector(_collect_metrics)
@@ -4,6 +4,7 @@ This package provides utilities for converting NetCDF and other formats
 to PNG images for display and processing.
 """
 
-from .netcdf import extract_metadata, render_png
+from .batch import PipelineThroughput, RenderStage
+from .netcdf import extract_metadata, render_array, render_png
 
-__all__ = ["extract_metadata", "render_png"]
+__all__ = ["PipelineThroughput", "RenderStage", "extract_metadata", "render_array", "render_png"]
@@ -0,0 +1,409 @@
+"""Process-pool NetCDF rendering fed by download completion.
+
+Downloading is I/O-bound and rendering is CPU-bound. Rendering each file on
+the downloading thread after it arrives means the network sits idle while a
+frame renders, and the CPU sits idle while the next file downloads.
+
+:class:`RenderStage` takes each file as soon as its download finishes and
+renders it on a process pool while downloads continue. The number of files
+queued or rendering at once is bounded by the memory budget from
+:class:`~goesvfi.pipeline.resource_manager.ResourceManager`, so a fast
+download does not pile up work faster than it can be rendered. Outputs newer
+than their source are skipped, and :class:`PipelineThroughput` reports
+download and render throughput together.
+"""
+
+import asyncio
+from collections.abc import Callable
+import concurrent.futures
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+from goesvfi.integrity_check.render.netcdf import render_png
+from goesvfi.utils import log
+
+LOGGER = log.get_logger(__name__)
+
+# Peak memory of one full-disk Band 13 render (5424x5424 float32 data, LUT
+# indices and RGB output)
+DEFAULT_JOB_MEMORY_MB = 512
+
+# Seconds between tries for a free slot in submit_async
+SLOT_POLL_INTERVAL = 0.02
+
+Renderer = Callable[..., Any]
+RenderedCallback = Callable[[Path, Path], None]
+ErrorCallback = Callable[[Path, BaseException], None]
+
+
+@dataclass
+class PipelineThroughput:
+    """Download and render counts for a :class:`RenderStage`."""
+
+    downloaded: int = 0
+    downloaded_bytes: int = 0
+    rendered: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    render_seconds: float = 0.0  # Summed over workers
+
+    @property
+    def completed(self) -> int:
+        """Files rendered or already up to date."""
+        return self.rendered + self.skipped
+
+    @property
+    def files_per_second(self) -> float:
+        """Files completed per wall-clock second."""
+        return self.completed / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def download_mb_per_second(self) -> float:
+        """Downloaded megabytes per wall-clock second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.downloaded_bytes / (1024 * 1024) / self.elapsed_seconds
+
+    def summary(self) -> str:
+        """Describe the counts and rates in one line."""
+        return (
+            f"{self.downloaded} downloaded ({self.downloaded_bytes / (1024 * 1024):.1f} MB), "
+            f"{self.rendered} rendered, {self.skipped} up to date, {self.failed} failed "
+            f"in {self.elapsed_seconds:.1f}s ({self.files_per_second:.2f} files/s, "
+            f"{self.download_mb_per_second:.1f} MB/s)"
+        )
+
+
+def is_up_to_date(source: Path, output: Path) -> bool:
+    """Check whether ``output`` exists and is at least as new as ``source``."""
+    try:
+        output_mtime = os.stat(output).st_mtime_ns
+        source_mtime = os.stat(source).st_mtime_ns
+    except OSError:
+        return False
+    return output_mtime >= source_mtime
+
+
+def _render_job(renderer: Renderer, source: Path, output: Path, options: dict[str, Any]) -> float:
+    """Render one file in a worker process.
+
+    Returns:
+        Seconds spent rendering
+    """
+    start = time.perf_counter()
+    renderer(source, output, **options)
+    return time.perf_counter() - start
+
+
+class RenderStage:
+    """Render NetCDF files on a process pool as their downloads complete.
+
+    Call :meth:`submit` (or :meth:`submit_async` from a coroutine) when a
+    download finishes. It blocks while the in-flight limit is reached, which
+    slows the producer to the rate the pool can render at.
+
+    Example:
+        with RenderStage(render_options={"colormap": "gray"}) as stage:
+            for path in downloads:
+                stage.submit(path, downloaded_bytes=path.stat().st_size)
+            LOGGER.info(stage.wait().summary())
+    """
+
+    def __init__(
+        self,
+        *,
+        renderer: Renderer = render_png,
+        render_options: dict[str, Any] | None = None,
+        max_workers: int | None = None,
+        job_memory_mb: int = DEFAULT_JOB_MEMORY_MB,
+        resource_manager: Any | None = None,
+        executor: concurrent.futures.Executor | None = None,
+        on_rendered: RenderedCallback | None = None,
+        on_error: ErrorCallback | None = None,
+    ) -> None:
+        """Initialize the stage; the pool starts on first use.
+
+        Args:
+            renderer: Picklable callable taking ``(source, output, **render_options)``
+            render_options: Keyword arguments passed to ``renderer``
+            max_workers: Render processes (None for the resource manager's optimum)
+            job_memory_mb: Estimated peak memory of one render
+            resource_manager: Resource manager for the memory budget and pool
+                (defaults to the global one)
+            executor: Executor to use instead of creating a process pool; it is
+                not shut down by the stage
+            on_rendered: Called with ``(source, output)`` after each render
+            on_error: Called with ``(source, exception)`` when a render fails
+        """
+        self.renderer = renderer
+        self.render_options = dict(render_options or {})
+        self.max_workers = max_workers
+        self.job_memory_mb = max(1, job_memory_mb)
+        self.on_rendered = on_rendered
+        self.on_error = on_error
+
+        if resource_manager is None and executor is None:
+            from goesvfi.pipeline.resource_manager import get_resource_manager
+
+            resource_manager = get_resource_manager()
+        self._resources = resource_manager
+        self._executor = executor
+        self._exit_stack = ExitStack()
+
+        self._lock = threading.Lock()
+        self._slots: threading.BoundedSemaphore | None = None
+        self._max_in_flight = 0
+        self._pending: set[concurrent.futures.Future[Path]] = set()
+        self._stats = PipelineThroughput()
+        self._started_at: float | None = None
+        self._closed = False
+
+    def __enter__(self) -> "RenderStage":
+        """Start the stage."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Wait for in-flight renders and shut the pool down."""
+        self.close()
+
+    @property
+    def max_in_flight(self) -> int:
+        """Files that may be queued or rendering at once (0 before start)."""
+        return self._max_in_flight
+
+    def _memory_budget_mb(self) -> int | None:
+        """Get the memory available for rendering, or None if unknown."""
+        if self._resources is None:
+            return None
+        limit = int(self._resources.get_config("max_memory_mb", 4096))
+        available = self._resources.memory_monitor.get_memory_stats().available_mb
+        # available_mb is 0 when psutil is missing
+        return min(limit, available) if available > 0 else limit
+
+    def start(self) -> None:
+        """Size the in-flight limit and create the pool, if not already done."""
+        with self._lock:
+            if self._closed:
+                msg = "RenderStage is closed"
+                raise RuntimeError(msg)
+            if self._slots is not None:
+                return
+
+            budget = self._memory_budget_mb()
+            memory_slots = max(1, budget // self.job_memory_mb) if budget is not None else None
+
+            if self._executor is None:
+                workers = self.max_workers or self._resources.get_optimal_workers()
+                # process_executor caps explicit requests at the configured maximum too
+                workers = min(workers, int(self._resources.get_config("max_workers", 2)))
+                if memory_slots is not None:
+                    workers = min(workers, memory_slots)
+                workers = max(1, workers)
+                self._executor = self._exit_stack.enter_context(
+                    self._resources.process_executor(workers, executor_id="netcdf_render")
+                )
+            else:
+                workers = self.max_workers or os.cpu_count() or 1
+
+            # Keep one file queued per worker so workers never wait for the producer
+            in_flight = 2 * max(1, workers)
+            if memory_slots is not None:
+                in_flight = min(in_flight, max(memory_slots, 1))
+            self._max_in_flight = in_flight
+            self._slots = threading.BoundedSemaphore(in_flight)
+            self._started_at = time.perf_counter()
+            LOGGER.info(
+                "Render stage started: %d workers, %d in flight (budget %s MB, %d MB per render)",
+                workers,
+                in_flight,
+                budget,
+                self.job_memory_mb,
+            )
+
+    def _skip_or_count(self, source: Path, output: Path, downloaded_bytes: int | None) -> bool:
+        """Record a download and report whether ``output`` is already up to date."""
+        up_to_date = is_up_to_date(source, output)
+        with self._lock:
+            if downloaded_bytes is not None:
+                self._stats.downloaded += 1
+                self._stats.downloaded_bytes += downloaded_bytes
+            if up_to_date:
+                self._stats.skipped += 1
+        if up_to_date:
+            LOGGER.debug("Skipping %s: %s is up to date", source, output)
+        return up_to_date
+
+    def _dispatch(self, source: Path, output: Path) -> concurrent.futures.Future[Path]:
+        """Send a render to the pool; the caller holds a slot, released when it finishes."""
+        if self._executor is None or self._slots is None:
+            msg = "RenderStage is not started"
+            raise RuntimeError(msg)
+        slots = self._slots
+        result: concurrent.futures.Future[Path] = concurrent.futures.Future()
+        with self._lock:
+            self._pending.add(result)
+
+        def finished(job: concurrent.futures.Future[float]) -> None:
+            slots.release()
+            # exception() raises on a cancelled job, e.g. from a shutdown with
+            # cancel_futures; the file wasn't rendered, but it didn't fail either
+            if job.cancelled():
+                LOGGER.debug("Rendering %s was cancelled", source)
+                result.set_exception(concurrent.futures.CancelledError(f"Rendering {source} was cancelled"))
+                with self._lock:
+                    self._pending.discard(result)
+                return
+            error = job.exception()
+            with self._lock:
+                if error is None:
+                    self._stats.rendered += 1
+                    self._stats.render_seconds += job.result()
+                else:
+                    self._stats.failed += 1
+            try:
+                if error is None:
+                    if self.on_rendered is not None:
+                        self.on_rendered(source, output)
+                else:
+                    LOGGER.error("Rendering %s failed: %s", source, error)
+                    if self.on_error is not None:
+                        self.on_error(source, error)
+            except Exception:
+                LOGGER.exception("Render callback for %s failed", source)
+            if error is None:
+                result.set_result(output)
+            else:
+                result.set_exception(error)
+            with self._lock:
+                self._pending.discard(result)
+
+        try:
+            job = self._executor.submit(_render_job, self.renderer, source, output, self.render_options)
+        except BaseException:
+            slots.release()
+            with self._lock:
+                self._pending.discard(result)
+            raise
+        job.add_done_callback(finished)
+        return result
+
+    @staticmethod
+    def _done(output: Path) -> concurrent.futures.Future[Path]:
+        """Get a future that has already resolved to ``output``."""
+        future: concurrent.futures.Future[Path] = concurrent.futures.Future()
+        future.set_result(output)
+        return future
+
+    def submit(
+        self,
+        source: str | Path,
+        output: str | Path | None = None,
+        *,
+        downloaded_bytes: int | None = None,
+        timeout: float | None = None,
+    ) -> concurrent.futures.Future[Path]:
+        """Queue a downloaded file for rendering.
+
+        Blocks while :attr:`max_in_flight` files are queued or rendering.
+
+        Args:
+            source: Downloaded NetCDF file
+            output: Image to write (defaults to ``source`` with a ``.png`` suffix)
+            downloaded_bytes: Size of the download, counted in the throughput
+            timeout: Seconds to wait for a free slot (None waits indefinitely)
+
+        Returns:
+            Future resolving to the output path; already resolved when the
+            output is up to date
+
+        Raises:
+            TimeoutError: If no slot frees up within ``timeout``
+        """
+        self.start()
+        source = Path(source)
+        output = Path(output) if output is not None else source.with_suffix(".png")
+        if self._skip_or_count(source, output, downloaded_bytes):
+            return self._done(output)
+
+        assert self._slots is not None  # noqa: S101 - set by start()
+        if not self._slots.acquire(timeout=timeout):
+            msg = f"No render slot free after {timeout}s"
+            raise TimeoutError(msg)
+        return self._dispatch(source, output)
+
+    async def submit_async(
+        self,
+        source: str | Path,
+        output: str | Path | None = None,
+        *,
+        downloaded_bytes: int | None = None,
+    ) -> concurrent.futures.Future[Path]:
+        """Queue a downloaded file for rendering without blocking the event loop.
+
+        Polls for a slot on the event loop, so a cancelled call never holds
+        one; see :meth:`submit`.
+
+        Returns:
+            Future resolving to the output path
+        """
+        await asyncio.to_thread(self.start)
+        source = Path(source)
+        output = Path(output) if output is not None else source.with_suffix(".png")
+        if await asyncio.to_thread(self._skip_or_count, source, output, downloaded_bytes):
+            return self._done(output)
+
+        assert self._slots is not None  # noqa: S101 - set by start()
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(SLOT_POLL_INTERVAL)
+        return self._dispatch(source, output)
+
+    def render(self, source: str | Path, output: str | Path | None = None) -> Path:
+        """Render one file through the pool and wait for it.
+
+        Returns:
+            Path of the rendered (or already up-to-date) image
+        """
+        return self.submit(source, output).result()
+
+    def stats(self) -> PipelineThroughput:
+        """Get a snapshot of the counts so far."""
+        with self._lock:
+            elapsed = time.perf_counter() - self._started_at if self._started_at is not None else 0.0
+            return replace(self._stats, elapsed_seconds=elapsed)
+
+    def wait(self, timeout: float | None = None) -> PipelineThroughput:
+        """Wait for every queued render to finish.
+
+        Returns:
+            Counts once the queue has drained (or ``timeout`` expired)
+        """
+        with self._lock:
+            pending = list(self._pending)
+        concurrent.futures.wait(pending, timeout=timeout)
+        return self.stats()
+
+    def close(self, wait: bool = True) -> PipelineThroughput:
+        """Stop accepting files and shut down the pool the stage created.
+
+        Args:
+            wait: Wait for queued renders first
+
+        Returns:
+            Final counts
+        """
+        if wait:
+            self.wait()
+        with self._lock:
+            self._closed = True
+        stats = self.stats()
+        self._exit_stack.close()
+        if stats.downloaded or stats.completed or stats.failed:
+            LOGGER.info("Render stage finished: %s", stats.summary())
+        return stats
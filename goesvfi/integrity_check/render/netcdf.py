@@ -2,19 +2,34 @@
 
 This module provides functions to render PNG images from GOES NetCDF files,
 specifically for Band 13 (Clean IR, 10.3 µm) data.
+
+Rendering reads the radiance, or only a crop window of it, as float32
+(block-averaged when a smaller output resolution is requested), converts it to
+brightness temperature in place, colours it with one ``np.take`` through a
+cached RGB lookup table and writes it with PIL. The output matches what the
+earlier matplotlib ``imshow``/``savefig`` renderer produced, without building a
+figure per file. ``render_array`` returns the RGB pixels instead.
+
+xarray is imported on first use, since importing it costs more than rendering
+a frame and the integrity tabs import this module when they are created.
 """
 
+from __future__ import annotations
+
+import functools
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import numpy.typing as npt
 from PIL import Image
-import xarray as xr
 
 from goesvfi.integrity_check.time_index import SatellitePattern
+from goesvfi.utils.lazy_import import lazy_import
 from goesvfi.utils.log import get_logger
 
+xr = lazy_import("xarray")
+
 LOGGER = get_logger(__name__)
 
 # GOES-16/18 Band 13 (Clean IR, 10.3 µm) rendering constants
@@ -23,6 +38,14 @@ DEFAULT_MIN_TEMP_K = 180.0  # Very cold cloud tops
 DEFAULT_MAX_TEMP_K = 320.0  # Warm surface
 DEFAULT_COLORMAP = "gray"  # Default grayscale
 
+# Colormap lookup table entries, as in the 256-entry matplotlib colormaps
+LUT_SIZE = 256
+# Colour of invalid pixels, which matplotlib left transparent over a white figure
+INVALID_RGB = (255, 255, 255)
+# zlib level for PNG output; encoding dominates render time, and level 1 is
+# several times faster than PIL's default 6 for slightly larger files
+PNG_COMPRESS_LEVEL = 1
+
 # Band 13 variable names in NetCDF files
 RADIANCE_VAR = "Rad"
 BAND_ID_VAR = "band_id"
@@ -61,9 +84,52 @@ def _validate_band_id(ds: xr.Dataset) -> None:
         raise ValueError(msg)
 
 
+def _planck_attrs(ds: xr.Dataset) -> tuple[float, float, float, float] | None:
+    """Get the Planck constants (fk1, fk2, bc1, bc2) if the dataset has them."""
+    if not all(k in ds.attrs for k in ["planck_fk1", "planck_fk2", "planck_bc1", "planck_bc2"]):
+        return None
+    return (
+        float(ds.attrs["planck_fk1"]),
+        float(ds.attrs["planck_fk2"]),
+        float(ds.attrs["planck_bc1"]),
+        float(ds.attrs["planck_bc2"]),
+    )
+
+
+def _normalize_radiance_inplace(
+    data: npt.NDArray[np.float32],
+    planck: tuple[float, float, float, float] | None,
+    min_temp_k: float,
+    max_temp_k: float,
+) -> npt.NDArray[np.float32]:
+    """Convert radiance to normalized, inverted brightness temperature in place.
+
+    Invalid pixels (non-positive temperature or NaN) become NaN.
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if planck is not None:
+            fk1, fk2, bc1, bc2 = planck
+            # T = (fk2 / ln(fk1 / L + 1) - bc1) / bc2
+            np.divide(fk1, data, out=data)
+            data += 1
+            np.log(data, out=data)
+            np.divide(fk2, data, out=data)
+            data -= bc1
+            data /= bc2
+
+        # NaN compares False, so it is marked invalid too
+        invalid = ~(data > 0)
+        np.clip(data, min_temp_k, max_temp_k, out=data)
+        # 1 - (T - min) / (max - min): cold is bright, warm is dark
+        data -= max_temp_k
+        data /= min_temp_k - max_temp_k
+        data[invalid] = np.nan
+    return data
+
+
 def _convert_radiance_to_temperature(
     data: npt.NDArray[np.float64], ds: xr.Dataset, min_temp_k: float, max_temp_k: float
-) -> npt.NDArray[np.float64]:
+) -> npt.NDArray[np.float32]:
     """Convert radiance data to brightness temperature and normalize.
 
     Args:
@@ -73,28 +139,9 @@ def _convert_radiance_to_temperature(
         max_temp_k: Maximum temperature for scaling
 
     Returns:
-        Normalized temperature data (0-1 range, inverted for IR)
+        Normalized temperature data (0-1 range, inverted for IR), NaN where invalid
     """
-    # Convert radiance to brightness temperature if Planck constants are available
-    if all(k in ds.attrs for k in ["planck_fk1", "planck_fk2", "planck_bc1", "planck_bc2"]):
-        fk1 = ds.attrs["planck_fk1"]
-        fk2 = ds.attrs["planck_fk2"]
-        bc1 = ds.attrs["planck_bc1"]
-        bc2 = ds.attrs["planck_bc2"]
-
-        # Apply Planck function to convert radiance to brightness temperature
-        data = (fk2 / np.log((fk1 / data) + 1) - bc1) / bc2
-
-    # Mask invalid data
-    data = np.ma.masked_less_equal(data, 0)  # type: ignore[no-untyped-call]
-    # Clip data to the specified temperature range
-    data = np.clip(data, min_temp_k, max_temp_k)
-
-    # Normalize to 0-1 range
-    normalized_data = (data - min_temp_k) / (max_temp_k - min_temp_k)
-
-    # Inverse for IR (cold = bright, warm = dark)
-    return 1 - normalized_data
+    return _normalize_radiance_inplace(np.array(data, dtype=np.float32), _planck_attrs(ds), min_temp_k, max_temp_k)
 
 
 def _get_colormap(colormap_name: str) -> Any:
@@ -127,52 +174,228 @@ def _get_colormap(colormap_name: str) -> Any:
     return LinearSegmentedColormap.from_list(colormap_name, cmap(np.linspace(0, 1, 256)), N=256)
 
 
-def _create_figure(data: npt.NDArray[np.float64], colormap_name: str, output_path: Path, dpi: int = 100) -> None:
-    """Create a matplotlib figure and save it to a file.
+@functools.lru_cache(maxsize=16)
+def _colormap_lut(colormap_name: str) -> npt.NDArray[np.uint8]:
+    """Get the RGB lookup table for a colormap.
+
+    Returns:
+        Read-only ``(LUT_SIZE + 1, 3)`` table; the last entry is for invalid pixels
+    """
+    if colormap_name == "gray":
+        # Same table as the "enhanced_gray" colormap, without importing matplotlib
+        rgb = np.repeat(np.linspace(0.0, 1.0, LUT_SIZE)[:, np.newaxis], 3, axis=1)
+    else:
+        rgb = _get_colormap(colormap_name)(np.linspace(0.0, 1.0, LUT_SIZE))[:, :3]
+
+    lut = np.empty((LUT_SIZE + 1, 3), dtype=np.uint8)
+    # Truncate, as matplotlib does when converting colormap floats to bytes
+    lut[:LUT_SIZE] = (rgb * 255).astype(np.uint8)
+    lut[LUT_SIZE] = INVALID_RGB
+    lut.flags.writeable = False
+    return lut
+
+
+def _lut_indices(data: npt.NDArray[np.float32], bounds: npt.NDArray[np.float32] | None = None) -> npt.NDArray[np.intp]:
+    """Map normalized data to LUT indices in place, stretching valid values to the full table.
+
+    Matches matplotlib's ``imshow`` defaults: the colour scale spans the
+    minimum to maximum of the valid pixels, and invalid pixels get the entry
+    after the colormap. ``bounds`` overrides the range taken from ``data``,
+    for data downsampled from an image whose range should still be used.
+    """
+    invalid = np.isnan(data)
+    if bounds is None:
+        valid = data[~invalid] if invalid.any() else data
+        if valid.size == 0:
+            return np.full(data.shape, LUT_SIZE, dtype=np.intp)
+        low, high = float(valid.min()), float(valid.max())
+    else:
+        low, high = float(np.min(bounds)), float(np.max(bounds))
+        if np.isnan(low) or np.isnan(high):
+            return np.full(data.shape, LUT_SIZE, dtype=np.intp)
+
+    span = high - low
+    data -= low
+    if span > 0:
+        data *= LUT_SIZE / span
+    else:
+        data[...] = 0
+    # Clip and fill invalid pixels before the cast, which is undefined for NaN
+    np.clip(data, 0, LUT_SIZE - 1, out=data)
+    data[invalid] = LUT_SIZE
+    return data.astype(np.intp)
+
+
+def _decode_block(shape: tuple[int, ...], resolution: tuple[int, int] | None) -> int:
+    """Get the block size to downsample by for an output resolution.
+
+    The block size keeps at least twice the target size in each dimension, so
+    the final LANCZOS resize still has several source pixels per output pixel.
+    """
+    if resolution is None or len(shape) != 2:
+        return 1
+    width, height = resolution
+    if width <= 0 or height <= 0:
+        return 1
+    return max(1, min(shape[1] // (2 * width), shape[0] // (2 * height)))
+
+
+def _block_mean(
+    data: npt.NDArray[np.float32], block: int
+) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.float32] | None]:
+    """Average ``block`` x ``block`` pixel blocks of radiance.
+
+    Averaging blocks rather than taking every n-th pixel keeps the result close
+    to resizing the full image, and every later step runs on the smaller array.
+    Blocks containing an invalid pixel are invalid.
+
+    Returns:
+        The radiance, and when it was downsampled, the full image's smallest
+        and largest valid radiance so the colour scale is unchanged
+    """
+    if block == 1:
+        return data, None
+
+    valid = data > 0
+    extremes = np.array(
+        [np.min(data, where=valid, initial=np.inf), np.max(data, where=valid, initial=-np.inf)], dtype=np.float32
+    )
+    if not np.isfinite(extremes).all():
+        extremes[:] = np.nan
+    rows, cols = max(1, data.shape[0] // block), max(1, data.shape[1] // block)
+    block_rows, block_cols = min(block, data.shape[0]), min(block, data.shape[1])
+    blocks = data[: rows * block_rows, : cols * block_cols].reshape(rows, block_rows, cols, block_cols)
+    return blocks.mean(axis=(1, 3), dtype=np.float32), extremes
+
+
+def _read_radiance(
+    ds: xr.Dataset, resolution: tuple[int, int] | None, window: tuple[int, int, int, int] | None = None
+) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.float32] | None]:
+    """Read the radiance variable as float32, block-averaged down towards ``resolution``.
 
     Args:
-        data: Normalized data to visualize
-        colormap_name: Name of the colormap to use
-        output_path: Path to save the figure
-        dpi: DPI for output image (default: 100)
+        ds: Dataset to read from
+        resolution: Optional output resolution (width, height)
+        window: Optional ``(x, y, width, height)`` pixel window to read
 
     Returns:
-        None
+        The radiance, and the radiance range to scale colours over (see ``_block_mean``)
     """
-    import matplotlib.pyplot as plt
+    data = _read_radiance_window(ds, window)
+    return _block_mean(data, _decode_block(data.shape, resolution))
 
-    # Get appropriate colormap
-    cmap = _get_colormap(colormap_name)
 
-    # Create a figure
-    fig_width = data.shape[1] / dpi
-    fig_height = data.shape[0] / dpi
+def _read_radiance_window(ds: xr.Dataset, window: tuple[int, int, int, int] | None) -> npt.NDArray[np.float32]:
+    """Read only the ``(x, y, width, height)`` pixel window of the radiance variable.
 
-    fig = plt.figure(figsize=(fig_width, fig_height), dpi=dpi)
-    ax = fig.add_axes((0, 0, 1, 1))  # Use tuple instead of list for rect parameter
-    ax.axis("off")
+    Rendered images keep the variable's row and column order, so a pixel
+    window is the same index window into its last two dimensions. Indexing the
+    lazily loaded variable before reading makes the backend read just that
+    hyperslab: HDF5 decompresses only the chunks the window touches (GOES L1b
+    files store ``Rad`` in tiles of a few hundred pixels), so the cost follows
+    the window's area rather than the full disk's.
 
-    # Plot the image
-    ax.imshow(data, cmap=cmap, aspect="auto")
+    Raises:
+        ValueError: If the window is empty or extends past the image
+    """
+    radiance = ds[RADIANCE_VAR]
+    if window is None:
+        return np.asarray(radiance.values, dtype=np.float32)
+
+    x, y, width, height = window
+    rows, cols = radiance.shape[-2:]
+    if x < 0 or y < 0 or width <= 0 or height <= 0 or x + width > cols or y + height > rows:
+        msg = f"Crop window {window} is outside the {cols}x{rows} image"
+        raise ValueError(msg)
+    return np.asarray(radiance[..., y : y + height, x : x + width].values, dtype=np.float32)
 
-    # Save to file
-    plt.savefig(output_path, dpi=dpi, bbox_inches="tight", pad_inches=0)
-    plt.close(fig)
 
+def _render_rgb(
+    data: npt.NDArray[np.float32],
+    planck: tuple[float, float, float, float] | None,
+    min_temp_k: float,
+    max_temp_k: float,
+    colormap: str,
+    extremes: npt.NDArray[np.float32] | None = None,
+    full_scale: bool = False,
+) -> npt.NDArray[np.uint8]:
+    """Colour radiance data, converting ``data`` in place.
 
-def _resize_image(image_path: Path, resolution: tuple[int, int]) -> None:
-    """Resize an image to the specified resolution.
+    Args:
+        data: Radiance, overwritten with normalized values
+        planck: Planck coefficients, or None if the data is used as is
+        min_temp_k: Minimum temperature in Kelvin for scaling
+        max_temp_k: Maximum temperature in Kelvin for scaling
+        colormap: Colormap name
+        extremes: Radiance range to scale colours over instead of that of ``data``
+        full_scale: Scale colours over the whole temperature range instead
+
+    Returns:
+        ``(height, width, 3)`` RGB image
+    """
+    data = np.atleast_2d(data)
+    _normalize_radiance_inplace(data, planck, min_temp_k, max_temp_k)
+    bounds = None
+    if full_scale:
+        bounds = np.array([0.0, 1.0], dtype=np.float32)
+    elif extremes is not None:
+        # The conversion is monotonic, so it maps the radiance range to the normalized range
+        bounds = _normalize_radiance_inplace(extremes.copy(), planck, min_temp_k, max_temp_k)
+    return np.take(_colormap_lut(colormap), _lut_indices(data, bounds), axis=0)
+
+
+def render_array(
+    netcdf_path: str | Path,
+    window: tuple[int, int, int, int] | None = None,
+    stride: int = 1,
+    min_temp_k: float = DEFAULT_MIN_TEMP_K,
+    max_temp_k: float = DEFAULT_MAX_TEMP_K,
+    colormap: str = DEFAULT_COLORMAP,
+) -> npt.NDArray[np.uint8]:
+    """Decode, calibrate and colour a GOES NetCDF file into an RGB array.
+
+    This is ``render_png`` without the image file, for callers that use the
+    pixels directly.
+
+    Without a window, colours span the image's temperature range, as in
+    ``render_png``. A window's colours span the whole ``min_temp_k`` to
+    ``max_temp_k`` range instead: a full disk almost always covers that range,
+    so a windowed frame matches the crop of the full render, and the colour
+    scale does not change between the frames of a regional video.
 
     Args:
-        image_path: Path to the image
-        resolution: Target resolution (width, height)
+        netcdf_path: Path to the NetCDF file
+        window: Optional ``(x, y, width, height)`` pixel crop, the only part read
+        stride: Downscale factor; each ``stride`` x ``stride`` block becomes one pixel
+        min_temp_k: Minimum temperature in Kelvin for scaling
+        max_temp_k: Maximum temperature in Kelvin for scaling
+        colormap: Colormap name (from matplotlib)
 
     Returns:
-        None
+        ``(height, width, 3)`` uint8 RGB image
+
+    Raises:
+        FileNotFoundError: If the NetCDF file doesn't exist
+        ValueError: If the file doesn't contain Band 13 radiance or the window
+            is outside the image
     """
-    img = Image.open(image_path)
-    img = img.resize(resolution, Image.LANCZOS)
-    img.save(image_path)
+    netcdf_path = Path(netcdf_path)
+    if not netcdf_path.exists():
+        msg = f"NetCDF file not found: {netcdf_path}"
+        raise FileNotFoundError(msg)
+    if stride < 1:
+        msg = f"stride must be at least 1, got {stride}"
+        raise ValueError(msg)
+
+    with xr.open_dataset(netcdf_path, cache=False) as ds:
+        _validate_band_id(ds)
+        if RADIANCE_VAR not in ds.variables:
+            msg = f"Radiance variable {RADIANCE_VAR!r} not found in dataset"
+            raise ValueError(msg)
+        data, extremes = _block_mean(_read_radiance_window(ds, window), stride)
+        planck = _planck_attrs(ds)
+
+    return _render_rgb(data, planck, min_temp_k, max_temp_k, colormap, extremes, full_scale=window is not None)
 
 
 def _prepare_output_path(netcdf_path: Path, output_path: str | Path | None) -> Path:
@@ -201,6 +424,7 @@ def render_png(
     satellite: SatellitePattern | None = None,
     resolution: tuple[int, int] | None = None,
     dpi: int = 100,
+    window: tuple[int, int, int, int] | None = None,
 ) -> Path:
     """Render a PNG image from a GOES NetCDF file.
 
@@ -213,13 +437,17 @@ def render_png(
         satellite: Satellite pattern enum (used for metadata)
         resolution: Optional output resolution (width, height)
         dpi: DPI for output image (default: 100)
+        window: Optional ``(x, y, width, height)`` crop in full-resolution
+            pixels; only this part of the file is read and rendered, with
+            colours scaled over the whole temperature range (see ``render_array``)
 
     Returns:
         Path to the rendered PNG image
 
     Raises:
         FileNotFoundError: If the NetCDF file doesn't exist
-        ValueError: If the NetCDF file doesn't contain Band 13 data
+        ValueError: If the NetCDF file doesn't contain Band 13 data, or the
+            window is outside the image
         IOError: If there's an error during rendering
     """
     # Convert to Path and validate existence
@@ -234,8 +462,9 @@ def render_png(
     LOGGER.debug("Rendering %s to %s", netcdf_path, final_output_path)
 
     try:
-        # Open the NetCDF dataset
-        with xr.open_dataset(netcdf_path) as ds:
+        # Open the NetCDF dataset; without caching, Rad is read once into a
+        # buffer the conversion can overwrite
+        with xr.open_dataset(netcdf_path, cache=False) as ds:
             # 1. Validate that this dataset contains the target band
             _validate_band_id(ds)
 
@@ -244,20 +473,22 @@ def render_png(
                 msg = f"Radiance variable {RADIANCE_VAR!r} not found in dataset"
                 raise ValueError(msg)
 
-            data = ds[RADIANCE_VAR].values
-
-            # 3. Convert radiance to brightness temperature and normalize
-            normalized_data = _convert_radiance_to_temperature(data, ds, min_temp_k, max_temp_k)
+            data, extremes = _read_radiance(ds, resolution, window)
+            planck = _planck_attrs(ds)
 
-            # 4. Create figure and save to file
-            _create_figure(normalized_data, colormap, final_output_path, dpi)
+        # 3. Convert radiance to brightness temperature and colour it
+        rgb = _render_rgb(data, planck, min_temp_k, max_temp_k, colormap, extremes, full_scale=window is not None)
+        del data
 
-            # 5. Optional resize
-            if resolution is not None:
-                _resize_image(final_output_path, resolution)
+        # 4. Optional resize, then save
+        image = Image.fromarray(rgb)
+        if resolution is not None and image.size != tuple(resolution):
+            image = image.resize(resolution, Image.Resampling.LANCZOS)
+        # compress_level only applies to PNG; other formats ignore it
+        image.save(final_output_path, dpi=(dpi, dpi), compress_level=PNG_COMPRESS_LEVEL)
 
-            LOGGER.debug("Rendered %s", final_output_path)
-            return final_output_path
+        LOGGER.debug("Rendered %s", final_output_path)
+        return final_output_path
 
     except KeyError as e:
         LOGGER.exception("Error occurred")
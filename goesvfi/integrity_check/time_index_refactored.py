@@ -11,6 +11,8 @@ import sys
 import traceback
 
 from goesvfi.utils import date_utils
+from goesvfi.utils.file_walker import walk_files
+from goesvfi.utils.filename_timestamps import HYPHENATED, ISO_COMPACT, UNDERSCORED, TimestampParser
 from goesvfi.utils.log import get_logger
 
 LOGGER = get_logger(__name__)
@@ -59,11 +61,26 @@ START_SECONDS = {"RadF": 0, "RadC": 0, "RadM": 0}
 # Type alias for satellite pattern
 SatellitePattern = str
 
-# Compiled patterns for timestamp extraction from filenames
+# Compiled patterns matching the satellite marker in a filename, e.g. the
+# "_G16_" of "image_G16_20230615T120000Z.png" or the "GOES16" of a CDN image
 COMPILED_PATTERNS: dict[str, Pattern[str]] = {
-    # Add your patterns here
+    pattern: re.compile(rf"_{code}_|{code}_13_|GOES-?{code[1:]}", re.IGNORECASE)
+    for pattern, code in SATELLITE_CODES.items()
 }
 
+# Shared parsers; each remembers the scheme and position of the last timestamp it found
+_FILENAME_PARSER = TimestampParser()
+_DIRECTORY_PARSER = TimestampParser((HYPHENATED, UNDERSCORED, ISO_COMPACT))
+_SATELLITE_NAME = re.compile(r"goes\d+_")
+_SATDAY_PATTERN = re.compile(r"GOES\d+/FD/\d+/(\d{4})/(\d{3})")
+
+# Time components following a date found by date_utils
+_TIME_PATTERNS = [
+    re.compile(r"_(\d{2})-(\d{2})-(\d{2})"),  # HH-MM-SS
+    re.compile(r"_(\d{2})(\d{2})(\d{2})"),  # HHMMSS
+    re.compile(r"T(\d{2})(\d{2})(\d{2})"),  # THHMMSS
+]
+
 
 def extract_timestamp(filename: str, pattern: SatellitePattern) -> datetime | None:
     """Extract a timestamp from a filename using a specific satellite pattern.
@@ -75,8 +92,10 @@ def extract_timestamp(filename: str, pattern: SatellitePattern) -> datetime | No
     Returns:
         datetime object if extraction succeeded, None otherwise
     """
-    # Implementation would be here
-    return None
+    compiled_pattern = COMPILED_PATTERNS.get(pattern)
+    if compiled_pattern is None or not compiled_pattern.search(filename):
+        return None
+    return _FILENAME_PARSER.parse(filename)
 
 
 def _try_extract_time_component(dirname: str, patterns: list[Pattern[str]]) -> tuple[int, int, int] | None:
@@ -111,58 +130,8 @@ def _try_primary_datetime_patterns(dirname: str) -> datetime | None:
     Returns:
         datetime object if successful, None otherwise
     """
-    # Pattern 1: YYYY-MM-DD_HH-MM-SS (primary format)
-    dir_pattern1 = re.compile(r"(\d{4})-(\d{2})-(\d{2})_(\d{2})-(\d{2})-(\d{2})")
-    match = dir_pattern1.search(dirname)
-
-    if match:
-        try:
-            year = int(match.group(1))
-            month = int(match.group(2))
-            day = int(match.group(3))
-            hour = int(match.group(4))
-            minute = int(match.group(5))
-            second = int(match.group(6))
-
-            return datetime(year, month, day, hour, minute, second)
-        except (ValueError, IndexError):
-            pass
-
-    # Pattern 2: YYYYMMDD_HHMMSS
-    dir_pattern2 = re.compile(r"(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})")
-    match = dir_pattern2.search(dirname)
-
-    if match:
-        try:
-            year = int(match.group(1))
-            month = int(match.group(2))
-            day = int(match.group(3))
-            hour = int(match.group(4))
-            minute = int(match.group(5))
-            second = int(match.group(6))
-
-            return datetime(year, month, day, hour, minute, second)
-        except (ValueError, IndexError):
-            pass
-
-    # Pattern 3: YYYYMMDDTHHMMSS
-    dir_pattern3 = re.compile(r"(\d{4})(\d{2})(\d{2})T(\d{2})(\d{2})(\d{2})")
-    match = dir_pattern3.search(dirname)
-
-    if match:
-        try:
-            year = int(match.group(1))
-            month = int(match.group(2))
-            day = int(match.group(3))
-            hour = int(match.group(4))
-            minute = int(match.group(5))
-            second = int(match.group(6))
-
-            return datetime(year, month, day, hour, minute, second)
-        except (ValueError, IndexError):
-            pass
-
-    return None
+    # YYYY-MM-DD_HH-MM-SS (primary format), YYYYMMDD_HHMMSS or YYYYMMDDTHHMMSS
+    return _DIRECTORY_PARSER.parse(dirname)
 
 
 def _try_satellite_specific_patterns(dirname: str) -> datetime | None:
@@ -175,8 +144,7 @@ def _try_satellite_specific_patterns(dirname: str) -> datetime | None:
         datetime object if successful, None otherwise
     """
     # Pattern 4: Satellite specific pattern like GOES18/FD/13/YYYY/DDD
-    satday_pattern = re.compile(r"GOES\d+/FD/\d+/(\d{4})/(\d{3})")
-    match = satday_pattern.search(dirname)
+    match = _SATDAY_PATTERN.search(dirname)
 
     if match:
         try:
@@ -192,21 +160,9 @@ def _try_satellite_specific_patterns(dirname: str) -> datetime | None:
             pass
 
     # Pattern 5: SATNAME_YYYYMMDD_HHMMSS (e.g. goes18_20230615_120000)
-    sat_pattern = re.compile(r"goes\d+_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})")
-    match = sat_pattern.search(dirname)
-
-    if match:
-        try:
-            year = int(match.group(1))
-            month = int(match.group(2))
-            day = int(match.group(3))
-            hour = int(match.group(4))
-            minute = int(match.group(5))
-            second = int(match.group(6))
-
-            return datetime(year, month, day, hour, minute, second)
-        except (ValueError, IndexError):
-            pass
+    sat_match = _SATELLITE_NAME.search(dirname)
+    if sat_match:
+        return UNDERSCORED.parse_at(dirname, sat_match.end())
 
     return None
 
@@ -229,19 +185,18 @@ def extract_timestamp_from_directory_name(dirname: str) -> datetime | None:
     Returns:
         datetime object if extraction succeeded, None otherwise
     """
-    # First try to parse with date_utils to extract date component
+    # Full timestamps are parsed by slicing, without a regex per format
+    result = _try_primary_datetime_patterns(dirname)
+    if result:
+        return result
+
+    # Then try to parse with date_utils to extract date component
     date_obj = date_utils.parse_satellite_path(dirname)
 
     # If date_utils successfully extracted a date, try to extract time components
     if date_obj:
         # Look for time components in various formats
-        time_patterns = [
-            re.compile(r"_(\d{2})-(\d{2})-(\d{2})"),  # HH-MM-SS
-            re.compile(r"_(\d{2})(\d{2})(\d{2})"),  # HHMMSS
-            re.compile(r"T(\d{2})(\d{2})(\d{2})"),  # THHMMSS
-        ]
-
-        time_components = _try_extract_time_component(dirname, time_patterns)
+        time_components = _try_extract_time_component(dirname, _TIME_PATTERNS)
         if time_components:
             hour, minute, second = time_components
             return datetime(date_obj.year, date_obj.month, date_obj.day, hour, minute, second)
@@ -249,13 +204,6 @@ def extract_timestamp_from_directory_name(dirname: str) -> datetime | None:
         # If we found a date but no time, return datetime at midnight
         return datetime(date_obj.year, date_obj.month, date_obj.day, 0, 0, 0)
 
-    # If date_utils couldn't extract a date, try our specialized parsers
-
-    # First try the primary datetime patterns
-    result = _try_primary_datetime_patterns(dirname)
-    if result:
-        return result
-
     # Then try satellite specific patterns
     result = _try_satellite_specific_patterns(dirname)
     if result:
@@ -347,17 +295,16 @@ def _scan_files_for_timestamps(
     Returns:
         List of timestamps extracted from files
     """
-    # Find all PNG files
-    png_files = list(directory.glob("**/*.png"))
-    LOGGER.info("Found %s PNG files in %s", len(png_files), directory)
-
-    # Extract timestamps from filenames
+    # Extract timestamps from PNG filenames as the walker finds them
     timestamps = []
-    for file_path in png_files:
-        timestamp = _extract_timestamp_from_file(file_path, pattern)
+    png_count = 0
+    for entry in walk_files(directory, suffixes=(".png",)):
+        png_count += 1
+        timestamp = _extract_timestamp_from_file(Path(entry.path), pattern)
         if timestamp and _filter_timestamp_by_range(timestamp, start_time, end_time):
             timestamps.append(timestamp)
 
+    LOGGER.info("Found %s PNG files in %s", png_count, directory)
     return timestamps
 
 
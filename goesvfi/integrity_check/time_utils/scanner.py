@@ -4,6 +4,7 @@ from datetime import datetime
 from pathlib import Path
 
 from goesvfi.utils import log
+from goesvfi.utils.file_walker import walk_files
 
 from .patterns import COMPILED_PATTERNS, SatellitePattern
 from .timestamp import TimestampExtractor
@@ -63,17 +64,17 @@ class DirectoryScanner:
         end_time: datetime | None,
     ) -> list[datetime]:
         """Extract timestamps from PNG files in directory."""
-        png_files = list(directory.glob("**/*.png"))
-        LOGGER.info("Found %s PNG files in %s", len(png_files), directory)
-
         timestamps = []
         extractor = TimestampExtractor()
+        png_count = 0
 
-        for file_path in png_files:
-            timestamp = cls._extract_timestamp_from_file(file_path, pattern, extractor)
+        for entry in walk_files(directory, suffixes=(".png",)):
+            png_count += 1
+            timestamp = cls._extract_timestamp_from_file(Path(entry.path), pattern, extractor)
             if timestamp and cls._is_in_time_range(timestamp, start_time, end_time):
                 timestamps.append(timestamp)
 
+        LOGGER.info("Found %s PNG files in %s", png_count, directory)
         return timestamps
 
     @classmethod
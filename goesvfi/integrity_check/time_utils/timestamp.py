@@ -6,6 +6,7 @@ import itertools
 import re
 
 from goesvfi.utils import date_utils, log
+from goesvfi.utils.filename_timestamps import HYPHENATED, ISO_COMPACT, UNDERSCORED, TimestampParser
 
 from .patterns import (
     COMPILED_GOES_PATTERNS,
@@ -15,6 +16,18 @@ from .patterns import (
 
 LOGGER = log.get_logger(__name__)
 
+# Parses full timestamps in directory names, remembering the last format found
+_DIRECTORY_PARSER = TimestampParser((HYPHENATED, UNDERSCORED, ISO_COMPACT))
+
+# Time components following a date found by date_utils
+_TIME_PATTERNS = (
+    re.compile(r"_(\d{2})-(\d{2})-(\d{2})"),
+    re.compile(r"_(\d{2})(\d{2})(\d{2})"),
+    re.compile(r"T(\d{2})(\d{2})(\d{2})"),
+)
+_SATDAY_PATTERN = re.compile(r"GOES\d+/FD/\d+/(\d{4})/(\d{3})")
+_SATELLITE_NAME = re.compile(r"goes\d+_")
+
 
 class TimestampExtractor:
     """Extract timestamps from filenames and directory names."""
@@ -126,17 +139,19 @@ class TimestampExtractor:
         Returns:
             datetime object if extraction succeeded, None otherwise
         """
-        # First try to parse with date_utils to extract date component
+        # Full timestamps (YYYY-MM-DD_HH-MM-SS, YYYYMMDD_HHMMSS, YYYYMMDDTHHMMSS)
+        # are parsed by slicing, without a regex per format
+        timestamp = _DIRECTORY_PARSER.parse(dirname)
+        if timestamp is not None:
+            return timestamp
+
+        # Then try to parse with date_utils to extract date component
         date_obj = date_utils.parse_satellite_path(dirname)
 
         # If date_utils successfully extracted a date, try to extract time components
         if date_obj:
             # Look for time components in HH-MM-SS or HHMMSS format
-            time_pattern1 = re.compile(r"_(\d{2})-(\d{2})-(\d{2})")
-            time_pattern2 = re.compile(r"_(\d{2})(\d{2})(\d{2})")
-            time_pattern3 = re.compile(r"T(\d{2})(\d{2})(\d{2})")
-
-            for pattern in [time_pattern1, time_pattern2, time_pattern3]:
+            for pattern in _TIME_PATTERNS:
                 match = pattern.search(dirname)
                 if match:
                     try:
@@ -158,64 +173,8 @@ class TimestampExtractor:
             # If we found a date but no time, return datetime at midnight
             return datetime(date_obj.year, date_obj.month, date_obj.day, 0, 0, 0)
 
-        # If date_utils couldn't extract a date, fall back to our original approach
-
-        # Pattern 1: YYYY-MM-DD_HH-MM-SS (primary format)
-        dir_pattern1 = re.compile(r"(\d{4})-(\d{2})-(\d{2})_(\d{2})-(\d{2})-(\d{2})")
-        match = dir_pattern1.search(dirname)
-
-        if match:
-            try:
-                year = int(match.group(1))
-                month = int(match.group(2))
-                day = int(match.group(3))
-                hour = int(match.group(4))
-                minute = int(match.group(5))
-                second = int(match.group(6))
-
-                return datetime(year, month, day, hour, minute, second)
-            except (ValueError, IndexError):
-                pass  # Try next pattern
-
-        # Pattern 2: YYYYMMDD_HHMMSS
-        dir_pattern2 = re.compile(r"(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})")
-        match = dir_pattern2.search(dirname)
-
-        if match:
-            try:
-                year = int(match.group(1))
-                month = int(match.group(2))
-                day = int(match.group(3))
-                hour = int(match.group(4))
-                minute = int(match.group(5))
-                second = int(match.group(6))
-
-                return datetime(year, month, day, hour, minute, second)
-            except (ValueError, IndexError):
-                pass  # Try next pattern
-
-        # Pattern 3: YYYYMMDDTHHMMSS
-        dir_pattern3 = re.compile(r"(\d{4})(\d{2})(\d{2})T(\d{2})(\d{2})(\d{2})")
-        match = dir_pattern3.search(dirname)
-
-        if match:
-            try:
-                year = int(match.group(1))
-                month = int(match.group(2))
-                day = int(match.group(3))
-                hour = int(match.group(4))
-                minute = int(match.group(5))
-                second = int(match.group(6))
-
-                return datetime(year, month, day, hour, minute, second)
-            except (ValueError, IndexError):
-                pass  # Try next pattern
-
-        # Pattern 4: Satellite specific pattern like GOES18/FD/13/YYYY/DDD
-        # This pattern is more complex, involves directories like GOES18/FD/13/2023/123
-        satday_pattern = re.compile(r"GOES\d+/FD/\d+/(\d{4})/(\d{3})")
-        match = satday_pattern.search(dirname)
-
+        # Satellite specific pattern like GOES18/FD/13/YYYY/DDD
+        match = _SATDAY_PATTERN.search(dirname)
         if match:
             try:
                 year = int(match.group(1))
@@ -229,22 +188,10 @@ class TimestampExtractor:
             except (ValueError, IndexError):
                 pass  # Try next pattern
 
-        # Pattern 5: SATNAME_YYYYMMDD_HHMMSS (e.g. goes18_20230615_120000)
-        sat_pattern = re.compile(r"goes\d+_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})")
-        match = sat_pattern.search(dirname)
-
+        # SATNAME_YYYYMMDD_HHMMSS (e.g. goes18_20230615_120000)
+        match = _SATELLITE_NAME.search(dirname)
         if match:
-            try:
-                year = int(match.group(1))
-                month = int(match.group(2))
-                day = int(match.group(3))
-                hour = int(match.group(4))
-                minute = int(match.group(5))
-                second = int(match.group(6))
-
-                return datetime(year, month, day, hour, minute, second)
-            except (ValueError, IndexError):
-                pass  # All patterns failed
+            return UNDERSCORED.parse_at(dirname, match.end())
 
         # No pattern matched
         return None
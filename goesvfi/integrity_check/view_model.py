@@ -436,6 +436,10 @@ class IntegrityCheckViewModel(QObject):
             LOGGER.exception("Error getting cache stats: %s", e)
             return {"error": str(e)}
 
+    def cleanup(self) -> None:
+        """Stop the background directory watcher started by the last scan."""
+        self._reconciler.stop_watching()
+
     # --- Callback handlers ---
 
     def _update_scan_progress(self, current: int, total: int, eta: float) -> None:
@@ -465,6 +469,7 @@ class IntegrityCheckViewModel(QObject):
 
         # Process successful result
         self._last_scan_time = datetime.now()  # pylint: disable=attribute-defined-outside-init
+        self._reconciler.watch_directory(self._base_directory, self._selected_pattern)
         self._total_expected = result.get("total_expected", 0)  # pylint: disable=attribute-defined-outside-init
         self._total_found = result.get("total_found", 0)  # pylint: disable=attribute-defined-outside-init
         self._detected_interval = result.get("interval", 0)  # pylint: disable=attribute-defined-outside-init
@@ -0,0 +1,282 @@
+"""Preprocessed frames and interpolations shared between jobs.
+
+Batch jobs often cover overlapping date ranges with the same crop and Sanchez
+settings, yet each job colourised, cropped and interpolated every frame again
+in its own temporary directory. :class:`ArtifactStore` keeps those results in
+one directory, addressed by a key derived from what produced them: the
+identity of the input frames and the processing parameters. A job that finds
+an artifact under its key links it into its own directory instead of
+computing it, so overlapping jobs only compute the frames they don't share.
+
+An input frame's identity is its resolved path, size and modification time,
+so a frame that is downloaded again gets new keys. The index is SQLite in WAL
+mode. Each job that uses an artifact holds a reference to it until the job
+releases them all; the store is kept under ``max_bytes`` by deleting the least
+recently used artifacts that no job references, so a running job never loses
+an artifact it took.
+"""
+
+from collections.abc import Iterable
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import sqlite3
+import threading
+import time
+from types import TracebackType
+from typing import Any
+
+from goesvfi.utils import config, log
+from goesvfi.utils.metrics import CACHE_REQUESTS
+
+LOGGER = log.get_logger(__name__)
+
+# Size the store is trimmed to, counting only unreferenced artifacts (5 GB)
+DEFAULT_MAX_BYTES = 5 * 1024**3
+
+# Seconds a connection waits on an index locked by another process
+BUSY_TIMEOUT = 30.0
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS artifacts (
+        key TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        last_used REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS artifacts_by_last_used ON artifacts (last_used)",
+    """
+    CREATE TABLE IF NOT EXISTS refs (
+        owner TEXT NOT NULL,
+        key TEXT NOT NULL,
+        PRIMARY KEY (owner, key)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS refs_by_key ON refs (key)",
+)
+
+
+def default_artifact_store_path() -> Path:
+    """Get the default artifact store directory in the cache directory."""
+    return Path(config.get_cache_dir()) / "artifacts"
+
+
+def input_identity(path: Path) -> str:
+    """Identify an input file by its resolved path, size and modification time."""
+    stat = path.stat()
+    return hashlib.sha256(f"{path.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}".encode()).hexdigest()
+
+
+def artifact_key(kind: str, *inputs: str, **params: Any) -> str:
+    """Derive the key of an artifact from its inputs and processing parameters.
+
+    Args:
+        kind: What the artifact is, e.g. ``"frame"`` or ``"interpolation"``
+        *inputs: Identities or keys of the inputs, in order
+        **params: Parameters that change the result; must be JSON serializable
+
+    Returns:
+        The key, a hex digest
+    """
+    h = hashlib.sha256(kind.encode())
+    for value in inputs:
+        h.update(b"\0" + value.encode())
+    h.update(b"\0" + json.dumps(params, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """Hard link ``source`` to ``destination``, copying it across file systems."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+class ArtifactStore:
+    """Content-addressed files with reference-counted eviction.
+
+    The store is safe to use from several threads and processes.
+    """
+
+    def __init__(self, root: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Open (or create) an artifact store.
+
+        Args:
+            root: Store directory; defaults to ``default_artifact_store_path()``
+            max_bytes: Size to trim unreferenced artifacts to
+        """
+        self.root = root if root is not None else default_artifact_store_path()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._objects = self.root / "objects"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._conn = sqlite3.connect(str(self.root / "index.db"), timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def __enter__(self) -> "ArtifactStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def path_for(self, key: str) -> Path:
+        """Get where the artifact with ``key`` is stored."""
+        return self._objects / key[:2] / f"{key}.png"
+
+    def checkout(self, key: str, destination: Path, owner: str | None = None) -> bool:
+        """Link a stored artifact to ``destination`` if there is one.
+
+        Args:
+            key: Artifact key
+            destination: Path for the job's own link or copy
+            owner: Job that holds a reference to the artifact until released
+
+        Returns:
+            True if the artifact was found
+        """
+        stored = self.path_for(key)
+        with self._lock, self._conn:
+            found = self._conn.execute("SELECT 1 FROM artifacts WHERE key = ?", (key,)).fetchone() is not None
+            if found and stored.exists():
+                self._conn.execute("UPDATE artifacts SET last_used = ? WHERE key = ?", (time.time(), key))
+                if owner is not None:
+                    self._conn.execute("INSERT OR IGNORE INTO refs (owner, key) VALUES (?, ?)", (owner, key))
+            else:
+                if found:
+                    LOGGER.warning("Artifact %s is missing from %s; dropping it", key, self._objects)
+                    self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                self.misses += 1
+                CACHE_REQUESTS.inc(cache="artifacts", result="miss")
+                return False
+            self.hits += 1
+            CACHE_REQUESTS.inc(cache="artifacts", result="hit")
+        link_or_copy(stored, destination)
+        return True
+
+    def put(self, key: str, source: Path, kind: str, owner: str | None = None) -> None:
+        """Store a copy of ``source`` under ``key``; ``source`` stays in place.
+
+        Args:
+            key: Artifact key, from ``artifact_key``
+            source: File to store
+            kind: What the artifact is, for statistics
+            owner: Job that holds a reference to the artifact until released
+        """
+        stored = self.path_for(key)
+        if not stored.exists():
+            stored.parent.mkdir(exist_ok=True)
+            # Linked under a unique name and renamed, so a reader never sees a partial file
+            partial = stored.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.partial")
+            try:
+                link_or_copy(source, partial)
+                partial.replace(stored)
+            finally:
+                partial.unlink(missing_ok=True)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts (key, kind, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, kind, stored.stat().st_size, time.time()),
+            )
+            if owner is not None:
+                self._conn.execute("INSERT OR IGNORE INTO refs (owner, key) VALUES (?, ?)", (owner, key))
+            over_budget = self._total_bytes() > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def release(self, owner: str) -> int:
+        """Drop every reference a job holds, then trim the store.
+
+        Returns:
+            The number of references dropped
+        """
+        with self._lock, self._conn:
+            released = self._conn.execute("DELETE FROM refs WHERE owner = ?", (owner,)).rowcount
+        if released:
+            LOGGER.debug("Job %s released %d artifacts", owner, released)
+            self.evict()
+        return released
+
+    def refcount(self, key: str) -> int:
+        """Count the jobs holding a reference to an artifact."""
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM refs WHERE key = ?", (key,)).fetchone()[0])
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Delete least recently used unreferenced artifacts until the store fits.
+
+        Args:
+            max_bytes: Size to trim to; defaults to ``self.max_bytes``
+
+        Returns:
+            The number of artifacts deleted
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock, self._conn:
+            excess = self._total_bytes() - limit
+            if excess <= 0:
+                return 0
+            evicted: list[str] = []
+            for key, size in self._conn.execute(
+                "SELECT key, size FROM artifacts WHERE key NOT IN (SELECT key FROM refs) ORDER BY last_used"
+            ):
+                if excess <= 0:
+                    break
+                evicted.append(key)
+                excess -= size
+            self._conn.executemany("DELETE FROM artifacts WHERE key = ?", [(key,) for key in evicted])
+        self._unlink(evicted)
+        if excess > 0:
+            LOGGER.debug("Artifact store over budget by %d bytes held by running jobs", excess)
+        LOGGER.debug("Evicted %d artifacts", len(evicted))
+        return len(evicted)
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get artifact counts and sizes by kind, and the hit rate since opening."""
+        with self._lock:
+            rows = self._conn.execute("SELECT kind, COUNT(*), SUM(size) FROM artifacts GROUP BY kind").fetchall()
+            referenced = int(self._conn.execute("SELECT COUNT(DISTINCT key) FROM refs").fetchone()[0])
+        lookups = self.hits + self.misses
+        return {
+            "artifacts_by_kind": {kind: count for kind, count, _size in rows},
+            "total_bytes": sum(size for _kind, _count, size in rows),
+            "referenced": referenced,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the index."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._conn.close()
+
+    def _total_bytes(self) -> int:
+        return int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0])
+
+    def _unlink(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            try:
+                self.path_for(key).unlink(missing_ok=True)
+            except OSError:
+                LOGGER.warning("Could not delete artifact %s", key, exc_info=True)
@@ -3,25 +3,86 @@
 This module provides a queue-based system for processing multiple video
 interpolation jobs in sequence with configurable priorities and resource
 management.
+
+Jobs are scheduled by a small pool of worker threads that sleep on a condition
+variable and wake when a job is added, finishes or is cancelled, or when the
+queue is stopped or resized. Pending jobs are taken in :class:`JobPriority`
+order, and a job is only admitted when its estimated memory and CPUs fit in
+what the :class:`ResourceManager` allows next to the jobs already running, so
+that several large jobs can't run together and exhaust memory while small
+jobs still run side by side. A job that doesn't fit keeps its place and
+reserves its share, so that smaller jobs queued after it can't starve it.
+When that job has a higher priority than running jobs, those are asked to
+stop through ``settings["should_stop"]``; a process function that honours it
+raises :class:`JobPreempted` and the job is queued again.
+
+Admission also follows the :class:`~goesvfi.utils.memory_pressure.MemoryPressureBus`.
+While memory pressure is critical no job is started, and if several jobs are
+running the lowest-priority one is preempted. Jobs are admitted again once the
+pressure has eased.
+
+Jobs are persisted in a :class:`~goesvfi.pipeline.job_store.JobStore`, one row
+per job, so each state change writes only the job that changed.
+
+A queue given an :class:`~goesvfi.pipeline.artifact_store.ArtifactStore` lends
+it to every job as ``settings["artifact_store"]``, with the job ID as
+``settings["artifact_owner"]``, so that jobs over overlapping frames share
+preprocessed frames and interpolations through ``run_vfi``. A job's references
+to artifacts are released when it stops running.
+
+The jobs of every live queue are reported as metrics, with the number of
+pending jobs as ``goes_vfi_processing_queue_size``.
 """
 
-from collections.abc import Callable
+import bisect
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 import json
 from pathlib import Path
-from queue import PriorityQueue
+import sqlite3
 import threading
 import time
 from typing import Any
+import weakref
 
+from PIL import Image
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from goesvfi.pipeline.artifact_store import ArtifactStore
+from goesvfi.pipeline.job_store import JobStore
+from goesvfi.pipeline.resource_manager import ResourceCapacity, estimate_processing_memory, get_resource_manager
 from goesvfi.utils import log
+from goesvfi.utils.memory_pressure import MemoryPressureBus, PressureLevel, get_memory_pressure_bus
+from goesvfi.utils.metrics import ERRORS, REGISTRY, MetricFamily
 
 LOGGER = log.get_logger(__name__)
 
+# Seconds between admission retries while a job waits for memory; memory
+# freed by other processes doesn't wake the workers
+ADMISSION_RETRY_SECONDS = 2.0
+
+# Seconds close() waits for running jobs to save their final state
+CLOSE_TIMEOUT_SECONDS = 5.0
+
+# Memory assumed for a job whose frame size can't be determined
+DEFAULT_JOB_MEMORY_MB = 500
+
+_IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".tif", ".tiff"}
+
+# Settings injected while a job runs, which aren't persisted
+_RUNTIME_SETTINGS = frozenset({"progress_callback", "should_stop", "artifact_store", "artifact_owner"})
+
+
+class JobPreempted(Exception):  # noqa: N818
+    """Raised by a process function that stopped because its job was preempted.
+
+    Process functions that can stop part way poll ``job.settings["should_stop"]``
+    and raise this when it returns True. The job is queued again instead of
+    being marked failed.
+    """
+
 
 class JobStatus(Enum):
     """Status of a batch job."""
@@ -58,6 +119,9 @@ class BatchJob:
     completed_at: datetime | None = None
     error_message: str | None = None
     progress: float = 0.0
+    queue_wait_seconds: float = 0.0  # Total time spent pending, across requeues
+    run_seconds: float = 0.0  # Total time spent running, across preemptions
+    preemptions: int = 0
 
     def __lt__(self, other: "BatchJob") -> bool:
         """Compare jobs by priority for queue ordering."""
@@ -72,7 +136,12 @@ class BatchJob:
             "name": self.name,
             "input_path": str(self.input_path),
             "output_path": str(self.output_path),
-            "settings": self.settings,
+            # Callbacks and the artifact store injected while the job runs aren't serializable
+            "settings": {
+                key: value
+                for key, value in self.settings.items()
+                if key not in _RUNTIME_SETTINGS and not callable(value)
+            },
             "priority": self.priority.name,
             "status": self.status.name,
             "created_at": self.created_at.isoformat(),
@@ -80,6 +149,9 @@ class BatchJob:
             "completed_at": (self.completed_at.isoformat() if self.completed_at else None),
             "error_message": self.error_message,
             "progress": self.progress,
+            "queue_wait_seconds": self.queue_wait_seconds,
+            "run_seconds": self.run_seconds,
+            "preemptions": self.preemptions,
         }
 
     @classmethod
@@ -96,6 +168,9 @@ class BatchJob:
             created_at=datetime.fromisoformat(data["created_at"]),
             error_message=data.get("error_message"),
             progress=data.get("progress", 0.0),
+            queue_wait_seconds=data.get("queue_wait_seconds", 0.0),
+            run_seconds=data.get("run_seconds", 0.0),
+            preemptions=data.get("preemptions", 0),
         )
 
         if data.get("started_at"):
@@ -106,6 +181,67 @@ class BatchJob:
         return job
 
 
+@dataclass(frozen=True)
+class JobResources:
+    """Memory and CPUs a job is expected to use while it runs."""
+
+    memory_mb: int
+    cpus: int = 1
+
+
+def estimate_job_resources(job: BatchJob) -> JobResources:
+    """Estimate the memory and CPUs a job needs while it runs.
+
+    The job uses one CPU per ``max_workers`` setting. ``estimated_memory_mb``
+    in the settings overrides the memory estimate; otherwise the frame size is
+    taken from the crop rectangle or the first image of the input, and
+    :func:`estimate_processing_memory` is applied to the frames the pipeline
+    holds at once: a pair of input frames and the frames interpolated between
+    them, for each worker.
+
+    Args:
+        job: The job to estimate
+
+    Returns:
+        The job's expected resource use
+    """
+    settings = job.settings
+    cpus = max(1, int(settings.get("max_workers") or 1))
+    if settings.get("estimated_memory_mb") is not None:
+        return JobResources(int(settings["estimated_memory_mb"]), cpus)
+
+    frame_size = _frame_size(job)
+    if frame_size is None:
+        return JobResources(DEFAULT_JOB_MEMORY_MB, cpus)
+
+    interpolated = max(0, int(settings.get("multiplier") or 2) - 1)
+    frames_in_flight = (2 + interpolated) * cpus
+    return JobResources(max(1, estimate_processing_memory(frames_in_flight, *frame_size)), cpus)
+
+
+def _frame_size(job: BatchJob) -> tuple[int, int] | None:
+    """Get a job's frame width and height, or None if it can't be read."""
+    crop_rect = job.settings.get("crop_rect")
+    if crop_rect and len(crop_rect) == 4:
+        return int(crop_rect[2]), int(crop_rect[3])
+
+    path: Path | None = job.input_path
+    try:
+        if job.input_path.is_dir():
+            images = (p for p in sorted(job.input_path.iterdir()) if p.suffix.lower() in _IMAGE_SUFFIXES)
+            path = next(images, None)
+        if path is None:
+            return None
+        # Only the header is read
+        with Image.open(path) as image:
+            return image.size
+    except (OSError, ValueError):
+        return None
+
+
+_queues: "weakref.WeakSet[BatchQueue]" = weakref.WeakSet()
+
+
 class BatchQueue(QObject):
     """Manages a queue of batch processing jobs."""
 
@@ -116,6 +252,8 @@ class BatchQueue(QObject):
     job_completed = pyqtSignal(str)  # job_id
     job_failed = pyqtSignal(str, str)  # job_id, error
     job_cancelled = pyqtSignal(str)  # job_id
+    job_deferred = pyqtSignal(str, str)  # job_id, reason
+    job_preempted = pyqtSignal(str)  # job_id
     queue_empty = pyqtSignal()
 
     def __init__(
@@ -123,71 +261,119 @@ class BatchQueue(QObject):
         process_function: Callable[[BatchJob], None],
         max_concurrent_jobs: int = 1,
         resource_manager: Any | None = None,
+        resource_estimator: Callable[[BatchJob], JobResources] = estimate_job_resources,
+        job_store: JobStore | None = None,
+        artifact_store: ArtifactStore | None = None,
+        memory_pressure: MemoryPressureBus | None = None,
     ) -> None:
         """Initialize batch queue.
 
         Args:
             process_function: Function to process each job
             max_concurrent_jobs: Maximum concurrent jobs (default 1)
-            resource_manager: Optional resource manager for limits
+            resource_manager: Optional resource manager for limits; the
+                global one is used when not given
+            resource_estimator: Function estimating the resources a job needs
+            job_store: Where jobs are persisted; defaults to a store at
+                ``default_job_store_path()``
+            artifact_store: Frames and interpolations shared between jobs
+            memory_pressure: Memory pressure that pauses admission; the
+                global bus is used when not given
         """
         super().__init__()
 
         self.process_function = process_function
-        self.max_concurrent_jobs = max_concurrent_jobs
         self.resource_manager = resource_manager
+        self.resource_estimator = resource_estimator
+        self._max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self._store = job_store if job_store is not None else JobStore()
+        self.artifact_store = artifact_store
+        self.memory_pressure = memory_pressure if memory_pressure is not None else get_memory_pressure_bus()
 
-        self._queue: PriorityQueue[BatchJob] = PriorityQueue()
         self._jobs: dict[str, BatchJob] = {}
-        self._active_jobs: dict[str, threading.Thread] = {}
+        self._pending: list[BatchJob] = []  # Sorted by priority, then age
+        self._enqueued_at: dict[str, float] = {}
+        self._resources: dict[str, JobResources] = {}
+        self._active_jobs: dict[str, JobResources] = {}
+        self._deferred: set[str] = set()
+        self._preempt_requested: set[str] = set()
+        self._waiting_for_resources = False
         self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
         self._running = False
-        self._worker_thread: threading.Thread | None = None
+        self._worker_count = 0
 
         # Load persisted queue
         self._load_queue()
 
+        self.memory_pressure.subscribe(self._on_memory_pressure)
+        _queues.add(self)
+
+    @property
+    def max_concurrent_jobs(self) -> int:
+        """Maximum number of jobs that run at once."""
+        return self._max_concurrent_jobs
+
+    @max_concurrent_jobs.setter
+    def max_concurrent_jobs(self, value: int) -> None:
+        with self._cond:
+            self._max_concurrent_jobs = max(1, value)
+            if self._running:
+                self._start_workers()
+            self._cond.notify_all()
+
     def start(self) -> None:
         """Start processing queue."""
-        if self._running:
-            return
-
-        self._running = True
-        self._worker_thread = threading.Thread(target=self._process_queue, daemon=True)
-        self._worker_thread.start()
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._start_workers()
+        self.memory_pressure.start()
         LOGGER.info("Batch queue started")
 
     def stop(self) -> None:
-        """Stop processing queue."""
-        self._running = False
-        if self._worker_thread:
-            self._worker_thread.join(timeout=5.0)
+        """Stop processing queue.
+
+        Running jobs finish; pending jobs stay queued until the queue is
+        started again.
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
         LOGGER.info("Batch queue stopped")
 
+    def close(self, timeout: float = CLOSE_TIMEOUT_SECONDS) -> None:
+        """Stop processing and close the job store.
+
+        Running jobs get up to ``timeout`` seconds to finish and save their
+        state. A job still running after that stays stored as running and
+        is queued again when the queue is next loaded.
+        """
+        self.stop()
+        self.memory_pressure.unsubscribe(self._on_memory_pressure)
+        with self._cond:
+            if not self._cond.wait_for(lambda: not self._active_jobs, timeout):
+                LOGGER.warning("Closing batch queue with %d jobs still running", len(self._active_jobs))
+        self._store.close()
+
     def add_job(self, job: BatchJob) -> None:
         """Add job to queue."""
-        with self._lock:
+        resources = self.resource_estimator(job)
+        # Stored before a worker can see it, so its later updates find the row
+        self._persist(self._store.put, job)
+        with self._cond:
             self._jobs[job.id] = job
-            self._queue.put(job)
-            # Don't call _save_queue here as we're already holding the lock
-            # Save the queue data directly
-            data = {"jobs": [j.to_dict() for j in self._jobs.values()]}
-
-        # Save outside the lock to avoid deadlock
-        queue_file = Path.home() / ".config" / "goesvfi" / "batch_queue.json"
-        queue_file.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with open(queue_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-        except Exception:
-            LOGGER.exception("Failed to save queue")
+            self._resources[job.id] = resources
+            if job.status == JobStatus.PENDING:
+                self._enqueue(job)
 
         self.job_added.emit(job.id)
-        LOGGER.info("Job %s added to queue: %s", job.id, job.name)
+        LOGGER.info("Job %s added to queue: %s (%sMB, %s CPUs)", job.id, job.name, resources.memory_mb, resources.cpus)
 
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a job."""
-        with self._lock:
+        with self._cond:
             if job_id not in self._jobs:
                 return False
 
@@ -198,22 +384,32 @@ class BatchQueue(QObject):
                 return False
 
             job.status = JobStatus.CANCELLED
-            # Don't call _save_queue here as we're already holding the lock
-            data = {"jobs": [j.to_dict() for j in self._jobs.values()]}
+            self._dequeue(job)
+            # A deferred job may have been holding back smaller ones
+            self._cond.notify_all()
 
-        # Save outside the lock to avoid deadlock
-        queue_file = Path.home() / ".config" / "goesvfi" / "batch_queue.json"
-        queue_file.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with open(queue_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-        except Exception:
-            LOGGER.exception("Failed to save queue")
+        self._persist(self._store.update, job, JobStatus.PENDING)
 
         self.job_cancelled.emit(job_id)
         LOGGER.info("Job %s cancelled", job_id)
         return True
 
+    def preempt_job(self, job_id: str) -> bool:
+        """Ask a running job to stop and go back to the queue.
+
+        The request is cooperative: it is seen by process functions that poll
+        ``settings["should_stop"]`` and raise :class:`JobPreempted`.
+
+        Returns:
+            True if the job is running and was asked to stop
+        """
+        with self._cond:
+            if job_id not in self._active_jobs:
+                return False
+            self._preempt_requested.add(job_id)
+        LOGGER.info("Job %s asked to stop for preemption", job_id)
+        return True
+
     def get_job(self, job_id: str) -> BatchJob | None:
         """Get job by ID."""
         return self._jobs.get(job_id)
@@ -229,6 +425,24 @@ class BatchQueue(QObject):
             pending = [j for j in self._jobs.values() if j.status == JobStatus.PENDING]
             return sorted(pending)
 
+    def get_statistics(self) -> dict[str, Any]:
+        """Get job counts, timings and the resources held by running jobs."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            active = list(self._active_jobs.values())
+
+        finished = [job for job in jobs if job.status in {JobStatus.COMPLETED, JobStatus.FAILED}]
+        return {
+            "jobs_by_status": {status.value: sum(job.status == status for job in jobs) for status in JobStatus},
+            "mean_queue_wait_seconds": (
+                sum(job.queue_wait_seconds for job in finished) / len(finished) if finished else 0.0
+            ),
+            "mean_run_seconds": sum(job.run_seconds for job in finished) / len(finished) if finished else 0.0,
+            "running_memory_mb": sum(resources.memory_mb for resources in active),
+            "running_cpus": sum(resources.cpus for resources in active),
+            "preemptions": sum(job.preemptions for job in jobs),
+        }
+
     def clear_completed(self) -> int:
         """Clear completed and cancelled jobs."""
         with self._lock:
@@ -238,60 +452,179 @@ class BatchQueue(QObject):
 
             for job_id in to_remove:
                 del self._jobs[job_id]
+                self._resources.pop(job_id, None)
 
-            # Don't call _save_queue here as we're already holding the lock
-            data = {"jobs": [j.to_dict() for j in self._jobs.values()]}
-
-        # Save outside the lock to avoid deadlock
-        queue_file = Path.home() / ".config" / "goesvfi" / "batch_queue.json"
-        queue_file.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with open(queue_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-        except Exception:
-            LOGGER.exception("Failed to save queue")
+        self._persist(self._store.delete, to_remove)
 
         LOGGER.info("Cleared %s completed/cancelled jobs", len(to_remove))
         return len(to_remove)
 
+    def _enqueue(self, job: BatchJob) -> None:
+        """Add a pending job to the schedule and wake a worker. Called with the lock held."""
+        bisect.insort(self._pending, job)
+        self._enqueued_at[job.id] = time.monotonic()
+        self._cond.notify()
+
+    def _dequeue(self, job: BatchJob) -> None:
+        """Remove a job from the schedule. Called with the lock held."""
+        self._pending = [pending for pending in self._pending if pending.id != job.id]
+        self._deferred.discard(job.id)
+        started = self._enqueued_at.pop(job.id, None)
+        if started is not None:
+            job.queue_wait_seconds += time.monotonic() - started
+
+    def _start_workers(self) -> None:
+        """Start worker threads up to the concurrency limit. Called with the lock held."""
+        while self._worker_count < self._max_concurrent_jobs:
+            self._worker_count += 1
+            threading.Thread(target=self._process_queue, name="BatchQueueWorker", daemon=True).start()
+
     def _process_queue(self) -> None:
-        """Worker thread to process queue."""
-        while self._running:
-            # Check if we can start another job
-            with self._lock:
-                if len(self._active_jobs) >= self.max_concurrent_jobs:
-                    time.sleep(0.5)
+        """Worker thread: wait for an admissible job, run it, repeat."""
+        while True:
+            with self._cond:
+                if not self._running or self._worker_count > self._max_concurrent_jobs:
+                    self._worker_count -= 1
+                    return
+                job, deferred = self._admit_next_job()
+                if job is None and not deferred:
+                    # Woken when a job is added, finishes or is cancelled
+                    self._cond.wait(ADMISSION_RETRY_SECONDS if self._waiting_for_resources else None)
                     continue
+                if job is not None and self._pending:
+                    # Another worker may be able to pack in the next job
+                    self._cond.notify()
 
-            # Get next job
-            try:
-                job = self._queue.get(timeout=0.5)
-            except Exception:
-                continue
-
-            # Skip if cancelled
-            if job.status == JobStatus.CANCELLED:
-                continue
+            for job_id, reason in deferred:
+                self.job_deferred.emit(job_id, reason)
+            if job is not None:
+                self._process_job(job)
 
-            # Start processing
-            thread = threading.Thread(target=self._process_job, args=(job,), daemon=True)
+    def _capacity(self) -> ResourceCapacity:
+        """Get the resources batch jobs may use."""
+        manager = self.resource_manager or get_resource_manager()
+        return manager.get_capacity()
 
-            with self._lock:
-                self._active_jobs[job.id] = thread
+    def _admit_next_job(self) -> tuple[BatchJob | None, list[tuple[str, str]]]:
+        """Pick the highest-priority pending job that fits and mark it running.
 
-            thread.start()
+        Called with the lock held.
 
-        # Wait for active jobs to complete
-        for thread in self._active_jobs.values():
-            thread.join(timeout=5.0)
+        Returns:
+            The admitted job, if any, and the ``(job_id, reason)`` of jobs that
+            were deferred for the first time
+        """
+        newly_deferred: list[tuple[str, str]] = []
+        self._waiting_for_resources = False
+        if not self._pending or len(self._active_jobs) >= self._max_concurrent_jobs:
+            return None, newly_deferred
+
+        if self.memory_pressure.level >= PressureLevel.CRITICAL:
+            # Woken when the pressure eases
+            self._waiting_for_resources = True
+            for job in self._pending:
+                if job.id not in self._deferred:
+                    self._deferred.add(job.id)
+                    reason = "memory pressure is critical"
+                    LOGGER.info("Job %s deferred: %s", job.id, reason)
+                    newly_deferred.append((job.id, reason))
+            return None, newly_deferred
+
+        capacity = self._capacity()
+        used_memory = sum(resources.memory_mb for resources in self._active_jobs.values())
+        used_cpus = sum(resources.cpus for resources in self._active_jobs.values())
+        # Running jobs' memory is already missing from what's available
+        memory_budget = capacity.memory_limit_mb
+        if capacity.available_memory_mb > 0:
+            memory_budget = min(memory_budget, capacity.available_memory_mb + used_memory)
+        free_memory = memory_budget - used_memory
+        free_cpus = capacity.cpus - used_cpus
+
+        for job in self._pending:
+            resources = self._resources.get(job.id)
+            if resources is None:
+                resources = self._resources[job.id] = self.resource_estimator(job)
+            cpus = min(resources.cpus, capacity.cpus)
+
+            if (resources.memory_mb <= free_memory and cpus <= free_cpus) or not self._active_jobs:
+                if resources.memory_mb > memory_budget:
+                    LOGGER.warning(
+                        "Job %s needs %sMB but only %sMB is available; running it alone",
+                        job.id,
+                        resources.memory_mb,
+                        memory_budget,
+                    )
+                self._dequeue(job)
+                self._active_jobs[job.id] = JobResources(resources.memory_mb, cpus)
+                job.status = JobStatus.RUNNING
+                return job, newly_deferred
+
+            self._waiting_for_resources = True
+            if job.id not in self._deferred:
+                self._deferred.add(job.id)
+                reason = f"needs {resources.memory_mb}MB and {cpus} CPUs; {max(free_memory, 0)}MB and {max(free_cpus, 0)} free"
+                LOGGER.info("Job %s deferred: %s", job.id, reason)
+                newly_deferred.append((job.id, reason))
+            self._request_preemption(job, resources.memory_mb - free_memory, cpus - free_cpus)
+            # Reserve what this job needs, so that smaller jobs queued after it
+            # can't keep it waiting forever
+            free_memory -= resources.memory_mb
+            free_cpus -= cpus
+
+        return None, newly_deferred
+
+    def _on_memory_pressure(self, level: PressureLevel) -> None:
+        """Pause or resume admission, preempting a job if memory is critical."""
+        with self._cond:
+            if level >= PressureLevel.CRITICAL and len(self._active_jobs) > 1:
+                candidates = [
+                    self._jobs[job_id] for job_id in self._active_jobs if job_id not in self._preempt_requested
+                ]
+                if len(candidates) > 1:
+                    victim = max(
+                        candidates,
+                        key=lambda running: (running.priority.value, running.started_at or datetime.min),
+                    )
+                    LOGGER.info("Preempting job %s under critical memory pressure", victim.id)
+                    self._preempt_requested.add(victim.id)
+            self._cond.notify_all()
+
+    def _request_preemption(self, job: BatchJob, memory_short_mb: int, cpus_short: int) -> None:
+        """Ask lower-priority running jobs to stop if that makes room for a job.
+
+        Called with the lock held.
+        """
+        candidates = sorted(
+            (
+                self._jobs[job_id]
+                for job_id in self._active_jobs
+                if job_id not in self._preempt_requested and self._jobs[job_id].priority.value > job.priority.value
+            ),
+            key=lambda running: (running.priority.value, running.started_at or datetime.min),
+            reverse=True,
+        )
+        victims: list[str] = []
+        freed_memory = freed_cpus = 0
+        for running in candidates:
+            if freed_memory >= memory_short_mb and freed_cpus >= cpus_short:
+                break
+            victims.append(running.id)
+            freed_memory += self._active_jobs[running.id].memory_mb
+            freed_cpus += self._active_jobs[running.id].cpus
+
+        if victims and freed_memory >= memory_short_mb and freed_cpus >= cpus_short:
+            for victim in victims:
+                LOGGER.info("Preempting job %s to make room for job %s", victim, job.id)
+            self._preempt_requested.update(victims)
 
     def _process_job(self, job: BatchJob) -> None:
         """Process a single job."""
+        run_started = time.monotonic()
+        preempted = False
         try:
             # Update status
-            job.status = JobStatus.RUNNING
             job.started_at = datetime.now()
-            self._save_queue()
+            self._persist(self._store.update, job, JobStatus.PENDING)
             self.job_started.emit(job.id)
 
             LOGGER.info("Processing job %s: %s", job.id, job.name)
@@ -301,70 +634,91 @@ class BatchQueue(QObject):
                 job.progress = progress
                 self.job_progress.emit(job.id, progress)
 
-            # Inject progress callback into settings
+            # Inject the callbacks into settings
             job.settings["progress_callback"] = progress_callback
+            job.settings["should_stop"] = lambda: job.id in self._preempt_requested
+            if self.artifact_store is not None:
+                job.settings["artifact_store"] = self.artifact_store
+                job.settings["artifact_owner"] = job.id
 
-            # Apply resource limits if configured
-            if self.resource_manager:
-                with self.resource_manager.monitor_resources():
-                    self.process_function(job)
-            else:
-                self.process_function(job)
+            self.process_function(job)
 
             # Mark completed
             job.status = JobStatus.COMPLETED
             job.completed_at = datetime.now()
             job.progress = 100.0
-            self._save_queue()
+            job.run_seconds += time.monotonic() - run_started
+            self._persist(self._store.update, job, JobStatus.RUNNING)
             self.job_completed.emit(job.id)
 
             LOGGER.info("Job %s completed successfully", job.id)
 
+        except JobPreempted:
+            preempted = True
+            job.status = JobStatus.PENDING
+            job.started_at = None
+            job.progress = 0.0
+            job.run_seconds += time.monotonic() - run_started
+            job.preemptions += 1
+            # Stored before it's queued again, like a new job
+            self._persist(self._store.update, job, JobStatus.RUNNING)
+            self.job_preempted.emit(job.id)
+            LOGGER.info("Job %s preempted; queued again", job.id)
+
         except Exception as e:
             # Mark failed
             job.status = JobStatus.FAILED
             job.completed_at = datetime.now()
             job.error_message = str(e)
-            self._save_queue()
+            job.run_seconds += time.monotonic() - run_started
+            self._persist(self._store.update, job, JobStatus.RUNNING)
             self.job_failed.emit(job.id, str(e))
+            ERRORS.inc(component="batch")
 
             LOGGER.error("Job %s failed: %s", job.id, e, exc_info=True)
 
         finally:
-            # Remove from active jobs
-            with self._lock:
+            if self.artifact_store is not None:
+                self._release_artifacts(job.id)
+
+            # Release the job's resources and let the workers admit more
+            with self._cond:
                 self._active_jobs.pop(job.id, None)
+                self._preempt_requested.discard(job.id)
+                # Unless it was cancelled after it stopped
+                if preempted and job.status == JobStatus.PENDING:
+                    self._enqueue(job)
+                self._cond.notify_all()
+                idle = not self._pending and not self._active_jobs
 
             # Check if queue is empty
-            if self._queue.empty() and not self._active_jobs:
+            if idle:
                 self.queue_empty.emit()
 
-    def _save_queue(self) -> None:
-        """Save queue state to disk."""
-        queue_file = Path.home() / ".config" / "goesvfi" / "batch_queue.json"
-        queue_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with self._lock:
-            data = {"jobs": [job.to_dict() for job in self._jobs.values()]}
+    def _release_artifacts(self, job_id: str) -> None:
+        """Drop a job's references to shared artifacts, logging instead of raising if it fails."""
+        assert self.artifact_store is not None
+        try:
+            self.artifact_store.release(job_id)
+        except (sqlite3.Error, OSError):
+            LOGGER.exception("Failed to release artifacts of job %s", job_id)
 
+    def _persist(self, operation: Callable[..., Any], *args: Any) -> None:
+        """Run a job store write, logging instead of raising if it fails."""
         try:
-            with open(queue_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-        except Exception:
+            operation(*args)
+        except sqlite3.Error:
             LOGGER.exception("Failed to save queue")
 
     def _load_queue(self) -> None:
-        """Load queue state from disk."""
-        queue_file = Path.home() / ".config" / "goesvfi" / "batch_queue.json"
-
-        if not queue_file.exists():
-            return
+        """Load queue state from the job store.
 
+        Jobs are read a batch of rows at a time. Jobs that were running when
+        the queue last stopped go back to pending.
+        """
+        self._import_legacy_queue()
         try:
-            with open(queue_file, encoding="utf-8") as f:
-                data = json.load(f)
-
-            for job_data in data.get("jobs", []):
+            for job_data in self._store.iter_jobs():
                 try:
                     job = BatchJob.from_dict(job_data)
 
@@ -373,28 +727,87 @@ class BatchQueue(QObject):
                         job.status = JobStatus.PENDING
                         job.started_at = None
                         job.progress = 0.0
+                        self._store.update(job, JobStatus.RUNNING)
 
                     self._jobs[job.id] = job
 
                     # Add pending jobs back to queue
                     if job.status == JobStatus.PENDING:
-                        self._queue.put(job)
+                        with self._cond:
+                            self._enqueue(job)
 
                 except Exception:
                     LOGGER.exception("Failed to load job")
 
             LOGGER.info("Loaded %s jobs from queue", len(self._jobs))
 
+        except sqlite3.Error:
+            LOGGER.exception("Failed to load queue")
+
+    def _import_legacy_queue(self) -> None:
+        """Move jobs from the JSON queue file used before the job store into an empty store.
+
+        The file is looked for next to the store's database, which by default
+        is where the queue file was written.
+        """
+        if str(self._store.db_path) == ":memory:":
+            return
+        queue_file = Path(self._store.db_path).with_suffix(".json")
+        if not queue_file.exists():
+            return
+
+        try:
+            if self._store.count():
+                return
+            with open(queue_file, encoding="utf-8") as f:
+                data = json.load(f)
+
+            jobs = []
+            for job_data in data.get("jobs", []):
+                try:
+                    jobs.append(BatchJob.from_dict(job_data))
+                except Exception:
+                    LOGGER.exception("Failed to load job")
+            self._store.put_many(jobs)
+            queue_file.replace(queue_file.with_name(queue_file.name + ".migrated"))
+            LOGGER.info("Moved %s jobs from %s to the job store", len(jobs), queue_file)
+
         except Exception:
             LOGGER.exception("Failed to load queue")
 
 
+def _collect_metrics() -> Iterator[MetricFamily]:
+    pending = 0
+    jobs_by_status = dict.fromkeys(JobStatus, 0)
+    for queue in list(_queues):
+        with queue._lock:  # noqa: SLF001
+            pending += len(queue._pending)  # noqa: SLF001
+            for job in queue._jobs.values():  # noqa: SLF001
+                jobs_by_status[job.status] += 1
+    yield MetricFamily(
+        "goes_vfi_processing_queue_size", "gauge", "Batch jobs waiting to run", [("", {}, float(pending))]
+    )
+    jobs = MetricFamily("goes_vfi_batch_jobs", "gauge", "Batch jobs, by status")
+    for status, count in jobs_by_status.items():
+        jobs.add(count, status=status.value)
+    yield jobs
+
+
+REGISTRY.register_collector(_collect_metrics)
+
+
 class BatchProcessor:
     """High-level batch processing manager."""
 
-    def __init__(self, resource_manager: Any | None = None) -> None:
-        """Initialize batch processor."""
+    def __init__(self, resource_manager: Any | None = None, artifact_store: ArtifactStore | None = None) -> None:
+        """Initialize batch processor.
+
+        Args:
+            resource_manager: Optional resource manager for limits
+            artifact_store: Frames and interpolations shared between the queue's jobs
+        """
         self.resource_manager = resource_manager
+        self.artifact_store = artifact_store
         self.queue: BatchQueue | None = None
 
     def create_queue(self, process_function: Callable[[BatchJob], None], max_concurrent: int = 1) -> BatchQueue:
@@ -403,6 +816,7 @@ class BatchProcessor:
             process_function=process_function,
             max_concurrent_jobs=max_concurrent,
             resource_manager=self.resource_manager,
+            artifact_store=self.artifact_store,
         )
         return self.queue
 
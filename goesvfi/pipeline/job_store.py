@@ -0,0 +1,201 @@
+"""SQLite storage for batch queue jobs.
+
+The batch queue used to rewrite every job to one JSON document on each state
+change, which costs O(n) per transition with thousands of queued jobs and
+leaves a truncated file if the process dies mid-write. :class:`JobStore` keeps
+one row per job instead, so a transition updates a single row in its own
+transaction. Status, priority and creation time are columns, indexed for the
+queries the queue makes; the rest of the job is the JSON from
+``BatchJob.to_dict``.
+
+The database runs in WAL mode, so a reader such as a second GUI instance is
+never blocked by a commit in progress. A status change is a conditional
+``UPDATE`` that only applies if the job is still in the status the caller
+expects, so two writers can't both move a job out of the same state.
+"""
+
+from collections.abc import Iterable, Iterator
+import json
+from pathlib import Path
+import sqlite3
+import threading
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+
+from goesvfi.utils import log
+
+if TYPE_CHECKING:
+    from goesvfi.pipeline.batch_queue import BatchJob, JobStatus
+
+LOGGER = log.get_logger(__name__)
+
+# Rows fetched at a time while the queue is reloaded
+LOAD_BATCH_SIZE = 500
+
+# Seconds a connection waits on a database locked by another process
+BUSY_TIMEOUT = 30.0
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        priority INTEGER NOT NULL,
+        created_at TEXT NOT NULL,
+        data TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, priority, created_at)",
+    "CREATE INDEX IF NOT EXISTS jobs_by_priority ON jobs (priority, created_at, id)",
+)
+
+
+def default_job_store_path() -> Path:
+    """Get the default job store location, next to the old JSON queue file."""
+    return Path.home() / ".config" / "goesvfi" / "batch_queue.db"
+
+
+def _row(job: "BatchJob") -> tuple[str, str, int, str, str]:
+    data = job.to_dict()
+    return job.id, job.status.name, job.priority.value, data["created_at"], json.dumps(data)
+
+
+class JobStore:
+    """Batch jobs stored one row per job in SQLite.
+
+    The store is safe to use from several threads. Every write is committed
+    in its own transaction.
+    """
+
+    def __init__(self, db_path: Path | str | None = None) -> None:
+        """Open (or create) a job store.
+
+        Args:
+            db_path: SQLite database file, or ``":memory:"``; defaults to
+                ``default_job_store_path()``
+        """
+        if db_path is None:
+            db_path = default_job_store_path()
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._closed = False
+        self._conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def __enter__(self) -> "JobStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def put(self, job: "BatchJob") -> None:
+        """Insert a job, or replace it if it's already stored."""
+        self.put_many([job])
+
+    def put_many(self, jobs: Iterable["BatchJob"]) -> None:
+        """Insert or replace several jobs in one transaction."""
+        rows = [_row(job) for job in jobs]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO jobs (id, status, priority, created_at, data) VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def update(self, job: "BatchJob", expected_status: "JobStatus | None" = None) -> bool:
+        """Write a job's current state to its row.
+
+        Args:
+            job: The job, with its new state
+            expected_status: Only update the row if it still has this status
+
+        Returns:
+            True if the row was updated; False if the job isn't stored or its
+            stored status isn't ``expected_status``
+        """
+        job_id, status, priority, _created_at, data = _row(job)
+        query = "UPDATE jobs SET status = ?, priority = ?, data = ? WHERE id = ?"
+        params: tuple[Any, ...] = (status, priority, data, job_id)
+        if expected_status is not None:
+            query += " AND status = ?"
+            params = (*params, expected_status.name)
+        with self._lock, self._conn:
+            updated = self._conn.execute(query, params).rowcount == 1
+        if not updated:
+            LOGGER.debug("Job %s not updated to %s; expected status %s", job_id, status, expected_status)
+        return updated
+
+    def delete(self, job_ids: Iterable[str]) -> int:
+        """Delete jobs by ID.
+
+        Returns:
+            The number of jobs deleted
+        """
+        with self._lock, self._conn:
+            return self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in job_ids]).rowcount
+
+    def iter_jobs(
+        self, statuses: Iterable["JobStatus"] | None = None, batch_size: int = LOAD_BATCH_SIZE
+    ) -> Iterator[dict[str, Any]]:
+        """Read stored jobs in priority order, a batch of rows at a time.
+
+        Args:
+            statuses: Only read jobs with these statuses
+            batch_size: Rows fetched per query
+
+        Yields:
+            Job data for ``BatchJob.from_dict``
+        """
+        conditions: list[str] = []
+        status_params: tuple[str, ...] = ()
+        if statuses is not None:
+            status_params = tuple(status.name for status in statuses)
+            conditions.append(f"status IN ({', '.join('?' * len(status_params))})")
+
+        # Keyset pagination: each batch starts after the last row read, so the
+        # lock isn't held while the caller works and no row is read twice
+        last_key: tuple[int, str, str] | None = None
+        while True:
+            where = list(conditions)
+            params: tuple[Any, ...] = status_params
+            if last_key is not None:
+                where.append("(priority, created_at, id) > (?, ?, ?)")
+                params = (*params, *last_key)
+            query = "SELECT id, status, priority, created_at, data FROM jobs"
+            if where:
+                query += " WHERE " + " AND ".join(where)
+            query += " ORDER BY priority, created_at, id LIMIT ?"
+            with self._lock:
+                rows = self._conn.execute(query, (*params, batch_size)).fetchall()
+
+            for job_id, status, priority, created_at, data in rows:
+                last_key = (priority, created_at, job_id)
+                job_data = json.loads(data)
+                job_data["status"] = status
+                yield job_data
+            if len(rows) < batch_size:
+                return
+
+    def count(self, status: "JobStatus | None" = None) -> int:
+        """Count stored jobs, optionally only those with one status."""
+        with self._lock:
+            if status is None:
+                return int(self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0])
+            return int(self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status.name,)).fetchone()[0])
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._conn.close()
@@ -0,0 +1,126 @@
+"""NetCDF frame source for the VFI pipeline.
+
+Making a video from raw GOES data used to mean rendering every NetCDF file
+to a PNG, which the pipeline then globbed and decoded again. A
+``NetCDFFrameSource`` reads the frames straight from the NetCDF files instead:
+each frame is decoded, calibrated and coloured in memory, with the crop and an
+optional downscale applied while reading, so only the cropped hyperslab of
+``Rad`` is read from disk.
+
+Frames are decoded on access, one file at a time, so a long sequence is never
+held in memory at once.
+"""
+
+from collections.abc import Iterator, Sequence
+import os
+import pathlib
+from typing import Any, overload
+
+import numpy as np
+import numpy.typing as npt
+
+from goesvfi.utils import log
+
+LOGGER = log.get_logger(__name__)
+
+# Suffixes of files read as NetCDF frames
+NETCDF_SUFFIXES = frozenset({".nc", ".nc4", ".netcdf"})
+
+
+def is_netcdf_file(path: pathlib.Path) -> bool:
+    """Check whether a path names a NetCDF file by its suffix."""
+    return path.suffix.lower() in NETCDF_SUFFIXES
+
+
+def find_netcdf_inputs(source: str | os.PathLike[str] | Sequence[pathlib.Path]) -> list[pathlib.Path] | None:
+    """Get the NetCDF files to read frames from.
+
+    Args:
+        source: An input folder, or a list of NetCDF files in frame order
+
+    Returns:
+        The NetCDF files, sorted by name for a folder, or None if the source is
+        a folder of PNG images (or holds no NetCDF files)
+
+    Raises:
+        ValueError: If a list of files contains something other than NetCDF files
+    """
+    if isinstance(source, str | os.PathLike):
+        folder = pathlib.Path(source)
+        if not folder.is_dir() or any(folder.glob("*.png")):
+            return None
+        return sorted(path for path in folder.iterdir() if is_netcdf_file(path)) or None
+
+    paths = [pathlib.Path(path) for path in source]
+    for path in paths:
+        if not is_netcdf_file(path):
+            msg = f"Not a NetCDF file: {path}"
+            raise ValueError(msg)
+    return paths
+
+
+class NetCDFFrameSource(Sequence[npt.NDArray[np.uint8]]):
+    """A sequence of RGB frames decoded from GOES Band 13 NetCDF files.
+
+    Indexing decodes a frame; slicing returns a source over the selected files
+    with the same options. Sources are picklable, so worker processes can
+    decode frames themselves.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[pathlib.Path],
+        crop_rect_xywh: tuple[int, int, int, int] | None = None,
+        stride: int = 1,
+        **render_options: Any,
+    ) -> None:
+        """Initialize the frame source.
+
+        Args:
+            paths: NetCDF files in frame order
+            crop_rect_xywh: Optional crop rectangle in full-resolution (x, y, width, height) pixels
+            stride: Downscale factor applied after cropping; 1 keeps full resolution
+            **render_options: ``min_temp_k``, ``max_temp_k`` and ``colormap`` for the renderer
+
+        Raises:
+            ValueError: If the stride is less than 1
+        """
+        if stride < 1:
+            msg = f"stride must be at least 1, got {stride}"
+            raise ValueError(msg)
+        self.paths = tuple(pathlib.Path(path) for path in paths)
+        self.crop_rect_xywh = crop_rect_xywh
+        self.stride = stride
+        self.render_options = render_options
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @overload
+    def __getitem__(self, index: int) -> npt.NDArray[np.uint8]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "NetCDFFrameSource": ...
+
+    def __getitem__(self, index: int | slice) -> "npt.NDArray[np.uint8] | NetCDFFrameSource":
+        if isinstance(index, slice):
+            return NetCDFFrameSource(self.paths[index], self.crop_rect_xywh, self.stride, **self.render_options)
+        return self.read(self.paths[index])
+
+    def __iter__(self) -> Iterator[npt.NDArray[np.uint8]]:
+        for path in self.paths:
+            yield self.read(path)
+
+    def read(self, path: pathlib.Path) -> npt.NDArray[np.uint8]:
+        """Decode one NetCDF file into a ``(height, width, 3)`` RGB frame.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file isn't Band 13 radiance or the crop is outside the image
+        """
+        # The renderer lives in the integrity check package, whose import pulls in the GUI
+        from goesvfi.integrity_check.render.netcdf import render_array
+
+        frame = render_array(path, window=self.crop_rect_xywh, stride=self.stride, **self.render_options)
+        LOGGER.debug("Decoded %s to a %dx%d frame", path.name, frame.shape[1], frame.shape[0])
+        return frame
@@ -15,19 +15,26 @@ import pathlib
 import shutil
 import subprocess
 import tempfile
+import threading
 from typing import Any
 
 import numpy as np
 from numpy.typing import NDArray
 from PIL import Image
 
+from goesvfi.utils.memory_pressure import get_memory_pressure_bus
+from goesvfi.utils.metrics import CACHE_REQUESTS
 from goesvfi.utils.rife_analyzer import RifeCommandBuilder
 
 logger = logging.getLogger(__name__)
 
 
 class ImageCache:
-    """LRU cache for processed images to reduce I/O operations."""
+    """LRU cache for processed images to reduce I/O operations.
+
+    The cache is registered with the memory pressure bus, which shrinks it
+    while memory is short.
+    """
 
     def __init__(self, max_size: int = 100):
         """Initialize cache with maximum size.
@@ -36,8 +43,37 @@ class ImageCache:
             max_size: Maximum number of images to cache
         """
         self.max_size = max_size
+        self._budget = 1.0
         self._cache: dict[str, NDArray[np.float32]] = {}
         self._access_order: list[str] = []
+        self._lock = threading.Lock()
+        get_memory_pressure_bus().register_cache(self)
+
+    @property
+    def capacity(self) -> int:
+        """Number of images the cache holds under its current memory budget."""
+        return int(self.max_size * self._budget)
+
+    def set_memory_budget(self, fraction: float) -> int:
+        """Limit the cache to a fraction of ``max_size``, evicting the oldest images.
+
+        Args:
+            fraction: Share of ``max_size`` the cache may use
+
+        Returns:
+            Number of images evicted
+        """
+        with self._lock:
+            self._budget = fraction
+            return self._evict_to(self.capacity)
+
+    def _evict_to(self, size: int) -> int:
+        evicted = 0
+        while len(self._cache) > size:
+            oldest_key = self._access_order.pop(0)
+            del self._cache[oldest_key]
+            evicted += 1
+        return evicted
 
     def _get_image_hash(self, img: NDArray[np.float32]) -> str:
         """Generate a hash key for an image array."""
@@ -63,11 +99,14 @@ class ImageCache:
             Cached result if found, None otherwise
         """
         key = self._get_image_hash(img)
-        if key in self._cache:
-            # Move to end (most recently used)
-            self._access_order.remove(key)
-            self._access_order.append(key)
-            return self._cache[key].copy()  # Return copy to prevent modification
+        with self._lock:
+            if key in self._cache:
+                # Move to end (most recently used)
+                self._access_order.remove(key)
+                self._access_order.append(key)
+                CACHE_REQUESTS.inc(cache="interpolation", result="hit")
+                return self._cache[key].copy()  # Return copy to prevent modification
+        CACHE_REQUESTS.inc(cache="interpolation", result="miss")
         return None
 
     def put(self, img: NDArray[np.float32], result: NDArray[np.float32]) -> None:
@@ -79,18 +118,24 @@ class ImageCache:
         """
         key = self._get_image_hash(img)
 
-        # Remove oldest entries if cache is full
-        while len(self._cache) >= self.max_size:
-            oldest_key = self._access_order.pop(0)
-            del self._cache[oldest_key]
+        with self._lock:
+            if key in self._cache:
+                self._access_order.remove(key)
+                del self._cache[key]
+            if self.capacity < 1:
+                return
 
-        self._cache[key] = result.copy()
-        self._access_order.append(key)
+            # Remove oldest entries if cache is full
+            self._evict_to(self.capacity - 1)
+
+            self._cache[key] = result.copy()
+            self._access_order.append(key)
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        self._cache.clear()
-        self._access_order.clear()
+        with self._lock:
+            self._cache.clear()
+            self._access_order.clear()
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
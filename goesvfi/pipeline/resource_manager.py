@@ -13,7 +13,7 @@ import threading
 from typing import Any
 
 from goesvfi.core.base_manager import ConfigurableManager
-from goesvfi.core.global_process_pool import get_global_process_pool
+from goesvfi.core.global_process_pool import GlobalProcessPool, get_global_process_pool
 from goesvfi.pipeline.exceptions import ResourceError
 from goesvfi.utils import log
 from goesvfi.utils.memory_manager import get_memory_monitor
@@ -33,6 +33,15 @@ class ResourceLimits:
     critical_memory_percent: float = 90.0
 
 
+@dataclass(frozen=True)
+class ResourceCapacity:
+    """Resources that processing may use, as seen at one point in time."""
+
+    memory_limit_mb: int
+    available_memory_mb: int  # 0 when system memory can't be measured
+    cpus: int
+
+
 class ResourceManager(ConfigurableManager):
     """Manages system resources for processing operations."""
 
@@ -146,6 +155,22 @@ class ResourceManager(ConfigurableManager):
 
         return optimal
 
+    def get_capacity(self) -> ResourceCapacity:
+        """Get the memory and CPUs that processing may use.
+
+        Returns:
+            The configured memory limit, the system memory currently available
+            and the CPUs allowed by ``max_cpu_percent``
+        """
+        stats = self.memory_monitor.get_memory_stats()
+        cpu_count = os.cpu_count() or 1
+        cpu_percent = float(self.get_config("max_cpu_percent", 80.0))
+        return ResourceCapacity(
+            memory_limit_mb=int(self.get_config("max_memory_mb", 4096)),
+            available_memory_mb=stats.available_mb,
+            cpus=max(1, int(cpu_count * cpu_percent / 100)),
+        )
+
     @contextmanager
     def process_executor(
         self, max_workers: int | None = None, executor_id: str = "default"
@@ -290,9 +315,13 @@ def managed_executor(
     max_workers: int | None = None,
     check_resources: bool = True,
     use_global_pool: bool = True,
-) -> Generator[ProcessPoolExecutor | ThreadPoolExecutor]:
+) -> Generator[GlobalProcessPool | ProcessPoolExecutor | ThreadPoolExecutor]:
     """Convenience context manager for resource-managed executors.
 
+    With ``use_global_pool`` the global process pool itself is yielded; it
+    has the executor's ``submit`` and ``map``, and limiting it to
+    ``max_workers`` doesn't restart its workers.
+
     Args:
         executor_type: "process" or "thread"
         max_workers: Maximum workers (None for optimal)
@@ -313,11 +342,7 @@ def managed_executor(
             global_pool = get_global_process_pool()
             global_pool.initialize()  # Ensure it's initialized
             with global_pool.batch_context(max_workers):
-                # Return the global pool's executor
-                if global_pool._executor is None:
-                    msg = "Global process pool executor is not available"
-                    raise RuntimeError(msg)
-                yield global_pool._executor
+                yield global_pool
         else:
             with manager.process_executor(max_workers) as executor:
                 yield executor
@@ -0,0 +1,326 @@
+"""Incremental rebuilds of a rolling-window loop.
+
+A "last 24 hours" loop regenerated every few minutes usually gains one frame
+and loses one per rebuild, but ``run_vfi`` interpolates and encodes the whole
+window again each time, so a rebuild costs as much as the window is long.
+
+:class:`RollingLoopBuilder` keeps a segment cache instead. Each pair of
+consecutive input frames is interpolated and encoded once into its own short
+MP4, which starts on a keyframe, so each segment is one closed GOP that can
+be joined to the others as is. A segment is keyed by the identity of its two
+input frames and by the render settings. A rebuild renders only the segments
+whose key isn't cached, which normally means the pair ending on the new frame
+and the final frame of the loop. Segments that have left the window are
+deleted, and the remaining ones are joined with FFmpeg's concat demuxer by
+stream copy. The cost of a rebuild then stays about the same whatever the
+window length.
+
+A frame's identity is its resolved path, size and modification time, so a
+frame that is downloaded again is rendered again. The render settings are
+part of every key, so changing them re-renders the whole loop once.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, field
+import hashlib
+from itertools import pairwise
+import json
+import pathlib
+import subprocess
+import tempfile
+import time
+from typing import Any
+
+from PIL import Image
+
+from goesvfi.pipeline.artifact_store import input_identity
+from goesvfi.pipeline.exceptions import FFmpegError
+from goesvfi.pipeline.run_vfi import encode_frame_to_png_bytes, run_rife_pair
+from goesvfi.pipeline.vfi_crop_handler import VFICropHandler
+from goesvfi.pipeline.vfi_ffmpeg_builder import VFIFFmpegBuilder
+from goesvfi.pipeline.vfi_image_processor import VFIImageProcessor
+from goesvfi.utils import log
+
+LOGGER = log.get_logger(__name__)
+
+# Key of the segment that holds only the final frame of the loop
+_LAST_FRAME = "last"
+
+
+@dataclass(frozen=True)
+class LoopSettings:
+    """Settings every segment of a loop is rendered with.
+
+    Attributes:
+        fps: Frame rate of the input frames; doubled when interpolating
+        skip_model: Encode the frames without RIFE interpolation
+        model_key: RIFE model
+        rife_options: Further ``rife_*`` options, as ``run_vfi`` takes them
+        false_colour: Colourise frames with Sanchez
+        res_km: Sanchez resolution in km
+        crop_rect_xywh: Crop rectangle applied to every frame
+        crf: Constant rate factor of the segments
+        preset: Encoding preset of the segments
+        pix_fmt: Pixel format of the segments
+    """
+
+    fps: int = 30
+    skip_model: bool = False
+    model_key: str = "rife-v4.6"
+    rife_options: dict[str, Any] = field(default_factory=dict)
+    false_colour: bool = False
+    res_km: int = 4
+    crop_rect_xywh: tuple[int, int, int, int] | None = None
+    crf: int = 20
+    preset: str = "medium"
+    pix_fmt: str = "yuv420p"
+
+    @property
+    def segment_fps(self) -> int:
+        """Frame rate of the segments, counting interpolated frames."""
+        return self.fps if self.skip_model else self.fps * 2
+
+    def fingerprint(self) -> str:
+        """Hash of the settings, shared by all segments rendered with them."""
+        return hashlib.sha256(json.dumps(asdict(self), sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass
+class LoopBuildResult:
+    """Outcome of one loop rebuild."""
+
+    output_path: pathlib.Path
+    segments: int
+    rendered: int
+    reused: int
+    expired: int
+    seconds: float
+
+
+def _key(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:32]
+
+
+def _run_ffmpeg(cmd: list[str], desc: str, stdin_data: bytes | None = None) -> None:
+    """Run an FFmpeg command to completion, raising ``FFmpegError`` if it fails."""
+    LOGGER.debug("Running ffmpeg command (%s): %s", desc, " ".join(cmd))
+    result = subprocess.run(cmd, input=stdin_data, capture_output=True, check=False)
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace")
+        LOGGER.error("FFmpeg (%s) failed (exit code %s): %s", desc, result.returncode, stderr)
+        msg = f"FFmpeg ({desc}) failed (exit code {result.returncode})"
+        raise FFmpegError(msg, command=" ".join(cmd), stderr=stderr)
+
+
+class RollingLoopBuilder:
+    """Builds a loop from a window of frames, reusing segments from earlier builds.
+
+    The cache directory belongs to one loop: anything in it that the latest
+    build didn't use is deleted when that build finishes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: pathlib.Path,
+        settings: LoopSettings,
+        rife_exe_path: pathlib.Path | None = None,
+    ) -> None:
+        """Initialize the builder.
+
+        Args:
+            cache_dir: Directory for this loop's processed frames and segments
+            settings: Render settings for every segment
+            rife_exe_path: RIFE executable; required unless ``settings.skip_model``
+
+        Raises:
+            ValueError: If interpolating without a RIFE executable
+        """
+        if rife_exe_path is None and not settings.skip_model:
+            msg = "A RIFE executable is required unless skip_model is set"
+            raise ValueError(msg)
+        self.cache_dir = cache_dir
+        self.settings = settings
+        self.rife_exe_path = rife_exe_path
+        self.frames_dir = cache_dir / "frames"
+        self.segments_dir = cache_dir / "segments"
+        self.frames_dir.mkdir(parents=True, exist_ok=True)
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+
+        self._fingerprint = settings.fingerprint()
+        crop_handler = VFICropHandler()
+        self._image_processor = VFIImageProcessor(crop_handler)
+        self._crop_for_pil = crop_handler.validate_crop_parameters(settings.crop_rect_xywh)
+        self._ffmpeg_builder = VFIFFmpegBuilder()
+        self._rife_config = {**settings.rife_options, "model_key": settings.model_key}
+
+    def build(
+        self,
+        frames: Sequence[pathlib.Path],
+        output_path: pathlib.Path,
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> LoopBuildResult:
+        """Build the loop for a window of frames.
+
+        Args:
+            frames: Input frames of the window, in order
+            output_path: Path for the loop video
+            progress_callback: Called with (segments rendered, segments to render)
+
+        Returns:
+            How many segments were rendered, reused and expired
+
+        Raises:
+            ValueError: If the window has fewer than two frames
+            FFmpegError: If encoding or joining segments fails
+            RIFEError: If interpolation fails
+        """
+        if len(frames) < 2:
+            msg = f"A loop needs at least 2 frames, got {len(frames)}"
+            raise ValueError(msg)
+        start_time = time.monotonic()
+        identities = [input_identity(path) for path in frames]
+
+        with tempfile.TemporaryDirectory(prefix="goesvfi_sanchez_") as sanchez_temp_dir:
+            sanchez_temp_path = pathlib.Path(sanchez_temp_dir)
+            # Every segment is sized like the first frame; segments of another size can't be joined
+            target_size = self._image_processor.get_image_dimensions(
+                self._processed_frame(frames[0], identities[0], sanchez_temp_path)
+            )
+            size_key = "{}x{}".format(*target_size)
+            keys = [_key(self._fingerprint, size_key, a, b) for a, b in pairwise(identities)]
+            keys.append(_key(self._fingerprint, size_key, identities[-1], _LAST_FRAME))
+            missing = [index for index, key in enumerate(keys) if not self._segment_path(key).exists()]
+            LOGGER.info(
+                "Loop of %d frames: %d segments cached, %d to render",
+                len(frames),
+                len(keys) - len(missing),
+                len(missing),
+            )
+
+            for done, index in enumerate(missing, 1):
+                first = self._processed_frame(frames[index], identities[index], sanchez_temp_path)
+                second = None
+                if index + 1 < len(frames):
+                    second = self._processed_frame(frames[index + 1], identities[index + 1], sanchez_temp_path)
+                self._render_segment(keys[index], first, second, target_size)
+                if progress_callback is not None:
+                    progress_callback(done, len(missing))
+
+        self._concat(keys, output_path)
+        expired = self._prune(set(keys), set(identities))
+        result = LoopBuildResult(
+            output_path=output_path,
+            segments=len(keys),
+            rendered=len(missing),
+            reused=len(keys) - len(missing),
+            expired=expired,
+            seconds=time.monotonic() - start_time,
+        )
+        LOGGER.info(
+            "Built %s in %.1fs: %d segments rendered, %d reused, %d expired",
+            output_path,
+            result.seconds,
+            result.rendered,
+            result.reused,
+            result.expired,
+        )
+        return result
+
+    def _segment_path(self, key: str) -> pathlib.Path:
+        return self.segments_dir / f"{key}.mp4"
+
+    def _processed_frame(self, path: pathlib.Path, identity: str, sanchez_temp_path: pathlib.Path) -> pathlib.Path:
+        """Get a frame cropped and colourised, processing it if it isn't cached."""
+        cached = self.frames_dir / f"{_key(self._fingerprint, identity)}.png"
+        if cached.exists():
+            return cached
+        with tempfile.TemporaryDirectory(dir=self.cache_dir) as output_dir:
+            processed = self._image_processor.process_single_image(
+                image_path=path,
+                crop_rect_pil=self._crop_for_pil,
+                false_colour=self.settings.false_colour,
+                res_km=self.settings.res_km,
+                sanchez_temp_dir=sanchez_temp_path,
+                output_dir=pathlib.Path(output_dir),
+            )
+            processed.replace(cached)
+        return cached
+
+    def _render_segment(
+        self,
+        key: str,
+        first: pathlib.Path,
+        second: pathlib.Path | None,
+        target_size: tuple[int, int],
+    ) -> None:
+        """Encode a frame and, if there is a next frame, the frame interpolated before it."""
+        images = [first]
+        interpolated = None
+        if second is not None and not self.settings.skip_model:
+            assert self.rife_exe_path is not None
+            interpolated = run_rife_pair(first, second, self.rife_exe_path, self._rife_config)
+            images.append(interpolated)
+
+        try:
+            frame_data = []
+            for image_path in images:
+                with Image.open(image_path) as img:
+                    if img.size != target_size:
+                        LOGGER.warning("Resizing frame %s from %s to %s.", image_path.name, img.size, target_size)
+                        img = img.resize(target_size, Image.Resampling.LANCZOS)
+                    frame_data.append(encode_frame_to_png_bytes(img))
+        finally:
+            if interpolated is not None:
+                interpolated.unlink(missing_ok=True)
+
+        # Encode next to the segment and rename, so a failed encode never leaves a cached segment
+        segment_path = self._segment_path(key)
+        partial_path = segment_path.with_suffix(".partial")
+        cmd = self._ffmpeg_builder.build_segment_command(
+            partial_path,
+            fps=self.settings.segment_fps,
+            crf=self.settings.crf,
+            preset=self.settings.preset,
+            pix_fmt=self.settings.pix_fmt,
+        )
+        try:
+            _run_ffmpeg(cmd, "segment", b"".join(frame_data))
+            partial_path.replace(segment_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+
+    def _concat(self, keys: list[str], output_path: pathlib.Path) -> None:
+        """Join the segments into the loop by stream copy, replacing the old loop at once."""
+        list_path = self.cache_dir / "segments.txt"
+        lines = []
+        for key in keys:
+            quoted = str(self._segment_path(key).resolve()).replace("'", "'\\''")
+            lines.append(f"file '{quoted}'\n")
+        list_path.write_text("".join(lines), encoding="utf-8")
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = output_path.with_name(f".{output_path.name}.partial")
+        try:
+            _run_ffmpeg(self._ffmpeg_builder.build_concat_command(list_path, partial_path), "concat")
+            partial_path.replace(output_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+
+    def _prune(self, keys: set[str], identities: set[str]) -> int:
+        """Delete segments and processed frames the window no longer uses.
+
+        Returns:
+            The number of segments deleted
+        """
+        expired = 0
+        for segment in self.segments_dir.glob("*.mp4"):
+            if segment.stem not in keys:
+                segment.unlink(missing_ok=True)
+                expired += 1
+        frame_keys = {_key(self._fingerprint, identity) for identity in identities}
+        for frame in self.frames_dir.glob("*.png"):
+            if frame.stem not in frame_keys:
+                frame.unlink(missing_ok=True)
+        return expired
@@ -1,4 +1,6 @@
-from collections.abc import Iterator
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Sequence
 from concurrent.futures import (  # Add parallel processing
     ProcessPoolExecutor,
 )
@@ -11,15 +13,14 @@ import time
 from typing import Any
 
 from PIL import Image
-from PyQt6.QtCore import QThread, pyqtSignal
+
+from goesvfi.pipeline.artifact_store import ArtifactStore, artifact_key, input_identity
 
 # Import custom exceptions
 from goesvfi.pipeline.exceptions import (
     FFmpegError,
     ProcessingError,
-    ResourceError,
     RIFEError,
-    SanchezError,
 )
 
 # Import image processing classes that tests expect
@@ -32,6 +33,7 @@ from goesvfi.pipeline.image_loader import (  # noqa: F401  # pylint: disable=unu
 from goesvfi.pipeline.image_saver import (  # noqa: F401  # pylint: disable=unused-import
     ImageSaver,
 )
+from goesvfi.pipeline.netcdf_frame_source import NetCDFFrameSource, find_netcdf_inputs
 
 # Import resource management
 from goesvfi.pipeline.resource_manager import (
@@ -51,6 +53,7 @@ from goesvfi.pipeline.vfi_input_validator import VFIInputValidator
 # --- Add Sanchez Import ---
 from goesvfi.sanchez.runner import colourise
 from goesvfi.utils import log
+from goesvfi.utils.metrics import ERRORS, FFMPEG_STALL_SECONDS, FRAMES_PROCESSED, RIFE_SECONDS
 
 # Import the RIFE analyzer utilities
 from goesvfi.utils.rife_analyzer import RifeCapabilityDetector
@@ -59,6 +62,16 @@ from goesvfi.utils.validation import validate_path_exists, validate_positive_int
 LOGGER = log.get_logger(__name__)
 
 
+def __getattr__(name: str) -> Any:
+    # VfiWorker is a QThread; importing it only on use keeps PyQt6 out of headless runs
+    if name == "VfiWorker":
+        from goesvfi.pipeline.vfi_worker import VfiWorker
+
+        return VfiWorker
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
 class VFIProcessor:
     """Handles the complex VFI processing pipeline with proper separation of concerns."""
 
@@ -70,6 +83,8 @@ class VFIProcessor:
         max_workers: int,
         rife_config: dict,
         processing_config: dict,
+        artifact_store: ArtifactStore | None = None,
+        artifact_owner: str | None = None,
     ) -> None:
         self.rife_exe_path = rife_exe_path
         self.fps = fps
@@ -78,6 +93,12 @@ class VFIProcessor:
         self.rife_config = rife_config
         self.processing_config = processing_config
 
+        # Frames and interpolations shared with other jobs, and the keys of
+        # the processed frames, which interpolation keys are derived from
+        self.artifact_store = artifact_store
+        self.artifact_owner = artifact_owner
+        self._frame_keys: dict[pathlib.Path, str] = {}
+
         # Initialize focused components
         self.input_validator = VFIInputValidator(fps, num_intermediate_frames)
         self.crop_handler = VFICropHandler()
@@ -88,6 +109,10 @@ class VFIProcessor:
         """Validate inputs and return sorted PNG paths."""
         return self.input_validator.validate_inputs(folder, skip_model)
 
+    def validate_netcdf_inputs(self, paths: list[pathlib.Path], skip_model: bool) -> list[pathlib.Path]:
+        """Validate NetCDF files used as frames in place of a PNG folder."""
+        return self.input_validator.validate_netcdf_inputs(paths, skip_model)
+
     def setup_crop_parameters(
         self, crop_rect_xywh: tuple[int, int, int, int] | None
     ) -> tuple[int, int, int, int] | None:
@@ -104,15 +129,20 @@ class VFIProcessor:
         """Process the first image and determine target dimensions."""
         LOGGER.info("Processing first image sequentially: %s", first_path.name)
 
-        processed_path_0 = self.image_processor.process_single_image(
-            image_path=first_path,
-            crop_rect_pil=crop_for_pil,
-            false_colour=self.processing_config["false_colour"],
-            res_km=self.processing_config["res_km"],
-            sanchez_temp_dir=sanchez_temp_path,
-            output_dir=processed_img_path,
-        )
-
+        # The first frame sets the target size rather than being resized to it,
+        # so it is shared without one
+        processed_path_0 = self._checkout_frame(first_path, crop_for_pil, None, processed_img_path)
+        if processed_path_0 is None:
+            processed_path_0 = self.image_processor.process_single_image(
+                image_path=first_path,
+                crop_rect_pil=crop_for_pil,
+                false_colour=self.processing_config["false_colour"],
+                res_km=self.processing_config["res_km"],
+                sanchez_temp_dir=sanchez_temp_path,
+                output_dir=processed_img_path,
+            )
+            FRAMES_PROCESSED.inc(stage="preprocess")
+            self._share_frame(first_path, crop_for_pil, None, processed_path_0)
         target_width, target_height = self.image_processor.get_image_dimensions(processed_path_0)
 
         LOGGER.info(
@@ -132,16 +162,22 @@ class VFIProcessor:
         target_width: int,
         target_height: int,
     ) -> list[pathlib.Path]:
-        """Process remaining images in parallel."""
+        """Process remaining images in parallel, taking those other jobs processed from the artifact store."""
+        shared = {
+            index: self._checkout_frame(path, crop_for_pil, (target_width, target_height), processed_img_path)
+            for index, path in enumerate(paths[1:])
+        }
+        to_process = [index for index, processed in shared.items() if processed is None]
         LOGGER.info(
-            "Processing remaining %s images in parallel (max_workers=%s)...",
-            len(paths) - 1,
+            "Processing remaining %s images in parallel (max_workers=%s, %s shared by other jobs)...",
+            len(to_process),
             self.max_workers,
+            len(shared) - len(to_process),
         )
 
         args_list = [
             (
-                p_path,
+                paths[index + 1],
                 crop_for_pil,
                 self.processing_config["false_colour"],
                 self.processing_config["res_km"],
@@ -150,14 +186,17 @@ class VFIProcessor:
                 target_width,
                 target_height,
             )
-            for p_path in paths[1:]
+            for index in to_process
         ]
 
         start_time = time.time()
         with managed_executor("process", max_workers=self.max_workers) as executor:
             try:
                 results_iterator = executor.map(_process_single_image_worker_wrapper, args_list)
-                processed_paths_rest = list(results_iterator)
+                for index, processed in zip(to_process, results_iterator, strict=True):
+                    shared[index] = processed
+                    FRAMES_PROCESSED.inc(stage="preprocess")
+                    self._share_frame(paths[index + 1], crop_for_pil, (target_width, target_height), processed)
             except Exception as e:
                 LOGGER.exception("Parallel processing failed during map execution.")
                 msg = f"Parallel processing failed: {e}"
@@ -168,7 +207,128 @@ class VFIProcessor:
             time.time() - start_time,
         )
 
-        return processed_paths_rest
+        # In frame order: every entry was filled in above
+        return [processed for processed in shared.values() if processed is not None]
+
+    def _frame_key(
+        self,
+        original_path: pathlib.Path,
+        crop_for_pil: tuple[int, int, int, int] | None,
+        target_size: tuple[int, int] | None,
+    ) -> str:
+        return artifact_key(
+            "frame",
+            input_identity(original_path),
+            crop=crop_for_pil,
+            false_colour=self.processing_config["false_colour"],
+            res_km=self.processing_config["res_km"],
+            target_size=target_size,
+        )
+
+    def _checkout_frame(
+        self,
+        original_path: pathlib.Path,
+        crop_for_pil: tuple[int, int, int, int] | None,
+        target_size: tuple[int, int] | None,
+        processed_img_path: pathlib.Path,
+    ) -> pathlib.Path | None:
+        """Link a frame another job already processed into this job's directory, if there is one."""
+        if self.artifact_store is None:
+            return None
+        key = self._frame_key(original_path, crop_for_pil, target_size)
+        processed = processed_img_path / f"processed_{original_path.stem}_{time.monotonic_ns()}.png"
+        if not self.artifact_store.checkout(key, processed, self.artifact_owner):
+            return None
+        self._frame_keys[processed] = key
+        return processed
+
+    def _share_frame(
+        self,
+        original_path: pathlib.Path,
+        crop_for_pil: tuple[int, int, int, int] | None,
+        target_size: tuple[int, int] | None,
+        processed: pathlib.Path,
+    ) -> None:
+        if self.artifact_store is None:
+            return
+        key = self._frame_key(original_path, crop_for_pil, target_size)
+        self.artifact_store.put(key, processed, "frame", self.artifact_owner)
+        self._frame_keys[processed] = key
+
+    def _interpolation_key(self, p1_processed_path: pathlib.Path, p2_processed_path: pathlib.Path) -> str | None:
+        """Key of the frame interpolated between two processed frames, if both are shared."""
+        first = self._frame_keys.get(p1_processed_path)
+        second = self._frame_keys.get(p2_processed_path)
+        if self.artifact_store is None or first is None or second is None:
+            return None
+        return artifact_key("interpolation", first, second, **self.rife_config)
+
+    def _interpolate_pair(self, p1_processed_path: pathlib.Path, p2_processed_path: pathlib.Path) -> pathlib.Path:
+        """Interpolate between two processed frames, reusing another job's result if there is one."""
+        key = self._interpolation_key(p1_processed_path, p2_processed_path)
+        if key is not None:
+            assert self.artifact_store is not None
+            interpolated = p1_processed_path.parent / f"interp_{time.monotonic_ns()}.png"
+            if self.artifact_store.checkout(key, interpolated, self.artifact_owner):
+                return interpolated
+
+        try:
+            with RIFE_SECONDS.time():
+                interpolated = run_rife_pair(
+                    p1_processed_path,
+                    p2_processed_path,
+                    self.rife_exe_path,
+                    self.rife_config,
+                )
+        except RIFEError:
+            ERRORS.inc(component="rife")
+            raise
+        FRAMES_PROCESSED.inc(stage="interpolate")
+        if key is not None:
+            assert self.artifact_store is not None
+            self.artifact_store.put(key, interpolated, "interpolation", self.artifact_owner)
+        return interpolated
+
+    def process_netcdf_frames(
+        self,
+        source: NetCDFFrameSource,
+        sanchez_temp_path: pathlib.Path,
+        processed_img_path: pathlib.Path,
+    ) -> list[pathlib.Path]:
+        """Decode NetCDF frames in parallel and save them for RIFE, which reads files."""
+        LOGGER.info(
+            "Decoding %s NetCDF frames in parallel (max_workers=%s)...",
+            len(source),
+            self.max_workers,
+        )
+
+        args_list = [
+            (
+                source[index : index + 1],
+                self.processing_config["false_colour"],
+                self.processing_config["res_km"],
+                sanchez_temp_path,
+                processed_img_path,
+            )
+            for index in range(len(source))
+        ]
+
+        start_time = time.time()
+        with managed_executor("process", max_workers=self.max_workers) as executor:
+            try:
+                processed_paths = list(executor.map(_process_netcdf_frame_worker_wrapper, args_list))
+                FRAMES_PROCESSED.inc(len(processed_paths), stage="preprocess")
+            except Exception as e:
+                LOGGER.exception("Parallel NetCDF decoding failed during map execution.")
+                msg = f"Parallel NetCDF decoding failed: {e}"
+                raise RuntimeError(msg) from e
+
+        LOGGER.info(
+            "Parallel NetCDF decoding finished in %.2f seconds.",
+            time.time() - start_time,
+        )
+
+        return processed_paths
 
     def create_ffmpeg_command(self, raw_path: pathlib.Path, skip_model: bool) -> list[str]:
         """Create FFmpeg command for video creation."""
@@ -188,6 +348,35 @@ class VFIProcessor:
         target_height: int,
     ) -> Iterator[tuple[int, int, float] | pathlib.Path]:
         """Handle video creation with FFmpeg and RIFE interpolation."""
+        yield from self._write_raw_video(
+            raw_path,
+            skip_model,
+            lambda ffmpeg_proc: self._process_frames_and_interpolation(
+                ffmpeg_proc,
+                all_processed_paths,
+                skip_model,
+                target_width,
+                target_height,
+            ),
+        )
+
+    def stream_video_creation(
+        self, source: NetCDFFrameSource, raw_path: pathlib.Path
+    ) -> Iterator[tuple[int, int, float] | pathlib.Path]:
+        """Handle video creation without interpolation, encoding decoded frames straight to FFmpeg."""
+        yield from self._write_raw_video(
+            raw_path,
+            True,
+            lambda ffmpeg_proc: self._stream_frames(ffmpeg_proc, source),
+        )
+
+    def _write_raw_video(
+        self,
+        raw_path: pathlib.Path,
+        skip_model: bool,
+        write_frames: Callable[[subprocess.Popen[bytes]], Iterator[tuple[int, int, float]]],
+    ) -> Iterator[tuple[int, int, float] | pathlib.Path]:
+        """Run FFmpeg while ``write_frames`` feeds it, yielding progress and then the raw video path."""
         ffmpeg_cmd = self.create_ffmpeg_command(raw_path, skip_model)
 
         ffmpeg_proc: subprocess.Popen[bytes] | None = None
@@ -204,13 +393,7 @@ class VFIProcessor:
                 raise OSError(msg)
 
             # Process frames and interpolation
-            yield from self._process_frames_and_interpolation(
-                ffmpeg_proc,
-                all_processed_paths,
-                skip_model,
-                target_width,
-                target_height,
-            )
+            yield from write_frames(ffmpeg_proc)
 
             # Finish FFmpeg process
             self._finalize_ffmpeg_process(ffmpeg_proc, raw_path)
@@ -274,7 +457,7 @@ class VFIProcessor:
                     all_processed_paths[0].name,
                     im0_handle.size,
                 )
-                png_data = _encode_frame_to_png_bytes(im0_handle)
+                png_data = encode_frame_to_png_bytes(im0_handle)
             _safe_write(
                 ffmpeg_proc,
                 png_data,
@@ -309,7 +492,7 @@ class VFIProcessor:
         for idx, path in enumerate(remaining_paths):
             try:
                 with Image.open(path) as img_handle:
-                    png_data = _encode_frame_to_png_bytes(img_handle)
+                    png_data = encode_frame_to_png_bytes(img_handle)
                 _safe_write(ffmpeg_proc, png_data, f"frame {idx + 2} ({path.name})")
 
                 # Yield progress
@@ -332,6 +515,46 @@ class VFIProcessor:
 
         LOGGER.info("Finished copying frames in skip model mode.")
 
+    def _stream_frames(
+        self, ffmpeg_proc: subprocess.Popen[bytes], source: NetCDFFrameSource
+    ) -> Iterator[tuple[int, int, float]]:
+        """Encode frames decoded in memory to FFmpeg, sized like the first frame."""
+        LOGGER.info("Skip model mode: streaming %s NetCDF frames directly.", len(source))
+
+        start_time = time.time()
+        last_yield_time = start_time
+        total_frames = len(source)
+        target_size: tuple[int, int] | None = None
+
+        for idx, path in enumerate(source.paths):
+            try:
+                img = Image.fromarray(source.read(path))
+                if target_size is None:
+                    target_size = img.size
+                    LOGGER.info("Target frame dimensions set by first frame: %sx%s", *target_size)
+                elif img.size != target_size:
+                    LOGGER.warning("Resizing frame %s from %s to %s.", path.name, img.size, target_size)
+                    img = img.resize(target_size, Image.Resampling.LANCZOS)
+                png_data = encode_frame_to_png_bytes(img)
+                _safe_write(ffmpeg_proc, png_data, f"frame {idx + 1} ({path.name})")
+            except OSError:
+                raise
+            except Exception as e:
+                msg = f"Failed processing {path.name}"
+                raise OSError(msg) from e
+
+            # Yield progress
+            current_time = time.time()
+            frames_processed = idx + 1
+            time_per_frame = (current_time - start_time) / frames_processed
+            eta = (total_frames - frames_processed) * time_per_frame
+
+            if current_time - last_yield_time > 1.0 or frames_processed == total_frames:
+                yield (frames_processed, total_frames, eta)
+                last_yield_time = current_time
+
+        LOGGER.info("Finished streaming frames in skip model mode.")
+
     def _process_interpolation_frames(
         self,
         ffmpeg_proc: subprocess.Popen[bytes],
@@ -352,12 +575,7 @@ class VFIProcessor:
             p2_processed_path = all_processed_paths[idx + 1]
 
             # Run RIFE interpolation
-            interpolated_frame_path = _run_rife_pair(
-                p1_processed_path,
-                p2_processed_path,
-                self.rife_exe_path,
-                self.rife_config,
-            )
+            interpolated_frame_path = self._interpolate_pair(p1_processed_path, p2_processed_path)
 
             # Write interpolated frame
             try:
@@ -374,7 +592,7 @@ class VFIProcessor:
                             (target_width, target_height),
                             Image.Resampling.LANCZOS,
                         )
-                    png_data = _encode_frame_to_png_bytes(im_interp)
+                    png_data = encode_frame_to_png_bytes(im_interp)
                 _safe_write(ffmpeg_proc, png_data, f"interpolated frame {idx}")
                 interpolated_frame_path.unlink()  # Clean up
 
@@ -393,7 +611,7 @@ class VFIProcessor:
                         p2_processed_path.name,
                         img2_handle.size,
                     )
-                    png_data = _encode_frame_to_png_bytes(img2_handle)
+                    png_data = encode_frame_to_png_bytes(img2_handle)
                 _safe_write(
                     ffmpeg_proc,
                     png_data,
@@ -494,233 +712,6 @@ class InterpolationPipeline:
         self._active_tasks.clear()
 
 
-class VfiWorker(QThread):
-    """Worker thread for VFI processing in GUI."""
-
-    # Signals
-    progress = pyqtSignal(int, int, float)  # current, total, eta
-    finished = pyqtSignal(str)  # output_path
-    error = pyqtSignal(str)  # error_message
-
-    def __init__(
-        self,
-        in_dir: str,
-        out_file_path: str,
-        fps: int = 30,
-        mid_count: int = 9,
-        max_workers: int = 2,
-        encoder: str = "libx264",
-        use_ffmpeg_interp: bool = False,
-        filter_preset: str = "full",
-        mi_mode: str = "bidir",
-        mc_mode: str = "aobmc",
-        me_mode: str = "bidir",
-        me_algo: str = "epzs",
-        search_param: int = 64,
-        scd_mode: str = "fdiff",
-        scd_threshold: float = 10.0,
-        minter_mb_size: int = 16,
-        minter_vsbmc: int = 1,
-        apply_unsharp: bool = False,
-        unsharp_lx: float = 5.0,
-        unsharp_ly: float = 5.0,
-        unsharp_la: float = 1.0,
-        unsharp_cx: float = 5.0,
-        unsharp_cy: float = 5.0,
-        unsharp_ca: float = 0.0,
-        crf: int = 23,
-        bitrate_kbps: int | None = None,
-        bufsize_kb: int | None = None,
-        pix_fmt: str = "yuv420p",
-        skip_model: bool = False,
-        crop_rect: tuple[int, int, int, int] | None = None,
-        debug_mode: bool = False,
-        rife_tile_enable: bool = False,
-        rife_tile_size: int = 256,
-        rife_uhd_mode: bool = False,
-        rife_thread_spec: str | None = None,
-        rife_tta_spatial: bool = False,
-        rife_tta_temporal: bool = False,
-        model_key: str | None = None,
-        false_colour: bool = False,
-        res_km: int = 2,
-        sanchez_gui_temp_dir: str | None = None,
-        **kwargs: Any,  # Catch any extra arguments
-    ) -> None:
-        """Initialize the VFI worker with processing parameters."""
-        super().__init__()
-
-        # Store all parameters
-        self.in_dir = in_dir
-        self.out_file_path = out_file_path
-        self.fps = fps
-        self.mid_count = mid_count
-        self.max_workers = max_workers
-        self.encoder = encoder
-        self.use_ffmpeg_interp = use_ffmpeg_interp
-        self.filter_preset = filter_preset
-        self.mi_mode = mi_mode
-        self.mc_mode = mc_mode
-        self.me_mode = me_mode
-        self.me_algo = me_algo
-        self.search_param = search_param
-        self.scd_mode = scd_mode
-        self.scd_threshold = scd_threshold
-        self.minter_mb_size = minter_mb_size
-        self.minter_vsbmc = minter_vsbmc
-        self.apply_unsharp = apply_unsharp
-        self.unsharp_lx = unsharp_lx
-        self.unsharp_ly = unsharp_ly
-        self.unsharp_la = unsharp_la
-        self.unsharp_cx = unsharp_cx
-        self.unsharp_cy = unsharp_cy
-        self.unsharp_ca = unsharp_ca
-        self.crf = crf
-        self.bitrate_kbps = bitrate_kbps
-        self.bufsize_kb = bufsize_kb
-        self.pix_fmt = pix_fmt
-        self.skip_model = skip_model
-        self.crop_rect = crop_rect
-        self.debug_mode = debug_mode
-        self.rife_tile_enable = rife_tile_enable
-        self.rife_tile_size = rife_tile_size
-        self.rife_uhd_mode = rife_uhd_mode
-        self.rife_thread_spec = rife_thread_spec
-        self.rife_tta_spatial = rife_tta_spatial
-        self.rife_tta_temporal = rife_tta_temporal
-        self.model_key = model_key
-        self.false_colour = false_colour
-        self.res_km = res_km
-        self.sanchez_gui_temp_dir = sanchez_gui_temp_dir
-
-        LOGGER.info("VfiWorker initialized with parameters")
-
-    def run(self) -> None:
-        """Run the VFI processing in a separate thread."""
-        try:
-            LOGGER.info("Starting VFI processing...")
-
-            # Check resources before starting
-            resource_manager = get_resource_manager()
-            try:
-                resource_manager.check_resources()
-            except ResourceError as e:
-                LOGGER.exception("Insufficient resources")
-                self.error.emit(f"Resource check failed: {e}")
-                return
-
-            rife_exe = self._get_rife_executable()
-            ffmpeg_args = self._prepare_ffmpeg_settings()
-
-            gen = run_vfi(
-                folder=pathlib.Path(self.in_dir),
-                output_mp4_path=pathlib.Path(self.out_file_path),
-                rife_exe_path=rife_exe,
-                fps=self.fps,
-                num_intermediate_frames=self.mid_count,
-                max_workers=self.max_workers,
-                rife_tile_enable=self.rife_tile_enable,
-                rife_tile_size=self.rife_tile_size,
-                rife_uhd_mode=self.rife_uhd_mode,
-                rife_thread_spec=self.rife_thread_spec or "1:2:2",
-                rife_tta_spatial=self.rife_tta_spatial,
-                rife_tta_temporal=self.rife_tta_temporal,
-                model_key=self.model_key or "rife-v4.6",
-                false_colour=self.false_colour,
-                res_km=self.res_km,
-                crop_rect_xywh=self.crop_rect,
-                skip_model=self.skip_model,
-                **ffmpeg_args,
-            )
-
-            for output in gen:
-                if isinstance(output, tuple):
-                    current, total, eta = output
-                    self.progress.emit(current, total, eta)
-                elif isinstance(output, pathlib.Path):
-                    self.finished.emit(str(output))
-
-            LOGGER.info("VFI processing completed")
-        except (FFmpegError, RIFEError, SanchezError, ProcessingError) as e:
-            # Specific processing errors - log with context
-            LOGGER.exception("Processing error")
-            self.error.emit(f"Processing failed: {e}")
-        except OSError as e:
-            # File system errors
-            LOGGER.exception("File operation error")
-            self.error.emit(f"File error: {e}")
-        except Exception as e:  # pragma: no cover - catch unexpected errors
-            LOGGER.exception("Unexpected error in VFI processing")
-            self.error.emit(f"Unexpected error: {e}")
-
-    def _get_rife_executable(self) -> pathlib.Path:
-        """Get the RIFE executable path based on model key."""
-        from goesvfi.utils.config import find_rife_executable
-
-        if self.model_key:
-            rife_path = find_rife_executable(self.model_key)
-            if rife_path:
-                return pathlib.Path(rife_path)
-
-        # Fallback to default RIFE executable
-        rife_path = find_rife_executable("rife-v4.6")  # Default model key
-        if rife_path:
-            return pathlib.Path(rife_path)
-
-        msg = "RIFE executable not found"
-        raise FileNotFoundError(msg)
-
-    def _prepare_ffmpeg_settings(self) -> dict:
-        """Prepare FFmpeg settings dictionary from instance attributes."""
-        return {
-            "use_ffmpeg_interp": self.use_ffmpeg_interp,
-            "filter_preset": self.filter_preset,
-            "mi_mode": self.mi_mode,
-            "mc_mode": self.mc_mode,
-            "me_mode": self.me_mode,
-            "me_algo": self.me_algo,
-            "search_param": self.search_param,
-            "scd_mode": self.scd_mode,
-            "scd_threshold": self.scd_threshold,
-            "minter_mb_size": self.minter_mb_size,
-            "minter_vsbmc": self.minter_vsbmc,
-            "apply_unsharp": self.apply_unsharp,
-            "unsharp_lx": self.unsharp_lx,
-            "unsharp_ly": self.unsharp_ly,
-            "unsharp_la": self.unsharp_la,
-            "unsharp_cx": self.unsharp_cx,
-            "unsharp_cy": self.unsharp_cy,
-            "unsharp_ca": self.unsharp_ca,
-            "crf": self.crf,
-            "bitrate_kbps": self.bitrate_kbps,
-            "bufsize_kb": self.bufsize_kb,
-            "pix_fmt": self.pix_fmt,
-        }
-
-    def _process_run_vfi_output(self, output_lines: list[str | pathlib.Path | tuple[int, int, float]]) -> None:
-        """Process output from run_vfi generator and emit appropriate signals."""
-        for line in output_lines:
-            if isinstance(line, tuple) and len(line) == 3:
-                # Progress update (current, total, time_elapsed)
-                current, total, time_elapsed = line
-                self.progress.emit(current, total, time_elapsed)
-            elif isinstance(line, pathlib.Path):
-                # Final output path as Path object
-                self.finished.emit(line)
-            elif isinstance(line, str):
-                if line.startswith(("Error:", "ERROR:")) or "error" in line.lower():
-                    # Error message - extract the actual error part
-                    if line.startswith("ERROR:"):
-                        error_msg = line[6:].strip()  # Remove "ERROR:" prefix
-                    else:
-                        error_msg = line
-                    self.error.emit(error_msg)
-                elif pathlib.Path(line).suffix in {".mp4", ".avi", ".mov"}:
-                    # Final output path as string
-                    self.finished.emit(line)
-                # Ignore other string outputs
-
-
 def _process_with_rife(
     ffmpeg_proc: subprocess.Popen,
     all_processed_paths: list[pathlib.Path],
@@ -784,10 +775,13 @@ def _process_with_rife(
             rife_cmd.append("-z")
 
         # Run RIFE interpolation
-        result = subprocess.run(rife_cmd, capture_output=True, text=True, check=False)
+        with RIFE_SECONDS.time():
+            result = subprocess.run(rife_cmd, capture_output=True, text=True, check=False)
         if result.returncode != 0:
             LOGGER.error("RIFE failed: %s", result.stderr)
+            ERRORS.inc(component="rife")
             continue
+        FRAMES_PROCESSED.inc(stage="interpolate")
 
         # Yield progress after RIFE processing
         elapsed = time.time() - start_time
@@ -797,7 +791,7 @@ def _process_with_rife(
         interpolated_path = processed_img_dir / f"interpolated_{i:06d}.png"
         try:
             with Image.open(interpolated_path) as img:
-                png_bytes = _encode_frame_to_png_bytes(img)
+                png_bytes = encode_frame_to_png_bytes(img)
                 _safe_write(ffmpeg_proc, png_bytes, f"interpolated frame {i}")
         except OSError as e:
             LOGGER.exception("Failed to read interpolated frame %d", i)
@@ -810,7 +804,7 @@ def _process_with_rife(
         # Write the next original frame
         try:
             with Image.open(next_frame) as img:
-                png_bytes = _encode_frame_to_png_bytes(img)
+                png_bytes = encode_frame_to_png_bytes(img)
                 _safe_write(ffmpeg_proc, png_bytes, f"frame {i + 1}")
         except Exception:
             LOGGER.exception("Failed to process frame %s", next_frame)
@@ -821,7 +815,7 @@ def _process_with_rife(
 
 
 # --- Helper function to encode frame to PNG bytes ---
-def _encode_frame_to_png_bytes(img: Image.Image) -> bytes:
+def encode_frame_to_png_bytes(img: Image.Image) -> bytes:
     """Encodes a PIL Image into PNG bytes memory.
 
     Args:
@@ -850,7 +844,11 @@ def _safe_write(proc: subprocess.Popen[bytes], data: bytes, frame_desc: str) ->
         )
 
     try:
+        # Time spent blocked here is time FFmpeg wasn't keeping up
+        started = time.monotonic()
         proc.stdin.write(data)
+        FFMPEG_STALL_SECONDS.inc(time.monotonic() - started)
+        FRAMES_PROCESSED.inc(stage="encode")
     except BrokenPipeError:
         # Try reading stderr immediately upon pipe error
         stderr_output = ""
@@ -1194,7 +1192,7 @@ def _process_in_skip_model_mode(
     for i, img_path in enumerate(image_paths[1:], 1):
         try:
             with Image.open(img_path) as img:
-                png_bytes = _encode_frame_to_png_bytes(img)
+                png_bytes = encode_frame_to_png_bytes(img)
                 _safe_write(ffmpeg_proc, png_bytes, f"frame {i}")
 
             elapsed = time.time() - start_time
@@ -1262,9 +1260,25 @@ def _process_single_image_worker_wrapper(
     return _process_single_image_worker(*args)
 
 
+def _process_netcdf_frame_worker_wrapper(
+    args: tuple[NetCDFFrameSource, bool, int, pathlib.Path, pathlib.Path],
+) -> pathlib.Path:
+    """Decodes the single frame of a NetCDF source and saves it as a processed image."""
+    source, false_colour, res_km, sanchez_temp_dir, output_dir = args
+    image_processor = VFIImageProcessor(VFICropHandler())
+    return image_processor.process_frame(
+        frame=source[0],
+        source_path=source.paths[0],
+        false_colour=false_colour,
+        res_km=res_km,
+        sanchez_temp_dir=sanchez_temp_dir,
+        output_dir=output_dir,
+    )
+
+
 # Function to run RIFE interpolation and write raw video stream via ffmpeg
 def run_vfi(
-    folder: pathlib.Path,
+    folder: pathlib.Path | Sequence[pathlib.Path],
     output_mp4_path: pathlib.Path,
     rife_exe_path: pathlib.Path,
     fps: int,
@@ -1288,6 +1302,19 @@ def run_vfi(
     """Runs RIFE interpolation or copies original frames to a raw video file.
     Uses parallel processing for Sanchez/cropping if enabled.
 
+    ``folder`` is a folder of PNG images, or of GOES Band 13 NetCDF files, or a
+    list of NetCDF files in frame order. NetCDF frames are decoded in memory
+    with the crop applied while reading; the ``netcdf_stride`` keyword
+    downscales them by an integer factor, and ``netcdf_colormap`` picks their
+    colormap. Without interpolation they go straight to FFmpeg; RIFE reads
+    files, so with interpolation each frame is saved once for it.
+
+    With the ``artifact_store`` keyword, an :class:`ArtifactStore`, processed
+    PNG frames and interpolated frames are shared with other jobs: what
+    another job already computed with the same settings is reused, and what
+    this job computes is stored. ``artifact_owner`` names the job, which holds
+    a reference to every artifact it uses until the store releases them.
+
     Yields:
         Tuple[int, int, float]: Progress updates (current_pair, total_pairs, eta_seconds).
         pathlib.Path: The path to the generated raw video file.
@@ -1332,10 +1359,17 @@ def run_vfi(
         max_workers=max_workers,
         rife_config=rife_config,
         processing_config=processing_config,
+        artifact_store=kwargs.get("artifact_store"),
+        artifact_owner=kwargs.get("artifact_owner"),
     )
 
+    netcdf_paths = find_netcdf_inputs(folder)
+    if netcdf_paths is not None:
+        yield from _run_vfi_netcdf(processor, netcdf_paths, output_mp4_path, skip_model, crop_rect_xywh, kwargs)
+        return
+
     # Validate inputs and get image paths
-    paths = processor.validate_inputs(folder, skip_model)
+    paths = processor.validate_inputs(pathlib.Path(folder), skip_model)
     LOGGER.info("Found %s images. Skip AI model: %s", len(paths), skip_model)
 
     # Setup crop parameters
@@ -1385,7 +1419,52 @@ def run_vfi(
         )
 
 
-def _run_rife_pair(
+def _run_vfi_netcdf(
+    processor: VFIProcessor,
+    netcdf_paths: list[pathlib.Path],
+    output_mp4_path: pathlib.Path,
+    skip_model: bool,
+    crop_rect_xywh: tuple[int, int, int, int] | None,
+    options: dict[str, Any],
+) -> Iterator[tuple[int, int, float] | pathlib.Path]:
+    """Runs ``run_vfi`` with frames decoded from NetCDF files instead of PNG images."""
+    paths = processor.validate_netcdf_inputs(netcdf_paths, skip_model)
+    LOGGER.info("Found %s NetCDF files. Skip AI model: %s", len(paths), skip_model)
+
+    # The crop is applied while reading, in the same coordinates as for PNG frames
+    crop_for_pil = processor.setup_crop_parameters(crop_rect_xywh)
+    render_options = {"colormap": options["netcdf_colormap"]} if "netcdf_colormap" in options else {}
+    source = NetCDFFrameSource(
+        paths,
+        crop_rect_xywh=crop_rect_xywh if crop_for_pil else None,
+        stride=options.get("netcdf_stride", 1),
+        **render_options,
+    )
+
+    raw_path = output_mp4_path.with_suffix(".raw.mp4")
+    LOGGER.info("Intermediate raw video path: %s", raw_path)
+
+    if skip_model and not processor.processing_config["false_colour"]:
+        yield from processor.stream_video_creation(source, raw_path)
+        return
+
+    with (
+        tempfile.TemporaryDirectory(prefix="goesvfi_sanchez_") as sanchez_temp_dir_str,
+        tempfile.TemporaryDirectory(prefix="goesvfi_processed_") as processed_img_dir_str,
+    ):
+        processed_img_path = pathlib.Path(processed_img_dir_str)
+        all_processed_paths = processor.process_netcdf_frames(
+            source, pathlib.Path(sanchez_temp_dir_str), processed_img_path
+        )
+        target_width, target_height = processor.image_processor.get_image_dimensions(all_processed_paths[0])
+        LOGGER.info("All %s NetCDF frames processed successfully.", len(all_processed_paths))
+
+        yield from processor.process_video_creation(
+            all_processed_paths, raw_path, skip_model, target_width, target_height
+        )
+
+
+def run_rife_pair(
     p1_path: pathlib.Path,
     p2_path: pathlib.Path,
     rife_exe_path: pathlib.Path,
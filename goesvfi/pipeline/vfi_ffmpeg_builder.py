@@ -178,6 +178,93 @@ class VFIFFmpegBuilder:
 
         return cmd
 
+    def build_segment_command(
+        self,
+        output_path: pathlib.Path,
+        fps: int,
+        crf: int,
+        preset: str,
+        encoder: str | None = None,
+        pix_fmt: str | None = None,
+    ) -> list[str]:
+        """Build FFmpeg command for encoding piped images into one loop segment.
+
+        Every segment is a separate file, so it starts with a keyframe and can
+        be joined to the others with ``build_concat_command`` without
+        re-encoding, as long as all of them are encoded with the same settings.
+
+        Args:
+            output_path: Path for the segment
+            fps: Frame rate of the piped images
+            crf: Constant rate factor
+            preset: Encoding preset
+            encoder: Video encoder to use (default: libx264)
+            pix_fmt: Pixel format (default: yuv420p)
+
+        Returns:
+            List of command arguments for FFmpeg
+        """
+        return [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-f",
+            "image2pipe",
+            "-framerate",
+            str(fps),
+            "-vcodec",
+            "png",
+            "-i",
+            "-",
+            "-an",
+            "-vcodec",
+            encoder or self.default_encoder,
+            "-preset",
+            preset,
+            "-crf",
+            str(crf),
+            "-pix_fmt",
+            pix_fmt or self.default_pix_fmt,
+            "-vf",
+            "scale=trunc(iw/2)*2:trunc(ih/2)*2",
+            "-f",
+            "mp4",
+            str(output_path),
+        ]
+
+    def build_concat_command(self, list_path: pathlib.Path, output_path: pathlib.Path) -> list[str]:
+        """Build FFmpeg command for joining segments by stream copy.
+
+        Args:
+            list_path: Concat demuxer list naming the segments in order
+            output_path: Path for the joined video
+
+        Returns:
+            List of command arguments for FFmpeg
+        """
+        return [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(list_path),
+            "-c",
+            "copy",
+            "-movflags",
+            "+faststart",
+            "-f",
+            "mp4",
+            str(output_path),
+        ]
+
     def _build_unsharp_filter(self, ffmpeg_args: dict[str, Any]) -> str | None:
         """Build unsharp filter parameters.
 
@@ -8,6 +8,8 @@ import pathlib
 import time
 from typing import Any
 
+import numpy as np
+import numpy.typing as npt
 from PIL import Image
 
 from goesvfi.sanchez.runner import colourise
@@ -85,6 +87,39 @@ class VFIImageProcessor:
             LOGGER.exception("Failed to process image %s", image_path.name)
             raise
 
+    def process_frame(
+        self,
+        frame: npt.NDArray[np.uint8],
+        source_path: pathlib.Path,
+        false_colour: bool,
+        res_km: int,
+        sanchez_temp_dir: pathlib.Path,
+        output_dir: pathlib.Path,
+    ) -> pathlib.Path:
+        """Process a frame decoded in memory, such as one read from a NetCDF file.
+
+        The frame is already cropped when it is read, so only Sanchez coloring
+        applies before it is saved.
+
+        Args:
+            frame: ``(height, width, 3)`` RGB frame
+            source_path: File the frame was read from (for naming)
+            false_colour: Whether to apply Sanchez false coloring
+            res_km: Resolution in km for Sanchez processing
+            sanchez_temp_dir: Temporary directory for Sanchez operations
+            output_dir: Output directory for processed image
+
+        Returns:
+            Path to the processed image
+        """
+        img = Image.fromarray(frame)
+        if false_colour:
+            img = self._apply_sanchez_coloring(img, source_path, res_km, sanchez_temp_dir)
+
+        processed_path = self._save_processed_image(img, source_path.stem, output_dir)
+        LOGGER.info("Processed %s: output size %s, saved to %s", source_path.name, img.size, processed_path.name)
+        return processed_path
+
     def _apply_sanchez_coloring(
         self, img: Image.Image, original_path: pathlib.Path, res_km: int, sanchez_temp_dir: pathlib.Path
     ) -> Image.Image:
@@ -93,18 +93,30 @@ class VFIInputValidator:
             LOGGER.error(msg)
             raise ValueError(msg)
 
-        # Validate minimum image count based on processing mode
+        self._validate_frame_count(len(paths), skip_model, "PNG image")
+
+        LOGGER.info("Found %d PNG images for processing", len(paths))
+        return paths
+
+    def _validate_frame_count(self, count: int, skip_model: bool, kind: str) -> None:
+        """Validate the minimum number of input frames for the processing mode.
+
+        Args:
+            count: Number of input frames
+            skip_model: Whether model processing is being skipped
+            kind: Singular name of the inputs, for the error message
+
+        Raises:
+            ValueError: If there are too few frames
+        """
         min_required = 1 if skip_model else 2
         mode_description = "skipping model" if skip_model else "interpolation"
 
-        if len(paths) < min_required:
-            msg = f"At least {min_required} PNG image{'s' if min_required > 1 else ''} required for {mode_description}."
-            LOGGER.error("Found %d images, need %d for %s", len(paths), min_required, mode_description)
+        if count < min_required:
+            msg = f"At least {min_required} {kind}{'s' if min_required > 1 else ''} required for {mode_description}."
+            LOGGER.error("Found %d images, need %d for %s", count, min_required, mode_description)
             raise ValueError(msg)
 
-        LOGGER.info("Found %d PNG images for processing", len(paths))
-        return paths
-
     def validate_inputs(self, folder: pathlib.Path, skip_model: bool) -> list[pathlib.Path]:
         """Comprehensive input validation combining all checks.
 
@@ -135,6 +147,31 @@ class VFIInputValidator:
 
         return image_paths
 
+    def validate_netcdf_inputs(self, paths: list[pathlib.Path], skip_model: bool) -> list[pathlib.Path]:
+        """Validate NetCDF files used as frames in place of a PNG folder.
+
+        Args:
+            paths: NetCDF files in frame order
+            skip_model: Whether model processing is being skipped
+
+        Returns:
+            The validated NetCDF paths
+
+        Raises:
+            FileNotFoundError: If a file is missing
+            ValueError: If there are too few files
+            NotImplementedError: If configuration is not supported
+        """
+        self.validate_processing_parameters()
+        self.validate_intermediate_frames_support(skip_model)
+
+        for path in paths:
+            validate_path_exists(path, must_be_file=True, field_name="NetCDF file")
+        self._validate_frame_count(len(paths), skip_model, "NetCDF file")
+
+        LOGGER.info("Input validation complete: %d NetCDF files", len(paths))
+        return paths
+
     def get_validation_summary(self) -> dict[str, Any]:
         """Get a summary of current validation configuration.
 
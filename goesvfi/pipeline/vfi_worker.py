@@ -0,0 +1,252 @@
+"""Qt worker thread that runs the VFI pipeline for the GUI.
+
+The worker lives apart from :mod:`goesvfi.pipeline.run_vfi` so that the
+pipeline itself can be imported without PyQt6, as the headless CLI does.
+``run_vfi`` still provides ``VfiWorker`` as a lazily imported attribute.
+The pipeline is in turn only imported when the worker runs, so the GUI can
+create workers without loading it at startup.
+"""
+
+import pathlib
+from typing import Any
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from goesvfi.pipeline.exceptions import (
+    FFmpegError,
+    ProcessingError,
+    ResourceError,
+    RIFEError,
+    SanchezError,
+)
+from goesvfi.utils import log
+
+LOGGER = log.get_logger(__name__)
+
+
+class VfiWorker(QThread):
+    """Worker thread for VFI processing in GUI."""
+
+    # Signals
+    progress = pyqtSignal(int, int, float)  # current, total, eta
+    finished = pyqtSignal(str)  # output_path
+    error = pyqtSignal(str)  # error_message
+
+    def __init__(
+        self,
+        in_dir: str,
+        out_file_path: str,
+        fps: int = 30,
+        mid_count: int = 9,
+        max_workers: int = 2,
+        encoder: str = "libx264",
+        use_ffmpeg_interp: bool = False,
+        filter_preset: str = "full",
+        mi_mode: str = "bidir",
+        mc_mode: str = "aobmc",
+        me_mode: str = "bidir",
+        me_algo: str = "epzs",
+        search_param: int = 64,
+        scd_mode: str = "fdiff",
+        scd_threshold: float = 10.0,
+        minter_mb_size: int = 16,
+        minter_vsbmc: int = 1,
+        apply_unsharp: bool = False,
+        unsharp_lx: float = 5.0,
+        unsharp_ly: float = 5.0,
+        unsharp_la: float = 1.0,
+        unsharp_cx: float = 5.0,
+        unsharp_cy: float = 5.0,
+        unsharp_ca: float = 0.0,
+        crf: int = 23,
+        bitrate_kbps: int | None = None,
+        bufsize_kb: int | None = None,
+        pix_fmt: str = "yuv420p",
+        skip_model: bool = False,
+        crop_rect: tuple[int, int, int, int] | None = None,
+        debug_mode: bool = False,
+        rife_tile_enable: bool = False,
+        rife_tile_size: int = 256,
+        rife_uhd_mode: bool = False,
+        rife_thread_spec: str | None = None,
+        rife_tta_spatial: bool = False,
+        rife_tta_temporal: bool = False,
+        model_key: str | None = None,
+        false_colour: bool = False,
+        res_km: int = 2,
+        sanchez_gui_temp_dir: str | None = None,
+        **kwargs: Any,  # Catch any extra arguments
+    ) -> None:
+        """Initialize the VFI worker with processing parameters."""
+        super().__init__()
+
+        # Store all parameters
+        self.in_dir = in_dir
+        self.out_file_path = out_file_path
+        self.fps = fps
+        self.mid_count = mid_count
+        self.max_workers = max_workers
+        self.encoder = encoder
+        self.use_ffmpeg_interp = use_ffmpeg_interp
+        self.filter_preset = filter_preset
+        self.mi_mode = mi_mode
+        self.mc_mode = mc_mode
+        self.me_mode = me_mode
+        self.me_algo = me_algo
+        self.search_param = search_param
+        self.scd_mode = scd_mode
+        self.scd_threshold = scd_threshold
+        self.minter_mb_size = minter_mb_size
+        self.minter_vsbmc = minter_vsbmc
+        self.apply_unsharp = apply_unsharp
+        self.unsharp_lx = unsharp_lx
+        self.unsharp_ly = unsharp_ly
+        self.unsharp_la = unsharp_la
+        self.unsharp_cx = unsharp_cx
+        self.unsharp_cy = unsharp_cy
+        self.unsharp_ca = unsharp_ca
+        self.crf = crf
+        self.bitrate_kbps = bitrate_kbps
+        self.bufsize_kb = bufsize_kb
+        self.pix_fmt = pix_fmt
+        self.skip_model = skip_model
+        self.crop_rect = crop_rect
+        self.debug_mode = debug_mode
+        self.rife_tile_enable = rife_tile_enable
+        self.rife_tile_size = rife_tile_size
+        self.rife_uhd_mode = rife_uhd_mode
+        self.rife_thread_spec = rife_thread_spec
+        self.rife_tta_spatial = rife_tta_spatial
+        self.rife_tta_temporal = rife_tta_temporal
+        self.model_key = model_key
+        self.false_colour = false_colour
+        self.res_km = res_km
+        self.sanchez_gui_temp_dir = sanchez_gui_temp_dir
+
+        LOGGER.info("VfiWorker initialized with parameters")
+
+    def run(self) -> None:
+        """Run the VFI processing in a separate thread."""
+        try:
+            LOGGER.info("Starting VFI processing...")
+            from goesvfi.pipeline import run_vfi as run_vfi_module
+
+            # Check resources before starting
+            resource_manager = run_vfi_module.get_resource_manager()
+            try:
+                resource_manager.check_resources()
+            except ResourceError as e:
+                LOGGER.exception("Insufficient resources")
+                self.error.emit(f"Resource check failed: {e}")
+                return
+
+            rife_exe = self._get_rife_executable()
+            ffmpeg_args = self._prepare_ffmpeg_settings()
+
+            gen = run_vfi_module.run_vfi(
+                folder=pathlib.Path(self.in_dir),
+                output_mp4_path=pathlib.Path(self.out_file_path),
+                rife_exe_path=rife_exe,
+                fps=self.fps,
+                num_intermediate_frames=self.mid_count,
+                max_workers=self.max_workers,
+                rife_tile_enable=self.rife_tile_enable,
+                rife_tile_size=self.rife_tile_size,
+                rife_uhd_mode=self.rife_uhd_mode,
+                rife_thread_spec=self.rife_thread_spec or "1:2:2",
+                rife_tta_spatial=self.rife_tta_spatial,
+                rife_tta_temporal=self.rife_tta_temporal,
+                model_key=self.model_key or "rife-v4.6",
+                false_colour=self.false_colour,
+                res_km=self.res_km,
+                crop_rect_xywh=self.crop_rect,
+                skip_model=self.skip_model,
+                **ffmpeg_args,
+            )
+
+            for output in gen:
+                if isinstance(output, tuple):
+                    current, total, eta = output
+                    self.progress.emit(current, total, eta)
+                elif isinstance(output, pathlib.Path):
+                    self.finished.emit(str(output))
+
+            LOGGER.info("VFI processing completed")
+        except (FFmpegError, RIFEError, SanchezError, ProcessingError) as e:
+            # Specific processing errors - log with context
+            LOGGER.exception("Processing error")
+            self.error.emit(f"Processing failed: {e}")
+        except OSError as e:
+            # File system errors
+            LOGGER.exception("File operation error")
+            self.error.emit(f"File error: {e}")
+        except Exception as e:  # pragma: no cover - catch unexpected errors
+            LOGGER.exception("Unexpected error in VFI processing")
+            self.error.emit(f"Unexpected error: {e}")
+
+    def _get_rife_executable(self) -> pathlib.Path:
+        """Get the RIFE executable path based on model key."""
+        from goesvfi.utils.config import find_rife_executable
+
+        if self.model_key:
+            rife_path = find_rife_executable(self.model_key)
+            if rife_path:
+                return pathlib.Path(rife_path)
+
+        # Fallback to default RIFE executable
+        rife_path = find_rife_executable("rife-v4.6")  # Default model key
+        if rife_path:
+            return pathlib.Path(rife_path)
+
+        msg = "RIFE executable not found"
+        raise FileNotFoundError(msg)
+
+    def _prepare_ffmpeg_settings(self) -> dict:
+        """Prepare FFmpeg settings dictionary from instance attributes."""
+        return {
+            "use_ffmpeg_interp": self.use_ffmpeg_interp,
+            "filter_preset": self.filter_preset,
+            "mi_mode": self.mi_mode,
+            "mc_mode": self.mc_mode,
+            "me_mode": self.me_mode,
+            "me_algo": self.me_algo,
+            "search_param": self.search_param,
+            "scd_mode": self.scd_mode,
+            "scd_threshold": self.scd_threshold,
+            "minter_mb_size": self.minter_mb_size,
+            "minter_vsbmc": self.minter_vsbmc,
+            "apply_unsharp": self.apply_unsharp,
+            "unsharp_lx": self.unsharp_lx,
+            "unsharp_ly": self.unsharp_ly,
+            "unsharp_la": self.unsharp_la,
+            "unsharp_cx": self.unsharp_cx,
+            "unsharp_cy": self.unsharp_cy,
+            "unsharp_ca": self.unsharp_ca,
+            "crf": self.crf,
+            "bitrate_kbps": self.bitrate_kbps,
+            "bufsize_kb": self.bufsize_kb,
+            "pix_fmt": self.pix_fmt,
+        }
+
+    def _process_run_vfi_output(self, output_lines: list[str | pathlib.Path | tuple[int, int, float]]) -> None:
+        """Process output from run_vfi generator and emit appropriate signals."""
+        for line in output_lines:
+            if isinstance(line, tuple) and len(line) == 3:
+                # Progress update (current, total, time_elapsed)
+                current, total, time_elapsed = line
+                self.progress.emit(current, total, time_elapsed)
+            elif isinstance(line, pathlib.Path):
+                # Final output path as Path object
+                self.finished.emit(line)
+            elif isinstance(line, str):
+                if line.startswith(("Error:", "ERROR:")) or "error" in line.lower():
+                    # Error message - extract the actual error part
+                    if line.startswith("ERROR:"):
+                        error_msg = line[6:].strip()  # Remove "ERROR:" prefix
+                    else:
+                        error_msg = line
+                    self.error.emit(error_msg)
+                elif pathlib.Path(line).suffix in {".mp4", ".avi", ".mov"}:
+                    # Final output path as string
+                    self.finished.emit(line)
+                # Ignore other string outputs
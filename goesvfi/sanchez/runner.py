@@ -4,6 +4,7 @@ import platform
 import subprocess
 
 from goesvfi.utils import config  # Import config module
+from goesvfi.utils.metrics import ERRORS, SANCHEZ_SECONDS
 
 LOGGER = logging.getLogger(__name__)
 
@@ -80,16 +81,17 @@ def colourise(ir_png: str | Path, out_png: str | Path, *, res_km: int = 4) -> Pa
     )  # Log cwd with better formatting
     try:
         # Use subprocess.run to capture output
-        result = subprocess.run(
-            cmd,
-            check=True,  # Still raise error on non-zero exit code
-            capture_output=True,
-            text=True,  # Decode stdout/stderr as text
-            encoding="utf-8",  # Explicitly set encoding
-            errors="replace",  # Handle potential decoding errors
-            cwd=binary_dir,  # <-- Set the current working directory
-            timeout=120,
-        )
+        with SANCHEZ_SECONDS.time():
+            result = subprocess.run(
+                cmd,
+                check=True,  # Still raise error on non-zero exit code
+                capture_output=True,
+                text=True,  # Decode stdout/stderr as text
+                encoding="utf-8",  # Explicitly set encoding
+                errors="replace",  # Handle potential decoding errors
+                cwd=binary_dir,  # <-- Set the current working directory
+                timeout=120,
+            )
         # Log stdout/stderr even on success if needed for debugging
         if result.stdout:
             LOGGER.debug("Sanchez stdout:\n%s", result.stdout)
@@ -106,6 +108,7 @@ def colourise(ir_png: str | Path, out_png: str | Path, *, res_km: int = 4) -> Pa
         if e.stderr:
             LOGGER.exception("--> Sanchez stderr:\n%s", e.stderr)
         # Re-raise the original exception or a more specific one
+        ERRORS.inc(component="sanchez")
         msg = f"Sanchez execution failed: {e}"
         raise RuntimeError(msg) from e
     except FileNotFoundError:
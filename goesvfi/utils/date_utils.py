@@ -9,10 +9,13 @@ from pathlib import Path
 import re
 
 from goesvfi.utils import log
+from goesvfi.utils.filename_timestamps import TimestampParser
 
 # Set up module logger
 LOGGER = log.get_logger(__name__)
 
+_PATH_TIMESTAMP_PARSER = TimestampParser()
+
 
 def date_to_doy(date: datetime.date) -> int:
     """Convert a date to day of year.
@@ -349,17 +352,11 @@ def parse_satellite_path(path: str | Path) -> datetime.date | None:
     """
     path_str = str(path)
 
-    # Try satellite filename pattern with full timestamp
-    match = re.search(r"goes\d+_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})", path_str)
-    if match:
-        try:
-            year = int(match.group(1))
-            month = int(match.group(2))
-            day = int(match.group(3))
-            # Ignore hour, minute, second for date parsing
-            return datetime.date(year, month, day)
-        except ValueError:
-            return None
+    # Full timestamps (goes18_YYYYMMDD_HHMMSS, YYYYMMDDTHHMMSSZ, GOES start
+    # times, ...) are parsed by slicing at the position found in the last path
+    timestamp = _PATH_TIMESTAMP_PARSER.parse(path_str)
+    if timestamp is not None:
+        return timestamp.date()
 
     # Try various date patterns using existing helper functions
     # Order is important: more specific patterns first
@@ -389,22 +386,14 @@ def parse_satellite_path(path: str | Path) -> datetime.date | None:
     if result:
         return result
 
-    # Try YYYYDDD pattern (7 digits for day-of-year) - LAST because it can match YYYYMMDD incorrectly
-    result = _try_doy_pattern(path_str, r"(\d{4})(\d{3})", "YYYYDDD")
-    if result:
-        return result
-
-    return None
+    # Try YYYYDDD pattern (7 digits for day-of-year) - LAST because it can match YYYYMMDD incorrectly.
+    # Only a run of exactly seven digits counts, so eight digits that aren't a
+    # valid YYYYMMDD are never misread as a day of the year
+    return _try_doy_pattern(path_str, r"(?<!\d)(\d{4})(\d{3})(?!\d)", "YYYYDDD")
 
 
 def _try_doy_pattern(path_str: str, pattern: str, pattern_name: str) -> datetime.date | None:
     """Try to parse using day-of-year pattern."""
-    # For YYYYDDD pattern, check if this string was already rejected as invalid YYYYMMDD
-    if pattern_name == "YYYYDDD":
-        if hasattr(_try_calendar_pattern, "_failed_yyyymmdd") and path_str in _try_calendar_pattern._failed_yyyymmdd:
-            LOGGER.debug("Skipping %s as YYYYDDD because it failed as YYYYMMDD", path_str)
-            return None
-
     match = re.search(pattern, path_str)
     if match:
         try:
@@ -431,12 +420,6 @@ def _try_calendar_pattern(path_str: str, pattern: str, pattern_name: str) -> dat
             return result
         except ValueError as e:
             LOGGER.debug("Invalid date from %s pattern: %s", pattern_name, e)
-            # For YYYYMMDD pattern specifically, mark as invalid to prevent fallback to YYYYDDD
-            if pattern_name == "YYYYMMDD":
-                # Store the failed pattern to prevent YYYYDDD from trying it
-                if not hasattr(_try_calendar_pattern, "_failed_yyyymmdd"):
-                    _try_calendar_pattern._failed_yyyymmdd = set()  # type: ignore
-                _try_calendar_pattern._failed_yyyymmdd.add(path_str)  # type: ignore
     return None
 
 
@@ -0,0 +1,273 @@
+"""Kernel-side file transfers for the sorters.
+
+Copying through a Python read/write loop moves every byte through user space
+on one thread, so sorting a large archive is bound by that loop rather than
+by the disks. :func:`copy_file` lets the kernel copy instead, trying in order:
+
+1. A reflink (``FICLONE``): on copy-on-write filesystems such as Btrfs and
+   XFS the copy shares the source's extents and no data is copied at all.
+2. ``os.copy_file_range``: an in-kernel copy, done server-side on NFS 4.2
+   and SMB3.
+3. ``os.sendfile``: an in-kernel copy for kernels or filesystems without
+   ``copy_file_range``.
+4. A buffered read/write loop.
+
+Each step falls back to the next only on the errors that mean "not
+supported here". :func:`transfer_file` adds hardlink and move modes, and
+:func:`map_ordered` runs transfers on a bounded thread pool while handing
+results back in input order, so progress is still reported in order.
+"""
+
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+import concurrent.futures
+from enum import Enum
+import errno
+import os
+from pathlib import Path
+import shutil
+import sys
+import threading
+from typing import TypeVar
+
+from goesvfi.utils import log
+
+LOGGER = log.get_logger(__name__)
+
+# Copies wait on I/O, so use a few more threads than cores
+DEFAULT_TRANSFER_WORKERS = min(8, 2 * (os.cpu_count() or 1))
+
+# Buffer size for the read/write fallback (1 MB)
+DEFAULT_BUFFER_SIZE = 1048576
+
+# Largest single copy_file_range/sendfile call; the kernel caps calls near 2 GB
+_MAX_KERNEL_CHUNK = 1 << 30
+
+# Linux ioctl that clones a file's extents: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+# Errors meaning a copy method is unavailable for these files, rather than failed
+_UNSUPPORTED_ERRNOS = frozenset(
+    code
+    for code in (
+        errno.EXDEV,
+        errno.ENOSYS,
+        errno.EINVAL,
+        errno.ENOTTY,
+        errno.EOPNOTSUPP,
+        getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+        errno.EBADF,
+        errno.ETXTBSY,
+    )
+)
+
+# Errors after which a hardlink falls back to a copy
+_LINK_FALLBACK_ERRNOS = frozenset({errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP})
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+class TransferMode(Enum):
+    """How a sorter puts a file at its destination."""
+
+    COPY = "copy"
+    HARDLINK = "hardlink"
+    MOVE = "move"
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    """Clone the source's extents into the destination if the filesystem supports it."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+    except OSError as e:
+        if e.errno in _UNSUPPORTED_ERRNOS or e.errno == errno.EPERM:
+            return False
+        raise
+    return True
+
+
+def _kernel_copy(copy: Callable[[int, int], int], size: int) -> int:
+    """Copy ``size`` bytes with ``copy(offset, count)``, returning the bytes copied."""
+    offset = 0
+    while offset < size:
+        copied = copy(offset, min(size - offset, _MAX_KERNEL_CHUNK))
+        if copied == 0:
+            # The source was truncated while copying
+            break
+        offset += copied
+    return offset
+
+
+def _copy_fd(src_fd: int, dst_fd: int, size: int, buffer_size: int) -> str:
+    """Copy an open file to an empty one, returning the method used."""
+    if _reflink(src_fd, dst_fd):
+        return "reflink"
+
+    kernel_copies: list[tuple[str, Callable[[int, int], int]]] = []
+    if hasattr(os, "copy_file_range"):
+        kernel_copies.append((
+            "copy_file_range",
+            lambda offset, count: os.copy_file_range(src_fd, dst_fd, count, offset, offset),
+        ))
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        kernel_copies.append(("sendfile", lambda offset, count: os.sendfile(dst_fd, src_fd, offset, count)))
+
+    for method, copy in kernel_copies:
+        try:
+            _kernel_copy(copy, size)
+        except OSError as e:
+            # A method that fails part way through can't be retried safely
+            if e.errno not in _UNSUPPORTED_ERRNOS or os.lseek(dst_fd, 0, os.SEEK_END) > 0:
+                raise
+            LOGGER.debug("%s unavailable (%s), falling back", method, errno.errorcode.get(e.errno or 0, e.errno))
+        else:
+            return method
+
+    os.lseek(src_fd, 0, os.SEEK_SET)
+    while buffer := os.read(src_fd, buffer_size):
+        view = memoryview(buffer)
+        while view:
+            view = view[os.write(dst_fd, view) :]
+    return "buffered"
+
+
+def copy_file(
+    source_path: Path,
+    dest_path: Path,
+    source_mtime_utc: float | None = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> str:
+    """Copy a file through the kernel, preserving its modification time.
+
+    Args:
+        source_path: File to copy
+        dest_path: Destination file, replaced if it exists
+        source_mtime_utc: Epoch seconds to set as the destination's access and
+            modification times; by default the source's permission bits and
+            times are copied, as ``shutil.copy2`` does
+        buffer_size: Buffer size for the read/write fallback
+
+    Returns:
+        The copy method used: ``"reflink"``, ``"copy_file_range"``,
+        ``"sendfile"`` or ``"buffered"``
+    """
+    with open(source_path, "rb") as sf, open(dest_path, "wb") as df:
+        method = _copy_fd(sf.fileno(), df.fileno(), os.fstat(sf.fileno()).st_size, buffer_size)
+
+    if source_mtime_utc is None:
+        shutil.copystat(source_path, dest_path)
+    else:
+        os.utime(dest_path, (source_mtime_utc, source_mtime_utc))
+    return method
+
+
+def _link(source_path: Path, dest_path: Path) -> None:
+    """Hardlink ``source_path`` at ``dest_path``, replacing an existing file there."""
+    if dest_path.exists() and os.path.samefile(source_path, dest_path):
+        return
+    temp_path = dest_path.with_name(f".{dest_path.name}.{os.getpid()}.{threading.get_ident()}.link")
+    os.link(source_path, temp_path)
+    try:
+        os.replace(temp_path, dest_path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def transfer_file(
+    source_path: Path,
+    dest_path: Path,
+    mode: TransferMode = TransferMode.COPY,
+    source_mtime_utc: float | None = None,
+) -> str:
+    """Put a file at its destination by copying, hardlinking or moving it.
+
+    Hardlinks and moves keep the source's inode, and with it the modification
+    time. A hardlink across filesystems (or where links aren't allowed) falls
+    back to a copy, and a move across filesystems copies and then removes
+    the source.
+
+    Args:
+        source_path: File to transfer
+        dest_path: Destination file, replaced if it exists
+        mode: Transfer mode
+        source_mtime_utc: Modification time for copies, see ``copy_file``
+
+    Returns:
+        The method used: ``"hardlink"``, ``"rename"`` or one of ``copy_file``'s
+    """
+    if mode is TransferMode.HARDLINK:
+        try:
+            _link(source_path, dest_path)
+        except OSError as e:
+            if e.errno not in _LINK_FALLBACK_ERRNOS:
+                raise
+            LOGGER.debug("Cannot hardlink %s (%s), copying", source_path, e)
+        else:
+            return "hardlink"
+    elif mode is TransferMode.MOVE:
+        try:
+            os.replace(source_path, dest_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        else:
+            return "rename"
+        method = copy_file(source_path, dest_path, source_mtime_utc)
+        source_path.unlink()
+        return method
+
+    return copy_file(source_path, dest_path, source_mtime_utc)
+
+
+def map_ordered(
+    fn: Callable[[_T], _R],
+    items: Iterable[_T],
+    max_workers: int = DEFAULT_TRANSFER_WORKERS,
+    key: Callable[[_T], Hashable | None] | None = None,
+) -> Iterator[tuple[_T, "concurrent.futures.Future[_R]"]]:
+    """Run ``fn`` over ``items`` on a thread pool, yielding results in input order.
+
+    Each item is yielded with its finished future, whose ``result()`` returns
+    or raises what ``fn`` did. ``items`` is consumed lazily, at most twice
+    ``max_workers`` items ahead of the one being yielded, so the caller can
+    decide what to submit from what it has seen. Items with the same
+    non-None ``key`` (such as a destination path) never run concurrently;
+    later ones wait for earlier ones, so they take effect in input order.
+
+    Closing the generator early cancels the items not yet started.
+    """
+    window = 2 * max(1, max_workers)
+    pending: deque[tuple[_T, concurrent.futures.Future[_R], Hashable | None]] = deque()
+    running: dict[Hashable, concurrent.futures.Future[_R]] = {}
+
+    def finish() -> tuple[_T, concurrent.futures.Future[_R]]:
+        item, future, item_key = pending.popleft()
+        concurrent.futures.wait((future,))
+        if item_key is not None and running.get(item_key) is future:
+            del running[item_key]
+        return item, future
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="transfer")
+    try:
+        for item in items:
+            item_key = key(item) if key is not None else None
+            if item_key is not None and item_key in running:
+                concurrent.futures.wait((running[item_key],))
+            future = executor.submit(fn, item)
+            if item_key is not None:
+                running[item_key] = future
+            pending.append((item, future, item_key))
+
+            while pending and (len(pending) >= window or pending[0][1].done()):
+                yield finish()
+
+        while pending:
+            yield finish()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,119 @@
+"""Parallel ``os.scandir`` directory walker.
+
+``Path.rglob`` and ``Path.iterdir`` followed by ``is_file()`` pay a ``stat`` per
+entry and list one directory at a time. On NFS or SMB each of those is a round
+trip, so a large archive walk is bound by latency rather than throughput.
+
+:func:`walk_files` lists directories with ``os.scandir``, whose ``DirEntry``
+objects carry the file type from the directory listing, and lists
+subdirectories concurrently on a thread pool. Matching entries are streamed as
+they are found. Name filters run on plain strings before any ``Path`` is built.
+"""
+
+from collections.abc import Callable, Generator
+import concurrent.futures
+import os
+
+from goesvfi.utils import log
+
+LOGGER = log.get_logger(__name__)
+
+# Listing is latency-bound, so use more threads than cores
+DEFAULT_WALK_WORKERS = min(16, 2 * (os.cpu_count() or 1))
+
+NameFilter = Callable[[str], bool]
+
+# Files and subdirectory paths found in one directory, and its depth
+_Listing = tuple[list[os.DirEntry[str]], list[str], int]
+
+
+def _list_directory(
+    path: str,
+    depth: int,
+    suffixes: tuple[str, ...] | None,
+    name_filter: NameFilter | None,
+    dir_filter: NameFilter | None,
+    min_depth: int,
+    max_depth: int | None,
+) -> _Listing:
+    """List one directory, keeping matching files and subdirectories to descend into."""
+    files: list[os.DirEntry[str]] = []
+    subdirs: list[str] = []
+    want_files = depth >= min_depth
+    descend = max_depth is None or depth < max_depth
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if descend and (dir_filter is None or dir_filter(entry.name)):
+                            subdirs.append(entry.path)
+                        continue
+                    if not want_files:
+                        continue
+                    name = entry.name
+                    if suffixes is not None and not name.endswith(suffixes):
+                        continue
+                    if name_filter is not None and not name_filter(name):
+                        continue
+                    if entry.is_file():
+                        files.append(entry)
+                except OSError:
+                    continue
+    except OSError as e:
+        LOGGER.debug("Could not list %s: %s", path, e)
+    return files, subdirs, depth
+
+
+def walk_files(
+    root: str | os.PathLike[str],
+    *,
+    suffixes: tuple[str, ...] | None = None,
+    name_filter: NameFilter | None = None,
+    dir_filter: NameFilter | None = None,
+    min_depth: int = 0,
+    max_depth: int | None = None,
+    max_workers: int | None = None,
+) -> Generator[os.DirEntry[str], None, None]:
+    """Yield the files under ``root``, listing directories in parallel.
+
+    Entries are yielded in no particular order. Symlinked directories are not
+    followed; symlinks to files are yielded.
+
+    Args:
+        root: Directory to walk
+        suffixes: Keep only file names ending with one of these (case-sensitive)
+        name_filter: Keep only file names for which this returns True
+        dir_filter: Descend only into subdirectories whose name passes this
+        min_depth: Skip files less than this many directories below ``root``
+        max_depth: Don't descend more than this many directories below ``root``
+        max_workers: Listing threads; 1 walks serially on the calling thread
+
+    Yields:
+        ``os.DirEntry`` for each matching file
+    """
+    options = (suffixes, name_filter, dir_filter, min_depth, max_depth)
+    workers = max_workers or DEFAULT_WALK_WORKERS
+    root_path = os.fspath(root)
+
+    if workers <= 1:
+        stack = [(root_path, 0)]
+        while stack:
+            path, depth = stack.pop()
+            files, subdirs, _ = _list_directory(path, depth, *options)
+            yield from files
+            stack.extend((subdir, depth + 1) for subdir in subdirs)
+        return
+
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scandir")
+    pending = {pool.submit(_list_directory, root_path, 0, *options)}
+    try:
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                files, subdirs, depth = future.result()
+                pending.update(pool.submit(_list_directory, subdir, depth + 1, *options) for subdir in subdirs)
+                yield from files
+    finally:
+        # Also reached when the consumer stops iterating early
+        pool.shutdown(wait=False, cancel_futures=True)
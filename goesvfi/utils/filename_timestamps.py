@@ -0,0 +1,336 @@
+"""Fast timestamp parsing for GOES file and directory names.
+
+The archive, sorter and download code meet a handful of naming schemes:
+
+* ``OR_ABI-L1b-RadF-M6C13_G16_s20231661200204_e..._c....nc`` - NetCDF start
+  time as ``sYYYYJJJHHMMSS`` plus tenths of a second
+* ``image_G16_20230615T120000Z.png`` - processed frames
+* ``goes16_20230615_120000_band13.png`` - downloaded band images
+* ``2023-06-15_12-00-00`` - timestamped output directories
+* ``20231661200_GOES16-ABI-FD-13-5424x5424.jpg`` - CDN images
+
+Trying one regex per scheme and handing the match to ``strptime`` costs several
+microseconds per name, which adds up over archives of millions of files.
+:class:`TimestampParser` finds the scheme and position of the timestamp in the
+first name with a regex and remembers both. Later names are parsed by slicing
+the digits at the remembered position and converting them with integer
+arithmetic; only names that don't fit fall back to detection.
+:meth:`TimestampParser.parse_many` parses names of equal length as one NumPy
+array and returns ``datetime64[s]`` values.
+"""
+
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime
+import functools
+import re
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Layout letters, each standing for one digit; "#" is a digit that is ignored
+_DIGIT_CHARS = frozenset("YmdjHMS#")
+
+# Names converted to NumPy at a time by parse_many, to bound memory use
+_CHUNK_SIZE = 1 << 16
+
+_ZERO = ord("0")
+
+
+@functools.cache
+def _jan1_ordinal(year: int) -> int:
+    return date(year, 1, 1).toordinal()
+
+
+class TimestampScheme:
+    """A naming scheme, described by a layout string.
+
+    In the layout, ``YYYY`` is the year, ``mm`` the month, ``dd`` the day,
+    ``jjj`` the day of year, ``HH`` the hour, ``MM`` the minute, ``SS`` the
+    second and ``#`` a digit that is ignored. Other characters, and letters
+    escaped with a backslash, must appear literally. A layout that starts or
+    ends with a digit only matches where the neighbouring character is not a
+    digit.
+    """
+
+    def __init__(self, name: str, layout: str) -> None:
+        """Initialize the scheme.
+
+        Args:
+            name: Short name used in logs and tests
+            layout: Layout string, e.g. ``"YYYYmmddTHHMMSS"``
+
+        Raises:
+            ValueError: If the layout has no complete date
+        """
+        self.name = name
+        self.layout = layout
+
+        # (character, is a digit) for each position the layout matches
+        tokens: list[tuple[str, bool]] = []
+        escaped = False
+        for char in layout:
+            if escaped or char != "\\":
+                tokens.append((char, not escaped and char in _DIGIT_CHARS))
+                escaped = False
+            else:
+                escaped = True
+        self.width = len(tokens)
+
+        spans: dict[str, tuple[int, int]] = {}
+        for offset, (char, is_digit) in enumerate(tokens):
+            if is_digit and char != "#":
+                start, end = spans.get(char, (offset, offset))
+                if end != offset:
+                    msg = f"Field {char!r} is not contiguous in layout {layout!r}"
+                    raise ValueError(msg)
+                spans[char] = (start, offset + 1)
+        if "Y" not in spans or ("j" not in spans and not ("m" in spans and "d" in spans)):
+            msg = f"Layout {layout!r} has no complete date"
+            raise ValueError(msg)
+
+        self.spans = spans
+        self.literals = tuple((offset, char) for offset, (char, is_digit) in enumerate(tokens) if not is_digit)
+        self.digit_offsets = np.array([offset for offset, (_, is_digit) in enumerate(tokens) if is_digit])
+        self.guard_start = tokens[0][1]
+        self.guard_end = tokens[-1][1]
+        # Digit runs, so one isdigit() call checks the whole timestamp
+        self._digit_runs = tuple(
+            (int(run[0]), int(run[-1]) + 1)
+            for run in np.split(self.digit_offsets, np.flatnonzero(np.diff(self.digit_offsets) > 1) + 1)
+        )
+        # Each field as (divisor, modulus) of the integer formed by all digits;
+        # (1, 1) yields 0 for fields the layout lacks
+        place = {int(offset): len(self.digit_offsets) - index - 1 for index, offset in enumerate(self.digit_offsets)}
+        self._field_math = tuple(
+            (10 ** place[spans[char][1] - 1], 10 ** (spans[char][1] - spans[char][0])) if char in spans else (1, 1)
+            for char in "YmdjHMS"
+        )
+        self._day_of_year = "j" in spans
+
+        pattern = "".join(r"\d" if is_digit else re.escape(char) for char, is_digit in tokens)
+        self.regex = re.compile(
+            ("(?<!\\d)" if self.guard_start else "") + pattern + ("(?!\\d)" if self.guard_end else "")
+        )
+
+    def __repr__(self) -> str:
+        return f"TimestampScheme({self.name!r}, {self.layout!r})"
+
+    def parse_at(self, text: str, start: int) -> datetime | None:
+        """Parse the timestamp whose layout begins at ``text[start]``.
+
+        Returns:
+            The timestamp, or None if the text there doesn't fit the layout or
+            isn't a valid date and time
+        """
+        end = start + self.width
+        if start < 0 or end > len(text):
+            return None
+        if self.guard_start and start and text[start - 1].isdigit():
+            return None
+        if self.guard_end and end < len(text) and text[end].isdigit():
+            return None
+        chunk = text[start:end]
+        for offset, char in self.literals:
+            if chunk[offset] != char:
+                return None
+        runs = self._digit_runs
+        digits = chunk[runs[0][0] : runs[0][1]] if len(runs) == 1 else "".join([chunk[a:b] for a, b in runs])
+        if not (digits.isascii() and digits.isdigit()):
+            return None
+
+        value = int(digits)
+        year, month, day, doy, hour, minute, second = [value // div % mod for div, mod in self._field_math]
+        if year < 1:
+            return None
+        if self._day_of_year:
+            leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            if not 1 <= doy <= 365 + leap:
+                return None
+            day_date = date.fromordinal(_jan1_ordinal(year) + doy - 1)
+            month, day = day_date.month, day_date.day
+
+        try:
+            return datetime(year, month, day, hour, minute, second)
+        except ValueError:
+            return None
+
+    def parse_codes(self, codes: NDArray[np.uint32], offset: int) -> tuple[NDArray[np.datetime64], NDArray[np.bool_]]:
+        """Parse a block of names given as code points.
+
+        Args:
+            codes: ``(n, columns)`` array of code points, one row per name
+            offset: Column where the layout begins
+
+        Returns:
+            ``datetime64[s]`` values and a mask of the rows that parsed; values
+            in rows outside the mask are meaningless
+        """
+        ok = np.ones(len(codes), dtype=bool)
+        for literal_offset, char in self.literals:
+            ok &= codes[:, offset + literal_offset] == ord(char)
+        # Code points below "0" wrap around to large unsigned values
+        digits = codes[:, offset + self.digit_offsets] - _ZERO
+        ok &= (digits <= 9).all(axis=1)
+        if self.guard_start and offset > 0:
+            ok &= codes[:, offset - 1] - _ZERO > 9
+        if self.guard_end and offset + self.width < codes.shape[1]:
+            ok &= codes[:, offset + self.width] - _ZERO > 9
+
+        def field(char: str) -> NDArray[np.int64]:
+            if char not in self.spans:
+                return np.zeros(len(codes), dtype=np.int64)
+            a, b = self.spans[char]
+            weights = 10 ** np.arange(b - a - 1, -1, -1, dtype=np.int64)
+            return (codes[:, offset + a : offset + b].astype(np.int64) - _ZERO) @ weights
+
+        year = field("Y")
+        ok &= year >= 1
+        if "j" in self.spans:
+            doy = field("j")
+            leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+            ok &= (doy >= 1) & (doy <= 365 + leap)
+            days = (year - 1970).astype("datetime64[Y]").astype("datetime64[D]") + (doy - 1)
+        else:
+            month = field("m")
+            day = field("d")
+            ok &= (month >= 1) & (month <= 12) & (day >= 1)
+            months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+            days = months.astype("datetime64[D]") + (day - 1)
+            # Rolled over into the next month, e.g. 31 June
+            ok &= days.astype("datetime64[M]") == months
+
+        hour, minute, second = field("H"), field("M"), field("S")
+        ok &= (hour < 24) & (minute < 60) & (second < 60)
+        seconds = hour * 3600 + minute * 60 + second
+        return days.astype("datetime64[s]") + seconds.astype("timedelta64[s]"), ok
+
+
+GOES_START = TimestampScheme("goes_start", "_sYYYYjjjHHMMSS#")
+ISO_COMPACT = TimestampScheme("iso_compact", "YYYYmmddTHHMMSS")
+UNDERSCORED = TimestampScheme("underscored", "YYYYmmdd_HHMMSS")
+HYPHENATED = TimestampScheme("hyphenated", "YYYY-mm-dd_HH-MM-SS")
+GOES_CDN = TimestampScheme("goes_cdn", r"YYYYjjjHHMM_G\O\E\S##")
+
+# Detection order; earlier schemes win when a name matches several
+DEFAULT_SCHEMES: tuple[TimestampScheme, ...] = (GOES_START, ISO_COMPACT, UNDERSCORED, HYPHENATED, GOES_CDN)
+
+
+class TimestampParser:
+    """Parse timestamps from names, remembering where the last one was found.
+
+    The remembered scheme and position are tried first, both counted from the
+    start of the name and from its end, so names that differ only in a prefix
+    or only in a suffix both take the fast path. A name that matches neither
+    falls back to detection, which tries each scheme in order. When a name
+    holds several timestamps, the remembered position wins over detection
+    order.
+
+    Instances are safe to share between threads.
+    """
+
+    def __init__(self, schemes: Sequence[TimestampScheme] = DEFAULT_SCHEMES) -> None:
+        """Initialize the parser.
+
+        Args:
+            schemes: Schemes to detect, in order of preference
+        """
+        self.schemes = tuple(schemes)
+        # (scheme, offset from start, offset from end) of the last timestamp found
+        self._cached: tuple[TimestampScheme, int, int] | None = None
+
+    @property
+    def scheme(self) -> TimestampScheme | None:
+        """Scheme of the last timestamp found, if any."""
+        cached = self._cached
+        return cached[0] if cached is not None else None
+
+    def parse(self, name: str) -> datetime | None:
+        """Parse the timestamp in a file or directory name.
+
+        Returns:
+            Naive datetime, or None if no scheme matches
+        """
+        located = self._locate(name)
+        return located[2] if located is not None else None
+
+    def _locate(self, name: str) -> tuple[TimestampScheme, int, datetime] | None:
+        cached = self._cached
+        if cached is not None:
+            scheme, from_start, from_end = cached
+            timestamp = scheme.parse_at(name, from_start)
+            if timestamp is not None:
+                return scheme, from_start, timestamp
+            start = len(name) - from_end
+            if start != from_start:
+                timestamp = scheme.parse_at(name, start)
+                if timestamp is not None:
+                    return scheme, start, timestamp
+
+        for scheme in self.schemes:
+            for match in scheme.regex.finditer(name):
+                start = match.start()
+                timestamp = scheme.parse_at(name, start)
+                if timestamp is not None:
+                    self._cached = (scheme, start, len(name) - start)
+                    return scheme, start, timestamp
+        return None
+
+    def parse_many(self, names: Iterable[str]) -> NDArray[np.datetime64]:
+        """Parse the timestamps in many names.
+
+        Returns:
+            ``datetime64[s]`` array in the order of ``names``, NaT where a name
+            has no timestamp
+        """
+        names = list(names)
+        result = np.full(len(names), np.datetime64("NaT"), dtype="datetime64[s]")
+        for chunk_start in range(0, len(names), _CHUNK_SIZE):
+            chunk = names[chunk_start : chunk_start + _CHUNK_SIZE]
+            self._parse_chunk(chunk, result[chunk_start : chunk_start + len(chunk)])
+        return result
+
+    def _parse_chunk(self, names: list[str], out: NDArray[np.datetime64]) -> None:
+        by_length: dict[int, list[int]] = {}
+        for row, name in enumerate(names):
+            by_length.setdefault(len(name), []).append(row)
+
+        for length, row_list in by_length.items():
+            rows = np.array(row_list)
+            located = self._locate(names[row_list[0]])
+            if located is None:
+                self._parse_rows(names, rows, out)
+                continue
+
+            scheme, start, _ = located
+            # Convert only the timestamp and its neighbouring characters
+            lo = max(start - 1, 0)
+            hi = min(start + scheme.width + 1, length)
+            window = np.array([names[row][lo:hi] for row in row_list], dtype=f"<U{hi - lo}")
+            codes = window.view(np.uint32).reshape(len(rows), hi - lo)
+            values, ok = scheme.parse_codes(codes, start - lo)
+            out[rows[ok]] = values[ok]
+            self._parse_rows(names, rows[~ok], out)
+
+    def _parse_rows(self, names: list[str], rows: NDArray[np.intp], out: NDArray[np.datetime64]) -> None:
+        for row in rows.tolist():
+            timestamp = self.parse(names[row])
+            if timestamp is not None:
+                out[row] = np.datetime64(timestamp, "s")
+
+
+_DEFAULT_PARSER = TimestampParser()
+
+
+def parse_filename_timestamp(name: str) -> datetime | None:
+    """Parse the timestamp in a name with the shared default parser."""
+    return _DEFAULT_PARSER.parse(name)
+
+
+def parse_filename_timestamps(names: Iterable[str]) -> NDArray[np.datetime64]:
+    """Parse the timestamps in many names with the shared default parser.
+
+    Returns:
+        ``datetime64[s]`` array in the order of ``names``, NaT where a name has
+        no timestamp
+    """
+    return _DEFAULT_PARSER.parse_many(names)
@@ -1,15 +1,20 @@
 """Cache management for image processing operations.
 
 Provides caching utilities that help reduce redundant processing operations
-in image processing pipelines.
+in image processing pipelines. Cache managers are registered with the memory
+pressure bus, which shrinks them while memory is short.
 """
 
 from collections.abc import Callable
 from pathlib import Path
+import threading
 from typing import Any
 
 import numpy as np
 
+from goesvfi.utils.memory_pressure import get_memory_pressure_bus
+from goesvfi.utils.metrics import CACHE_REQUESTS
+
 from .base import ImageProcessingResult, ProcessorBase
 
 
@@ -20,37 +25,65 @@ class CacheManager:
         self.cache: dict[str, Any] = {}
         self.access_order: list[str] = []
         self.max_cache_size = max_cache_size
+        self._budget = 1.0
+        self._lock = threading.RLock()
+        get_memory_pressure_bus().register_cache(self)
+
+    @property
+    def capacity(self) -> int:
+        """Number of entries the cache holds under its current memory budget."""
+        return int(self.max_cache_size * self._budget)
+
+    def set_memory_budget(self, fraction: float) -> int:
+        """Limit the cache to a fraction of ``max_cache_size``.
+
+        Returns:
+            Number of least recently used entries evicted
+        """
+        with self._lock:
+            self._budget = fraction
+            return self._evict_to(self.capacity)
+
+    def _evict_to(self, size: int) -> int:
+        evicted = 0
+        while len(self.cache) > size:
+            oldest_key = self.access_order.pop(0)
+            del self.cache[oldest_key]
+            evicted += 1
+        return evicted
 
     def get(self, key: str) -> Any | None:
         """Get cached data by key."""
-        if key in self.cache:
-            # Move to end of access order (most recently used)
-            self.access_order.remove(key)
-            self.access_order.append(key)
-            return self.cache[key]
+        with self._lock:
+            if key in self.cache:
+                # Move to end of access order (most recently used)
+                self.access_order.remove(key)
+                self.access_order.append(key)
+                CACHE_REQUESTS.inc(cache="image_processing", result="hit")
+                return self.cache[key]
+        CACHE_REQUESTS.inc(cache="image_processing", result="miss")
         return None
 
     def put(self, key: str, data: Any) -> None:
         """Store data in cache with key."""
-        if key in self.cache:
-            # Update existing entry
-            self.cache[key] = data
-            self.access_order.remove(key)
-            self.access_order.append(key)
-        else:
-            # Add new entry
-            if len(self.cache) >= self.max_cache_size:
-                # Remove least recently used item
-                oldest_key = self.access_order.pop(0)
-                del self.cache[oldest_key]
-
-            self.cache[key] = data
-            self.access_order.append(key)
+        with self._lock:
+            if key in self.cache:
+                # Update existing entry
+                self.cache[key] = data
+                self.access_order.remove(key)
+                self.access_order.append(key)
+            elif self.capacity > 0:
+                # Add new entry, removing least recently used items to make room
+                self._evict_to(self.capacity - 1)
+
+                self.cache[key] = data
+                self.access_order.append(key)
 
     def clear(self) -> None:
         """Clear all cached data."""
-        self.cache.clear()
-        self.access_order.clear()
+        with self._lock:
+            self.cache.clear()
+            self.access_order.clear()
 
     def contains(self, key: str) -> bool:
         """Check if key exists in cache."""
@@ -58,10 +91,11 @@ class CacheManager:
 
     def remove(self, key: str) -> bool:
         """Remove specific key from cache."""
-        if key in self.cache:
-            del self.cache[key]
-            self.access_order.remove(key)
-            return True
+        with self._lock:
+            if key in self.cache:
+                del self.cache[key]
+                self.access_order.remove(key)
+                return True
         return False
 
     def size(self) -> int:
@@ -11,6 +11,8 @@ from PyQt6.QtCore import QSize
 from PyQt6.QtGui import QPixmap
 
 from goesvfi.utils import log
+from goesvfi.utils.memory_pressure import get_memory_pressure_bus
+from goesvfi.utils.metrics import CACHE_REQUESTS
 
 from .converters import (
     ArrayToImageConverter,
@@ -23,16 +25,43 @@ from .preview import SanchezWarningOverlay
 
 LOGGER = log.get_logger(__name__)
 
+# Sanchez results kept for previews; each is a full-size image array
+SANCHEZ_CACHE_MAX_ENTRIES = 32
+
 
 class RefactoredPreviewProcessor:
     """Refactored version of _load_process_scale_preview using the image processing framework.
 
     This class demonstrates how to reduce complexity by breaking down the monolithic
     350-line function into composable processing stages.
+
+    The Sanchez cache keeps the most recently used ``max_entries`` results and
+    is registered with the memory pressure bus, which shrinks it while memory
+    is short.
     """
 
-    def __init__(self, sanchez_cache: dict[Path, Any]) -> None:
+    def __init__(self, sanchez_cache: dict[Path, Any], max_entries: int = SANCHEZ_CACHE_MAX_ENTRIES) -> None:
         self.sanchez_cache = sanchez_cache
+        self.max_entries = max_entries
+        self._budget = 1.0
+        get_memory_pressure_bus().register_cache(self)
+
+    def set_memory_budget(self, fraction: float) -> int:
+        """Limit the Sanchez cache to a fraction of ``max_entries``.
+
+        Returns:
+            Number of least recently used results evicted
+        """
+        self._budget = fraction
+        return self._trim_cache()
+
+    def _trim_cache(self) -> int:
+        # The dict keeps insertion order and hits are moved to the end, so the
+        # first keys are the least recently used
+        excess = len(self.sanchez_cache) - int(self.max_entries * self._budget)
+        for image_path in list(self.sanchez_cache)[: max(0, excess)]:
+            self.sanchez_cache.pop(image_path, None)
+        return max(0, excess)
 
     def load_process_scale_preview(
         self,
@@ -128,7 +157,9 @@ class RefactoredPreviewProcessor:
             # Try cache first
             if image_path in self.sanchez_cache:
                 LOGGER.debug("Using cached Sanchez result for %s", image_path.name)
+                CACHE_REQUESTS.inc(cache="sanchez_preview", result="hit")
                 return self._create_cached_image_data(image_path)
+            CACHE_REQUESTS.inc(cache="sanchez_preview", result="miss")
             # Process with Sanchez
             return self._process_with_sanchez(image_path, image_loader, sanchez_processor, context)
         # Load original image
@@ -138,7 +169,8 @@ class RefactoredPreviewProcessor:
         """Create ImageData from cached Sanchez result."""
         from goesvfi.pipeline.image_processing_interfaces import ImageData
 
-        cached_array = self.sanchez_cache[image_path]
+        cached_array = self.sanchez_cache.pop(image_path)
+        self.sanchez_cache[image_path] = cached_array  # Most recently used
         return ImageData(
             image_data=cached_array,
             metadata={"source_path": image_path, "cached": True},
@@ -168,6 +200,7 @@ class RefactoredPreviewProcessor:
             if processed_data and processed_data.image_data is not None:
                 # Cache the result
                 self.sanchez_cache[image_path] = processed_data.image_data
+                self._trim_cache()
                 return processed_data
             # Sanchez failed, update context and return original
             context["draw_sanchez_warning"] = True
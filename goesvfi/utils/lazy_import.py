@@ -0,0 +1,52 @@
+"""Deferred imports for heavy optional dependencies.
+
+Packages such as xarray take longer to import than the modules that use them
+take to run once, and a GUI module that imports them at the top makes every
+start pay for them even if the feature is never used. :func:`lazy_import`
+returns a module object whose code runs on first attribute access, so a module
+can keep ``xr = lazy_import("xarray")`` at the top and use ``xr.open_dataset``
+as usual.
+
+A missing package still fails at the ``lazy_import`` call, so optional
+dependency checks keep working. Modules using a lazy import should add
+``from __future__ import annotations`` so that annotations such as
+``xr.Dataset`` don't load the package when the function is defined.
+"""
+
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+_lock = threading.Lock()
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Import a module on first attribute access.
+
+    Args:
+        name: Absolute module name, e.g. ``"xarray"``
+
+    Returns:
+        The module if it was already imported, otherwise a module that loads
+        itself when first used
+
+    Raises:
+        ModuleNotFoundError: If the module can't be found
+    """
+    with _lock:
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.loader is None:
+            msg = f"No module named {name!r}"
+            raise ModuleNotFoundError(msg, name=name)
+
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+        return module
@@ -0,0 +1,308 @@
+"""Memory pressure levels that caches and work queues react to.
+
+:class:`MemoryMonitor` polls memory on a background thread, but nothing acted
+on what it saw: caches kept growing and work kept being submitted until the
+system ran out of memory. :class:`MemoryPressureBus` turns its readings into a
+:class:`PressureLevel` and tells subscribers when the level changes.
+
+- Caches registered with the bus are limited to a share of their size for
+  each level (``CACHE_BUDGETS``) and evict their least recently used entries
+  down to it. They can grow back once the pressure is normal again.
+- Work queues check ``level`` or call ``wait_for_admission`` before starting
+  more work, and pause while the level is critical.
+
+In a container, the memory that matters is the container's limit rather than
+the host's RAM. When the process runs in a cgroup v2 with a memory limit, as
+under Docker, the level is computed from the cgroup's usage and limit; page
+cache the kernel can reclaim (``inactive_file``) doesn't count as used.
+Otherwise the system memory figures from psutil are used. The thresholds are
+those of :class:`MemoryStats`: elevated when memory is low, critical when it is
+critically low. A level is only lowered after ``recovery_readings``
+consecutive readings below it, so a level doesn't flap at a threshold.
+"""
+
+from collections.abc import Callable
+from enum import IntEnum
+from pathlib import Path
+import threading
+import types
+from typing import Any, Protocol
+import weakref
+
+from goesvfi.utils import log
+from goesvfi.utils.memory_manager import MemoryMonitor, MemoryStats, get_memory_monitor
+
+LOGGER = log.get_logger(__name__)
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+PROC_SELF_CGROUP = Path("/proc/self/cgroup")
+
+# Consecutive readings at a lower level before the level is lowered
+RECOVERY_READINGS = 3
+
+# Seconds between readings while the bus is running
+DEFAULT_INTERVAL = 2.0
+
+
+class PressureLevel(IntEnum):
+    """How short of memory the process is."""
+
+    NORMAL = 0
+    ELEVATED = 1
+    CRITICAL = 2
+
+
+# Share of a cache's configured size it may use at each level
+CACHE_BUDGETS = {
+    PressureLevel.NORMAL: 1.0,
+    PressureLevel.ELEVATED: 0.5,
+    PressureLevel.CRITICAL: 0.0,
+}
+
+
+class MemoryBudgeted(Protocol):
+    """A cache that can be limited to a share of its configured size."""
+
+    def set_memory_budget(self, fraction: float) -> int:
+        """Limit the cache to ``fraction`` of its size, returning the number of entries evicted."""
+
+
+def _cgroup_dir(cgroup_root: Path, proc_cgroup: Path) -> Path | None:
+    """Find the process's cgroup v2 directory, if it runs in one."""
+    try:
+        lines = proc_cgroup.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        # The unified hierarchy's entry is "0::<path>"
+        if line.startswith("0::"):
+            directory = cgroup_root / line[3:].lstrip("/")
+            # Inside a container's cgroup namespace its own cgroup is the root
+            return directory if directory.is_dir() else cgroup_root
+    return None
+
+
+def _read_int(path: Path) -> int | None:
+    try:
+        value = path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def container_memory_stats(cgroup_root: Path = CGROUP_ROOT, proc_cgroup: Path = PROC_SELF_CGROUP) -> MemoryStats | None:
+    """Get memory statistics from the process's cgroup v2 memory limit.
+
+    Args:
+        cgroup_root: Mount point of the cgroup v2 hierarchy
+        proc_cgroup: The process's cgroup membership file
+
+    Returns:
+        Statistics against the nearest memory limit of the process's cgroup
+        and its ancestors, or None if there is no cgroup v2 memory limit
+    """
+    directory = _cgroup_dir(cgroup_root, proc_cgroup)
+    while directory is not None:
+        limit = _read_int(directory / "memory.max")  # None for "max", i.e. no limit
+        current = _read_int(directory / "memory.current")
+        if limit is not None and current is not None:
+            break
+        directory = directory.parent if directory != cgroup_root and cgroup_root in directory.parents else None
+    else:
+        return None
+
+    reclaimable = 0
+    try:
+        for line in (directory / "memory.stat").read_text(encoding="utf-8").splitlines():
+            name, _, value = line.partition(" ")
+            if name == "inactive_file":
+                reclaimable = int(value)
+                break
+    except (OSError, ValueError):
+        pass
+
+    used = max(0, current - reclaimable)
+    mb = 1024 * 1024
+    return MemoryStats(
+        total_mb=limit // mb,
+        available_mb=max(0, limit - used) // mb,
+        used_mb=used // mb,
+        percent_used=min(100.0, used / limit * 100) if limit else 100.0,
+    )
+
+
+def pressure_level(stats: MemoryStats) -> PressureLevel:
+    """Classify memory statistics by the thresholds of :class:`MemoryStats`."""
+    if stats.is_critical_memory:
+        return PressureLevel.CRITICAL
+    if stats.is_low_memory:
+        return PressureLevel.ELEVATED
+    return PressureLevel.NORMAL
+
+
+class MemoryPressureBus:
+    """Publishes the memory pressure level to subscribers and registered caches.
+
+    Caches and bound-method subscribers are held weakly, so subscribing
+    doesn't keep an object alive. Callbacks run on the thread that took the
+    reading.
+    """
+
+    def __init__(
+        self,
+        monitor: MemoryMonitor | None = None,
+        recovery_readings: int = RECOVERY_READINGS,
+        cgroup_root: Path = CGROUP_ROOT,
+        proc_cgroup: Path = PROC_SELF_CGROUP,
+    ) -> None:
+        """Initialize the bus.
+
+        Args:
+            monitor: Monitor whose readings drive the bus; defaults to the global one
+            recovery_readings: Consecutive lower readings before the level is lowered
+            cgroup_root: Mount point of the cgroup v2 hierarchy
+            proc_cgroup: The process's cgroup membership file
+        """
+        self.monitor = monitor if monitor is not None else get_memory_monitor()
+        self.recovery_readings = max(1, recovery_readings)
+        self._cgroup_root = cgroup_root
+        self._proc_cgroup = proc_cgroup
+        self._level = PressureLevel.NORMAL
+        self._stats: MemoryStats | None = None
+        self._lower_readings = 0
+        self._subscribers: list[Callable[[], Any]] = []
+        self._caches: weakref.WeakSet[MemoryBudgeted] = weakref.WeakSet()
+        self._attached = False
+        self._lock = threading.Lock()
+        self._admission = threading.Condition(self._lock)
+
+    @property
+    def level(self) -> PressureLevel:
+        """The current pressure level."""
+        return self._level
+
+    @property
+    def stats(self) -> MemoryStats | None:
+        """The last reading, against the container's limit when there is one."""
+        return self._stats
+
+    def start(self, interval: float = DEFAULT_INTERVAL) -> None:
+        """Take readings from the monitor's background thread."""
+        with self._lock:
+            if not self._attached:
+                self._attached = True
+                self.monitor.add_callback(self.update)
+        self.monitor.start_monitoring(interval=interval)
+
+    def subscribe(self, callback: Callable[[PressureLevel], None]) -> None:
+        """Call ``callback`` with the new level whenever the level changes."""
+        if isinstance(callback, types.MethodType):
+            ref: Callable[[], Any] = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback  # noqa: E731
+        with self._lock:
+            self._subscribers.append(ref)
+
+    def unsubscribe(self, callback: Callable[[PressureLevel], None]) -> None:
+        """Stop calling ``callback``."""
+        with self._lock:
+            self._subscribers = [ref for ref in self._subscribers if (held := ref()) is not None and held != callback]
+
+    def register_cache(self, cache: MemoryBudgeted) -> None:
+        """Limit a cache to the budget of the current level, and of every later level."""
+        with self._lock:
+            self._caches.add(cache)
+            level = self._level
+        if level != PressureLevel.NORMAL:
+            cache.set_memory_budget(CACHE_BUDGETS[level])
+
+    def check(self) -> PressureLevel:
+        """Take a reading now and return the resulting level."""
+        return self.update(MemoryMonitor.get_memory_stats())
+
+    def update(self, stats: MemoryStats) -> PressureLevel:
+        """Take a reading of system memory, as the monitor's callback.
+
+        Args:
+            stats: System memory statistics; replaced by the container's when
+                it has a memory limit
+
+        Returns:
+            The resulting level
+        """
+        stats = container_memory_stats(self._cgroup_root, self._proc_cgroup) or stats
+        reading = pressure_level(stats)
+        callbacks: list[Callable[[PressureLevel], None]] = []
+        caches: list[MemoryBudgeted] = []
+        with self._lock:
+            self._stats = stats
+            previous = self._level
+            if reading > previous:
+                self._level = reading
+            elif reading < previous:
+                self._lower_readings += 1
+                if self._lower_readings >= self.recovery_readings:
+                    self._level = reading
+            if reading >= self._level:
+                self._lower_readings = 0
+            level = self._level
+            if level != previous:
+                self._admission.notify_all()
+                callbacks = [callback for callback in (ref() for ref in self._subscribers) if callback is not None]
+                caches = list(self._caches)
+        if level != previous:
+            self._publish(previous, level, stats, callbacks, caches)
+        return level
+
+    def wait_for_admission(self, timeout: float | None = None) -> bool:
+        """Wait until the level is below critical.
+
+        Returns:
+            False if the level was still critical after ``timeout`` seconds
+        """
+        with self._admission:
+            return self._admission.wait_for(lambda: self._level < PressureLevel.CRITICAL, timeout)
+
+    def _publish(
+        self,
+        previous: PressureLevel,
+        level: PressureLevel,
+        stats: MemoryStats,
+        callbacks: list[Callable[[PressureLevel], None]],
+        caches: list[MemoryBudgeted],
+    ) -> None:
+        log_method = LOGGER.warning if level > previous else LOGGER.info
+        log_method(
+            "Memory pressure %s -> %s: %sMB available (%s%% used)",
+            previous.name.lower(),
+            level.name.lower(),
+            stats.available_mb,
+            round(stats.percent_used, 1),
+        )
+        budget = CACHE_BUDGETS[level]
+        evicted = 0
+        for cache in caches:
+            try:
+                evicted += cache.set_memory_budget(budget)
+            except Exception:
+                LOGGER.exception("Error limiting cache %r to its memory budget", cache)
+        if evicted:
+            LOGGER.info("Evicted %d cache entries under memory pressure", evicted)
+        for callback in callbacks:
+            try:
+                callback(level)
+            except Exception:
+                LOGGER.exception("Error in memory pressure callback")
+
+
+_memory_pressure_bus: MemoryPressureBus | None = None
+_bus_lock = threading.Lock()
+
+
+def get_memory_pressure_bus() -> MemoryPressureBus:
+    """Get the global memory pressure bus, driven by the global memory monitor."""
+    global _memory_pressure_bus  # pylint: disable=global-statement
+    with _bus_lock:
+        if _memory_pressure_bus is None:
+            _memory_pressure_bus = MemoryPressureBus()
+        return _memory_pressure_bus
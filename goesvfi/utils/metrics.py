@@ -0,0 +1,546 @@
+"""Application metrics and an optional HTTP exporter in the Prometheus format.
+
+The monitoring stack in ``monitoring/`` scrapes ``/metrics`` on port 8080. This
+module provides the metrics behind that endpoint without depending on a
+Prometheus client library.
+
+Metrics live in a :class:`MetricsRegistry`, normally the global ``REGISTRY``:
+
+- :class:`Counter`, :class:`Gauge` and :class:`Histogram` are updated by the
+  code being measured, with label values passed as keyword arguments.
+- Collectors are functions called at each scrape that report figures other
+  components already keep, such as ``get_stats()`` results, so those
+  components don't need to update metrics as they go.
+
+The application's own metrics are defined here so their names are in one
+place. Counters and histograms updated in worker processes of the global
+process pool are sent back with each task's result and merged into the
+pool's process (see :meth:`MetricsRegistry.drain` and
+:meth:`MetricsRegistry.merge`).
+
+:func:`start_metrics_server` serves the registry over HTTP on a background
+thread. It is started by the command line's ``--metrics-port`` option, or by
+setting ``GOESVFI_METRICS_PORT``.
+"""
+
+import bisect
+from collections.abc import Callable, Generator, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import math
+import os
+import threading
+import time
+from typing import Any
+
+from goesvfi.utils import log
+
+try:
+    import psutil
+
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+LOGGER = log.get_logger(__name__)
+
+METRICS_PORT_ENV = "GOESVFI_METRICS_PORT"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; from a fast cached step up to a slow RIFE pair on the CPU
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = tuple[str, ...]
+
+
+@dataclass
+class MetricFamily:
+    """A metric's samples as reported by a collector.
+
+    Each sample is ``(name_suffix, labels, value)``; the suffix is appended to
+    the family's name, as in ``_bucket``, and is usually empty.
+    """
+
+    name: str
+    type: str
+    help: str
+    samples: list[tuple[str, dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, value: float, suffix: str = "", **labels: Any) -> None:
+        """Add a sample."""
+        self.samples.append((suffix, {name: str(label) for name, label in labels.items()}, float(value)))
+
+
+class _Metric:
+    """A metric updated by the application, with one value per label set."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            msg = f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}"
+            raise ValueError(msg)
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> dict[str, str]:
+        return dict(zip(self.labelnames, key, strict=True))
+
+    def collect(self) -> MetricFamily:
+        """Get the metric's current samples."""
+        raise NotImplementedError
+
+    def drain(self) -> dict[LabelValues, Any]:
+        """Take the values recorded so far, leaving the metric empty."""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: dict[LabelValues, Any]) -> None:
+        """Add values drained from the same metric in another process."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A value that only goes up, such as a number of frames or seconds spent."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """Add ``amount`` to the counter."""
+        if amount < 0:
+            msg = f"{self.name} can only be increased"
+            raise ValueError(msg)
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def merge(self, values: dict[LabelValues, Any]) -> None:
+        """Add values drained from the same metric in another process."""
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = self._values.get(key, 0.0) + value
+
+    def value(self, **labels: Any) -> float:
+        """Get the counter's value."""
+        with self._lock:
+            return float(self._values.get(self._key(labels), 0.0))
+
+    def collect(self) -> MetricFamily:
+        """Get the metric's current samples."""
+        family = MetricFamily(self.name, self.type, self.documentation)
+        with self._lock:
+            for key, value in self._values.items():
+                family.add(value, **self._labels(key))
+        return family
+
+
+class Gauge(_Metric):
+    """A value that can go up and down, such as a queue's length."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Set the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """Add ``amount``, which may be negative, to the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def drain(self) -> dict[LabelValues, Any]:
+        """Gauges describe their own process and aren't sent to another."""
+        return {}
+
+    def merge(self, values: dict[LabelValues, Any]) -> None:
+        """Gauges describe their own process and aren't merged."""
+
+    def value(self, **labels: Any) -> float:
+        """Get the gauge's value."""
+        with self._lock:
+            return float(self._values.get(self._key(labels), 0.0))
+
+    def collect(self) -> MetricFamily:
+        """Get the metric's current samples."""
+        family = MetricFamily(self.name, self.type, self.documentation)
+        with self._lock:
+            for key, value in self._values.items():
+                family.add(value, **self._labels(key))
+        return family
+
+
+class Histogram(_Metric):
+    """The distribution of observed values, such as latencies, in buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        if "le" in self.labelnames:
+            msg = "A histogram can't have a label named 'le'"
+            raise ValueError(msg)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record an observed value."""
+        key = self._key(labels)
+        with self._lock:
+            # One count per bucket, plus one for values above the last bucket
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def merge(self, values: dict[LabelValues, Any]) -> None:
+        """Add values drained from the same metric in another process."""
+        with self._lock:
+            for key, (counts, total) in values.items():
+                if len(counts) != len(self.buckets) + 1:
+                    LOGGER.warning("Ignoring %s values with different buckets", self.name)
+                    continue
+                merged, merged_total = self._values.get(key, ([0] * len(counts), 0.0))
+                self._values[key] = ([a + b for a, b in zip(merged, counts, strict=True)], merged_total + total)
+
+    @contextmanager
+    def time(self, **labels: Any) -> Generator[None]:
+        """Observe the seconds spent in the ``with`` block, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:
+        """Get the number of observations."""
+        with self._lock:
+            counts, _ = self._values.get(self._key(labels), ([], 0.0))
+            return sum(counts)
+
+    def sum(self, **labels: Any) -> float:
+        """Get the sum of the observed values."""
+        with self._lock:
+            return float(self._values.get(self._key(labels), ([], 0.0))[1])
+
+    def collect(self) -> MetricFamily:
+        """Get the metric's current samples, with cumulative buckets."""
+        family = MetricFamily(self.name, self.type, self.documentation)
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                labels = self._labels(key)
+                cumulative = 0
+                for bound, bucket_count in zip((*self.buckets, math.inf), counts, strict=True):
+                    cumulative += bucket_count
+                    family.add(cumulative, "_bucket", **labels, le=_format_value(bound))
+                family.add(total, "_sum", **labels)
+                family.add(cumulative, "_count", **labels)
+        return family
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(text: str, *, quotes: bool) -> str:
+    text = text.replace("\\", "\\\\").replace("\n", "\\n")
+    return text.replace('"', '\\"') if quotes else text
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value, quotes=True)}"' for name, value in labels.items())
+    return f"{{{pairs}}}"
+
+
+class MetricsRegistry:
+    """The metrics and collectors reported at a scrape."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Iterable[MetricFamily]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Get the counter called ``name``, creating it if needed."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Get the gauge called ``name``, creating it if needed."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get the histogram called ``name``, creating it if needed."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric: Any) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            msg = f"Metric {metric.name} is already registered as a {existing.type} with labels {existing.labelnames}"
+            raise ValueError(msg)
+        return existing
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Call ``collector`` at each scrape for metrics kept elsewhere."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Stop calling ``collector``."""
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def collect(self) -> list[MetricFamily]:
+        """Get every metric's samples, skipping collectors that fail."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        families = [metric.collect() for metric in metrics]
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception:
+                LOGGER.exception("Error in metrics collector %r", collector)
+        return families
+
+    def render(self) -> str:
+        """Get every metric in the Prometheus text exposition format."""
+        # Families reported more than once, say by two collectors, are
+        # written once with all their samples
+        merged: dict[str, MetricFamily] = {}
+        for family in self.collect():
+            if family.name in merged:
+                merged[family.name].samples.extend(family.samples)
+            else:
+                merged[family.name] = MetricFamily(family.name, family.type, family.help, list(family.samples))
+
+        lines: list[str] = []
+        for family in merged.values():
+            lines.append(f"# HELP {family.name} {_escape(family.help, quotes=False)}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            lines.extend(
+                f"{family.name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+                for suffix, labels, value in family.samples
+            )
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> dict[str, dict[LabelValues, Any]]:
+        """Take the counter and histogram values recorded so far.
+
+        Used in worker processes, whose metrics are sent to the process that
+        serves them.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: values for metric in metrics if (values := metric.drain())}
+
+    def merge(self, snapshot: dict[str, dict[LabelValues, Any]]) -> None:
+        """Add values drained from this registry's metrics in another process."""
+        for name, values in snapshot.items():
+            with self._lock:
+                metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(values)
+
+
+class MetricsServer:
+    """Serves a registry at ``/metrics`` over HTTP on a background thread."""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """Bind the server; it doesn't serve until started.
+
+        Args:
+            registry: The metrics to serve
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port
+
+        Raises:
+            OSError: If the address can't be bound
+        """
+        self.registry = registry
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        """The port the server listens on."""
+        return int(self._httpd.server_address[1])
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                LOGGER.debug("Metrics request from %s: %s", self.address_string(), format % args)
+
+        return Handler
+
+    def start(self) -> None:
+        """Start serving."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="MetricsServer", daemon=True)
+            self._thread.start()
+            LOGGER.info("Serving metrics at http://%s:%d/metrics", self._httpd.server_address[0], self.port)
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+
+REGISTRY = MetricsRegistry()
+
+FRAMES_PROCESSED = REGISTRY.counter(
+    "goes_vfi_frames_processed_total", "Frames that finished a pipeline stage", ("stage",)
+)
+RIFE_SECONDS = REGISTRY.histogram("goes_vfi_rife_seconds", "Seconds to interpolate a frame pair with RIFE")
+SANCHEZ_SECONDS = REGISTRY.histogram("goes_vfi_sanchez_seconds", "Seconds to colourise a frame with Sanchez")
+FFMPEG_STALL_SECONDS = REGISTRY.counter(
+    "goes_vfi_ffmpeg_pipe_stall_seconds_total", "Seconds spent blocked writing frames to FFmpeg"
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "goes_vfi_cache_requests_total", "Cache lookups, by cache and hit or miss", ("cache", "result")
+)
+ERRORS = REGISTRY.counter("goes_vfi_errors_total", "Errors, by the component they happened in", ("component",))
+
+
+def _collect_cache_hit_ratios() -> Iterator[MetricFamily]:
+    family = MetricFamily("goes_vfi_cache_hit_ratio", "gauge", "Share of cache lookups that were hits")
+    lookups: dict[str, dict[str, float]] = {}
+    for _, labels, value in CACHE_REQUESTS.collect().samples:
+        lookups.setdefault(labels["cache"], {})[labels["result"]] = value
+    for cache, results in sorted(lookups.items()):
+        total = sum(results.values())
+        family.add(results.get("hit", 0.0) / total if total else 0.0, cache=cache)
+    yield family
+
+
+def _collect_process() -> Iterator[MetricFamily]:
+    if not PSUTIL_AVAILABLE:
+        return
+    process = psutil.Process()
+    with process.oneshot():
+        memory = process.memory_info()
+        cpu = process.cpu_times()
+        created = process.create_time()
+    yield MetricFamily(
+        "process_resident_memory_bytes", "gauge", "Resident memory size in bytes", [("", {}, float(memory.rss))]
+    )
+    yield MetricFamily(
+        "process_virtual_memory_bytes", "gauge", "Virtual memory size in bytes", [("", {}, float(memory.vms))]
+    )
+    yield MetricFamily(
+        "process_cpu_seconds_total", "counter", "User and system CPU time in seconds", [("", {}, cpu.user + cpu.system)]
+    )
+    yield MetricFamily(
+        "process_start_time_seconds",
+        "gauge",
+        "Start time of the process in seconds since the epoch",
+        [("", {}, created)],
+    )
+
+
+REGISTRY.register_collector(_collect_cache_hit_ratios)
+REGISTRY.register_collector(_collect_process)
+
+_server: MetricsServer | None = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", registry: MetricsRegistry | None = None) -> MetricsServer:
+    """Serve metrics at ``/metrics``, once per process.
+
+    Args:
+        port: Port to listen on; 0 picks a free port
+        host: Interface to listen on; use ``0.0.0.0`` for scrapes from other
+            containers
+        registry: The metrics to serve; defaults to ``REGISTRY``
+
+    Returns:
+        The running server; the one already running if there is one
+
+    Raises:
+        OSError: If the address can't be bound
+    """
+    global _server  # pylint: disable=global-statement
+    with _server_lock:
+        if _server is None:
+            _server = MetricsServer(registry or REGISTRY, host, port)
+            _server.start()
+        return _server
+
+
+def stop_metrics_server() -> None:
+    """Stop the server started by :func:`start_metrics_server`."""
+    global _server  # pylint: disable=global-statement
+    with _server_lock:
+        if _server is not None:
+            _server.stop()
+            _server = None
+
+
+def start_metrics_server_from_env() -> MetricsServer | None:
+    """Start the metrics server if ``GOESVFI_METRICS_PORT`` is set.
+
+    ``GOESVFI_METRICS_HOST`` sets the interface, by default only the local one.
+
+    Returns:
+        The running server, or None if metrics aren't enabled or can't be served
+    """
+    value = os.environ.get(METRICS_PORT_ENV, "").strip()
+    if not value:
+        return None
+    try:
+        return start_metrics_server(int(value), os.environ.get("GOESVFI_METRICS_HOST", "127.0.0.1"))
+    except ValueError:
+        LOGGER.warning("Ignoring %s=%r: not a port number", METRICS_PORT_ENV, value)
+    except OSError as e:
+        LOGGER.warning("Can't serve metrics on port %s: %s", value, e)
+    return None
@@ -0,0 +1,209 @@
+"""Startup cost measurements: import-time audits and time to first paint.
+
+The GUI starts slowly when a module near the top of the import graph pulls in a
+heavy dependency, or when a probe runs before the window appears. Neither
+shows up in functional tests, so this module provides the two measurements used
+to track them:
+
+- :func:`audit_imports` runs a statement in a fresh interpreter under
+  ``python -X importtime`` and parses the per-module self and cumulative
+  import times, so a test can check both the total cost and which modules
+  were loaded.
+- :func:`process_uptime` gives the seconds since the process started;
+  ``MainWindow`` reports it on its first paint through
+  :func:`record_startup_metric`, which logs it and, when the
+  ``GOESVFI_STARTUP_METRICS`` environment variable names a file, appends it
+  there as a JSON line so runs can be compared over time.
+"""
+
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import re
+import subprocess
+import sys
+import time
+from typing import Any
+
+from goesvfi.utils import log
+
+LOGGER = log.get_logger(__name__)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Packages the GUI must not import before they are first used
+DEFERRED_PACKAGES = ("xarray", "matplotlib", "aioboto3", "aiohttp", "botocore")
+
+# Environment variable naming a JSON lines file that startup metrics are appended to
+METRICS_FILE_ENV = "GOESVFI_STARTUP_METRICS"
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)\s*$")
+
+# Fallback start time when the process start time isn't available
+_MODULE_LOADED = time.monotonic()
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """The import cost of one module, as reported by ``-X importtime``."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def self_seconds(self) -> float:
+        """Time spent in the module itself."""
+        return self.self_us / 1e6
+
+    @property
+    def cumulative_seconds(self) -> float:
+        """Time spent in the module and the modules it imported first."""
+        return self.cumulative_us / 1e6
+
+
+@dataclass
+class ImportAudit:
+    """The modules a statement imported and what each of them cost."""
+
+    statement: str
+    records: list[ImportRecord] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        """Time spent importing, including interpreter startup imports."""
+        return sum(record.self_us for record in self.records) / 1e6
+
+    @property
+    def modules(self) -> set[str]:
+        """Names of every module imported."""
+        return {record.module for record in self.records}
+
+    def loaded(self, package: str) -> bool:
+        """Check whether a package or any of its submodules was imported."""
+        prefix = f"{package}."
+        return any(record.module == package or record.module.startswith(prefix) for record in self.records)
+
+    def cumulative_seconds(self, module: str) -> float:
+        """Get the cumulative import time of a module, or 0.0 if it wasn't imported."""
+        for record in self.records:
+            if record.module == module:
+                return record.cumulative_seconds
+        return 0.0
+
+    def top(self, count: int = 15) -> list[ImportRecord]:
+        """Get the modules that took longest to import themselves."""
+        return sorted(self.records, key=lambda record: record.self_us, reverse=True)[:count]
+
+    def report(self, count: int = 15) -> str:
+        """Format the slowest modules as a table."""
+        lines = [f"Import audit of {self.statement!r}: {self.total_seconds:.3f}s in {len(self.records)} modules"]
+        lines.extend(
+            f"{record.self_seconds * 1000:9.1f} ms {record.cumulative_seconds * 1000:9.1f} ms  {record.module}"
+            for record in self.top(count)
+        )
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the audit to JSON-serializable data."""
+        return {
+            "statement": self.statement,
+            "total_seconds": self.total_seconds,
+            "modules": [
+                {"module": record.module, "self_us": record.self_us, "cumulative_us": record.cumulative_us}
+                for record in self.records
+            ],
+        }
+
+
+def parse_importtime(text: str) -> list[ImportRecord]:
+    """Parse ``-X importtime`` output; other lines are ignored.
+
+    Args:
+        text: The interpreter's stderr
+
+    Returns:
+        One record per imported module, in the order they finished importing
+    """
+    records = []
+    for line in text.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def audit_imports(
+    statement: str,
+    repeat: int = 1,
+    python: str | None = None,
+    env: dict[str, str] | None = None,
+    timeout: float = 120.0,
+) -> ImportAudit:
+    """Run a statement in a fresh interpreter and audit what it imported.
+
+    Args:
+        statement: Python code to run, e.g. ``"import goesvfi.gui"``
+        repeat: Runs to make; the fastest is kept, so a busy machine doesn't
+            inflate the result
+        python: Interpreter to run; defaults to ``sys.executable``
+        env: Environment for the interpreter; defaults to this process's
+        timeout: Seconds to allow each run
+
+    Returns:
+        The audit of the fastest run
+
+    Raises:
+        subprocess.CalledProcessError: If the statement fails
+    """
+    audits = []
+    for _ in range(max(1, repeat)):
+        result = subprocess.run(
+            [python or sys.executable, "-X", "importtime", "-c", statement],
+            capture_output=True,
+            text=True,
+            env=env,
+            timeout=timeout,
+            check=True,
+        )
+        audits.append(ImportAudit(statement, parse_importtime(result.stderr)))
+    return min(audits, key=lambda audit: audit.total_seconds)
+
+
+def process_uptime() -> float:
+    """Get the seconds since this process started.
+
+    Falls back to the time since this module was imported when the process
+    start time isn't available.
+    """
+    if psutil is not None:
+        try:
+            return max(0.0, time.time() - psutil.Process().create_time())
+        except psutil.Error:
+            pass
+    return time.monotonic() - _MODULE_LOADED
+
+
+def record_startup_metric(name: str, seconds: float) -> None:
+    """Log a startup metric and append it to the ``GOESVFI_STARTUP_METRICS`` file, if set.
+
+    Args:
+        name: Metric name, e.g. ``"first_paint_seconds"``
+        seconds: Measured value
+    """
+    LOGGER.info("Startup metric %s: %.3fs", name, seconds)
+    metrics_file = os.environ.get(METRICS_FILE_ENV)
+    if not metrics_file:
+        return
+    entry = {"metric": name, "seconds": round(seconds, 4), "timestamp": time.time(), "pid": os.getpid()}
+    try:
+        with Path(metrics_file).open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        LOGGER.warning("Could not write startup metric to %s: %s", metrics_file, e)
@@ -0,0 +1,249 @@
+"""Compact representation of timestamps on a regular cadence.
+
+A :class:`Timeline` stores membership of the slots ``start + i * cadence`` in a
+NumPy boolean array instead of a ``set[datetime]``. Ten years of 1-minute
+mesoscale imagery is about 5M slots: a few megabytes as a bitmap, versus
+hundreds of megabytes as Python datetime objects.
+
+Set algebra (``&``, ``|``, ``-``, ``^``, ``~``) is vectorised. Run-length
+ranges serialise a timeline compactly. Datetimes are only created when the
+timeline is iterated, which should happen at the UI edge.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC; naive values are returned as-is."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+class Timeline:
+    """Set of timestamps drawn from the regular grid ``start + i * cadence``.
+
+    The grid has ``slot_count`` slots. ``len()`` and iteration cover only the
+    slots that are members, so a timeline can stand in for a ``set[datetime]``
+    wherever code just counts, sorts or loops over timestamps.
+    """
+
+    __slots__ = ("_bits", "cadence", "start")
+
+    def __init__(self, start: datetime, cadence: timedelta, bits: ArrayLike) -> None:
+        """Create a timeline from a membership array.
+
+        Args:
+            start: Timestamp of slot 0
+            cadence: Spacing between slots (must be positive)
+            bits: One boolean per slot
+        """
+        if cadence <= timedelta(0):
+            msg = f"Timeline cadence must be positive, got {cadence}"
+            raise ValueError(msg)
+        array = np.array(bits, dtype=np.bool_)
+        if array.ndim != 1:
+            msg = "Timeline bits must be one-dimensional"
+            raise ValueError(msg)
+        array.flags.writeable = False
+        self.start = start
+        self.cadence = cadence
+        self._bits = array
+
+    # --- Construction ---
+
+    @staticmethod
+    def slots_between(start: datetime, end: datetime, cadence: timedelta) -> int:
+        """Number of grid slots from ``start`` up to and including ``end``."""
+        if end < start:
+            return 0
+        return (end - start) // cadence + 1
+
+    @classmethod
+    def full(cls, start: datetime, end: datetime, cadence: timedelta) -> Timeline:
+        """Timeline containing every slot between ``start`` and ``end``."""
+        return cls(start, cadence, np.ones(cls.slots_between(start, end, cadence), dtype=np.bool_))
+
+    @classmethod
+    def empty(cls, start: datetime, end: datetime, cadence: timedelta) -> Timeline:
+        """Timeline over ``start``..``end`` with no members."""
+        return cls(start, cadence, np.zeros(cls.slots_between(start, end, cadence), dtype=np.bool_))
+
+    @classmethod
+    def _from_offsets(
+        cls, start: datetime, cadence: timedelta, slot_count: int, offsets_us: NDArray[np.int64]
+    ) -> Timeline:
+        step_us = cadence // _MICROSECOND
+        on_grid = offsets_us[(offsets_us >= 0) & (offsets_us % step_us == 0)] // step_us
+        bits = np.zeros(slot_count, dtype=np.bool_)
+        bits[on_grid[on_grid < slot_count]] = True
+        return cls(start, cadence, bits)
+
+    @classmethod
+    def from_timestamps(
+        cls,
+        start: datetime,
+        end: datetime,
+        cadence: timedelta,
+        timestamps: Iterable[datetime],
+    ) -> Timeline:
+        """Build a timeline from datetimes, ignoring any that are off the grid.
+
+        Timestamps must use the same timezone convention (naive or aware) as
+        ``start``.
+        """
+        offsets = np.fromiter(((ts - start) // _MICROSECOND for ts in timestamps), dtype=np.int64)
+        return cls._from_offsets(start, cadence, cls.slots_between(start, end, cadence), offsets)
+
+    @classmethod
+    def from_datetime64(
+        cls,
+        start: datetime,
+        end: datetime,
+        cadence: timedelta,
+        values: NDArray[np.datetime64],
+    ) -> Timeline:
+        """Build a timeline from a ``datetime64`` array of UTC timestamps."""
+        origin = np.datetime64(_naive_utc(start), "us")
+        offsets = (np.asarray(values).astype("datetime64[us]") - origin).astype(np.int64)
+        return cls._from_offsets(start, cadence, cls.slots_between(start, end, cadence), offsets)
+
+    @classmethod
+    def from_ranges(
+        cls,
+        start: datetime,
+        cadence: timedelta,
+        slot_count: int,
+        ranges: Iterable[tuple[int, int]],
+    ) -> Timeline:
+        """Rebuild a timeline from half-open ``(first, stop)`` slot ranges."""
+        bits = np.zeros(slot_count, dtype=np.bool_)
+        for first, stop in ranges:
+            bits[first:stop] = True
+        return cls(start, cadence, bits)
+
+    # --- Grid properties ---
+
+    @property
+    def bits(self) -> NDArray[np.bool_]:
+        """Read-only membership array, one entry per slot."""
+        return self._bits
+
+    @property
+    def slot_count(self) -> int:
+        """Number of slots in the grid (members and non-members)."""
+        return int(self._bits.size)
+
+    @property
+    def end(self) -> datetime:
+        """Timestamp of the last grid slot."""
+        return self.start + self.cadence * max(self.slot_count - 1, 0)
+
+    def same_grid(self, other: Timeline) -> bool:
+        """Whether ``other`` covers exactly the same slots as this timeline."""
+        return self.start == other.start and self.cadence == other.cadence and self.slot_count == other.slot_count
+
+    def _combine(self, other: object, op: Callable[[NDArray[np.bool_], NDArray[np.bool_]], NDArray[np.bool_]]) -> Any:
+        """Apply a bitwise operation to two timelines on the same grid."""
+        if not isinstance(other, Timeline):
+            return NotImplemented
+        if not self.same_grid(other):
+            msg = "Timelines must share start, cadence and slot count for set operations"
+            raise ValueError(msg)
+        return Timeline(self.start, self.cadence, op(self._bits, other._bits))
+
+    # --- Set algebra ---
+
+    def __and__(self, other: Timeline) -> Timeline:
+        return self._combine(other, np.logical_and)
+
+    def __or__(self, other: Timeline) -> Timeline:
+        return self._combine(other, np.logical_or)
+
+    def __sub__(self, other: Timeline) -> Timeline:
+        return self._combine(other, lambda a, b: a & ~b)
+
+    def __xor__(self, other: Timeline) -> Timeline:
+        return self._combine(other, np.logical_xor)
+
+    def __invert__(self) -> Timeline:
+        """Complement within the grid."""
+        return Timeline(self.start, self.cadence, ~self._bits)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Timeline):
+            return NotImplemented
+        return self.same_grid(other) and bool(np.array_equal(self._bits, other._bits))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    # --- Membership and counting ---
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._bits))
+
+    def __bool__(self) -> bool:
+        return bool(self._bits.any())
+
+    def __contains__(self, timestamp: object) -> bool:
+        if not isinstance(timestamp, datetime):
+            return False
+        try:
+            offset = timestamp - self.start
+        except TypeError:
+            return False
+        index, remainder = divmod(offset, self.cadence)
+        return not remainder and 0 <= index < self.slot_count and bool(self._bits[index])
+
+    def indices(self) -> NDArray[np.intp]:
+        """Slot indices of the members."""
+        return np.flatnonzero(self._bits)
+
+    def ranges(self) -> NDArray[np.int64]:
+        """Run-length encode the members as half-open ``[first, stop)`` slot ranges.
+
+        Returns:
+            Array of shape ``(n, 2)``
+        """
+        padded = np.concatenate(([False], self._bits, [False])).astype(np.int8)
+        edges = np.flatnonzero(np.diff(padded))
+        return edges.reshape(-1, 2).astype(np.int64)
+
+    # --- Conversion at the UI edge ---
+
+    def __iter__(self) -> Iterator[datetime]:
+        start, cadence = self.start, self.cadence
+        for index in self.indices().tolist():
+            yield start + cadence * index
+
+    def timestamps(self) -> list[datetime]:
+        """Members as a sorted list of datetimes."""
+        return list(self)
+
+    def to_datetime64(self) -> NDArray[np.datetime64]:
+        """Members as a ``datetime64[us]`` array in UTC."""
+        origin = np.datetime64(_naive_utc(self.start), "us")
+        step = np.timedelta64(self.cadence // _MICROSECOND, "us")
+        return origin + self.indices().astype(np.int64) * step
+
+    def intervals(self) -> list[tuple[datetime, datetime]]:
+        """Members as inclusive ``(first, last)`` timestamp pairs, one per run."""
+        return [
+            (self.start + self.cadence * int(first), self.start + self.cadence * (int(stop) - 1))
+            for first, stop in self.ranges()
+        ]
+
+    def __repr__(self) -> str:
+        return (
+            f"Timeline(start={self.start.isoformat()}, cadence={self.cadence}, "
+            f"slots={self.slot_count}, members={len(self)})"
+        )
@@ -0,0 +1,175 @@
+"""Fixtures and options for the pipeline benchmarks.
+
+The benchmarks are kept out of the unit, integration and GUI runs, and are
+skipped unless selected: run them with ``python -m pytest tests/benchmarks``
+(or ``tox -e benchmark``, or ``-m benchmark``). Each
+benchmark's result is checked against ``baselines.json`` and the run fails on
+a regression beyond the tolerance. Baselines depend on the machine: after an
+intended change, or on a new CI runner, store new ones with
+``--benchmark-update`` from a run of all of them: peak memory includes
+what earlier benchmarks left in the process, so a partial run's is lower.
+
+Sizes and the stand-in tools' latencies can be set in the environment:
+
+- ``GOESVFI_BENCH_RESOLUTIONS``: comma-separated names from ``RESOLUTIONS``
+  (default: ``sd,hd``)
+- ``GOESVFI_BENCH_FRAMES``: frames per run (default: 8)
+- ``GOESVFI_BENCH_RIFE_LATENCY`` and ``GOESVFI_BENCH_SANCHEZ_LATENCY``:
+  seconds per call of the stand-in executables (default: 0.02)
+- ``GOESVFI_BENCH_TOLERANCE``: allowed relative regression (default: 0.25)
+"""
+
+from collections.abc import Callable, Iterator
+import os
+from pathlib import Path
+import platform
+import tempfile
+
+import pytest
+
+from goesvfi.core.global_process_pool import GlobalProcessPool
+from goesvfi.sanchez import runner as sanchez_runner
+
+from .harness import (
+    RESOLUTIONS,
+    Baselines,
+    StageMeter,
+    StageResult,
+    use_fake_sanchez,
+    write_fake_ffmpeg,
+    write_fake_rife,
+    write_fake_sanchez,
+)
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+RESOLUTION_NAMES = [name.strip() for name in os.environ.get("GOESVFI_BENCH_RESOLUTIONS", "sd,hd").split(",")]
+FRAMES = int(os.environ.get("GOESVFI_BENCH_FRAMES", "8"))
+RIFE_LATENCY = float(os.environ.get("GOESVFI_BENCH_RIFE_LATENCY", "0.02"))
+SANCHEZ_LATENCY = float(os.environ.get("GOESVFI_BENCH_SANCHEZ_LATENCY", "0.02"))
+
+Resolution = tuple[str, tuple[int, int]]
+CheckRegression = Callable[[str, StageResult], None]
+
+_baselines_key = pytest.StashKey[Baselines]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-update", action="store_true", help="Store this run's benchmark results as the baselines"
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=float(os.environ.get("GOESVFI_BENCH_TOLERANCE", "0.25")),
+        help="Allowed relative regression from the baselines (default: 0.25)",
+    )
+    group.addoption(
+        "--benchmark-baselines", type=Path, default=BASELINES_PATH, help="Baselines file (default: baselines.json)"
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # The options only exist when pytest starts in this directory
+    config.stash[_baselines_key] = Baselines(
+        config.getoption("--benchmark-baselines", BASELINES_PATH),
+        config.getoption("--benchmark-tolerance", float(os.environ.get("GOESVFI_BENCH_TOLERANCE", "0.25"))),
+    )
+
+
+def _selected(config: pytest.Config) -> bool:
+    """Whether the benchmarks were asked for, by path or by marker."""
+    here = Path(__file__).parent
+    for arg in config.args:
+        path = Path(arg.split("::")[0]).resolve()
+        if path == here or here in path.parents:
+            return True
+    return "benchmark" in (config.option.markexpr or "")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    here = Path(__file__).parent
+    skip = None if _selected(config) else pytest.mark.skip(reason="benchmarks run with: pytest tests/benchmarks")
+    for item in items:
+        if here in item.path.parents:
+            item.add_marker(pytest.mark.benchmark)
+            if skip is not None:
+                item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter, config: pytest.Config) -> None:
+    baselines = config.stash[_baselines_key]
+    if not baselines.results:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'benchmark':<32} {'frames/s':>10} {'peak RSS MB':>12} {'peak temp MB':>13}")
+    for name, result in baselines.items():
+        terminalreporter.write_line(
+            f"{name:<32} {result['frames_per_second']:>10.2f} {result['peak_rss_mb']:>12.1f}"
+            f" {result['peak_temp_mb']:>13.1f}"
+        )
+    if config.getoption("--benchmark-update", False):
+        baselines.save()
+        terminalreporter.write_line(f"Stored baselines in {baselines.path}")
+
+
+@pytest.fixture(params=RESOLUTION_NAMES)
+def resolution(request: pytest.FixtureRequest) -> Resolution:
+    """A frame size name and its ``(width, height)``."""
+    return request.param, RESOLUTIONS[request.param]
+
+
+@pytest.fixture(scope="session")
+def bench_env(tmp_path_factory: pytest.TempPathFactory) -> Iterator[dict[str, Path]]:
+    """Stand-in tools on ``PATH`` and an isolated temporary directory.
+
+    The global process pool is restarted inside, so its workers start with
+    the temporary directory in place and install the Sanchez stand-in.
+    """
+    root = tmp_path_factory.mktemp("bench")
+    tools = root / "bin"
+    temp = root / "tmp"
+    temp.mkdir()
+    env = {
+        "rife": write_fake_rife(tools, RIFE_LATENCY),
+        "sanchez": write_fake_sanchez(tools, SANCHEZ_LATENCY),
+        "ffmpeg": write_fake_ffmpeg(tools),
+        "temp": temp,
+    }
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("PATH", f"{tools}{os.pathsep}{os.environ['PATH']}")
+        mp.setenv("TMPDIR", str(temp))
+        mp.setattr(tempfile, "tempdir", str(temp))
+        mp.setitem(sanchez_runner._LOOKUP, (platform.system(), platform.machine()), env["sanchez"])  # noqa: SLF001
+        _restart_global_pool()
+        GlobalProcessPool().update_config({"initializer": use_fake_sanchez, "initargs": (str(env["sanchez"]),)})
+        try:
+            yield env
+        finally:
+            _restart_global_pool()
+
+
+def _restart_global_pool() -> None:
+    if GlobalProcessPool._instance is not None:  # noqa: SLF001
+        GlobalProcessPool._instance.cleanup()  # noqa: SLF001
+    GlobalProcessPool._instance = None  # noqa: SLF001
+
+
+@pytest.fixture()
+def meter(bench_env: dict[str, Path]) -> StageMeter:
+    """A meter for one stage, watching the benchmarks' temporary directory."""
+    return StageMeter(bench_env["temp"])
+
+
+@pytest.fixture()
+def check_regression(request: pytest.FixtureRequest) -> CheckRegression:
+    """Fail the benchmark if its result regressed from the baseline."""
+    baselines = request.config.stash[_baselines_key]
+
+    def check(name: str, result: StageResult) -> None:
+        regressions = baselines.regressions(name, result)
+        if regressions and not request.config.getoption("--benchmark-update", False):
+            pytest.fail(f"{name} regressed beyond {baselines.tolerance:.0%}: {'; '.join(regressions)}")
+
+    return check
@@ -0,0 +1,422 @@
+"""Offline harness for the pipeline benchmarks.
+
+Everything here runs on a Linux CPU without a GPU or network access:
+
+- :func:`write_frames` and :func:`write_band13` generate synthetic IR frames
+  and NetCDF files at the sizes in ``RESOLUTIONS``; a frame's clouds drift
+  with its index, so consecutive frames differ the way real ones do.
+- :func:`write_fake_rife`, :func:`write_fake_sanchez` and
+  :func:`write_fake_ffmpeg` write stand-in executables that do the least
+  work of the real tools after a set latency, so a benchmark measures
+  GOES-VFI's own overhead plus a known cost per call.
+- :class:`ObjectServer` serves files over HTTP as a stand-in for the NOAA
+  S3 buckets (path-style HeadObject, GetObject and ListObjectsV2) and the
+  STAR CDN.
+- :class:`StageMeter` measures a stage's throughput, the peak resident
+  memory of the process and its children, and the peak size of the
+  temporary directory.
+- :class:`Baselines` compares results with the stored baselines.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+from pathlib import Path
+import platform
+import stat
+import sys
+import threading
+import time
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+import numpy as np
+from PIL import Image
+import psutil
+
+# Frame sizes by name: a preview, an HD crop and a CONUS scene at 2 km
+RESOLUTIONS = {
+    "sd": (640, 360),
+    "hd": (1920, 1080),
+    "conus": (2500, 1500),
+}
+
+MB = 1024 * 1024
+
+# Seconds between samples of memory and disk use
+SAMPLE_INTERVAL = 0.02
+
+PLANCK = {"planck_fk1": 10803.3, "planck_fk2": 1392.74, "planck_bc1": 0.0755, "planck_bc2": 0.99975}
+
+
+def _cloud_field(width: int, height: int, index: int, seed: int) -> np.ndarray:
+    """Smooth banded field in [0, 1] that drifts east by a few pixels per frame."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    x += 4 * index
+    field = np.sin(x / 37.0) * np.cos(y / 23.0) + 0.5 * np.sin((x + y) / 71.0)
+    field += rng.normal(0, 0.05, (height, width)).astype(np.float32)
+    return (field - field.min()) / (field.max() - field.min())
+
+
+def write_frames(directory: Path, count: int, resolution: tuple[int, int], seed: int = 0) -> list[Path]:
+    """Write ``count`` greyscale IR frames named in time order.
+
+    Args:
+        directory: Folder for the frames, created if needed
+        count: Number of frames
+        resolution: ``(width, height)`` of each frame
+        seed: Seed for the noise
+
+    Returns:
+        The frame paths in order
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    width, height = resolution
+    paths = []
+    for index in range(count):
+        field = _cloud_field(width, height, index, seed + index)
+        path = directory / f"goes16_20230615_{index // 6:02d}{index % 6}000_band13.png"
+        Image.fromarray((field * 255).astype(np.uint8), mode="L").save(path)
+        paths.append(path)
+    return paths
+
+
+def write_band13(path: Path, resolution: tuple[int, int], index: int = 0) -> Path:
+    """Write a packed Band 13 radiance file as the ABI L1b products store it."""
+    import xarray as xr
+
+    width, height = resolution
+    rad = (40 + 120 * _cloud_field(width, height, index, index)).astype(np.float32)
+    ds = xr.Dataset({"Rad": (["y", "x"], rad), "band_id": np.int8(13)}, attrs=PLANCK)
+    ds.to_netcdf(
+        path, encoding={"Rad": {"dtype": "int16", "scale_factor": 0.0354, "add_offset": -1.0, "_FillValue": -1}}
+    )
+    return path
+
+
+def _write_script(path: Path, body: str) -> Path:
+    path.write_text(f"#!{sys.executable}\n{body}", encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+FAKE_RIFE = '''"""Stand-in for rife-ncnn-vulkan: blends the two frames."""
+import sys
+import time
+
+USAGE = """Usage: rife-ncnn-vulkan -0 infile -1 infile1 -o outfile [options]...
+  -h                   show this help
+  -0 input0-path       input image0 path
+  -1 input1-path       input image1 path
+  -o output-path       output image path
+  -m model-path        rife model path
+  -t tile-size         tile size
+  -j load:proc:save    thread count for load/proc/save
+"""
+
+if "-h" in sys.argv or "--help" in sys.argv:
+    print(USAGE)
+    sys.exit(0)
+
+from PIL import Image
+
+args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+time.sleep({latency!r})
+with Image.open(args["-0"]) as first, Image.open(args["-1"]) as second:
+    Image.blend(first, second.convert(first.mode), 0.5).save(args["-o"])
+'''
+
+FAKE_SANCHEZ = '''"""Stand-in for Sanchez: maps the IR image through a colour ramp."""
+import sys
+import time
+
+from PIL import Image, ImageOps
+
+args = dict(zip(sys.argv[2::2], sys.argv[3::2]))
+time.sleep({latency!r})
+with Image.open(args["-s"]) as ir:
+    ImageOps.colorize(ir.convert("L"), black="#102040", white="#f0f0ff", mid="#40a040").save(args["-o"])
+'''
+
+FAKE_FFMPEG = '''"""Stand-in for FFmpeg: drains the frames piped to it into the output file."""
+import sys
+import time
+
+time.sleep({latency!r})
+with open(sys.argv[-1], "wb") as output:
+    while chunk := sys.stdin.buffer.read(1 << 20):
+        output.write(chunk[:64])
+'''
+
+
+def write_fake_rife(directory: Path, latency: float = 0.0) -> Path:
+    """Write a RIFE stand-in that sleeps ``latency`` seconds per frame pair."""
+    directory.mkdir(parents=True, exist_ok=True)
+    return _write_script(directory / "rife-ncnn-vulkan", FAKE_RIFE.replace("{latency!r}", repr(latency)))
+
+
+def write_fake_sanchez(directory: Path, latency: float = 0.0) -> Path:
+    """Write a Sanchez stand-in that sleeps ``latency`` seconds per frame."""
+    directory.mkdir(parents=True, exist_ok=True)
+    return _write_script(directory / "Sanchez", FAKE_SANCHEZ.replace("{latency!r}", repr(latency)))
+
+
+def use_fake_sanchez(path: str) -> None:
+    """Make ``goesvfi.sanchez.runner`` run the stand-in at ``path`` on this platform.
+
+    Also the process pool's worker initializer: the pool's workers are
+    spawned rather than forked, so a patch in the parent doesn't reach them.
+    """
+    from goesvfi.sanchez import runner
+
+    runner._LOOKUP[(platform.system(), platform.machine())] = Path(path)  # noqa: SLF001
+
+
+def write_fake_ffmpeg(directory: Path, latency: float = 0.0) -> Path:
+    """Write an FFmpeg stand-in, named ``ffmpeg`` to be found on ``PATH``.
+
+    It keeps a little of each chunk it reads so the output isn't empty, and
+    sleeps ``latency`` seconds before reading, like a slow encoder start.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    return _write_script(directory / "ffmpeg", FAKE_FFMPEG.replace("{latency!r}", repr(latency)))
+
+
+class _ObjectHandler(BaseHTTPRequestHandler):
+    server: _ObjectHTTPServer
+
+    def do_HEAD(self) -> None:
+        self._send_object(body=False)
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if query.get("list-type") == ["2"]:
+            self._send_listing(unquote(url.path).strip("/"), query.get("prefix", [""])[0])
+        else:
+            self._send_object(body=True)
+
+    def _send_object(self, body: bool) -> None:
+        time.sleep(self.server.latency)
+        path = self.server.root / unquote(urlsplit(self.path).path).lstrip("/")
+        if not path.is_file() or self.server.root not in path.resolve().parents:
+            self.send_error(404)
+            return
+        data = path.read_bytes()
+        start, end = 0, len(data) - 1
+        byte_range = self.headers.get("Range", "")
+        if byte_range.startswith("bytes="):
+            first, _, last = byte_range[6:].partition("-")
+            start, end = int(first or 0), min(int(last) if last else end, end)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("ETag", f'"{path.stat().st_mtime_ns:x}"')
+        self.end_headers()
+        if body:
+            self.wfile.write(data[start : end + 1])
+            self.server.bytes_served += end - start + 1
+
+    def _send_listing(self, bucket: str, prefix: str) -> None:
+        time.sleep(self.server.latency)
+        root = self.server.root / bucket
+        contents = "".join(
+            f"<Contents><Key>{escape(key)}</Key><Size>{path.stat().st_size}</Size>"
+            f"<LastModified>2023-06-15T12:00:00.000Z</LastModified></Contents>"
+            for path in sorted(root.rglob("*"))
+            if path.is_file() and (key := path.relative_to(root).as_posix()).startswith(prefix)
+        )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<Name>{escape(bucket)}</Name><Prefix>{escape(prefix)}</Prefix>"
+            f"<KeyCount>{contents.count('<Contents>')}</KeyCount><IsTruncated>false</IsTruncated>"
+            f"{contents}</ListBucketResult>"
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+class _ObjectHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, root: Path, latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), _ObjectHandler)
+        self.root = root.resolve()
+        self.latency = latency
+        self.bytes_served = 0
+
+
+class ObjectServer:
+    """Serves the files under ``root`` on a local port, after ``latency`` seconds per request.
+
+    S3 clients address objects as ``/<bucket>/<key>`` with ``url`` as their
+    endpoint; CDN URLs map to ``/<path>`` on the same server.
+    """
+
+    def __init__(self, root: Path, latency: float = 0.0) -> None:
+        self._server = _ObjectHTTPServer(root, latency)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="object-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def bytes_served(self) -> int:
+        return self._server.bytes_served
+
+    def __enter__(self) -> ObjectServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def _tree_size(root: Path) -> int:
+    total = 0
+    for directory, _, files in os.walk(root):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(directory, name)).st_size
+            except OSError:
+                pass  # Removed while walking
+    return total
+
+
+@dataclass
+class StageResult:
+    """What one benchmarked stage did and used."""
+
+    frames: int
+    seconds: float
+    peak_rss_mb: float
+    peak_temp_mb: float
+
+    @property
+    def frames_per_second(self) -> float:
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {"frames_per_second": round(self.frames_per_second, 3), **asdict(self)}
+
+
+class StageMeter:
+    """Measures the stage run in its ``with`` block; set ``frames`` inside it.
+
+    Memory and temporary disk use are sampled on a thread. Resident memory is
+    summed over the process and its children, which include the global
+    process pool's workers and the stand-in executables. Temporary disk use
+    is the size of ``temp_dir`` above its size when the stage started.
+    """
+
+    def __init__(self, temp_dir: Path, interval: float = SAMPLE_INTERVAL) -> None:
+        self.temp_dir = temp_dir
+        self.interval = interval
+        self.frames = 0
+        self.result: StageResult | None = None
+        self._process = psutil.Process()
+        self._peak_rss = 0
+        self._peak_temp = 0
+        self._temp_start = 0
+        self._started = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stage-meter", daemon=True)
+
+    def _rss(self) -> int:
+        total = 0
+        for process in [self._process, *self._process.children(recursive=True)]:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass  # Exited since it was listed
+        return total
+
+    def _sample(self) -> None:
+        self._peak_rss = max(self._peak_rss, self._rss())
+        self._peak_temp = max(self._peak_temp, _tree_size(self.temp_dir) - self._temp_start)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> StageMeter:
+        self._temp_start = _tree_size(self.temp_dir)
+        self._sample()
+        self._thread.start()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        seconds = time.perf_counter() - self._started
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        self.result = StageResult(self.frames, seconds, self._peak_rss / MB, self._peak_temp / MB)
+
+
+class Baselines:
+    """Stored results, and the check of new results against them.
+
+    A result regresses when its throughput falls below the baseline by more
+    than ``tolerance``, or its peak memory or temporary disk use rises above
+    the baseline by more than ``tolerance`` plus ``slack_mb``; the slack keeps
+    near-zero baselines from failing on noise.
+    """
+
+    def __init__(self, path: Path, tolerance: float, slack_mb: float = 16.0) -> None:
+        self.path = path
+        self.tolerance = tolerance
+        self.slack_mb = slack_mb
+        self.results: dict[str, dict[str, float]] = {}
+        try:
+            self.stored: dict[str, dict[str, float]] = json.loads(path.read_text(encoding="utf-8"))["benchmarks"]
+        except FileNotFoundError:
+            self.stored = {}
+
+    def regressions(self, name: str, result: StageResult) -> list[str]:
+        """Record ``result`` and describe how it regressed from the baseline, if it did."""
+        self.results[name] = result.as_dict()
+        baseline = self.stored.get(name)
+        if baseline is None:
+            return []
+        found = []
+        floor = baseline["frames_per_second"] * (1 - self.tolerance)
+        if result.frames_per_second < floor:
+            found.append(f"{result.frames_per_second:.2f} frames/s, below {floor:.2f}")
+        for key, label in (("peak_rss_mb", "peak RSS"), ("peak_temp_mb", "peak temp disk")):
+            ceiling = baseline[key] * (1 + self.tolerance) + self.slack_mb
+            if getattr(result, key) > ceiling:
+                found.append(f"{label} {getattr(result, key):.1f} MB, above {ceiling:.1f} MB")
+        return found
+
+    def items(self) -> Iterator[tuple[str, dict[str, float]]]:
+        return iter(sorted(self.results.items()))
+
+    def save(self) -> None:
+        """Store this run's results as the baselines, keeping those it didn't measure."""
+        merged = {**self.stored, **self.results}
+        data = {
+            "machine": {"cpus": os.cpu_count(), "python": sys.version.split()[0]},
+            "benchmarks": dict(sorted(merged.items())),
+        }
+        self.path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
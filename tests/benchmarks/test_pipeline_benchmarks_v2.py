@@ -0,0 +1,122 @@
+"""Benchmarks of interpolation with ``run_vfi`` and NetCDF rendering with ``render_png``.
+
+The stand-in RIFE, Sanchez and FFmpeg keep the external tools' cost fixed,
+so a regression here is in GOES-VFI's own work: loading, colourising and
+saving frames, handing pairs to RIFE and streaming the video to FFmpeg.
+"""
+
+from pathlib import Path
+from typing import Any
+
+from goesvfi.integrity_check.render.netcdf import render_png
+from goesvfi.pipeline.run_vfi import run_vfi
+from goesvfi.utils.metrics import FRAMES_PROCESSED, RIFE_SECONDS, SANCHEZ_SECONDS
+
+from .conftest import FRAMES, CheckRegression, Resolution
+from .harness import StageMeter, write_band13, write_frames
+
+STAGES = ("preprocess", "interpolate", "encode")
+
+
+def frames_by_stage() -> dict[str, float]:
+    return {stage: FRAMES_PROCESSED.value(stage=stage) for stage in STAGES}
+
+
+def interpolate(inputs: Path | list[Path], output: Path, rife: Path, **kwargs: Any) -> Path:
+    """Run ``run_vfi`` with one frame between each pair, returning the raw video."""
+    raw = None
+    for update in run_vfi(
+        folder=inputs,
+        output_mp4_path=output,
+        rife_exe_path=rife,
+        fps=30,
+        num_intermediate_frames=1,
+        max_workers=2,
+        **kwargs,
+    ):
+        if isinstance(update, Path):
+            raw = update
+    assert raw is not None
+    assert raw.stat().st_size > 0
+    return raw
+
+
+class TestRunVfi:
+    def test_interpolate(
+        self,
+        resolution: Resolution,
+        bench_env: dict[str, Path],
+        meter: StageMeter,
+        check_regression: CheckRegression,
+        tmp_path: Path,
+    ) -> None:
+        name, size = resolution
+        write_frames(tmp_path / "frames", FRAMES, size)
+        before, rife_calls = frames_by_stage(), RIFE_SECONDS.count()
+
+        with meter:
+            interpolate(tmp_path / "frames", tmp_path / "out.mp4", bench_env["rife"])
+            meter.frames = 2 * FRAMES - 1
+
+        after = frames_by_stage()
+        assert [after[stage] - before[stage] for stage in STAGES] == [FRAMES, FRAMES - 1, 2 * FRAMES - 1]
+        assert RIFE_SECONDS.count() - rife_calls == FRAMES - 1
+        assert meter.result is not None
+        check_regression(f"run_vfi[{name}]", meter.result)
+
+    def test_interpolate_with_sanchez(
+        self,
+        resolution: Resolution,
+        bench_env: dict[str, Path],
+        meter: StageMeter,
+        check_regression: CheckRegression,
+        tmp_path: Path,
+    ) -> None:
+        name, size = resolution
+        write_frames(tmp_path / "frames", FRAMES, size)
+        sanchez_calls = SANCHEZ_SECONDS.count()
+
+        with meter:
+            interpolate(tmp_path / "frames", tmp_path / "out.mp4", bench_env["rife"], false_colour=True, res_km=2)
+            meter.frames = 2 * FRAMES - 1
+
+        # Frames colourised in pool workers are counted here too; a frame
+        # Sanchez failed on would have been left grey without an error
+        assert SANCHEZ_SECONDS.count() - sanchez_calls == FRAMES
+        assert meter.result is not None
+        check_regression(f"run_vfi_sanchez[{name}]", meter.result)
+
+    def test_interpolate_netcdf(
+        self,
+        resolution: Resolution,
+        bench_env: dict[str, Path],
+        meter: StageMeter,
+        check_regression: CheckRegression,
+        tmp_path: Path,
+    ) -> None:
+        name, size = resolution
+        (tmp_path / "nc").mkdir()
+        paths = [write_band13(tmp_path / "nc" / f"frame_{index:03d}.nc", size, index) for index in range(FRAMES)]
+
+        with meter:
+            interpolate(paths, tmp_path / "out.mp4", bench_env["rife"])
+            meter.frames = 2 * FRAMES - 1
+
+        assert meter.result is not None
+        check_regression(f"run_vfi_netcdf[{name}]", meter.result)
+
+
+class TestRenderPng:
+    def test_render(
+        self, resolution: Resolution, meter: StageMeter, check_regression: CheckRegression, tmp_path: Path
+    ) -> None:
+        name, size = resolution
+        paths = [write_band13(tmp_path / f"frame_{index:03d}.nc", size, index) for index in range(FRAMES)]
+
+        with meter:
+            for path in paths:
+                assert render_png(path, path.with_suffix(".png")).stat().st_size > 0
+                meter.frames += 1
+
+        assert meter.result is not None
+        check_regression(f"render_png[{name}]", meter.result)
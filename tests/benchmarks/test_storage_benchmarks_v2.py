@@ -0,0 +1,183 @@
+"""Benchmarks of sorting files, the timestamp cache and downloads from the stand-in S3 and CDN.
+
+Each benchmark counts files (or cache rows) as its frames. The downloads
+run against :class:`ObjectServer`, so they measure the client side of a
+fetch: connection handling, writing to disk and the stores' bookkeeping.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import os
+from pathlib import Path
+
+import aioboto3
+from botocore import UNSIGNED
+from botocore.config import Config
+import numpy as np
+import pytest
+
+from goesvfi.date_sorter.sorter import DateSorter
+from goesvfi.file_sorter.sorter import FileSorter
+from goesvfi.integrity_check.cache_db import CacheDB
+from goesvfi.integrity_check.remote.cdn_store import CDNStore
+from goesvfi.integrity_check.remote.s3_connection_pool import S3ConnectionPool
+from goesvfi.integrity_check.remote.s3_store import S3Store
+from goesvfi.integrity_check.time_index import SatellitePattern, TimeIndex
+
+from .conftest import FRAMES, CheckRegression
+from .harness import ObjectServer, StageMeter
+
+SORT_FILES = 128 * FRAMES
+CACHE_ROWS = 2000 * FRAMES
+DOWNLOADS = 4 * FRAMES
+OBJECT_SIZE = 2 * 1024 * 1024
+START = datetime(2023, 6, 15, 12, 0)
+CDN_HOST = "https://cdn.star.nesdis.noaa.gov"
+
+
+def write_file(path: Path, size: int = 16 * 1024) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+def timestamps(count: int, minutes: int = 10) -> list[datetime]:
+    return [START + timedelta(minutes=minutes * index) for index in range(count)]
+
+
+class TestSorters:
+    def test_file_sorter(self, meter: StageMeter, check_regression: CheckRegression, tmp_path: Path) -> None:
+        for ts in timestamps(SORT_FILES):
+            write_file(tmp_path / "source" / ts.strftime("%Y-%m-%d_%H-%M-%S") / "goes16.png")
+        sorter = FileSorter(verify_content=False)
+
+        with meter:
+            stats = sorter.sort_files(str(tmp_path / "source"), str(tmp_path / "sorted"))
+            meter.frames = stats["files_copied"]
+
+        assert stats["files_copied"] == SORT_FILES
+        assert meter.result is not None
+        check_regression("file_sorter", meter.result)
+
+    def test_date_sorter(self, meter: StageMeter, check_regression: CheckRegression, tmp_path: Path) -> None:
+        for ts in timestamps(SORT_FILES):
+            write_file(tmp_path / "source" / f"goes16_{ts:%Y%m%dT%H%M%S}Z.png")
+        progress: list[int] = []
+
+        with meter:
+            DateSorter().sort_files(
+                str(tmp_path / "source"),
+                str(tmp_path / "sorted"),
+                "%Y/%m/%d",
+                progress_callback=lambda current, _total: progress.append(current),
+            )
+            meter.frames = progress[-1]
+
+        assert meter.frames == SORT_FILES
+        assert len(list((tmp_path / "sorted").rglob("*.png"))) == SORT_FILES
+        assert meter.result is not None
+        check_regression("date_sorter", meter.result)
+
+
+class TestCacheDB:
+    def test_add_and_query(self, meter: StageMeter, check_regression: CheckRegression, tmp_path: Path) -> None:
+        cache = CacheDB(tmp_path / "cache.db")
+        entries = [(ts, f"/data/{ts:%Y%m%d%H%M}.nc") for ts in timestamps(CACHE_ROWS)]
+
+        async def add_and_query() -> np.ndarray:
+            for start in range(0, CACHE_ROWS, 1000):
+                await cache.add_timestamps(SatellitePattern.GOES_16, entries[start : start + 1000])
+            return await cache.get_timestamps_bitmap(
+                SatellitePattern.GOES_16, START, entries[-1][0] + timedelta(minutes=10), interval_minutes=10
+            )
+
+        try:
+            with meter:
+                bitmap = asyncio.run(add_and_query())
+                meter.frames = CACHE_ROWS
+        finally:
+            cache.close()
+
+        assert bitmap.sum() == CACHE_ROWS
+        assert not bitmap[-1]
+        assert meter.result is not None
+        check_regression("cache_db", meter.result)
+
+
+class TestDownloads:
+    def test_s3_store(self, meter: StageMeter, check_regression: CheckRegression, tmp_path: Path) -> None:
+        store = S3Store(use_connection_pool=True)
+        satellite = SatellitePattern.GOES_16
+        wanted = timestamps(DOWNLOADS)
+        for ts in wanted:
+            bucket, key = store._get_bucket_and_key(ts, satellite, exact_match=True)  # noqa: SLF001
+            write_file(tmp_path / "objects" / bucket / key, OBJECT_SIZE)
+
+        with ObjectServer(tmp_path / "objects") as server:
+
+            async def client() -> object:
+                config = Config(signature_version=UNSIGNED, s3={"addressing_style": "path"})
+                context = aioboto3.Session().client(
+                    "s3", region_name="us-east-1", endpoint_url=server.url, config=config
+                )
+                return await context.__aenter__()
+
+            async def download_all() -> list[Path]:
+                pool = S3ConnectionPool(max_connections=4, client_factory=client)
+                store._connection_pool = pool  # noqa: SLF001
+                try:
+                    async with store:
+                        return await asyncio.gather(
+                            *(
+                                store.download(ts, satellite, tmp_path / "downloads" / f"{index}.nc")
+                                for index, ts in enumerate(wanted)
+                            )
+                        )
+                finally:
+                    await pool.close_all()
+
+            with meter:
+                paths = asyncio.run(download_all())
+                meter.frames = len(paths)
+
+        assert all(path.stat().st_size == OBJECT_SIZE for path in paths)
+        assert server.bytes_served == DOWNLOADS * OBJECT_SIZE
+        assert meter.result is not None
+        check_regression("s3_download", meter.result)
+
+    def test_cdn_store(
+        self, meter: StageMeter, check_regression: CheckRegression, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        satellite = SatellitePattern.GOES_16
+        wanted = timestamps(DOWNLOADS)
+        for ts in wanted:
+            url = TimeIndex.to_cdn_url(ts, satellite)
+            write_file(tmp_path / "objects" / url.removeprefix(f"{CDN_HOST}/"), OBJECT_SIZE)
+
+        with ObjectServer(tmp_path / "objects") as server:
+            to_cdn_url = TimeIndex.to_cdn_url
+            monkeypatch.setattr(
+                TimeIndex,
+                "to_cdn_url",
+                staticmethod(
+                    lambda ts, sat, resolution=None: to_cdn_url(ts, sat, resolution).replace(CDN_HOST, server.url)
+                ),
+            )
+
+            async def download_all() -> list[Path]:
+                async with CDNStore() as store:
+                    return await asyncio.gather(
+                        *(
+                            store.download(ts, satellite, tmp_path / "downloads" / f"{index}.jpg")
+                            for index, ts in enumerate(wanted)
+                        )
+                    )
+
+            with meter:
+                paths = asyncio.run(download_all())
+                meter.frames = len(paths)
+
+        assert all(path.stat().st_size == OBJECT_SIZE for path in paths)
+        assert server.bytes_served == DOWNLOADS * OBJECT_SIZE
+        assert meter.result is not None
+        check_regression("cdn_download", meter.result)
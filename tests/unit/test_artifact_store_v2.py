@@ -0,0 +1,236 @@
+"""Tests for sharing preprocessed frames and interpolations between jobs."""
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+import os
+from pathlib import Path
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from PIL import Image
+from PyQt6.QtCore import Qt
+import pytest
+
+from goesvfi.pipeline.artifact_store import ArtifactStore, artifact_key, input_identity
+from goesvfi.pipeline.batch_queue import BatchJob, BatchQueue, JobResources
+from goesvfi.pipeline.job_store import JobStore
+from goesvfi.pipeline.run_vfi import VFIProcessor
+from goesvfi.pipeline.vfi_image_processor import VFIImageProcessor
+
+
+def write_file(path: Path, size: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def write_frames(folder: Path, indices: range) -> list[Path]:
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in indices:
+        path = folder / f"frame_{index:04d}.png"
+        if not path.exists():
+            Image.new("RGB", (8, 6), (index * 30 % 256, 0, 0)).save(path)
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture()
+def store(tmp_path: Path) -> ArtifactStore:
+    with ArtifactStore(tmp_path / "artifacts") as artifact_store:
+        yield artifact_store
+
+
+class TestArtifactStore:
+    def test_checkout_links_a_stored_artifact(self, store: ArtifactStore, tmp_path: Path) -> None:
+        source = write_file(tmp_path / "job1" / "frame.png", 10)
+
+        assert not store.checkout("abc", tmp_path / "missing.png")
+        store.put("abc", source, "frame")
+        source.unlink()  # The job's temporary directory goes away
+
+        assert store.checkout("abc", tmp_path / "job2.png", owner="job2")
+        assert (tmp_path / "job2.png").read_bytes() == b"x" * 10
+        stats = store.get_statistics()
+        assert stats["artifacts_by_kind"] == {"frame": 1}
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    def test_referenced_artifacts_are_never_evicted(self, store: ArtifactStore, tmp_path: Path) -> None:
+        store.put("shared", write_file(tmp_path / "a.png", 100), "frame", owner="job1")
+        assert store.checkout("shared", tmp_path / "b.png", owner="job2")
+        assert store.refcount("shared") == 2
+
+        assert store.release("job1") == 1
+        assert store.evict(0) == 0
+        assert store.path_for("shared").exists()
+
+        store.release("job2")
+        assert store.evict(0) == 1
+        assert not store.path_for("shared").exists()
+        assert not store.checkout("shared", tmp_path / "c.png")
+
+    def test_least_recently_used_are_evicted_first(self, tmp_path: Path) -> None:
+        with ArtifactStore(tmp_path / "artifacts", max_bytes=250) as store:
+            for key in ("old", "used", "new"):
+                store.put(key, write_file(tmp_path / f"{key}.png", 100), "frame")
+                time.sleep(0.01)
+            # Putting the third artifact went over budget
+            assert not store.path_for("old").exists()
+
+            assert store.checkout("used", tmp_path / "used-copy.png")
+            assert store.evict(100) == 1
+            assert store.path_for("used").exists()
+            assert not store.path_for("new").exists()
+
+    def test_missing_object_is_a_miss(self, store: ArtifactStore, tmp_path: Path) -> None:
+        store.put("gone", write_file(tmp_path / "a.png", 10), "frame")
+        store.path_for("gone").unlink()
+
+        assert not store.checkout("gone", tmp_path / "b.png")
+        assert store.get_statistics()["artifacts_by_kind"] == {}
+
+    def test_keys(self, tmp_path: Path) -> None:
+        path = write_file(tmp_path / "frame.png", 10)
+        identity = input_identity(path)
+
+        assert artifact_key("frame", identity, crop=None) == artifact_key("frame", identity, crop=None)
+        assert artifact_key("frame", identity, crop=None) != artifact_key("frame", identity, crop=(0, 0, 4, 4))
+        assert artifact_key("frame", identity) != artifact_key("interpolation", identity)
+
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert input_identity(path) != identity
+
+
+@contextmanager
+def thread_executor(_kind: str, max_workers: int | None = None) -> Iterator[ThreadPoolExecutor]:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        yield executor
+
+
+class FakeRife:
+    def __init__(self) -> None:
+        self.pairs: list[tuple[str, str]] = []
+
+    def __call__(self, p1: Path, p2: Path, rife_exe_path: Path, rife_config: dict) -> Path:
+        self.pairs.append((p1.name.split("_")[2], p2.name.split("_")[2]))
+        output = p1.parent / f"interp_{time.monotonic_ns()}.png"
+        Image.new("RGB", (8, 6)).save(output)
+        return output
+
+
+def run_job(
+    frames: list[Path],
+    work_dir: Path,
+    store: ArtifactStore,
+    owner: str,
+    rife: FakeRife,
+    crop_xywh: tuple[int, int, int, int] | None = (0, 0, 6, 4),
+) -> list[Path]:
+    """Preprocess and interpolate frames the way ``run_vfi`` does, returning the processed frames."""
+    processor = VFIProcessor(
+        rife_exe_path=Path("rife"),
+        fps=30,
+        num_intermediate_frames=1,
+        max_workers=1,
+        rife_config={"model_key": "rife-v4.6"},
+        processing_config={"false_colour": False, "res_km": 4},
+        artifact_store=store,
+        artifact_owner=owner,
+    )
+    work_dir.mkdir()
+    crop = processor.setup_crop_parameters(crop_xywh)
+    with (
+        patch("goesvfi.pipeline.run_vfi.managed_executor", thread_executor),
+        patch("goesvfi.pipeline.run_vfi.run_rife_pair", side_effect=rife),
+    ):
+        first, width, height = processor.process_first_image(frames[0], crop, work_dir, work_dir)
+        rest = processor.process_remaining_images(frames, crop, work_dir, work_dir, width, height)
+        processed = [first, *rest]
+        list(processor._process_interpolation_frames(MagicMock(), processed, width, height))
+    return processed
+
+
+def test_overlapping_jobs_only_compute_the_difference(store: ArtifactStore, tmp_path: Path) -> None:
+    frames = write_frames(tmp_path / "in", range(5))
+    rife = FakeRife()
+    run_job(frames[1:], tmp_path / "job1", store, "job1", rife)
+    assert (store.hits, store.misses, len(rife.pairs)) == (0, 4 + 3, 3)
+
+    rife.pairs.clear()
+    processed = run_job(frames[:4], tmp_path / "job2", store, "job2", rife)
+
+    # Frames 2 and 3 and the pair between them came from job 1; frame 1 started
+    # job 1, so it wasn't resized to a target size and isn't shared with job 2
+    assert store.hits == 3
+    assert rife.pairs == [("0000", "0001"), ("0001", "0002")]
+    with Image.open(processed[0]) as img:
+        assert img.size == (6, 4)
+    frame_2 = artifact_key(
+        "frame", input_identity(frames[2]), crop=(0, 0, 6, 4), false_colour=False, res_km=4, target_size=(6, 4)
+    )
+    assert store.refcount(frame_2) == 2
+
+
+def test_frames_are_not_shared_across_target_sizes(store: ArtifactStore, tmp_path: Path) -> None:
+    frames = write_frames(tmp_path / "in", range(3))
+    larger = tmp_path / "in" / "frame_0003.png"
+    Image.new("RGB", (10, 8)).save(larger)
+    run_job([*frames, larger], tmp_path / "job1", store, "job1", FakeRife(), crop_xywh=None)
+
+    # Starting from the larger frame sets a different target size
+    run_job([larger, frames[0]], tmp_path / "job2", store, "job2", FakeRife(), crop_xywh=None)
+
+    assert store.hits == 0
+
+
+def test_first_frame_is_shared_when_processing_changes_its_size(store: ArtifactStore, tmp_path: Path) -> None:
+    frames = write_frames(tmp_path / "in", range(3))
+    process_single_image = VFIImageProcessor.process_single_image
+
+    def halve(self: VFIImageProcessor, *args: object, **kwargs: object) -> Path:
+        processed = process_single_image(self, *args, **kwargs)
+        with Image.open(processed) as img:
+            smaller = img.resize((img.width // 2, img.height // 2))
+        smaller.save(processed)
+        return processed
+
+    with patch.object(VFIImageProcessor, "process_single_image", halve):
+        run_job(frames, tmp_path / "job1", store, "job1", FakeRife(), crop_xywh=None)
+        processed = run_job(frames, tmp_path / "job2", store, "job2", FakeRife(), crop_xywh=None)
+
+    # Every frame and pair came from job 1, the first frame included
+    assert store.hits == 3 + 2
+    with Image.open(processed[0]) as img:
+        assert img.size == (4, 3)
+
+
+def test_batch_queue_lends_its_store_to_jobs(store: ArtifactStore, tmp_path: Path) -> None:
+    seen: dict[str, object] = {}
+
+    def process(job: BatchJob) -> None:
+        seen.update(job.settings)
+        store.put("key", write_file(tmp_path / "frame.png", 10), "frame", owner=job.settings["artifact_owner"])
+
+    queue = BatchQueue(
+        process,
+        job_store=JobStore(":memory:"),
+        resource_estimator=lambda job: JobResources(1),
+        artifact_store=store,
+    )
+    done = threading.Event()
+    queue.queue_empty.connect(done.set, Qt.ConnectionType.DirectConnection)
+    job = BatchJob("job1", "Job", tmp_path, tmp_path / "out.mp4", {"fps": 30}, created_at=datetime(2024, 1, 1))
+    queue.add_job(job)
+    queue.start()
+    assert done.wait(20)
+    queue.close()
+
+    assert seen["artifact_store"] is store
+    assert seen["artifact_owner"] == "job1"
+    # The job's references are released once it finishes
+    assert store.refcount("key") == 0
+    assert set(job.to_dict()["settings"]) == {"fps"}
@@ -0,0 +1,113 @@
+"""Tests for the shared integrity check asyncio runtime."""
+
+import asyncio
+import concurrent.futures
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from goesvfi.integrity_check.async_runtime import AsyncRuntime, get_async_runtime
+
+
+@pytest.fixture()
+def runtime():
+    rt = AsyncRuntime(name="TestAsyncRuntime")
+    yield rt
+    rt.shutdown(timeout=5.0)
+
+
+class TestAsyncRuntime:
+    def test_submit_runs_on_single_persistent_loop(self, runtime: AsyncRuntime) -> None:
+        async def loop_and_thread() -> tuple[asyncio.AbstractEventLoop, str]:
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        first = runtime.submit(loop_and_thread()).result(timeout=5)
+        second = runtime.run(loop_and_thread(), timeout=5)
+
+        assert first == second
+        assert first[1] == "TestAsyncRuntime"
+        assert runtime.is_running
+
+    def test_loop_bound_resources_survive_between_operations(self, runtime: AsyncRuntime) -> None:
+        state: dict[str, asyncio.Event] = {}
+
+        async def create() -> None:
+            state["event"] = asyncio.Event()
+
+        async def use() -> bool:
+            state["event"].set()
+            await asyncio.wait_for(state["event"].wait(), timeout=1)
+            return True
+
+        runtime.run(create())
+        assert runtime.run(use(), timeout=5)
+
+    def test_cancelling_future_cancels_coroutine(self, runtime: AsyncRuntime) -> None:
+        started = threading.Event()
+        cancelled = threading.Event()
+
+        async def slow() -> None:
+            started.set()
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        future = runtime.submit(slow())
+        assert started.wait(5)
+        future.cancel()
+
+        assert cancelled.wait(5)
+        with pytest.raises(concurrent.futures.CancelledError):
+            future.result(timeout=5)
+
+    def test_run_timeout_cancels(self, runtime: AsyncRuntime) -> None:
+        with pytest.raises(concurrent.futures.TimeoutError):
+            runtime.run(asyncio.sleep(30), timeout=0.05)
+
+    def test_submit_from_runtime_thread_is_rejected(self, runtime: AsyncRuntime) -> None:
+        async def nested() -> None:
+            runtime.submit(asyncio.sleep(0))
+
+        with pytest.raises(RuntimeError):
+            runtime.run(nested(), timeout=5)
+
+    def test_stores_are_cached_and_closed_on_shutdown(self, runtime: AsyncRuntime) -> None:
+        store = MagicMock()
+        store.close = AsyncMock()
+        factory = MagicMock(return_value=store)
+
+        assert runtime.get_store("cdn", factory) is store
+        assert runtime.get_store("cdn", factory) is store
+        factory.assert_called_once()
+
+        runtime.start()
+        with patch(
+            "goesvfi.integrity_check.remote.s3_connection_pool.close_global_pool", new=AsyncMock()
+        ) as close_pool:
+            runtime.shutdown(timeout=5)
+
+        store.close.assert_awaited_once()
+        close_pool.assert_awaited_once()
+        assert not runtime.is_running
+
+    def test_shutdown_cancels_pending_work_and_restarts(self, runtime: AsyncRuntime) -> None:
+        future = runtime.submit(asyncio.sleep(30))
+        runtime.shutdown(timeout=5)
+
+        assert future.cancelled()
+        assert runtime.run(asyncio.sleep(0, result="again"), timeout=5) == "again"
+
+    def test_typed_store_accessors_share_instances(self, runtime: AsyncRuntime) -> None:
+        with patch("goesvfi.integrity_check.remote.cdn_store.CDNStore") as cdn_cls:
+            first = runtime.cdn_store(resolution="1000x1000")
+            second = runtime.cdn_store(resolution="1000x1000")
+            runtime.cdn_store(resolution="250x250")
+
+        assert first is second
+        assert cdn_cls.call_count == 2
+
+    def test_global_runtime_is_singleton(self) -> None:
+        assert get_async_runtime() is get_async_runtime()
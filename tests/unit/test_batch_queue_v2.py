@@ -10,6 +10,8 @@ Optimizations:
 """
 
 from pathlib import Path
+import threading
+import time
 from typing import Any
 from unittest.mock import MagicMock, patch
 
@@ -22,6 +24,7 @@ from goesvfi.pipeline.batch_queue import (
     JobPriority,
     JobStatus,
 )
+from goesvfi.pipeline.job_store import JobStore
 
 
 @pytest.fixture()
@@ -95,11 +98,11 @@ def batch_queue(mock_process_function: Any, mock_file_operations: Any) -> Any:
     queue = BatchQueue(
         process_function=mock_process_function,
         max_concurrent_jobs=2,  # Increased for better testing
+        job_store=JobStore(":memory:"),
     )
     yield queue
     # Clean up
-    if queue._running:  # noqa: SLF001
-        queue.stop()
+    queue.close()
 
 
 class TestBatchJob:
@@ -264,22 +267,44 @@ class TestBatchQueue:
         assert batch_queue.get_job("pending_1") is not None
         assert batch_queue.get_job("running_1") is not None
 
-    @patch("goesvfi.pipeline.batch_queue.json.dump")
-    @patch("goesvfi.pipeline.batch_queue.open", create=True)
-    def test_queue_persistence(
-        self, mock_open: Any, mock_json_dump: Any, batch_queue: Any, sample_job_data: Any
+    def test_queue_persistence(  # noqa: PLR6301
+        self, mock_process_function: Any, sample_job_data: Any, tmp_path: Path
     ) -> None:
         """Test saving and loading queue state."""
-        job_data = sample_job_data["basic"]
-        job = BatchJob(**job_data)
-        batch_queue.add_job(job)
+        store_path = tmp_path / "batch_queue.db"
+        queue = BatchQueue(process_function=mock_process_function, job_store=JobStore(store_path))
+        queue.add_job(BatchJob(**sample_job_data["basic"]))
+        queue.add_job(BatchJob(**sample_job_data["high_priority"]))
+        assert queue.cancel_job("test_001")
+        queue.close()
+
+        reloaded = BatchQueue(process_function=mock_process_function, job_store=JobStore(store_path))
+        try:
+            assert reloaded.get_job("test_001").status == JobStatus.CANCELLED  # type: ignore[union-attr]
+            assert [job.id for job in reloaded.get_pending_jobs()] == ["high_priority_job"]
+        finally:
+            reloaded.close()
 
-        # Force save
-        batch_queue._save_queue()  # noqa: SLF001
+    def test_close_waits_for_running_jobs(self, sample_job_data: Any, tmp_path: Path) -> None:  # noqa: PLR6301
+        """Test that a job running when the queue closes saves its final state."""
+        store_path = tmp_path / "batch_queue.db"
+        started = threading.Event()
 
-        # Verify save operations were called
-        mock_open.assert_called()
-        mock_json_dump.assert_called()
+        def process(job: BatchJob) -> None:  # noqa: ARG001
+            started.set()
+            time.sleep(0.2)
+
+        queue = BatchQueue(process_function=process, job_store=JobStore(store_path))
+        queue.add_job(BatchJob(**sample_job_data["basic"]))
+        queue.start()
+        assert started.wait(10)
+        queue.close()
+
+        reloaded = BatchQueue(process_function=process, job_store=JobStore(store_path))
+        try:
+            assert reloaded.get_job("test_001").status == JobStatus.COMPLETED  # type: ignore[union-attr]
+        finally:
+            reloaded.close()
 
     @pytest.mark.parametrize("max_concurrent", [1, 2, 4])
     def test_queue_concurrency_settings(
@@ -289,6 +314,7 @@ class TestBatchQueue:
         queue = BatchQueue(
             process_function=mock_process_function,
             max_concurrent_jobs=max_concurrent,
+            job_store=JobStore(":memory:"),
         )
 
         try:
@@ -308,23 +334,24 @@ class TestBatchQueue:
             pending_jobs = queue.get_pending_jobs()
             assert len(pending_jobs) == max_concurrent + 2
         finally:
-            if queue._running:  # noqa: SLF001
-                queue.stop()
+            queue.close()
 
 
 class TestBatchProcessor:
     """Test BatchProcessor class with consolidated test methods."""
 
-    def test_processor_queue_creation(self) -> None:  # noqa: PLR6301
+    def test_processor_queue_creation(self, tmp_path: Path) -> None:  # noqa: PLR6301
         """Test creating a queue through processor."""
         processor = BatchProcessor()
         mock_func = MagicMock()
 
-        queue = processor.create_queue(process_function=mock_func, max_concurrent=3)
+        with patch("goesvfi.pipeline.job_store.Path.home", return_value=tmp_path):
+            queue = processor.create_queue(process_function=mock_func, max_concurrent=3)
 
         assert isinstance(queue, BatchQueue)
         assert queue.max_concurrent_jobs == 3
         assert processor.queue == queue
+        queue.close()
 
     def test_job_creation_from_paths(self) -> None:  # noqa: PLR6301
         """Test creating jobs from file paths with various configurations."""
@@ -0,0 +1,326 @@
+"""Tests for the event-driven, resource-aware BatchQueue scheduler."""
+
+from collections.abc import Callable, Iterator
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+from PyQt6.QtCore import Qt
+import pytest
+
+from goesvfi.pipeline.batch_queue import (
+    DEFAULT_JOB_MEMORY_MB,
+    BatchJob,
+    BatchQueue,
+    JobPreempted,
+    JobPriority,
+    JobResources,
+    JobStatus,
+    estimate_job_resources,
+)
+from goesvfi.pipeline.resource_manager import ResourceCapacity, ResourceManager, estimate_processing_memory
+
+# Signals are emitted from worker threads and there's no event loop running
+DIRECT = Qt.ConnectionType.DirectConnection
+
+
+def wait_for(predicate: Callable[[], bool], timeout: float = 20.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+class Recorder:
+    """Process function that records starts and holds each job until released."""
+
+    def __init__(self, hold: bool = True) -> None:
+        self.hold = hold
+        self.started: list[str] = []
+        self.start_times: dict[str, float] = {}
+        self.running: dict[str, int] = {}
+        self.peak_memory_mb = 0
+        self.peak_jobs = 0
+        self._release: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def release(self, job_id: str) -> None:
+        self._gate(job_id).set()
+
+    def _gate(self, job_id: str) -> threading.Event:
+        with self._lock:
+            return self._release.setdefault(job_id, threading.Event())
+
+    def __call__(self, job: BatchJob) -> None:
+        with self._lock:
+            self.started.append(job.id)
+            self.start_times.setdefault(job.id, time.monotonic())
+            self.running[job.id] = job.settings["memory_mb"]
+            self.peak_memory_mb = max(self.peak_memory_mb, sum(self.running.values()))
+            self.peak_jobs = max(self.peak_jobs, len(self.running))
+        try:
+            if self.hold:
+                assert self._gate(job.id).wait(30)
+        finally:
+            with self._lock:
+                del self.running[job.id]
+
+
+def settings_estimator(job: BatchJob) -> JobResources:
+    return JobResources(job.settings["memory_mb"], job.settings.get("cpus", 1))
+
+
+def make_job(job_id: str, memory_mb: int, priority: JobPriority = JobPriority.NORMAL, **settings: Any) -> BatchJob:
+    return BatchJob(
+        id=job_id,
+        name=job_id,
+        input_path=Path(f"/nonexistent/{job_id}.png"),
+        output_path=Path(f"/nonexistent/{job_id}.mp4"),
+        settings={"memory_mb": memory_mb, **settings},
+        priority=priority,
+    )
+
+
+@pytest.fixture()
+def make_queue(tmp_path: Path) -> Iterator[Callable[..., BatchQueue]]:
+    queues: list[BatchQueue] = []
+
+    def factory(
+        process: Callable[[BatchJob], None], memory_mb: int = 1000, cpus: int = 8, max_concurrent: int = 4
+    ) -> BatchQueue:
+        manager = MagicMock()
+        manager.get_capacity.return_value = ResourceCapacity(
+            memory_limit_mb=memory_mb, available_memory_mb=0, cpus=cpus
+        )
+        queue = BatchQueue(process, max_concurrent, resource_manager=manager, resource_estimator=settings_estimator)
+        queues.append(queue)
+        return queue
+
+    with patch("goesvfi.pipeline.batch_queue.Path.home", return_value=tmp_path):
+        yield factory
+        for queue in queues:
+            queue.close()
+
+
+def test_jobs_run_in_priority_order(make_queue: Callable[..., BatchQueue]) -> None:
+    recorder = Recorder(hold=False)
+    queue = make_queue(recorder, max_concurrent=1)
+    done = threading.Event()
+    queue.queue_empty.connect(done.set, DIRECT)
+    for job_id, priority in [("low", JobPriority.LOW), ("normal", JobPriority.NORMAL), ("urgent", JobPriority.URGENT)]:
+        queue.add_job(make_job(job_id, 100, priority))
+    queue.add_job(make_job("high", 100, JobPriority.HIGH))
+
+    queue.start()
+
+    assert done.wait(20)
+    assert recorder.started == ["urgent", "high", "normal", "low"]
+
+
+def test_jobs_are_packed_into_the_memory_budget(make_queue: Callable[..., BatchQueue]) -> None:
+    recorder = Recorder()
+    queue = make_queue(recorder, memory_mb=1000, max_concurrent=8)
+    for i in range(5):
+        queue.add_job(make_job(f"job{i}", 250))
+
+    queue.start()
+
+    assert wait_for(lambda: len(recorder.started) == 4)
+    time.sleep(0.1)
+    assert len(recorder.started) == 4  # The fifth job doesn't fit
+    recorder.release("job0")
+    assert wait_for(lambda: "job4" in recorder.started)
+    for i in range(1, 5):
+        recorder.release(f"job{i}")
+    assert wait_for(lambda: all(job.status == JobStatus.COMPLETED for job in queue.get_all_jobs()))
+    assert recorder.peak_memory_mb == 1000
+
+
+def test_cpu_budget_limits_concurrency(make_queue: Callable[..., BatchQueue]) -> None:
+    recorder = Recorder()
+    queue = make_queue(recorder, memory_mb=10_000, cpus=4, max_concurrent=8)
+    for i in range(3):
+        queue.add_job(make_job(f"job{i}", 100, cpus=2))
+
+    queue.start()
+
+    assert wait_for(lambda: len(recorder.started) == 2)
+    time.sleep(0.1)
+    assert sorted(recorder.started) == ["job0", "job1"]
+    recorder.release("job0")
+    assert wait_for(lambda: "job2" in recorder.started)
+    recorder.release("job1")
+    recorder.release("job2")
+
+
+def test_deferred_job_is_not_starved_by_smaller_ones(make_queue: Callable[..., BatchQueue]) -> None:
+    recorder = Recorder()
+    queue = make_queue(recorder, memory_mb=1000)
+    deferred: list[str] = []
+    queue.job_deferred.connect(lambda job_id, reason: deferred.append(job_id), DIRECT)
+    queue.start()
+    queue.add_job(make_job("first", 600, JobPriority.NORMAL))
+    assert wait_for(lambda: recorder.started == ["first"])
+
+    queue.add_job(make_job("big", 800, JobPriority.HIGH))
+    queue.add_job(make_job("small", 300, JobPriority.LOW))
+    time.sleep(0.1)
+
+    # "small" would fit next to "first", but the memory is reserved for "big"
+    assert recorder.started == ["first"]
+    assert wait_for(lambda: deferred == ["big", "small"])
+    recorder.release("first")
+    assert wait_for(lambda: recorder.started == ["first", "big"])
+    recorder.release("big")
+    assert wait_for(lambda: recorder.started == ["first", "big", "small"])
+    recorder.release("small")
+    assert recorder.peak_memory_mb <= 1000
+
+
+def test_job_larger_than_the_budget_runs_alone(make_queue: Callable[..., BatchQueue]) -> None:
+    recorder = Recorder(hold=False)
+    queue = make_queue(recorder, memory_mb=1000)
+    queue.add_job(make_job("huge", 5000))
+    queue.add_job(make_job("small", 100, JobPriority.LOW))
+
+    queue.start()
+
+    assert wait_for(lambda: all(job.status == JobStatus.COMPLETED for job in queue.get_all_jobs()))
+    assert recorder.started == ["huge", "small"]
+    assert recorder.peak_jobs == 1
+
+
+def test_lower_priority_job_is_preempted(make_queue: Callable[..., BatchQueue]) -> None:
+    started: list[str] = []
+
+    def process(job: BatchJob) -> None:
+        started.append(job.id)
+        if job.id == "low" and started.count("low") == 1:
+            assert wait_for(job.settings["should_stop"])
+            raise JobPreempted
+
+    queue = make_queue(process, memory_mb=1000)
+    preempted: list[str] = []
+    queue.job_preempted.connect(preempted.append, DIRECT)
+    queue.start()
+    queue.add_job(make_job("low", 800, JobPriority.LOW))
+    assert wait_for(lambda: started == ["low"])
+
+    queue.add_job(make_job("urgent", 800, JobPriority.URGENT))
+
+    assert wait_for(lambda: all(job.status == JobStatus.COMPLETED for job in queue.get_all_jobs()))
+    assert started == ["low", "urgent", "low"]
+    assert preempted == ["low"]
+    low = queue.get_job("low")
+    assert low is not None
+    assert low.preemptions == 1
+    assert queue.get_statistics()["preemptions"] == 1
+
+
+def test_equal_priority_job_is_not_preempted(make_queue: Callable[..., BatchQueue]) -> None:
+    recorder = Recorder()
+    queue = make_queue(recorder, memory_mb=1000)
+    queue.start()
+    queue.add_job(make_job("first", 800))
+    assert wait_for(lambda: recorder.started == ["first"])
+
+    queue.add_job(make_job("second", 800))
+    assert not queue.preempt_job("second")
+    time.sleep(0.1)
+
+    assert not queue.get_job("first").settings["should_stop"]()  # type: ignore[union-attr]
+    recorder.release("first")
+    assert wait_for(lambda: recorder.started == ["first", "second"])
+    recorder.release("second")
+
+
+def test_workers_wake_without_polling(make_queue: Callable[..., BatchQueue]) -> None:
+    recorder = Recorder()
+    queue = make_queue(recorder, max_concurrent=1)
+    queue.start()
+    time.sleep(0.05)
+
+    added = time.monotonic()
+    queue.add_job(make_job("first", 100))
+    queue.add_job(make_job("second", 100))
+    assert wait_for(lambda: "first" in recorder.start_times)
+
+    # Raising the limit starts the waiting job straight away
+    queue.max_concurrent_jobs = 2
+    assert wait_for(lambda: "second" in recorder.start_times)
+    # The old scheduler polled every 0.5 seconds
+    assert recorder.start_times["first"] - added < 0.45
+    assert recorder.start_times["second"] - added < 0.45
+    recorder.release("first")
+    recorder.release("second")
+
+
+def test_queue_wait_and_run_times(make_queue: Callable[..., BatchQueue]) -> None:
+    def process(job: BatchJob) -> None:
+        time.sleep(0.2)
+
+    queue = make_queue(process, max_concurrent=1)
+    done = threading.Event()
+    queue.queue_empty.connect(done.set, DIRECT)
+    queue.add_job(make_job("first", 100))
+    queue.add_job(make_job("second", 100))
+
+    queue.start()
+
+    assert done.wait(20)
+    first, second = queue.get_job("first"), queue.get_job("second")
+    assert first is not None and second is not None
+    assert first.run_seconds >= 0.2 and second.run_seconds >= 0.2
+    # The second job waited while the first one ran
+    assert second.queue_wait_seconds >= 0.2
+    assert second.queue_wait_seconds > first.queue_wait_seconds
+    stats = queue.get_statistics()
+    assert stats["jobs_by_status"]["completed"] == 2
+    assert stats["mean_run_seconds"] >= 0.2
+
+    # Runtime callbacks are left out, so the job can still be persisted
+    data = json.loads(json.dumps(second.to_dict()))
+    assert "should_stop" not in data["settings"]
+    assert BatchJob.from_dict(data).queue_wait_seconds == second.queue_wait_seconds
+
+
+class TestEstimateJobResources:
+    def test_frame_size_is_read_from_the_first_image(self, tmp_path: Path) -> None:
+        Image.fromarray(np.zeros((1000, 2000, 3), dtype=np.uint8)).save(tmp_path / "frame_000.png")
+        job = BatchJob("id", "job", tmp_path, tmp_path / "out.mp4", {"max_workers": 2, "multiplier": 3})
+
+        resources = estimate_job_resources(job)
+
+        # A pair of input frames and two interpolated frames, for each of two workers
+        assert resources == JobResources(estimate_processing_memory(8, 2000, 1000), 2)
+
+    def test_crop_rect_and_override(self, tmp_path: Path) -> None:
+        job = BatchJob("id", "job", tmp_path / "missing.png", tmp_path / "out.mp4", {"crop_rect": (0, 0, 500, 400)})
+        assert estimate_job_resources(job).memory_mb == estimate_processing_memory(3, 500, 400)
+
+        job.settings["estimated_memory_mb"] = 1234
+        assert estimate_job_resources(job) == JobResources(1234, 1)
+
+    def test_unreadable_input_uses_the_default(self, tmp_path: Path) -> None:
+        (tmp_path / "frame.png").write_bytes(b"not an image")
+        job = BatchJob("id", "job", tmp_path / "frame.png", tmp_path / "out.mp4", {})
+
+        assert estimate_job_resources(job) == JobResources(DEFAULT_JOB_MEMORY_MB, 1)
+
+
+def test_resource_manager_capacity() -> None:
+    manager = ResourceManager()
+    manager.update_config({"max_memory_mb": 2048, "max_cpu_percent": 50.0})
+
+    with patch("goesvfi.pipeline.resource_manager.os.cpu_count", return_value=8):
+        capacity = manager.get_capacity()
+
+    assert (capacity.memory_limit_mb, capacity.cpus) == (2048, 4)
+    assert capacity.available_memory_mb >= 0
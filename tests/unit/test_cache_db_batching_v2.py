@@ -0,0 +1,169 @@
+"""Tests for the WAL-mode, batched-write CacheDB."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+import sqlite3
+import threading
+
+import numpy as np
+import pytest
+
+from goesvfi.integrity_check.cache_db import CacheDB
+from goesvfi.integrity_check.time_index import SatellitePattern
+from goesvfi.utils.timeline import Timeline
+
+START = datetime(2023, 1, 1, 0, 0, tzinfo=UTC)
+
+# Rows in a bulk load; throughput itself is measured in tests/benchmarks
+BULK_ROWS = 200_000
+
+
+@pytest.fixture()
+def cache_db(tmp_path: Path):
+    db = CacheDB(db_path=tmp_path / "cache.db")
+    yield db
+    db.close()
+
+
+class TestCacheDBBatching:
+    def test_database_uses_wal(self, cache_db: CacheDB) -> None:
+        with sqlite3.connect(cache_db.db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    @pytest.mark.asyncio()
+    async def test_add_timestamps_round_trip(self, cache_db: CacheDB) -> None:
+        entries = [(START + timedelta(minutes=10 * i), f"/data/{i}.png") for i in range(50)]
+
+        written = await cache_db.add_timestamps(SatellitePattern.GOES_16, entries)
+
+        assert written == 50
+        found = await cache_db.get_timestamps(SatellitePattern.GOES_16, START, START + timedelta(days=1))
+        assert found == {ts for ts, _ in entries}
+        assert await cache_db.timestamp_exists(entries[7][0], SatellitePattern.GOES_16)
+        assert not await cache_db.timestamp_exists(entries[7][0], SatellitePattern.GOES_18)
+
+    @pytest.mark.asyncio()
+    async def test_bitmap_marks_found_grid_slots(self, cache_db: CacheDB) -> None:
+        found = [START + timedelta(minutes=10 * i) for i in (0, 3, 5)]
+        off_grid = START + timedelta(minutes=14)
+        await cache_db.add_timestamps(SatellitePattern.GOES_16, [(ts, None) for ts in [*found, off_grid]])
+        await cache_db.add_timestamps(SatellitePattern.GOES_16, [(START + timedelta(minutes=20), None)], found=False)
+
+        bitmap = await cache_db.get_timestamps_bitmap(
+            SatellitePattern.GOES_16, START, START + timedelta(minutes=60), interval_minutes=10
+        )
+
+        assert bitmap.dtype == np.bool_
+        assert bitmap.tolist() == [True, False, False, True, False, True, False]
+
+    @pytest.mark.asyncio()
+    async def test_async_writes_do_not_block_event_loop(self, cache_db: CacheDB) -> None:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        tick_task = asyncio.create_task(ticker())
+        entries = [(START + timedelta(minutes=i), None) for i in range(20_000)]
+        await cache_db.add_timestamps(SatellitePattern.GOES_16, entries)
+        tick_task.cancel()
+
+        assert ticks > 1
+
+    def test_concurrent_writes_are_batched(self, cache_db: CacheDB) -> None:
+        writer = cache_db._writer  # noqa: SLF001
+        assert writer is not None
+
+        def add(offset: int) -> None:
+            for i in range(25):
+                asyncio.run(
+                    cache_db.add_timestamp(
+                        START + timedelta(minutes=offset * 1000 + i), SatellitePattern.GOES_16, "/x", True
+                    )
+                )
+
+        threads = [threading.Thread(target=add, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        cache_db.flush()
+
+        assert cache_db.get_cache_stats()["found_count"] == 200
+        assert writer.operations_committed >= 200
+
+    def test_failed_operation_does_not_poison_batch(self, cache_db: CacheDB) -> None:
+        def bad(conn: sqlite3.Connection) -> None:
+            conn.execute("INSERT INTO no_such_table VALUES (1)")
+
+        bad_future = cache_db._submit_write(bad)  # noqa: SLF001
+        cache_db.add_entry("/a.nc", "hash", 1, START)
+
+        with pytest.raises(sqlite3.OperationalError):
+            bad_future.result(timeout=5)
+        assert cache_db.get_entry("/a.nc") is not None
+
+    def test_store_scan_results_round_trip(self, cache_db: CacheDB) -> None:
+        missing = [START + timedelta(minutes=10 * i) for i in range(3)]
+        scan_id = cache_db.store_scan_results(
+            START, START + timedelta(hours=1), SatellitePattern.GOES_16, 10, Path("/data"), missing, 7, 4
+        )
+
+        cached = cache_db.get_cached_scan(
+            START, START + timedelta(hours=1), SatellitePattern.GOES_16, 10, Path("/data")
+        )
+
+        assert cached is not None
+        assert cached["id"] == scan_id
+        assert sorted(cached["missing_timestamps"]) == missing
+
+    def test_store_scan_results_serialises_timeline_as_ranges(self, cache_db: CacheDB) -> None:
+        end = START + timedelta(days=30)
+        missing = Timeline.full(START, end, timedelta(minutes=10)) - Timeline.from_timestamps(
+            START, end, timedelta(minutes=10), [START + timedelta(days=10)]
+        )
+        cache_db.store_scan_results(START, end, SatellitePattern.GOES_16, 10, Path("/data"), missing, 0, 0)
+        cache_db.flush()
+
+        with sqlite3.connect(cache_db.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM missing_ranges").fetchone()[0] == 2
+            assert conn.execute("SELECT COUNT(*) FROM missing_timestamps").fetchone()[0] == 0
+
+        cached = cache_db.get_cached_scan(START, end, SatellitePattern.GOES_16, 10, Path("/data"))
+        assert cached is not None
+        assert cached["missing_timestamps"] == missing
+
+    def test_legacy_database_is_migrated(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "legacy.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE timestamps (satellite TEXT NOT NULL, timestamp TEXT NOT NULL, file_path TEXT, "
+                "found BOOLEAN DEFAULT 0, last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+                "PRIMARY KEY (satellite, timestamp))"
+            )
+            conn.execute("INSERT INTO timestamps VALUES ('GOES_16', ?, NULL, 1, NULL)", (START.isoformat(),))
+
+        with CacheDB(db_path=db_path) as db:
+            bitmap = asyncio.run(db.get_timestamps_bitmap("GOES_16", START, START + timedelta(minutes=10), 10))
+
+        assert bitmap.tolist() == [True, False]
+
+
+@pytest.mark.slow()
+class TestCacheDBBulkLoad:
+    """A multi-year history loads in one batch and reads back intact."""
+
+    def test_bulk_insert_and_bitmap_query(self, cache_db: CacheDB) -> None:
+        entries = [(START + timedelta(minutes=10 * i), None) for i in range(BULK_ROWS)]
+        end = entries[-1][0]
+
+        asyncio.run(cache_db.add_timestamps(SatellitePattern.GOES_16, entries))
+        bitmap = asyncio.run(cache_db.get_timestamps_bitmap(SatellitePattern.GOES_16, START, end, 10))
+        found = asyncio.run(cache_db.get_timestamps(SatellitePattern.GOES_16, START, end))
+
+        assert int(bitmap.sum()) == BULK_ROWS
+        assert len(found) == BULK_ROWS
@@ -0,0 +1,150 @@
+"""Tests for the headless goesvfi command line interface."""
+
+from collections.abc import Callable
+import json
+import os
+from pathlib import Path
+import re
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from goesvfi import cli
+
+# GUI and remote-store packages that headless subcommands must not import
+GUI_AND_REMOTE = ("PyQt6", "xarray", "matplotlib", "aioboto3")
+
+
+def run_python(code: str, *args: str) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "PYTHONPATH": str(Path(cli.__file__).parents[1])}
+    return subprocess.run(
+        [sys.executable, *args, "-c", code], capture_output=True, text=True, env=env, timeout=120, check=True
+    )
+
+
+def modules_after(code: str) -> list[str]:
+    """Run code in a fresh interpreter and list the loaded top-level modules."""
+    result = run_python(f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def write(path: Path, content: bytes = b"frame") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def test_import_time_is_reported(record_property: Callable[[str, object], None]) -> None:
+    # Timings depend on the machine, so the best of a few runs is reported rather than asserted
+    cumulative_us = []
+    for _ in range(3):
+        stderr = run_python("import goesvfi.cli", "-X", "importtime").stderr
+        match = re.search(r"\|\s*(\d+)\s*\|\s*goesvfi\.cli$", stderr, re.MULTILINE)
+        assert match
+        cumulative_us.append(int(match.group(1)))
+
+    record_property("cli_import_seconds", min(cumulative_us) / 1e6)
+
+
+def test_startup_imports_no_heavy_modules() -> None:
+    loaded = modules_after("from goesvfi import cli; cli.build_parser().parse_args(['sort', 'files', 'a', 'b'])")
+
+    assert not [module for module in loaded if module.split(".")[0] in cli.HEAVY_MODULES]
+
+
+def test_sort_files(tmp_path: Path) -> None:
+    write(tmp_path / "src" / "2023-05-01_07-00-00" / "goes16.png")
+    code = f"from goesvfi.cli import main; assert main(['sort', 'files', {str(tmp_path / 'src')!r}, {str(tmp_path / 'dst')!r}]) == 0"
+
+    loaded = modules_after(code)
+
+    assert (tmp_path / "dst" / "goes16" / "goes16_20230501T070000Z.png").read_bytes() == b"frame"
+    assert not [module for module in loaded if module.split(".")[0] in GUI_AND_REMOTE]
+
+
+def test_sort_dates_with_move(tmp_path: Path) -> None:
+    source = write(tmp_path / "src" / "sat_20230501T120000Z.png")
+
+    assert cli.main(["sort", "dates", str(source.parent), str(tmp_path / "dst"), "--mode", "move"]) == 0
+
+    assert not source.exists()
+    assert (tmp_path / "dst" / "2023" / "05" / "01" / source.name).exists()
+
+
+def test_reconcile_reports_missing_timestamps(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    for hour in (0, 1, 3):
+        write(tmp_path / "archive" / f"goes16_G16_20230501T{hour:02d}0000Z.png")
+    args = [
+        "reconcile",
+        str(tmp_path / "archive"),
+        "--start=2023-05-01T00:00:00",
+        "--end=2023-05-01T03:00:00",
+        "--interval=60",
+        f"--cache-db={tmp_path / 'cache.db'}",
+        "--json",
+    ]
+
+    assert cli.main(args) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert (report["total_expected"], report["total_found"], report["missing"]) == (4, 3, ["2023-05-01T02:00:00"])
+
+    assert cli.main([*args, "--fail-on-missing"]) == 2
+
+
+def test_reconcile_does_not_import_the_gui() -> None:
+    loaded = modules_after("import goesvfi.integrity_check.reconciler")
+
+    assert not [module for module in loaded if module.split(".")[0] in GUI_AND_REMOTE]
+
+
+def test_run_does_not_import_widgets() -> None:
+    loaded = modules_after("import goesvfi.pipeline.run_vfi")
+
+    assert "PyQt6.QtWidgets" not in loaded
+    assert "PyQt6.QtGui" not in loaded
+    assert not [module for module in loaded if module.split(".")[0] in ("xarray", "matplotlib", "aioboto3")]
+
+
+def test_run_interpolates_then_encodes(tmp_path: Path) -> None:
+    raw = write(tmp_path / "out.raw.mp4")
+    frames = tmp_path / "frames"
+    frames.mkdir()
+
+    def fake_run_vfi(**kwargs):
+        yield (1, 1, 0.0)
+        yield raw
+
+    with (
+        patch("goesvfi.pipeline.run_vfi.run_vfi", side_effect=fake_run_vfi) as run_vfi,
+        patch("goesvfi.pipeline.encode.encode_with_ffmpeg") as encode,
+    ):
+        status = cli.main([
+            "run",
+            str(frames),
+            "-o",
+            str(tmp_path / "out.mp4"),
+            "--skip-model",
+            "--crop=1,2,30,40",
+            "--encoder=x265",
+        ])
+
+    assert status == 0
+    kwargs = run_vfi.call_args.kwargs
+    assert (kwargs["folder"], kwargs["crop_rect_xywh"], kwargs["skip_model"]) == (frames, (1, 2, 30, 40), True)
+    assert encode.call_args.args == (raw, tmp_path / "out.mp4", "Software x265")
+    assert encode.call_args.kwargs["bufsize_kb"] == 2 * cli.DEFAULT_BITRATE_KBPS
+    assert not raw.exists()
+
+
+def test_encode_failure_sets_exit_status(tmp_path: Path) -> None:
+    with patch("goesvfi.pipeline.encode.encode_with_ffmpeg", side_effect=OSError("ffmpeg failed")):
+        assert cli.main(["encode", str(tmp_path / "in.mp4"), str(tmp_path / "out.mp4"), "--encoder=copy"]) == 1
+
+
+def test_bad_crop_is_a_usage_error() -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        cli.build_parser().parse_args(["run", "frames", "-o", "out.mp4", "--crop=1,2,3"])
+
+    assert excinfo.value.code == 2
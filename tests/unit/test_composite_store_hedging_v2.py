@@ -0,0 +1,180 @@
+"""Tests for hedged downloads and latency tracking in CompositeStore."""
+
+import asyncio
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from goesvfi.integrity_check.remote.base import AuthenticationError, RemoteStoreError
+from goesvfi.integrity_check.remote.composite_store import CompositeStore, SourceLatencyTracker
+from goesvfi.integrity_check.time_index import SatellitePattern
+
+TIMESTAMP = datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+
+class FakeStore:
+    """Store that writes a payload after a configurable delay."""
+
+    def __init__(self, delay: float, payload: bytes = b"x" * 1024, error: Exception | None = None) -> None:
+        self.delay = delay
+        self.payload = payload
+        self.error = error
+        self.calls: list[Path] = []
+        self.cancelled = False
+
+    async def download(self, ts: datetime, satellite: SatellitePattern, dest_path: Path) -> Path:
+        self.calls.append(dest_path)
+        try:
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            dest_path.write_bytes(self.payload[:1])
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        dest_path.write_bytes(self.payload)
+        return dest_path
+
+    async def close(self) -> None:
+        pass
+
+
+def make_store(sources: list[tuple[str, FakeStore]], **kwargs) -> CompositeStore:
+    store = CompositeStore(enable_s3=False, enable_cdn=True, **kwargs)
+    store.sources = sources  # type: ignore[assignment]
+    return store
+
+
+class TestSourceLatencyTracker:
+    def test_percentile_requires_min_samples(self) -> None:
+        tracker = SourceLatencyTracker(min_samples=3)
+        tracker.record(1.0)
+        tracker.record(2.0)
+        assert tracker.percentile(95) is None
+        tracker.record(3.0)
+        assert tracker.percentile(95) == 3.0
+
+    def test_ewma_and_throughput(self) -> None:
+        tracker = SourceLatencyTracker(alpha=0.5)
+        tracker.record(2.0, size_bytes=1000)
+        tracker.record(4.0, size_bytes=1000)
+        assert tracker.ewma_latency == pytest.approx(3.0)
+        assert tracker.ewma_throughput == pytest.approx(375.0)
+        assert tracker.ewma_size == pytest.approx(1000.0)
+
+    def test_censored_samples_only_raise_the_estimate(self) -> None:
+        tracker = SourceLatencyTracker(alpha=0.5, min_samples=1)
+        tracker.record(2.0)
+        tracker.record_censored(1.0)
+        assert tracker.ewma_latency == pytest.approx(2.0)
+        tracker.record_censored(4.0)
+        assert tracker.ewma_latency == pytest.approx(3.0)
+        assert tracker.percentile(95) == 2.0
+
+
+class TestCompositeStoreHedging:
+    @pytest.mark.asyncio()
+    async def test_fast_primary_does_not_hedge(self, tmp_path: Path) -> None:
+        primary, backup = FakeStore(0.01), FakeStore(0.01)
+        store = make_store([("S3", primary), ("CDN", backup)], default_hedge_delay=1.0)
+
+        dest = tmp_path / "out.nc"
+        result = await store.download(TIMESTAMP, SatellitePattern.GOES_16, dest)
+
+        assert result == dest
+        assert dest.read_bytes() == primary.payload
+        assert backup.calls == []
+        assert store.source_stats["S3"]["successes"] == 1
+
+    @pytest.mark.asyncio()
+    async def test_slow_primary_is_hedged_and_cancelled(self, tmp_path: Path) -> None:
+        primary, backup = FakeStore(5.0), FakeStore(0.01, payload=b"y" * 2048)
+        store = make_store([("S3", primary), ("CDN", backup)], default_hedge_delay=0.05)
+
+        dest = tmp_path / "out.nc"
+        result = await asyncio.wait_for(store.download(TIMESTAMP, SatellitePattern.GOES_16, dest), timeout=2.0)
+
+        assert result == dest
+        assert dest.read_bytes() == backup.payload
+        assert primary.cancelled
+        assert backup.calls[0] != dest
+        assert not backup.calls[0].exists()
+        assert store.source_stats["CDN"]["hedges"] == 1
+        assert store.source_stats["CDN"]["hedge_wins"] == 1
+        # Cancelled loser is not counted as a failure
+        assert store.source_stats["S3"]["failures"] == 0
+        assert store.duplicated_bytes == 1
+
+    @pytest.mark.asyncio()
+    async def test_hedge_budget_disables_hedging(self, tmp_path: Path) -> None:
+        primary, backup = FakeStore(0.2), FakeStore(0.01)
+        store = make_store(
+            [("S3", primary), ("CDN", backup)],
+            default_hedge_delay=0.01,
+            hedge_budget_ratio=0.0,
+            hedge_burst_bytes=0,
+        )
+        store.latency["CDN"].record(0.1, size_bytes=4096)
+
+        dest = tmp_path / "out.nc"
+        await store.download(TIMESTAMP, SatellitePattern.GOES_16, dest)
+
+        assert backup.calls == []
+        assert dest.read_bytes() == primary.payload
+
+    @pytest.mark.asyncio()
+    async def test_no_burst_budget_disables_hedging_of_unknown_size(self, tmp_path: Path) -> None:
+        primary, backup = FakeStore(0.2), FakeStore(0.01)
+        store = make_store([("S3", primary), ("CDN", backup)], default_hedge_delay=0.01, hedge_burst_bytes=0)
+
+        dest = tmp_path / "out.nc"
+        await store.download(TIMESTAMP, SatellitePattern.GOES_16, dest)
+
+        assert backup.calls == []
+        assert dest.read_bytes() == primary.payload
+
+    @pytest.mark.asyncio()
+    async def test_losing_source_does_not_look_faster(self, tmp_path: Path) -> None:
+        primary, backup = FakeStore(5.0), FakeStore(0.01)
+        store = make_store([("S3", primary), ("CDN", backup)], default_hedge_delay=0.05)
+        tracker = store._get_tracker("S3")
+        for _ in range(4):  # Too few for a p95, so the default delay applies
+            tracker.record(10.0)
+
+        await asyncio.wait_for(store.download(TIMESTAMP, SatellitePattern.GOES_16, tmp_path / "out.nc"), timeout=2.0)
+
+        assert primary.cancelled
+        assert tracker.ewma_latency == pytest.approx(10.0)
+        assert tracker.percentile(95) is None
+
+    @pytest.mark.asyncio()
+    async def test_failed_primary_falls_back(self, tmp_path: Path) -> None:
+        primary = FakeStore(0.01, error=RemoteStoreError("boom"))
+        backup = FakeStore(0.01)
+        store = make_store([("S3", primary), ("CDN", backup)], enable_hedging=False)
+
+        dest = tmp_path / "out.nc"
+        result = await store.download(TIMESTAMP, SatellitePattern.GOES_16, dest)
+
+        assert result == dest
+        assert backup.calls == [dest]
+        assert store.source_stats["S3"]["consecutive_failures"] == 1
+
+    @pytest.mark.asyncio()
+    async def test_authentication_error_stops_fallback(self, tmp_path: Path) -> None:
+        primary = FakeStore(0.01, error=AuthenticationError("denied"))
+        backup = FakeStore(0.01)
+        store = make_store([("S3", primary), ("CDN", backup)])
+
+        with pytest.raises(RemoteStoreError):
+            await store.download(TIMESTAMP, SatellitePattern.GOES_16, tmp_path / "out.nc")
+        assert backup.calls == []
+
+    def test_hedge_delay_uses_p95(self) -> None:
+        store = make_store([("S3", FakeStore(0.0))], default_hedge_delay=3.0)
+        assert store._get_hedge_delay("S3") == 3.0
+        for latency in (0.1, 0.2, 0.3, 0.4, 0.5):
+            store.latency["S3"].record(latency)
+        assert store._get_hedge_delay("S3") == pytest.approx(0.5)
@@ -160,6 +160,21 @@ class TestParseSatellitePathV2:
         date = parse_satellite_path(complex_path)
         assert date == datetime.date(2023, 5, 3)
 
+    @pytest.mark.parametrize(
+        "path_str,expected_date",
+        [
+            # ISO date whose time part isn't a valid time
+            ("/data/12345678_20231027T999999Z.nc", datetime.date(2023, 10, 27)),
+            # Day of year after eight digits that aren't a calendar date
+            ("/data/12345678_2023123.nc", datetime.date(2023, 5, 3)),
+            # Eight digits that aren't a calendar date aren't read as YYYYDDD
+            ("/data/20231501/file.nc", None),
+        ],
+    )
+    def test_parse_satellite_path_fallbacks(self, path_str: str, expected_date: datetime.date | None) -> None:  # noqa: PLR6301
+        """Test the fallbacks for dates the full timestamp parser rejects."""
+        assert parse_satellite_path(path_str) == expected_date
+
 
 class TestFormatSatellitePathV2:
     """Optimized tests for format_satellite_path function."""
@@ -0,0 +1,222 @@
+"""Tests for the persistent incremental directory index."""
+
+from datetime import UTC, datetime, timedelta
+import os
+from pathlib import Path
+import time
+
+import numpy as np
+import pytest
+
+from goesvfi.integrity_check import directory_index
+from goesvfi.integrity_check.cache_db import CacheDB
+from goesvfi.integrity_check.directory_index import DirectoryIndex, DirectoryIndexWatcher
+from goesvfi.integrity_check.reconciler import Reconciler
+from goesvfi.integrity_check.time_index import SatellitePattern
+from goesvfi.integrity_check.view_model import IntegrityCheckViewModel
+
+START = datetime(2023, 1, 1, 0, 0)
+PATTERN = SatellitePattern.GOES_16
+
+
+def make_image(directory: Path, ts: datetime) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"goes16_{ts:%Y%m%d_%H%M%S}_band13.png"
+    path.write_bytes(b"")
+    return path
+
+
+def settle(*directories: Path) -> None:
+    """Backdate directory mtimes so they fall outside the racy window."""
+    past = time.time() - 60
+    for directory in directories:
+        os.utime(directory, (past, past))
+
+
+def as_datetimes(values: np.ndarray) -> list[datetime]:
+    return values.astype("datetime64[s]").tolist()
+
+
+@pytest.fixture()
+def cache_db(tmp_path: Path):
+    db = CacheDB(db_path=tmp_path / "cache.db")
+    yield db
+    db.close()
+
+
+@pytest.fixture()
+def archive(tmp_path: Path) -> Path:
+    root = tmp_path / "archive"
+    for day in range(2):
+        for slot in range(3):
+            make_image(root / f"day{day}", START + timedelta(days=day, minutes=10 * slot))
+    settle(root, root / "day0", root / "day1")
+    return root
+
+
+class TestDirectoryIndex:
+    def test_first_refresh_indexes_all_files(self, cache_db: CacheDB, archive: Path) -> None:
+        index = DirectoryIndex(cache_db)
+
+        stats = index.refresh(archive, PATTERN)
+
+        assert stats.directories_listed == 3
+        assert stats.files_indexed == 6
+        assert as_datetimes(index.timestamps(archive, PATTERN)) == sorted(
+            START + timedelta(days=day, minutes=10 * slot) for day in range(2) for slot in range(3)
+        )
+
+    def test_unchanged_directories_are_not_relisted(self, cache_db: CacheDB, archive: Path) -> None:
+        index = DirectoryIndex(cache_db)
+        index.refresh(archive, PATTERN)
+
+        stats = index.refresh(archive, PATTERN)
+
+        assert stats.directories_checked == 3
+        assert stats.directories_listed == 0
+        assert not stats.changed
+
+    def test_only_changed_directory_is_relisted(self, cache_db: CacheDB, archive: Path) -> None:
+        index = DirectoryIndex(cache_db)
+        index.refresh(archive, PATTERN)
+        new_ts = START + timedelta(days=1, hours=5)
+        make_image(archive / "day1", new_ts)
+
+        stats = index.refresh(archive, PATTERN)
+
+        assert stats.directories_listed == 1
+        assert new_ts in as_datetimes(index.timestamps(archive, PATTERN))
+
+    def test_removed_directory_is_dropped(self, cache_db: CacheDB, archive: Path) -> None:
+        index = DirectoryIndex(cache_db)
+        index.refresh(archive, PATTERN)
+        for path in (archive / "day0").iterdir():
+            path.unlink()
+        (archive / "day0").rmdir()
+
+        stats = index.refresh(archive, PATTERN)
+
+        assert stats.directories_removed == 1
+        assert len(index.timestamps(archive, PATTERN)) == 3
+
+    def test_date_range_query(self, cache_db: CacheDB, archive: Path) -> None:
+        index = DirectoryIndex(cache_db)
+        index.refresh(archive, PATTERN)
+
+        found = index.timestamps(archive, PATTERN, START + timedelta(minutes=5), START + timedelta(days=1))
+
+        assert as_datetimes(found) == [
+            START + timedelta(minutes=10),
+            START + timedelta(minutes=20),
+            START + timedelta(days=1),
+        ]
+
+    def test_recently_modified_directory_is_relisted(self, cache_db: CacheDB, archive: Path) -> None:
+        index = DirectoryIndex(cache_db)
+        os.utime(archive / "day0")
+        index.refresh(archive, PATTERN)
+
+        stats = index.refresh(archive, PATTERN)
+
+        assert stats.directories_listed == 1
+
+    def test_subdirectory_fallback_accepts_aware_bounds(self, cache_db: CacheDB, tmp_path: Path) -> None:
+        root = tmp_path / "dirs"
+        for hour in range(3):
+            (root / f"{START + timedelta(hours=hour):%Y-%m-%d_%H-%M-%S}").mkdir(parents=True)
+        index = DirectoryIndex(cache_db)
+        index.refresh(root, PATTERN)
+
+        found = index.timestamps(
+            root,
+            PATTERN,
+            START.replace(tzinfo=UTC) + timedelta(hours=1),
+            START.replace(tzinfo=UTC) + timedelta(hours=2),
+        )
+
+        assert as_datetimes(found) == [START + timedelta(hours=1), START + timedelta(hours=2)]
+
+
+class TestReconcilerWithIndex:
+    def test_new_files_are_picked_up_without_force_rescan(self, tmp_path: Path, archive: Path) -> None:
+        reconciler = Reconciler(cache_db_path=tmp_path / "reconciler.db")
+        end = START + timedelta(minutes=30)
+
+        first = reconciler.scan_date_range(START, end, PATTERN, archive, interval_minutes=10)
+        cached = reconciler.scan_date_range(START, end, PATTERN, archive, interval_minutes=10)
+        make_image(archive / "day0", START + timedelta(minutes=30))
+        rescanned = reconciler.scan_date_range(START, end, PATTERN, archive, interval_minutes=10)
+        reconciler.cache.close()
+
+        assert first["missing"].timestamps() == [START + timedelta(minutes=30)]
+        assert cached["source"] == "cache"
+        assert rescanned["source"] == "scan"
+        assert len(rescanned["missing"]) == 0
+
+    def test_files_indexed_by_a_watcher_invalidate_cached_results(
+        self, tmp_path: Path, archive: Path, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(directory_index, "RACY_MTIME_WINDOW_NS", 0)
+        reconciler = Reconciler(cache_db_path=tmp_path / "reconciler.db")
+        end = START + timedelta(minutes=30)
+        first = reconciler.scan_date_range(START, end, PATTERN, archive, interval_minutes=10)
+
+        changes = []
+        watcher = DirectoryIndexWatcher(reconciler.index, archive, PATTERN, interval=0.05, on_change=changes.append)
+        make_image(archive / "day0", START + timedelta(minutes=30))
+        watcher.start()
+        try:
+            deadline = time.time() + 5
+            while not changes and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+        rescanned = reconciler.scan_date_range(START, end, PATTERN, archive, interval_minutes=10)
+        reconciler.cache.close()
+
+        assert changes
+        assert len(first["missing"]) == 1
+        assert rescanned["source"] == "scan"
+        assert len(rescanned["missing"]) == 0
+
+
+class TestViewModelWatching:
+    def test_scan_starts_watcher_and_cleanup_stops_it(self, tmp_path: Path, archive: Path) -> None:
+        reconciler = Reconciler(cache_db_path=tmp_path / "reconciler.db")
+        view_model = IntegrityCheckViewModel(reconciler)
+        view_model.base_directory = archive
+        view_model.selected_pattern = PATTERN
+
+        view_model._handle_scan_completed({"status": "completed", "missing": []})  # noqa: SLF001
+        watcher = reconciler._watcher  # noqa: SLF001
+        try:
+            assert watcher is not None
+            assert watcher.is_running
+        finally:
+            view_model.cleanup()
+        reconciler.cache.close()
+
+        assert reconciler._watcher is None  # noqa: SLF001
+        assert not watcher.is_running
+
+
+class TestDirectoryIndexWatcher:
+    def test_watcher_refreshes_in_background(self, cache_db: CacheDB, archive: Path, monkeypatch) -> None:
+        monkeypatch.setattr(directory_index, "RACY_MTIME_WINDOW_NS", 0)
+        index = DirectoryIndex(cache_db)
+        changes = []
+        watcher = DirectoryIndexWatcher(index, archive, PATTERN, interval=0.05, on_change=changes.append)
+
+        watcher.start()
+        try:
+            deadline = time.time() + 5
+            while not changes and time.time() < deadline:
+                time.sleep(0.01)
+            make_image(archive / "day0", START + timedelta(hours=7))
+            while len(index.timestamps(archive, PATTERN)) < 7 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+
+        assert not watcher.is_running
+        assert len(index.timestamps(archive, PATTERN)) == 7
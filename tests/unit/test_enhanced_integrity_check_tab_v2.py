@@ -15,23 +15,8 @@ from unittest.mock import MagicMock, patch
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
-# Patch network components before imports to prevent initialization
-import unittest.mock
-
 from PyQt6.QtCore import QDateTime
 from PyQt6.QtWidgets import QApplication
-
-# Import comprehensive mocks from test utils
-from tests.utils.mocks import MockCDNStore, MockS3Store
-
-# Patch at the module level before any imports
-unittest.mock.patch("goesvfi.integrity_check.remote.s3_store.S3Store", MockS3Store).start()
-unittest.mock.patch("goesvfi.integrity_check.remote.cdn_store.CDNStore", MockCDNStore).start()
-# Also patch in the enhanced_gui_tab module to ensure it uses our mocks
-unittest.mock.patch("goesvfi.integrity_check.enhanced_gui_tab.S3Store", MockS3Store).start()
-unittest.mock.patch("goesvfi.integrity_check.enhanced_gui_tab.CDNStore", MockCDNStore).start()
-# Don't patch TimeIndex globally - let individual tests control it
-
 import pytest
 
 from goesvfi.integrity_check.enhanced_gui_tab import (  # noqa: E402
@@ -45,6 +30,9 @@ from goesvfi.integrity_check.enhanced_view_model import (  # noqa: E402
 from goesvfi.integrity_check.time_index import SatellitePattern  # noqa: E402
 from goesvfi.integrity_check.view_model import ScanStatus  # noqa: E402
 
+# Import comprehensive mocks from test utils
+from tests.utils.mocks import MockCDNStore, MockS3Store  # noqa: E402
+
 # Import our test utilities
 from tests.utils.pyqt_async_test import (  # noqa: E402
     AsyncSignalWaiter,
@@ -56,6 +44,23 @@ from tests.utils.pyqt_async_test import (  # noqa: E402
 pytestmark = pytest.mark.timeout(30)  # 30 second timeout for all tests in this file
 
 
+@pytest.fixture(autouse=True, scope="module")
+def _mock_remote_stores():
+    """Replace the network stores for this module's tests only.
+
+    Patches started at import time were never stopped, so later modules that
+    imported S3Store got MockS3Store instead.
+    """
+    # Don't patch TimeIndex globally - let individual tests control it
+    with (
+        patch("goesvfi.integrity_check.remote.s3_store.S3Store", MockS3Store),
+        patch("goesvfi.integrity_check.remote.cdn_store.CDNStore", MockCDNStore),
+        patch("goesvfi.integrity_check.enhanced_gui_tab.S3Store", MockS3Store),
+        patch("goesvfi.integrity_check.enhanced_gui_tab.CDNStore", MockCDNStore),
+    ):
+        yield
+
+
 class TestEnhancedIntegrityCheckTabFileOperationsV2(PyQtAsyncTestCase):
     """Test cases for EnhancedIntegrityCheckTab with comprehensive file operations coverage."""
 
@@ -170,7 +170,7 @@ class TestEnhancedIntegrityCheckViewModelV2(PyQtAsyncTestCase):
 
         # Verify cache_db is wrapped in ThreadLocalCacheDB but has same path
         assert isinstance(custom_vm._cache_db, ThreadLocalCacheDB)  # noqa: SLF001
-        assert custom_vm._cache_db.db_path == self.mock_cache_db.db_path  # noqa: SLF001
+        assert custom_vm._cache_db.db_path == Path(self.mock_cache_db.db_path)  # noqa: SLF001
 
         # Clean up to avoid warnings
         vm.cleanup()
@@ -626,6 +626,19 @@ class TestEnhancedIntegrityCheckViewModelV2(PyQtAsyncTestCase):
         if hasattr(vm, "_cache_db"):
             delattr(vm, "_cache_db")
 
+    def test_cleanup_stops_watcher_before_closing_cache(self) -> None:
+        """Test the directory watcher is stopped before the cache it writes to is closed."""
+        calls = MagicMock()
+        reconciler = MagicMock()
+        reconciler.stop_watching = calls.stop_watching
+        reconciler.cache.close = calls.close_cache
+        self.view_model._reconciler.cache.close()  # noqa: SLF001
+        self.view_model._reconciler = reconciler  # noqa: SLF001
+
+        self.view_model.cleanup()
+
+        assert [name for name, _args, _kwargs in calls.mock_calls] == ["stop_watching", "close_cache"]
+
     def test_start_enhanced_scan_comprehensive(self) -> None:
         """Test starting enhanced scan with various configurations."""
         # Test scan scenarios
@@ -935,16 +948,8 @@ class TestAsyncTasksV2(PyQtAsyncTestCase):
         self.download_task = AsyncDownloadTask(self.mock_view_model)
         self.download_task.signals = self.signals
 
-        # Patch event loop
-        self.patch_new_event_loop = patch("asyncio.new_event_loop", return_value=self._event_loop)
-        self.mock_new_event_loop = self.patch_new_event_loop.start()
-
     def tearDown(self) -> None:
         """Tear down test fixtures."""
-        # Stop patches
-        if hasattr(self, "patch_new_event_loop"):
-            self.patch_new_event_loop.stop()
-
         # Clean up AsyncMock references
         if (
             hasattr(self, "mock_view_model")
@@ -986,19 +991,13 @@ class TestAsyncTasksV2(PyQtAsyncTestCase):
 
         expected_result = {"status": "completed", "existing": set(), "missing": set()}
 
-        with patch.object(test_task, "_run_scan", new=AsyncMock(return_value=expected_result)):  # noqa: SIM117
-            with patch("asyncio.new_event_loop") as mock_loop_factory:
-                mock_loop = AsyncMock()
-                mock_loop.run_until_complete = MagicMock(return_value=expected_result)
-                mock_loop.close = MagicMock()
-                mock_loop_factory.return_value = mock_loop
+        with patch.object(test_task, "_run_scan", new=AsyncMock(return_value=expected_result)):
+            test_task.run()
+            QCoreApplication.processEvents()
 
-                with patch("asyncio.set_event_loop"):
-                    test_task.run()
-                    QCoreApplication.processEvents()
-
-                    scan_finished_spy.assert_called_once()
-                    assert scan_finished_spy.call_args[0][0] == expected_result
+            scan_finished_spy.assert_called_once()
+            assert scan_finished_spy.call_args[0][0] == expected_result
+            assert self.mock_view_model._scan_task_future.done()  # noqa: SLF001
 
         # Test scan with exception
         test_task_error = AsyncScanTask(self.mock_view_model)
@@ -1007,19 +1006,12 @@ class TestAsyncTasksV2(PyQtAsyncTestCase):
         error_spy_2 = MagicMock()
         test_task_error.signals.error.connect(error_spy_2)
 
-        # Don't patch _run_scan, let the loop throw the error
-        with patch("asyncio.new_event_loop") as mock_loop_factory:
-            mock_loop = MagicMock()  # Use MagicMock instead of AsyncMock
-            mock_loop.run_until_complete.side_effect = Exception("Test error")
-            mock_loop.close = MagicMock()
-            mock_loop_factory.return_value = mock_loop
-
-            with patch("asyncio.set_event_loop"):
-                test_task_error.run()
-                QCoreApplication.processEvents()
+        with patch.object(test_task_error, "_run_scan", new=AsyncMock(side_effect=Exception("Test error"))):
+            test_task_error.run()
+            QCoreApplication.processEvents()
 
-                error_spy_2.assert_called_once()
-                assert "Test error" in error_spy_2.call_args[0][0]
+            error_spy_2.assert_called_once()
+            assert "Test error" in error_spy_2.call_args[0][0]
 
     @async_test
     async def test_run_scan_comprehensive(self) -> None:
@@ -1100,19 +1092,12 @@ class TestAsyncTasksV2(PyQtAsyncTestCase):
         mock_timestamp = datetime(2023, 6, 15, 0, 0, 0, tzinfo=UTC)
         expected_result = {mock_timestamp: Path("/test_path/test.png")}
 
-        with patch.object(test_task, "_run_downloads", new=AsyncMock(return_value=expected_result)):  # noqa: SIM117
-            with patch("asyncio.new_event_loop") as mock_loop_factory:
-                mock_loop = AsyncMock()
-                mock_loop.run_until_complete = MagicMock(return_value=expected_result)
-                mock_loop.close = MagicMock()
-                mock_loop_factory.return_value = mock_loop
+        with patch.object(test_task, "_run_downloads", new=AsyncMock(return_value=expected_result)):
+            test_task.run()
+            QCoreApplication.processEvents()
 
-                with patch("asyncio.set_event_loop"):
-                    test_task.run()
-                    QCoreApplication.processEvents()
-
-                    download_finished_spy.assert_called()
-                    assert download_finished_spy.call_args[0][0] == expected_result
+            download_finished_spy.assert_called()
+            assert download_finished_spy.call_args[0][0] == expected_result
 
         # Test download with exception
         test_task_error = AsyncDownloadTask(self.mock_view_model)
@@ -1121,19 +1106,12 @@ class TestAsyncTasksV2(PyQtAsyncTestCase):
         error_spy_2 = MagicMock()
         test_task_error.signals.error.connect(error_spy_2)
 
-        # Don't patch _run_downloads, let the loop throw the error
-        with patch("asyncio.new_event_loop") as mock_loop_factory:
-            mock_loop = MagicMock()  # Use MagicMock instead of AsyncMock
-            mock_loop.run_until_complete.side_effect = Exception("Test error")
-            mock_loop.close = MagicMock()
-            mock_loop_factory.return_value = mock_loop
-
-            with patch("asyncio.set_event_loop"):
-                test_task_error.run()
-                QCoreApplication.processEvents()
+        with patch.object(test_task_error, "_run_downloads", new=AsyncMock(side_effect=Exception("Test error"))):
+            test_task_error.run()
+            QCoreApplication.processEvents()
 
-                error_spy_2.assert_called_once()
-                assert "Test error" in error_spy_2.call_args[0][0]
+            error_spy_2.assert_called_once()
+            assert "Test error" in error_spy_2.call_args[0][0]
 
     @async_test
     async def test_run_downloads_comprehensive(self) -> None:
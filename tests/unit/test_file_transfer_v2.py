@@ -0,0 +1,311 @@
+"""Tests for kernel file transfers and the sorters that use them."""
+
+import errno
+import os
+from pathlib import Path
+import random
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from goesvfi.utils import file_transfer
+from goesvfi.utils.file_transfer import TransferMode, copy_file, map_ordered, transfer_file
+
+# Import the GUI package first; the sorter modules are reached through it
+import goesvfi.gui  # noqa: F401  # isort: skip
+from goesvfi.date_sorter.sorter import DateSorter  # isort: skip
+from goesvfi.file_sorter.sorter import DuplicateMode, FileSorter  # isort: skip
+
+MTIME = 1_600_000_000.0
+
+
+def write(path: Path, content: bytes, mtime: float = MTIME) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def unsupported(*_args, **_kwargs):
+    raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+
+@pytest.fixture()
+def no_reflink(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(file_transfer, "_reflink", lambda src_fd, dst_fd: False)
+
+
+class TestCopyFile:
+    def test_copies_content_and_mtime(self, tmp_path: Path) -> None:
+        content = os.urandom(3 * 1024 * 1024 + 17)
+        source = write(tmp_path / "src.bin", content)
+
+        method = copy_file(source, tmp_path / "dst.bin", MTIME + 5)
+
+        assert method in {"reflink", "copy_file_range", "sendfile", "buffered"}
+        assert (tmp_path / "dst.bin").read_bytes() == content
+        assert (tmp_path / "dst.bin").stat().st_mtime == MTIME + 5
+
+    def test_defaults_to_copying_metadata(self, tmp_path: Path) -> None:
+        source = write(tmp_path / "src.bin", b"data")
+        source.chmod(0o640)
+
+        copy_file(source, tmp_path / "dst.bin")
+
+        assert (tmp_path / "dst.bin").stat().st_mtime == MTIME
+        assert (tmp_path / "dst.bin").stat().st_mode & 0o777 == 0o640
+
+    @pytest.mark.usefixtures("no_reflink")
+    def test_falls_back_when_kernel_copies_are_unsupported(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        source = write(tmp_path / "src.bin", b"x" * 100_000)
+
+        if hasattr(os, "copy_file_range"):
+            monkeypatch.setattr(os, "copy_file_range", unsupported)
+            if hasattr(os, "sendfile"):
+                assert copy_file(source, tmp_path / "a.bin") == "sendfile"
+        if hasattr(os, "sendfile"):
+            monkeypatch.setattr(os, "sendfile", unsupported)
+        assert copy_file(source, tmp_path / "b.bin", buffer_size=4096) == "buffered"
+        assert (tmp_path / "b.bin").read_bytes() == b"x" * 100_000
+
+    @pytest.mark.usefixtures("no_reflink")
+    @pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="needs copy_file_range")
+    def test_real_errors_are_raised(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        def no_space(*_args, **_kwargs):
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+        monkeypatch.setattr(os, "copy_file_range", no_space)
+
+        with pytest.raises(OSError, match="No space"):
+            copy_file(write(tmp_path / "src.bin", b"data"), tmp_path / "dst.bin")
+
+
+class TestTransferFile:
+    def test_hardlink_shares_the_inode(self, tmp_path: Path) -> None:
+        source = write(tmp_path / "src.bin", b"data")
+        dest = write(tmp_path / "out" / "dst.bin", b"old")
+
+        assert transfer_file(source, dest, TransferMode.HARDLINK) == "hardlink"
+        assert dest.stat().st_ino == source.stat().st_ino
+        assert dest.stat().st_mtime == MTIME
+        assert sorted(path.name for path in dest.parent.iterdir()) == ["dst.bin"]
+
+    def test_hardlink_falls_back_to_copy(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        source = write(tmp_path / "src.bin", b"data")
+        monkeypatch.setattr(os, "link", unsupported)
+
+        assert transfer_file(source, tmp_path / "dst.bin", TransferMode.HARDLINK, MTIME) != "hardlink"
+        assert (tmp_path / "dst.bin").read_bytes() == b"data"
+        assert (tmp_path / "dst.bin").stat().st_ino != source.stat().st_ino
+
+    def test_move_renames(self, tmp_path: Path) -> None:
+        source = write(tmp_path / "src.bin", b"data")
+
+        assert transfer_file(source, tmp_path / "dst.bin", TransferMode.MOVE) == "rename"
+        assert not source.exists()
+        assert (tmp_path / "dst.bin").stat().st_mtime == MTIME
+
+    def test_move_across_filesystems_copies_then_removes(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        source = write(tmp_path / "src.bin", b"data")
+        monkeypatch.setattr(os, "replace", unsupported)
+
+        transfer_file(source, tmp_path / "dst.bin", TransferMode.MOVE, MTIME)
+
+        assert not source.exists()
+        assert (tmp_path / "dst.bin").read_bytes() == b"data"
+        assert (tmp_path / "dst.bin").stat().st_mtime == MTIME
+
+
+class TestMapOrdered:
+    def test_yields_in_input_order(self) -> None:
+        def work(item: int) -> int:
+            time.sleep(random.uniform(0, 0.005))
+            return item * 2
+
+        results = [(item, future.result()) for item, future in map_ordered(work, range(50), max_workers=4)]
+
+        assert results == [(i, i * 2) for i in range(50)]
+
+    def test_consumes_items_lazily(self) -> None:
+        pulled = 0
+
+        def items():
+            nonlocal pulled
+            for i in range(100):
+                pulled += 1
+                yield i
+
+        for done, (item, _future) in enumerate(map_ordered(lambda item: item, items(), max_workers=2), 1):
+            assert pulled - done <= 4
+            assert item == done - 1
+
+    def test_same_key_items_run_in_order(self) -> None:
+        active: dict[int, int] = {}
+        overlaps = []
+        order = []
+        lock = threading.Lock()
+
+        def work(item: tuple[int, int]) -> None:
+            key, index = item
+            with lock:
+                active[key] = active.get(key, 0) + 1
+                overlaps.append(active[key])
+                order.append(item)
+            time.sleep(0.002)
+            with lock:
+                active[key] -= 1
+
+        items = [(i % 3, i) for i in range(30)]
+        list(map_ordered(work, items, max_workers=6, key=lambda item: item[0]))
+
+        assert max(overlaps) == 1
+        for key in range(3):
+            assert [index for k, index in order if k == key] == [index for k, index in items if k == key]
+
+    def test_errors_are_returned_with_their_item(self) -> None:
+        def work(item: int) -> int:
+            if item == 2:
+                raise ValueError(item)
+            return item
+
+        futures = dict(map_ordered(work, range(4), max_workers=2))
+
+        with pytest.raises(ValueError, match="2"):
+            futures[2].result()
+        assert futures[3].result() == 3
+
+
+class TestFileSorter:
+    @pytest.mark.parametrize("transfer_mode", [TransferMode.COPY, TransferMode.HARDLINK])
+    def test_sorts_with_ordered_progress(self, tmp_path: Path, transfer_mode: TransferMode) -> None:
+        source = tmp_path / "src"
+        for i in range(12):
+            write(source / f"2023-05-01_07-{i:02d}-00" / "goes16.png", f"frame {i}".encode(), MTIME + i)
+        progress = []
+
+        stats = FileSorter(transfer_mode=transfer_mode, max_workers=4).sort_files(
+            str(source), str(tmp_path / "dst"), progress_callback=lambda current, total: progress.append(current)
+        )
+
+        assert stats["files_copied"] == 12
+        frames = sorted((tmp_path / "dst" / "goes16").iterdir())
+        assert [frame.name for frame in frames][:2] == ["goes16_20230501T070000Z.png", "goes16_20230501T070100Z.png"]
+        assert frames[5].read_bytes() == b"frame 5"
+        assert frames[5].stat().st_mtime == MTIME + 5
+        # The last folders counted while walking, then one update per file in order
+        assert progress[-12:] == list(range(1, 13))
+
+    def test_identical_files_are_skipped(self, tmp_path: Path) -> None:
+        source = tmp_path / "src"
+        write(source / "2023-05-01_07-00-00" / "goes16.png", b"frame")
+        sorter = FileSorter()
+
+        sorter.sort_files(str(source), str(tmp_path / "dst"))
+        stats = sorter.sort_files(str(source), str(tmp_path / "dst"))
+
+        assert (stats["files_copied"], stats["files_skipped"]) == (0, 1)
+
+    @pytest.mark.parametrize(
+        ("duplicate_mode", "expected"),
+        [
+            (DuplicateMode.OVERWRITE, {"x_20230501T070000Z.png": b"second"}),
+            (DuplicateMode.SKIP, {"x_20230501T070000Z.png": b"first"}),
+            (DuplicateMode.RENAME, {"x_20230501T070000Z.png": b"first", "x_20230501T070000Z_1.png": b"second"}),
+        ],
+    )
+    def test_duplicates_within_one_run(
+        self, tmp_path: Path, duplicate_mode: DuplicateMode, expected: dict[str, bytes]
+    ) -> None:
+        # Named files keep their names, so both land on the same destination
+        source = tmp_path / "src"
+        write(source / "2023-05-01_07-00-00" / "x_20230501T070000Z.png", b"first", MTIME)
+        write(source / "2023-05-01_08-00-00" / "x_20230501T070000Z.png", b"second", MTIME + 100)
+
+        FileSorter(duplicate_mode=duplicate_mode, max_workers=4).sort_files(str(source), str(tmp_path / "dst"))
+
+        written = {path.name: path.read_bytes() for path in (tmp_path / "dst").rglob("*.png")}
+        assert written == expected
+
+    def test_file_errors_skip_the_file_and_sort_the_rest(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        source = tmp_path / "src"
+        for i in range(3):
+            write(source / f"2023-05-01_07-{i:02d}-00" / "goes16.png", f"frame {i}".encode())
+        sorter = FileSorter(max_workers=2)
+        plan_file = sorter._plan_file  # noqa: SLF001
+        transfer = file_transfer.transfer_file
+
+        def failing_plan(file_path: Path, folder_datetime: str, destination_dir: Path) -> Path | None:
+            if file_path.parent.name.endswith("01-00"):
+                msg = "database is locked"
+                raise sqlite3.OperationalError(msg)
+            return plan_file(file_path, folder_datetime, destination_dir)
+
+        def failing_transfer(source_path: Path, dest_path: Path, *args: object) -> None:
+            if source_path.parent.name.endswith("02-00"):
+                msg = "transfer failed"
+                raise RuntimeError(msg)
+            transfer(source_path, dest_path, *args)
+
+        monkeypatch.setattr(sorter, "_plan_file", failing_plan)
+        monkeypatch.setattr("goesvfi.file_sorter.sorter.transfer_file", failing_transfer)
+
+        stats = sorter.sort_files(str(source), str(tmp_path / "dst"))
+
+        assert (stats["files_copied"], stats["files_skipped"]) == (1, 2)
+        assert [path.name for path in (tmp_path / "dst" / "goes16").iterdir()] == ["goes16_20230501T070000Z.png"]
+
+    def test_dry_run_writes_nothing(self, tmp_path: Path) -> None:
+        source = tmp_path / "src"
+        write(source / "2023-05-01_07-00-00" / "goes16.png", b"frame")
+
+        stats = FileSorter(dry_run=True).sort_files(str(source), str(tmp_path / "dst"))
+
+        assert stats["files_copied"] == 0
+        assert list((tmp_path / "dst").iterdir()) == []
+
+
+class TestDateSorter:
+    def test_copies_like_copy2(self, tmp_path: Path) -> None:
+        source = tmp_path / "src"
+        for i in range(6):
+            write(source / f"sat_2023050{i + 1}T120000Z.png", f"{i}".encode(), MTIME + i).chmod(0o640)
+        progress = []
+
+        DateSorter(max_workers=3).sort_files(
+            str(source), str(tmp_path / "dst"), "%Y/%m/%d", lambda current, total: progress.append((current, total))
+        )
+
+        dest = tmp_path / "dst" / "2023" / "05" / "03" / "sat_20230503T120000Z.png"
+        assert dest.read_bytes() == b"2"
+        assert dest.stat().st_mtime == MTIME + 2
+        assert dest.stat().st_mode & 0o777 == 0o640
+        assert progress == [(i, 6) for i in range(1, 7)] + [(6, 6)]
+
+    def test_move_mode(self, tmp_path: Path) -> None:
+        source = write(tmp_path / "src" / "sat_20230501T120000Z.png", b"frame")
+
+        DateSorter(transfer_mode=TransferMode.MOVE).sort_files(str(source.parent), str(tmp_path / "dst"), "%Y-%m-%d")
+
+        assert not source.exists()
+        assert (tmp_path / "dst" / "2023-05-01" / source.name).stat().st_mtime == MTIME
+
+    def test_cancel_stops_before_remaining_files(self, tmp_path: Path) -> None:
+        source = tmp_path / "src"
+        for i in range(5):
+            write(source / f"sat_2023050{i + 1}T120000Z.png", b"frame")
+        calls = 0
+
+        def should_cancel() -> bool:
+            nonlocal calls
+            calls += 1
+            return calls > 2
+
+        DateSorter(max_workers=1).sort_files(
+            str(source), str(tmp_path / "dst"), "%Y-%m-%d", should_cancel=should_cancel
+        )
+
+        assert len(list((tmp_path / "dst").rglob("*.png"))) == 2
@@ -0,0 +1,90 @@
+"""Tests for the parallel scandir walker."""
+
+import os
+from pathlib import Path
+import threading
+
+import pytest
+
+from goesvfi.utils import file_walker
+from goesvfi.utils.file_walker import walk_files
+
+
+@pytest.fixture()
+def tree(tmp_path: Path) -> Path:
+    for rel in [
+        "a.png",
+        "notes.txt",
+        "2023/001/b.png",
+        "2023/001/c.PNG",
+        "2023/002/d.png",
+        "2024/e.png",
+        "skip/f.png",
+    ]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x")
+    return tmp_path
+
+
+def relpaths(root: Path, entries) -> set[str]:
+    return {Path(entry.path).relative_to(root).as_posix() for entry in entries}
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_walks_all_files(tree: Path, workers: int) -> None:
+    found = relpaths(tree, walk_files(tree, max_workers=workers))
+
+    assert found == {
+        "a.png",
+        "notes.txt",
+        "2023/001/b.png",
+        "2023/001/c.PNG",
+        "2023/002/d.png",
+        "2024/e.png",
+        "skip/f.png",
+    }
+
+
+def test_suffix_and_name_filters(tree: Path) -> None:
+    found = relpaths(tree, walk_files(tree, suffixes=(".png",), name_filter=lambda name: name != "d.png"))
+
+    assert found == {"a.png", "2023/001/b.png", "2024/e.png", "skip/f.png"}
+
+
+def test_dir_filter_and_depth_limits(tree: Path) -> None:
+    found = relpaths(tree, walk_files(tree, dir_filter=lambda name: name != "skip", min_depth=1, max_depth=1))
+
+    assert found == {"2024/e.png"}
+
+
+def test_symlinked_directories_are_not_followed(tree: Path) -> None:
+    os.symlink(tree / "2023", tree / "link")
+
+    found = relpaths(tree, walk_files(tree, suffixes=(".png",)))
+
+    assert not any(path.startswith("link/") for path in found)
+
+
+def test_entries_are_dir_entries(tree: Path) -> None:
+    entry = next(walk_files(tree, name_filter=lambda name: name == "a.png"))
+
+    assert isinstance(entry, os.DirEntry)
+    assert entry.is_file()
+
+
+def test_unreadable_directory_is_skipped(tree: Path) -> None:
+    assert list(walk_files(tree / "missing")) == []
+
+
+def test_closing_early_stops_pool(tree: Path, monkeypatch) -> None:
+    before = threading.active_count()
+    walker = walk_files(tree, max_workers=4)
+    next(walker)
+    walker.close()
+
+    for thread in threading.enumerate():
+        if thread.name.startswith("scandir"):
+            thread.join(timeout=5)
+    assert threading.active_count() <= before
+    assert file_walker.DEFAULT_WALK_WORKERS >= 1
@@ -0,0 +1,134 @@
+"""Tests for the fast filename timestamp parser."""
+
+from datetime import datetime, timedelta
+import re
+
+import numpy as np
+import pytest
+
+from goesvfi.utils.filename_timestamps import (
+    GOES_CDN,
+    GOES_START,
+    HYPHENATED,
+    ISO_COMPACT,
+    UNDERSCORED,
+    TimestampParser,
+    TimestampScheme,
+    parse_filename_timestamp,
+)
+
+# Names in a large archive listing
+LISTING_NAMES = 100_000
+
+START = datetime(2023, 1, 1)
+
+
+@pytest.mark.parametrize(
+    ("name", "expected", "scheme"),
+    [
+        (
+            "OR_ABI-L1b-RadF-M6C13_G16_s20231661200204_e20231661209512_c20231661209564.nc",
+            datetime(2023, 6, 15, 12, 0, 20),
+            GOES_START,
+        ),
+        ("image_G16_20230615T120000Z.png", datetime(2023, 6, 15, 12), ISO_COMPACT),
+        ("goes16_20230615_120000_band13.png", datetime(2023, 6, 15, 12), UNDERSCORED),
+        ("2024-12-21_18-00-22", datetime(2024, 12, 21, 18, 0, 22), HYPHENATED),
+        ("20243661200_GOES18-ABI-FD-13-5424x5424.jpg", datetime(2024, 12, 31, 12), GOES_CDN),
+    ],
+)
+def test_detects_each_scheme(name: str, expected: datetime, scheme: TimestampScheme) -> None:
+    parser = TimestampParser()
+
+    assert parser.parse(name) == expected
+    assert parser.scheme is scheme
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "random_file.png",
+        "image_G16_20230631T120000Z.png",  # 31 June
+        "image_G16_20230615T240000Z.png",  # hour 24
+        "OR_ABI-L1b-RadF-M6C13_G16_s20233661200204_e.nc",  # day 366 of a common year
+        "image_G16_120230615T120000Z.png",  # digits run into the timestamp
+        "image_G16_２０２３0615T120000Z.png",  # non-ASCII digits
+    ],
+)
+def test_rejects_invalid_names(name: str) -> None:
+    assert TimestampParser().parse(name) is None
+
+
+def test_remembered_position_is_used_without_regex(monkeypatch) -> None:
+    parser = TimestampParser()
+    parser.parse("goes16_20230615_120000_band13.png")
+    monkeypatch.setattr(UNDERSCORED, "regex", re.compile("(?!)"))
+
+    assert parser.parse("goes18_20230615_121000_band13.png") == datetime(2023, 6, 15, 12, 10)
+    # Same suffix, longer prefix: found counting from the end
+    assert parser.parse("longer_goes16_20230615_122000_band13.png") == datetime(2023, 6, 15, 12, 20)
+    # Neither end lines up, and detection is disabled
+    assert parser.parse("x_goes16_20230615_123000_band2.png") is None
+
+
+def test_falls_back_to_detection_when_scheme_changes() -> None:
+    parser = TimestampParser()
+    parser.parse("goes16_20230615_120000_band13.png")
+
+    assert parser.parse("2024-12-21_18-00-22") == datetime(2024, 12, 21, 18, 0, 22)
+    assert parser.scheme is HYPHENATED
+
+
+def test_invalid_layout_is_rejected() -> None:
+    with pytest.raises(ValueError, match="no complete date"):
+        TimestampScheme("time_only", "HHMMSS")
+
+
+def test_parse_many_matches_scalar_parse() -> None:
+    names = [
+        "image_G16_20230615T120000Z.png",
+        "image_G16_20230615T121000Z.png",
+        "image_G16_20230631T120000Z.png",
+        "notes.txt",
+        "goes16_20240229_235959_band13.png",
+        "image_G16_2023061xT120000Z.png",
+        "OR_ABI-L1b-RadF-M6C13_G16_s20240600000000_e.nc",
+    ]
+
+    values = TimestampParser().parse_many(names)
+
+    assert values.dtype == np.dtype("datetime64[s]")
+    expected = [TimestampParser().parse(name) for name in names]
+    assert [None if np.isnat(value) else value.astype(datetime) for value in values] == expected
+
+
+def test_parse_many_empty() -> None:
+    assert TimestampParser().parse_many([]).shape == (0,)
+
+
+def test_shared_parser() -> None:
+    assert parse_filename_timestamp("image_G16_20230615T120000Z.png") == datetime(2023, 6, 15, 12)
+
+
+def _listing_names(count: int) -> list[str]:
+    return [
+        f"OR_ABI-L1b-RadF-M6C13_G16_s{ts:%Y%j%H%M%S}0_e{ts:%Y%j%H%M%S}0_c{ts:%Y%j%H%M%S}0.nc"
+        for ts in (START + timedelta(minutes=10 * i) for i in range(count))
+    ]
+
+
+@pytest.mark.slow()
+class TestTimestampParserListing:
+    """Parsing a large archive listing matches regex plus strptime."""
+
+    def test_large_goes_listing(self) -> None:
+        names = _listing_names(LISTING_NAMES)
+        pattern = re.compile(r"_s(\d{13})")
+
+        baseline = [datetime.strptime(pattern.search(name).group(1), "%Y%j%H%M%S") for name in names]
+        parser = TimestampParser()
+        scalar = [parser.parse(name) for name in names]
+        batch = TimestampParser().parse_many(names)
+
+        assert scalar == baseline
+        assert batch.tolist() == baseline
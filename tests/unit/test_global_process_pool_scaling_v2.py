@@ -0,0 +1,151 @@
+"""Tests for resizing, priorities and lazy mapping in the global process pool."""
+
+from collections.abc import Iterator
+import itertools
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from goesvfi.core.global_process_pool import GlobalProcessPool, TaskPriority, _QueuedTask
+from goesvfi.pipeline.resource_manager import managed_executor
+from goesvfi.utils.memory_pressure import MemoryPressureBus, PressureLevel
+
+
+def double(x: int) -> int:
+    return x * 2
+
+
+def stamp(x: int, delay: float = 0.0) -> tuple[int, float]:
+    time.sleep(delay)
+    return x, time.monotonic()
+
+
+@pytest.fixture()
+def pool() -> Iterator[GlobalProcessPool]:
+    GlobalProcessPool._instance = None  # noqa: SLF001
+    pool = GlobalProcessPool()
+    yield pool
+    pool.cleanup()
+    GlobalProcessPool._instance = None  # noqa: SLF001
+
+
+def wait_until_running(pool: GlobalProcessPool, count: int) -> None:
+    deadline = time.monotonic() + 30
+    while pool.get_stats()["running_tasks"] < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_map_reads_its_input_lazily(pool: GlobalProcessPool) -> None:
+    pulled: list[int] = []
+
+    def numbers() -> Iterator[int]:
+        for number in range(100):
+            pulled.append(number)
+            yield number
+
+    results = pool.map(double, numbers(), max_in_flight=2)
+    assert next(results) == 0
+    # Two chunks submitted ahead, topped up by one as the first result came back
+    assert len(pulled) <= 3
+    results.close()
+
+    assert list(itertools.islice(pool.map(double, itertools.count(), chunksize=3), 5)) == [0, 2, 4, 6, 8]
+    assert list(pool.map(double, range(7), chunksize=3)) == [0, 2, 4, 6, 8, 10, 12]
+
+
+def test_interactive_tasks_are_dispatched_first(pool: GlobalProcessPool) -> None:
+    pool.resize(1)
+    blocker = pool.submit(stamp, -1, 0.5)
+    wait_until_running(pool, 1)
+
+    batch = [pool.submit_with_priority(TaskPriority.BATCH, stamp, i) for i in range(3)]
+    preview = pool.submit_with_priority(TaskPriority.INTERACTIVE, stamp, 99)
+
+    blocker.result(timeout=30)
+    preview_time = preview.result(timeout=30)[1]
+    assert all(preview_time < future.result(timeout=30)[1] for future in batch)
+
+
+def test_resizing_keeps_the_workers(pool: GlobalProcessPool) -> None:
+    pool.set_config("min_workers", 2)
+    executor_pids = {future.result(timeout=30) for future in [pool.submit(os.getpid) for _ in range(2)]}
+    executor = pool._executor  # noqa: SLF001
+
+    with pool.batch_context(1):
+        assert pool._worker_limit() == 1  # noqa: SLF001
+        assert pool.submit(os.getpid).result(timeout=30) in executor_pids
+    pool.resize(3)
+
+    assert pool._executor is executor  # noqa: SLF001
+    assert pool.submit(os.getpid).result(timeout=30) in executor_pids
+
+
+def test_managed_executor_shares_the_running_pool(pool: GlobalProcessPool) -> None:
+    with managed_executor("process", max_workers=1, check_resources=False) as executor:
+        assert executor is pool
+        assert list(executor.map(double, iter([1, 2]))) == [2, 4]
+    with managed_executor("process", check_resources=False) as executor:
+        assert executor is pool
+
+
+class TestScaling:
+    @pytest.fixture(autouse=True)
+    def _no_sampling_delay(self) -> Iterator[None]:
+        with (
+            patch("goesvfi.core.global_process_pool.LOAD_SAMPLE_INTERVAL", 0),
+            patch("goesvfi.core.global_process_pool.SCALE_INTERVAL", 0),
+        ):
+            yield
+
+    def scale(
+        self,
+        pool: GlobalProcessPool,
+        running: int,
+        queued: int,
+        cpu: float = 0.1,
+        memory: PressureLevel = PressureLevel.NORMAL,
+    ) -> int:
+        pool._running = running  # noqa: SLF001
+        pool._queue = [_QueuedTask(1, i, double, (), {}, None) for i in range(queued)]  # type: ignore[arg-type]  # noqa: SLF001
+        with (
+            patch.object(pool, "_cpu_load", return_value=cpu),
+            patch.object(pool, "_memory_level", return_value=memory),
+        ):
+            pool._check_scaling()  # noqa: SLF001
+        return pool.get_stats()["current_workers"]
+
+    def test_grows_with_the_queue_up_to_the_limit(self, pool: GlobalProcessPool) -> None:
+        pool.update_config({"max_workers": 4, "min_workers": 1})
+        assert self.scale(pool, running=0, queued=0) == 1
+        assert self.scale(pool, running=1, queued=1) == 2
+        assert self.scale(pool, running=2, queued=10) == 4
+
+    def test_does_not_grow_on_a_busy_machine(self, pool: GlobalProcessPool) -> None:
+        pool.update_config({"max_workers": 4, "min_workers": 1})
+        assert self.scale(pool, running=1, queued=5, cpu=0.95) == 1
+        assert self.scale(pool, running=1, queued=5, cpu=0.5) == 4
+
+    def test_shrinks_under_memory_pressure_or_when_work_runs_out(self, pool: GlobalProcessPool) -> None:
+        pool.update_config({"max_workers": 4, "min_workers": 1})
+        assert self.scale(pool, running=0, queued=8) == 4
+        assert self.scale(pool, running=4, queued=4, memory=PressureLevel.ELEVATED) == 3
+        assert self.scale(pool, running=4, queued=4, memory=PressureLevel.ELEVATED) == 2
+        assert self.scale(pool, running=4, queued=4, memory=PressureLevel.CRITICAL) == 1
+        assert self.scale(pool, running=1, queued=0) == 1
+
+    def test_fixed_size_without_auto_scale(self, pool: GlobalProcessPool) -> None:
+        pool.update_config({"max_workers": 3, "auto_scale": False})
+        assert self.scale(pool, running=0, queued=0, memory=PressureLevel.CRITICAL) == 3
+
+    def test_memory_level_does_not_take_readings(self, pool: GlobalProcessPool) -> None:
+        bus = MemoryPressureBus(monitor=MagicMock())
+        bus._level = PressureLevel.ELEVATED  # noqa: SLF001
+        with (
+            patch("goesvfi.core.global_process_pool.get_memory_pressure_bus", return_value=bus),
+            patch.object(bus, "update") as update,
+        ):
+            assert pool._memory_level() == PressureLevel.ELEVATED  # noqa: SLF001
+        update.assert_not_called()
@@ -181,8 +181,9 @@ class TestGlobalProcessPool(unittest.TestCase):
 
         # Use batch context with limited workers
         with pool.batch_context(max_concurrent=2):
-            # Should have limited workers
-            assert pool.get_config("max_workers") == min(2, original_max)
+            # Should have limited workers without changing the config
+            assert pool._worker_limit() == min(2, original_max)  # noqa: SLF001
+            assert pool.get_config("max_workers") == original_max
 
             # Submit tasks
             futures = [pool.submit(simple_task, i) for i in range(4)]
@@ -191,6 +192,27 @@ class TestGlobalProcessPool(unittest.TestCase):
 
         # Should restore original config
         assert pool.get_config("max_workers") == original_max
+        assert pool._worker_limit() == original_max  # noqa: SLF001
+
+    def test_overlapping_batch_contexts(self) -> None:
+        """Test that overlapping batches apply the smallest active limit."""
+        pool = get_global_process_pool()
+        self.pool = pool
+        pool.resize(4)
+
+        first = pool.batch_context(max_concurrent=2)
+        second = pool.batch_context(max_concurrent=3)
+        first.__enter__()
+        second.__enter__()
+        assert pool._worker_limit() == 2  # noqa: SLF001
+
+        # The first batch exits while the second is still running
+        first.__exit__(None, None, None)
+        assert pool._worker_limit() == 3  # noqa: SLF001
+
+        second.__exit__(None, None, None)
+        assert pool.get_config("max_workers") == 4
+        assert pool._worker_limit() == 4  # noqa: SLF001
 
     def test_process_pool_context(self) -> None:
         """Test process pool context manager."""
@@ -0,0 +1,176 @@
+"""Tests for content-hash duplicate detection and its SQLite cache."""
+
+import json
+import os
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from goesvfi.file_sorter import hash_cache as hash_cache_mod
+from goesvfi.file_sorter.hash_cache import HashCache, find_duplicates, hash_file
+
+# Import the GUI package first; the sorter module is reached through it
+import goesvfi.gui  # noqa: F401  # isort: skip
+from goesvfi.file_sorter.sorter import DuplicateMode, FileSorter, main  # isort: skip
+
+MTIME = 1_600_000_000.0
+
+
+def write(path: Path, content: bytes, mtime: float = MTIME) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture()
+def cache(tmp_path: Path):
+    with HashCache(tmp_path / "hashes.db") as hash_cache:
+        yield hash_cache
+
+
+def test_hash_file_streams_chunks(tmp_path: Path) -> None:
+    content = os.urandom(100_000)
+    path = write(tmp_path / "a.bin", content)
+
+    assert hash_file(path, chunk_size=4096) == hash_file(path)
+    assert hash_file(path) != hash_file(write(tmp_path / "b.bin", content[:-1] + b"\0"))
+
+
+def test_unchanged_files_are_not_rehashed(tmp_path: Path, cache: HashCache) -> None:
+    path = write(tmp_path / "a.bin", b"data")
+    digest = cache.hash(path)
+    cache.close()
+
+    with HashCache(tmp_path / "hashes.db") as reopened, patch.object(hash_cache_mod, "hash_file") as rehash:
+        assert reopened.hash(path) == digest
+        rehash.assert_not_called()
+        assert (reopened.hits, reopened.misses) == (1, 0)
+
+
+@pytest.mark.parametrize("change", ["mtime", "inode"])
+def test_changed_files_are_rehashed(tmp_path: Path, cache: HashCache, change: str) -> None:
+    path = write(tmp_path / "a.bin", b"data")
+    digest = cache.hash(path)
+
+    if change == "mtime":
+        os.utime(path, (MTIME + 10, MTIME + 10))
+    else:
+        # Replaced by a file of the same size and mtime, as a re-download might leave it
+        write(tmp_path / "b.bin", b"new!").replace(path)
+
+    assert cache.get(path) is None
+    assert (cache.hash(path) != digest) == (change == "inode")
+    assert cache.misses == 2
+
+
+def test_same_content_ignores_mtime(tmp_path: Path, cache: HashCache) -> None:
+    first = write(tmp_path / "a.bin", b"data", MTIME)
+    assert cache.same_content(first, write(tmp_path / "b.bin", b"data", MTIME + 3600))
+    assert not cache.same_content(first, write(tmp_path / "c.bin", b"diff", MTIME))
+    with patch.object(hash_cache_mod, "hash_file") as rehash:
+        assert not cache.same_content(first, write(tmp_path / "d.bin", b"longer"))
+        rehash.assert_not_called()
+
+
+def test_prune_removes_missing_files(tmp_path: Path, cache: HashCache) -> None:
+    kept, removed = write(tmp_path / "a.bin", b"a"), write(tmp_path / "b.bin", b"b")
+    cache.hash(kept)
+    cache.hash(removed)
+    removed.unlink()
+
+    assert cache.prune() == 1
+    assert cache.get(kept) is not None
+
+
+def test_find_duplicates_reports_groups(tmp_path: Path, cache: HashCache) -> None:
+    write(tmp_path / "a" / "1.png", b"same")
+    write(tmp_path / "b" / "1.png", b"same")
+    write(tmp_path / "b" / "2.png", b"same")
+    write(tmp_path / "b" / "3.png", b"diff")
+    write(tmp_path / "b" / "unique.png", b"different size")
+    write(tmp_path / "b" / "empty.png", b"")
+    write(tmp_path / "b" / "empty2.png", b"")
+
+    report = find_duplicates(tmp_path, cache, suffixes=(".png",))
+
+    assert report.files_scanned == 7
+    # Only files sharing a size are hashed; empty files are ignored
+    assert report.files_hashed == 4
+    assert [group.paths for group in report.groups] == [
+        [tmp_path / "a" / "1.png", tmp_path / "b" / "1.png", tmp_path / "b" / "2.png"]
+    ]
+    assert (report.duplicate_files, report.wasted_bytes) == (2, 8)
+    assert "2 duplicates in 1 groups" in report.summary()
+    assert json.loads(json.dumps(report.to_dict()))["groups"][0]["size"] == 4
+
+    # A second report reads every hash from the cache
+    assert find_duplicates(tmp_path, cache, suffixes=(".png",)).cache_hits == 4
+
+
+class TestVerifiedSort:
+    @staticmethod
+    def sort(source: Path, dest: Path, cache: HashCache, **kwargs) -> dict:
+        sorter = FileSorter(verify_content=True, hash_cache=cache, **kwargs)
+        return sorter.sort_files(str(source), str(dest))
+
+    def test_redownload_with_same_size_and_mtime_is_copied(self, tmp_path: Path, cache: HashCache) -> None:
+        frame = write(tmp_path / "src" / "2023-05-01_07-00-00" / "goes16.png", b"old frame")
+        dest = tmp_path / "dst" / "goes16" / "goes16_20230501T070000Z.png"
+        self.sort(frame.parent.parent, tmp_path / "dst", cache)
+
+        write(frame, b"new frame")
+        unverified = FileSorter().sort_files(str(frame.parent.parent), str(tmp_path / "dst"))
+        assert (unverified["files_copied"], dest.read_bytes()) == (0, b"old frame")
+
+        stats = self.sort(frame.parent.parent, tmp_path / "dst", cache)
+        assert (stats["files_copied"], dest.read_bytes()) == (1, b"new frame")
+
+    def test_identical_content_with_new_mtime_is_skipped(self, tmp_path: Path, cache: HashCache) -> None:
+        frame = write(tmp_path / "src" / "2023-05-01_07-00-00" / "goes16.png", b"frame")
+        self.sort(frame.parent.parent, tmp_path / "dst", cache)
+        os.utime(frame, (MTIME + 3600, MTIME + 3600))
+
+        stats = self.sort(frame.parent.parent, tmp_path / "dst", cache)
+
+        assert (stats["files_copied"], stats["files_skipped"]) == (0, 1)
+
+    def test_rename_mode_does_not_rename_twice(self, tmp_path: Path, cache: HashCache) -> None:
+        source = tmp_path / "src"
+        write(source / "2023-05-01_07-00-00" / "x_20230501T070000Z.png", b"first")
+        write(source / "2023-05-01_08-00-00" / "x_20230501T070000Z.png", b"second")
+
+        self.sort(source, tmp_path / "dst", cache, duplicate_mode=DuplicateMode.RENAME)
+        stats = self.sort(source, tmp_path / "dst", cache, duplicate_mode=DuplicateMode.RENAME)
+
+        assert (stats["files_copied"], stats["files_skipped"]) == (0, 2)
+        assert sorted(path.name for path in (tmp_path / "dst").rglob("*.png")) == [
+            "x_20230501T070000Z.png",
+            "x_20230501T070000Z_1.png",
+        ]
+
+    def test_default_cache_is_opened_and_closed(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(hash_cache_mod, "default_hash_cache_path", lambda: tmp_path / "default.db")
+        frame = write(tmp_path / "src" / "2023-05-01_07-00-00" / "goes16.png", b"frame")
+        sorter = FileSorter(verify_content=True)
+
+        sorter.sort_files(str(frame.parent.parent), str(tmp_path / "dst"))
+        sorter.sort_files(str(frame.parent.parent), str(tmp_path / "dst"))
+
+        assert sorter.hash_cache is None
+        with HashCache(tmp_path / "default.db") as default_cache:
+            assert default_cache.get(tmp_path / "dst" / "goes16" / "goes16_20230501T070000Z.png") is not None
+
+
+def test_cli_dedup_report(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    write(tmp_path / "a.png", b"same")
+    write(tmp_path / "b.png", b"same")
+    argv = ["sorter", str(tmp_path), "--dedup-report", "--hash-cache", str(tmp_path / "cache" / "hashes.db")]
+
+    with patch.object(sys, "argv", argv):
+        main()
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["groups"][0]["paths"] == [str(tmp_path / "a.png"), str(tmp_path / "b.png")]
@@ -0,0 +1,165 @@
+"""Tests for the SQLite batch job store and the queue's use of it."""
+
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+import sqlite3
+import threading
+from unittest.mock import MagicMock
+
+from PyQt6.QtCore import Qt
+import pytest
+
+from goesvfi.pipeline.batch_queue import BatchJob, BatchQueue, JobPriority, JobResources, JobStatus
+from goesvfi.pipeline.job_store import JobStore
+
+
+def make_job(job_id: str, priority: JobPriority = JobPriority.NORMAL, minutes: int = 0, **kwargs: object) -> BatchJob:
+    return BatchJob(
+        id=job_id,
+        name=f"Job {job_id}",
+        input_path=Path(f"/data/{job_id}"),
+        output_path=Path(f"/out/{job_id}.mp4"),
+        settings={"fps": 30},
+        priority=priority,
+        created_at=datetime(2024, 1, 1) + timedelta(minutes=minutes),
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def make_queue(store: JobStore, process: MagicMock | None = None) -> BatchQueue:
+    return BatchQueue(
+        process or MagicMock(),
+        job_store=store,
+        resource_estimator=lambda job: JobResources(1),
+    )
+
+
+@pytest.fixture()
+def store(tmp_path: Path) -> JobStore:
+    with JobStore(tmp_path / "batch_queue.db") as job_store:
+        yield job_store
+
+
+class TestJobStore:
+    def test_jobs_are_read_in_priority_order_in_batches(self, store: JobStore) -> None:
+        store.put_many([
+            make_job("low", JobPriority.LOW, 0),
+            make_job("normal-late", JobPriority.NORMAL, 5),
+            make_job("urgent", JobPriority.URGENT, 9),
+            make_job("normal-early", JobPriority.NORMAL, 1),
+            make_job("high", JobPriority.HIGH, 3),
+        ])
+
+        ids = [data["id"] for data in store.iter_jobs(batch_size=2)]
+
+        assert ids == ["urgent", "high", "normal-early", "normal-late", "low"]
+
+    def test_round_trip_and_status_filter(self, store: JobStore) -> None:
+        done = make_job("done", status=JobStatus.COMPLETED, run_seconds=12.5)
+        store.put_many([make_job("pending"), done])
+
+        loaded = [BatchJob.from_dict(data) for data in store.iter_jobs([JobStatus.COMPLETED])]
+
+        assert loaded == [done]
+        assert store.count() == 2
+        assert store.count(JobStatus.PENDING) == 1
+
+    def test_status_transition_is_conditional(self, store: JobStore) -> None:
+        job = make_job("job")
+        store.put(job)
+
+        job.status = JobStatus.RUNNING
+        assert store.update(job, JobStatus.PENDING)
+        # A second writer that still thinks the job is pending loses
+        job.status = JobStatus.CANCELLED
+        assert not store.update(job, JobStatus.PENDING)
+        assert not store.update(make_job("missing"))
+
+        (data,) = store.iter_jobs()
+        assert data["status"] == "RUNNING"
+
+    def test_delete(self, store: JobStore) -> None:
+        store.put_many([make_job("a"), make_job("b"), make_job("c")])
+
+        assert store.delete(["a", "c", "missing"]) == 2
+        assert [data["id"] for data in store.iter_jobs()] == ["b"]
+
+    def test_wal_mode_and_indexes(self, store: JobStore, tmp_path: Path) -> None:
+        conn = sqlite3.connect(tmp_path / "batch_queue.db")
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT data FROM jobs WHERE status = 'PENDING' ORDER BY priority, created_at"
+            ).fetchall()
+        finally:
+            conn.close()
+        assert "jobs_by_status" in " ".join(str(row[-1]) for row in plan)
+
+
+class TestQueuePersistence:
+    def test_running_jobs_resume_as_pending(self, store: JobStore) -> None:
+        interrupted = make_job("interrupted", status=JobStatus.RUNNING, progress=40.0, started_at=datetime(2024, 1, 2))
+        store.put_many([
+            interrupted,
+            make_job("waiting", JobPriority.HIGH),
+            make_job("failed", status=JobStatus.FAILED),
+        ])
+
+        queue = make_queue(store)
+
+        assert [job.id for job in queue.get_pending_jobs()] == ["waiting", "interrupted"]
+        job = queue.get_job("interrupted")
+        assert job is not None
+        assert (job.status, job.started_at, job.progress) == (JobStatus.PENDING, None, 0.0)
+        assert queue.get_job("failed").status == JobStatus.FAILED  # type: ignore[union-attr]
+        assert store.count(JobStatus.RUNNING) == 0
+
+    def test_transitions_are_written_per_job(self, store: JobStore) -> None:
+        process = MagicMock(side_effect=[None, RuntimeError("boom")])
+        queue = make_queue(store, process)
+        done = threading.Event()
+        queue.queue_empty.connect(done.set, Qt.ConnectionType.DirectConnection)
+        queue.add_job(make_job("ok", minutes=0))
+        queue.add_job(make_job("bad", minutes=1))
+        queue.add_job(make_job("cancelled", JobPriority.LOW, minutes=2))
+        assert queue.cancel_job("cancelled")
+
+        queue.start()
+        assert done.wait(20)
+        queue.stop()
+
+        stored = {data["id"]: data for data in store.iter_jobs()}
+        assert {job_id: data["status"] for job_id, data in stored.items()} == {
+            "ok": "COMPLETED",
+            "bad": "FAILED",
+            "cancelled": "CANCELLED",
+        }
+        assert stored["bad"]["error_message"] == "boom"
+        assert "progress_callback" not in stored["ok"]["settings"]
+
+        assert queue.clear_completed() == 2
+        assert [data["id"] for data in store.iter_jobs()] == ["bad"]
+
+    def test_legacy_queue_file_is_imported_once(self, tmp_path: Path) -> None:
+        legacy_file = tmp_path / "batch_queue.json"
+        jobs = [make_job("old-running", status=JobStatus.RUNNING), make_job("old-pending", minutes=1)]
+        legacy_file.write_text(json.dumps({"jobs": [job.to_dict() for job in jobs]}))
+
+        with JobStore(tmp_path / "batch_queue.db") as job_store:
+            queue = make_queue(job_store)
+            assert [job.id for job in queue.get_pending_jobs()] == ["old-running", "old-pending"]
+
+        assert not legacy_file.exists()
+        assert (tmp_path / "batch_queue.json.migrated").exists()
+        with JobStore(tmp_path / "batch_queue.db") as job_store:
+            assert job_store.count(JobStatus.PENDING) == 2
+
+    def test_store_errors_are_logged_not_raised(self, tmp_path: Path) -> None:
+        job_store = JobStore(tmp_path / "batch_queue.db")
+        queue = make_queue(job_store)
+        queue.add_job(make_job("job"))
+        job_store.close()
+
+        assert queue.cancel_job("job")
+        assert queue.get_job("job").status == JobStatus.CANCELLED  # type: ignore[union-attr]
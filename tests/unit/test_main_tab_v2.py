@@ -459,3 +459,45 @@ class TestMainTabOptimizedV2:
         assert main_tab.rife_uhd_checkbox.isChecked()
         assert main_tab.sanchez_false_colour_checkbox.isChecked()
         assert main_tab.sanchez_res_combo.currentText() == "2"
+
+
+def test_rife_models_are_analyzed_on_first_use(tmp_path: Path) -> None:
+    """Model executables are probed when a model is first used rather than while the tab is built."""
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    rife_exe = tmp_path / "rife-cli"
+    rife_exe.write_text("")
+    details = {"version": "4.6", "capabilities": {"uhd": True}, "supported_args": [], "help_text": ""}
+
+    def create_tab() -> MainTab:
+        return MainTab(
+            main_view_model=MagicMock(),
+            image_loader=MagicMock(),
+            sanchez_processor=MagicMock(),
+            image_cropper=MagicMock(),
+            settings=MagicMock(spec=QSettings),
+            request_previews_update_signal=MagicMock(),
+            main_window_ref=MagicMock(),
+        )
+
+    with (
+        patch("goesvfi.gui_tabs.main_tab.get_available_rife_models", return_value=["rife-v4.6"]),
+        patch("goesvfi.gui_tabs.main_tab.get_cache_dir", return_value=tmp_path),
+        patch("goesvfi.utils.config.find_rife_executable", return_value=rife_exe),
+        patch("goesvfi.utils.rife_analyzer.analyze_rife_executable", return_value=details) as analyze,
+    ):
+        tab = create_tab()
+        analyze.assert_not_called()
+        assert tab.rife_model_combo.itemText(0) == "rife-v4.6"
+        assert not tab.rife_uhd_checkbox.isEnabled()
+
+        tab.encoder_combo.setCurrentText("RIFE")
+        assert tab._validate_encoder_and_model() == ("RIFE", "rife-v4.6")  # noqa: SLF001
+        tab._on_model_activated(0)  # noqa: SLF001
+
+        analyze.assert_called_once_with(rife_exe)
+        assert tab.rife_model_combo.itemText(0) == "rife-v4.6 (v4.6)"
+        assert tab.rife_uhd_checkbox.isEnabled()
+
+        # The next start reads the analysis from the cache
+        assert create_tab().rife_model_combo.itemText(0) == "rife-v4.6 (v4.6)"
+        analyze.assert_called_once()
@@ -0,0 +1,278 @@
+"""Tests for memory pressure levels and the caches and queues that react to them."""
+
+from datetime import datetime
+from pathlib import Path
+import threading
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PyQt6.QtCore import Qt
+import pytest
+
+from goesvfi.core.global_process_pool import GlobalProcessPool
+from goesvfi.pipeline.batch_queue import BatchJob, BatchQueue, JobPriority, JobResources
+from goesvfi.pipeline.job_store import JobStore
+from goesvfi.pipeline.optimized_interpolator import ImageCache
+from goesvfi.pipeline.resource_manager import ResourceCapacity
+from goesvfi.utils.image_processing.cache import CacheManager
+from goesvfi.utils.image_processing.refactored_preview import RefactoredPreviewProcessor
+from goesvfi.utils.memory_manager import MemoryStats
+from goesvfi.utils.memory_pressure import MemoryPressureBus, PressureLevel, container_memory_stats
+
+MB = 1024 * 1024
+NORMAL = MemoryStats(total_mb=16000, available_mb=8000, percent_used=50.0)
+ELEVATED = MemoryStats(total_mb=16000, available_mb=1600, percent_used=90.0)
+CRITICAL = MemoryStats(total_mb=16000, available_mb=100, percent_used=99.0)
+
+
+def write_cgroup(directory: Path, limit: str, current: int, inactive_file: int = 0) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "memory.max").write_text(f"{limit}\n")
+    (directory / "memory.current").write_text(f"{current}\n")
+    (directory / "memory.stat").write_text(f"anon {current}\ninactive_file {inactive_file}\nactive_file 0\n")
+
+
+@pytest.fixture()
+def bus(tmp_path: Path) -> MemoryPressureBus:
+    # No cgroup, so the readings given are used as they are
+    return MemoryPressureBus(monitor=MagicMock(), proc_cgroup=tmp_path / "missing")
+
+
+class TestContainerMemory:
+    def test_uses_the_cgroup_limit_without_reclaimable_cache(self, tmp_path: Path) -> None:
+        write_cgroup(tmp_path / "cgroup" / "docker" / "abc", "max", 0)
+        write_cgroup(tmp_path / "cgroup" / "docker", str(1024 * MB), 900 * MB, inactive_file=100 * MB)
+        (tmp_path / "cgroup.proc").write_text("0::/docker/abc\n")
+
+        stats = container_memory_stats(tmp_path / "cgroup", tmp_path / "cgroup.proc")
+
+        assert stats is not None
+        assert (stats.total_mb, stats.used_mb, stats.available_mb) == (1024, 800, 224)
+        assert stats.percent_used == pytest.approx(78.125)
+        assert stats.is_low_memory
+
+    def test_namespaced_cgroup_is_the_root(self, tmp_path: Path) -> None:
+        write_cgroup(tmp_path / "cgroup", str(2048 * MB), 100 * MB)
+        (tmp_path / "cgroup.proc").write_text("0::/\n")
+
+        stats = container_memory_stats(tmp_path / "cgroup", tmp_path / "cgroup.proc")
+
+        assert stats is not None
+        assert stats.available_mb == 1948
+
+    def test_no_limit_or_no_cgroup_v2(self, tmp_path: Path) -> None:
+        write_cgroup(tmp_path / "cgroup", "max", 100 * MB)
+        (tmp_path / "cgroup.proc").write_text("0::/\n")
+        assert container_memory_stats(tmp_path / "cgroup", tmp_path / "cgroup.proc") is None
+
+        (tmp_path / "cgroup.proc").write_text("4:memory:/docker/abc\n")
+        assert container_memory_stats(tmp_path / "cgroup", tmp_path / "cgroup.proc") is None
+        assert container_memory_stats(tmp_path / "cgroup", tmp_path / "missing") is None
+
+
+class FakeCache:
+    def __init__(self) -> None:
+        self.budgets: list[float] = []
+
+    def set_memory_budget(self, fraction: float) -> int:
+        self.budgets.append(fraction)
+        return 0
+
+
+class TestMemoryPressureBus:
+    def test_levels_rise_at_once_and_fall_after_recovery(self, bus: MemoryPressureBus) -> None:
+        levels: list[PressureLevel] = []
+        bus.subscribe(levels.append)
+        cache = FakeCache()
+        bus.register_cache(cache)
+
+        assert bus.update(ELEVATED) == PressureLevel.ELEVATED
+        assert bus.update(CRITICAL) == PressureLevel.CRITICAL
+        assert bus.update(NORMAL) == PressureLevel.CRITICAL
+        assert bus.update(NORMAL) == PressureLevel.CRITICAL
+        assert bus.update(NORMAL) == PressureLevel.NORMAL
+
+        assert levels == [PressureLevel.ELEVATED, PressureLevel.CRITICAL, PressureLevel.NORMAL]
+        assert cache.budgets == [0.5, 0.0, 1.0]
+
+    def test_a_reading_at_the_level_restarts_recovery(self, bus: MemoryPressureBus) -> None:
+        bus.update(ELEVATED)
+        for stats in (NORMAL, NORMAL, ELEVATED, NORMAL, NORMAL):
+            assert bus.update(stats) == PressureLevel.ELEVATED
+        assert bus.update(NORMAL) == PressureLevel.NORMAL
+
+    def test_container_limit_replaces_system_memory(self, tmp_path: Path) -> None:
+        write_cgroup(tmp_path / "cgroup", str(1024 * MB), 1000 * MB)
+        (tmp_path / "cgroup.proc").write_text("0::/\n")
+        bus = MemoryPressureBus(
+            monitor=MagicMock(), cgroup_root=tmp_path / "cgroup", proc_cgroup=tmp_path / "cgroup.proc"
+        )
+
+        assert bus.update(NORMAL) == PressureLevel.CRITICAL
+        assert bus.stats is not None
+        assert bus.stats.total_mb == 1024
+
+    def test_late_registration_gets_the_current_budget(self, bus: MemoryPressureBus) -> None:
+        bus.update(ELEVATED)
+        cache = FakeCache()
+        bus.register_cache(cache)
+        assert cache.budgets == [0.5]
+
+    def test_subscribers_are_held_weakly(self, bus: MemoryPressureBus) -> None:
+        cache = FakeCache()
+        bus.subscribe(cache.set_memory_budget)
+        bus.register_cache(FakeCache())
+        del cache
+
+        bus.update(CRITICAL)  # Doesn't call anything that was collected
+
+        levels: list[PressureLevel] = []
+        bus.subscribe(levels.append)
+        bus.unsubscribe(levels.append)
+        bus.update(ELEVATED)
+        bus.update(ELEVATED)
+        bus.update(ELEVATED)
+        assert levels == []
+
+    def test_admission_waits_while_critical(self, bus: MemoryPressureBus) -> None:
+        bus.recovery_readings = 1
+        bus.update(CRITICAL)
+        assert not bus.wait_for_admission(timeout=0.01)
+
+        timer = threading.Timer(0.05, bus.update, (NORMAL,))
+        timer.start()
+        assert bus.wait_for_admission(timeout=10)
+        timer.join()
+
+    def test_start_attaches_to_the_monitor(self, bus: MemoryPressureBus) -> None:
+        bus.start(interval=0.5)
+        bus.start(interval=0.5)
+        bus.monitor.add_callback.assert_called_once_with(bus.update)
+        bus.monitor.start_monitoring.assert_called_with(interval=0.5)
+
+
+class TestCachesShrinkToBudget:
+    def test_image_cache(self, bus: MemoryPressureBus) -> None:
+        with patch("goesvfi.pipeline.optimized_interpolator.get_memory_pressure_bus", return_value=bus):
+            cache = ImageCache(max_size=4)
+        images = [np.full((2, 2), i, dtype=np.float32) for i in range(4)]
+        for image in images:
+            cache.put(image, image)
+        assert cache.get(images[0]) is not None  # Now the most recently used
+
+        bus.update(ELEVATED)
+        assert cache.get_stats()["size"] == 2
+        assert cache.get(images[0]) is not None
+        assert cache.get(images[1]) is None
+
+        bus.update(CRITICAL)
+        cache.put(images[1], images[1])
+        assert cache.get_stats()["size"] == 0
+
+    def test_cache_manager(self, bus: MemoryPressureBus) -> None:
+        with patch("goesvfi.utils.image_processing.cache.get_memory_pressure_bus", return_value=bus):
+            cache = CacheManager(max_cache_size=10)
+        for key in "abcdefghij":
+            cache.put(key, key)
+
+        assert cache.set_memory_budget(0.3) == 7
+        assert [key for key in "abcdefghij" if cache.contains(key)] == ["h", "i", "j"]
+        cache.put("k", "k")
+        assert cache.size() == 3
+
+        cache.set_memory_budget(1.0)
+        cache.put("l", "l")
+        assert cache.size() == 4
+
+    def test_sanchez_preview_cache(self, bus: MemoryPressureBus) -> None:
+        sanchez_cache: dict[Path, Any] = {Path(f"{i}.png"): i for i in range(6)}
+        with patch("goesvfi.utils.image_processing.refactored_preview.get_memory_pressure_bus", return_value=bus):
+            processor = RefactoredPreviewProcessor(sanchez_cache, max_entries=4)
+
+        bus.update(ELEVATED)
+
+        assert sanchez_cache == {Path("4.png"): 4, Path("5.png"): 5}
+        assert processor.set_memory_budget(0.0) == 2
+        assert sanchez_cache == {}
+
+
+class TestAdmission:
+    def test_process_pool_pauses_when_critical(self, bus: MemoryPressureBus) -> None:
+        GlobalProcessPool._instance = None  # noqa: SLF001
+        pool = GlobalProcessPool()
+        pool.update_config({"max_workers": 4, "min_workers": 2})
+        pool._running = 3  # noqa: SLF001
+        pool._queue = [MagicMock()] * 5  # noqa: SLF001
+        try:
+            with (
+                patch("goesvfi.core.global_process_pool.get_memory_pressure_bus", return_value=bus),
+                patch("goesvfi.core.global_process_pool.LOAD_SAMPLE_INTERVAL", 0),
+                patch.object(pool, "_cpu_load", return_value=0.0),
+            ):
+                bus.update(CRITICAL)
+                pool._check_scaling()  # noqa: SLF001
+                # Nothing more is dispatched until the running tasks are down to one
+                assert pool.get_stats()["current_workers"] == 1
+        finally:
+            pool._queue = []  # noqa: SLF001
+            GlobalProcessPool._instance = None  # noqa: SLF001
+
+    def test_batch_queue_holds_jobs_and_preempts_while_critical(self, bus: MemoryPressureBus, tmp_path: Path) -> None:
+        started: list[str] = []
+        release = threading.Event()
+
+        def process(job: BatchJob) -> None:
+            started.append(job.id)
+            while not release.wait(0.01):
+                if job.settings["should_stop"]():
+                    from goesvfi.pipeline.batch_queue import JobPreempted
+
+                    raise JobPreempted
+
+        manager = MagicMock()
+        manager.get_capacity.return_value = ResourceCapacity(memory_limit_mb=4096, available_memory_mb=0, cpus=4)
+        queue = BatchQueue(
+            process,
+            max_concurrent_jobs=3,
+            resource_manager=manager,
+            job_store=JobStore(":memory:"),
+            resource_estimator=lambda job: JobResources(1),
+            memory_pressure=bus,
+        )
+        preempted = threading.Event()
+        queue.job_preempted.connect(lambda _job_id: preempted.set(), Qt.ConnectionType.DirectConnection)
+
+        def job(job_id: str, priority: JobPriority) -> BatchJob:
+            return BatchJob(
+                job_id, job_id, tmp_path, tmp_path / f"{job_id}.mp4", {}, priority, created_at=datetime(2024, 1, 1)
+            )
+
+        queue.add_job(job("high", JobPriority.HIGH))
+        queue.add_job(job("low", JobPriority.LOW))
+        queue.start()
+        try:
+            for _ in range(500):
+                if len(started) == 2:
+                    break
+                threading.Event().wait(0.01)
+            assert sorted(started) == ["high", "low"]
+
+            bus.update(CRITICAL)
+            assert preempted.wait(10)
+            queue.add_job(job("new", JobPriority.URGENT))
+            threading.Event().wait(0.2)
+            assert started.count("low") == 1
+            assert "new" not in started
+
+            bus.recovery_readings = 1
+            bus.update(NORMAL)
+            for _ in range(500):
+                if "new" in started and started.count("low") == 2:
+                    break
+                threading.Event().wait(0.01)
+            assert "new" in started
+            assert started.count("low") == 2
+        finally:
+            release.set()
+            queue.close()
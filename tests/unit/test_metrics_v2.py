@@ -0,0 +1,203 @@
+"""Tests for the metrics registry, its collectors and the /metrics exporter."""
+
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+import urllib.error
+import urllib.request
+
+import pytest
+
+from goesvfi import cli
+from goesvfi.core.global_process_pool import GlobalProcessPool
+from goesvfi.integrity_check.remote.s3_utils.download_stats import DownloadStatsTracker
+from goesvfi.pipeline.batch_queue import BatchJob, BatchQueue
+from goesvfi.pipeline.job_store import JobStore
+from goesvfi.utils.image_processing.cache import CacheManager
+from goesvfi.utils.memory_pressure import MemoryPressureBus
+from goesvfi.utils.metrics import (
+    CACHE_REQUESTS,
+    CONTENT_TYPE,
+    REGISTRY,
+    MetricFamily,
+    MetricsRegistry,
+    MetricsServer,
+    start_metrics_server,
+    stop_metrics_server,
+)
+
+
+def record_frames(count: int) -> int:
+    REGISTRY.counter("goes_vfi_test_worker_frames_total", "Frames counted in a worker").inc(count)
+    return count
+
+
+def sample(text: str, line_start: str) -> float:
+    """Get the value of the first sample line starting with ``line_start``."""
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    msg = f"No sample starting with {line_start!r} in:\n{text}"
+    raise AssertionError(msg)
+
+
+class TestRegistry:
+    def test_renders_the_text_format(self) -> None:
+        registry = MetricsRegistry()
+        frames = registry.counter("frames_total", "Frames done", ("stage",))
+        frames.inc(stage="rife")
+        frames.inc(2, stage="rife")
+        registry.gauge("queue_size", "Jobs waiting").set(4)
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value)
+
+        assert registry.render() == (
+            "# HELP frames_total Frames done\n"
+            "# TYPE frames_total counter\n"
+            'frames_total{stage="rife"} 3.0\n'
+            "# HELP queue_size Jobs waiting\n"
+            "# TYPE queue_size gauge\n"
+            "queue_size 4.0\n"
+            "# HELP latency_seconds Latency\n"
+            "# TYPE latency_seconds histogram\n"
+            'latency_seconds_bucket{le="0.1"} 1.0\n'
+            'latency_seconds_bucket{le="1.0"} 2.0\n'
+            'latency_seconds_bucket{le="+Inf"} 3.0\n'
+            "latency_seconds_sum 5.55\n"
+            "latency_seconds_count 3.0\n"
+        )
+
+    def test_escapes_label_values(self) -> None:
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors", ("message",)).inc(message='say "hi"\\\n')
+        assert 'errors_total{message="say \\"hi\\"\\\\\\n"} 1.0' in registry.render()
+
+    def test_metrics_are_registered_once(self) -> None:
+        registry = MetricsRegistry()
+        counter = registry.counter("done_total", "Done", ("stage",))
+        assert registry.counter("done_total", "Done", ("stage",)) is counter
+        with pytest.raises(ValueError, match="already registered"):
+            registry.gauge("done_total", "Done")
+        with pytest.raises(ValueError, match="takes labels"):
+            counter.inc(step="rife")
+        with pytest.raises(ValueError, match="only be increased"):
+            counter.inc(-1, stage="rife")
+
+    def test_collectors_are_reported_and_failures_skipped(self) -> None:
+        registry = MetricsRegistry()
+
+        def pool() -> Iterator[MetricFamily]:
+            yield MetricFamily("pool_workers", "gauge", "Workers", [("", {"pool": "a"}, 2.0)])
+
+        def other_pool() -> Iterator[MetricFamily]:
+            yield MetricFamily("pool_workers", "gauge", "Workers", [("", {"pool": "b"}, 3.0)])
+
+        def broken() -> Iterator[MetricFamily]:
+            raise RuntimeError
+
+        for collector in (pool, broken, other_pool):
+            registry.register_collector(collector)
+        text = registry.render()
+
+        assert text.count("# TYPE pool_workers gauge") == 1
+        assert sample(text, 'pool_workers{pool="b"}') == 3.0
+
+        registry.unregister_collector(other_pool)
+        assert 'pool="b"' not in registry.render()
+
+    def test_drained_values_merge_into_another_registry(self) -> None:
+        worker, parent = MetricsRegistry(), MetricsRegistry()
+        for registry in (worker, parent):
+            registry.counter("frames_total", "Frames", ("stage",))
+            registry.histogram("latency_seconds", "Latency", buckets=(1.0,))
+            registry.gauge("workers", "Workers")
+        worker.counter("frames_total", "Frames", ("stage",)).inc(2, stage="sanchez")
+        worker.histogram("latency_seconds", "Latency", buckets=(1.0,)).observe(0.5)
+        worker.gauge("workers", "Workers").set(3)
+        parent.counter("frames_total", "Frames", ("stage",)).inc(stage="sanchez")
+
+        parent.merge(worker.drain())
+
+        assert parent.counter("frames_total", "Frames", ("stage",)).value(stage="sanchez") == 3
+        assert parent.histogram("latency_seconds", "Latency", buckets=(1.0,)).count() == 1
+        assert parent.gauge("workers", "Workers").value() == 0
+        assert worker.drain() == {}
+
+
+class TestMetricsServer:
+    def test_scrape(self) -> None:
+        registry = MetricsRegistry()
+        registry.counter("scrapes_total", "Scrapes").inc()
+        server = MetricsServer(registry, port=0)
+        server.start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=10) as response:  # noqa: S310
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                assert sample(response.read().decode(), "scrapes_total") == 1.0
+            with pytest.raises(urllib.error.HTTPError, match="404"):
+                urllib.request.urlopen(f"http://127.0.0.1:{server.port}/other", timeout=10)  # noqa: S310
+        finally:
+            server.stop()
+
+    def test_cli_option_starts_the_server(self, tmp_path: Path) -> None:
+        (tmp_path / "source").mkdir()
+        try:
+            assert (
+                cli.main(["--metrics-port", "0", "sort", "files", str(tmp_path / "source"), str(tmp_path), "--dry-run"])
+                == 0
+            )
+            server = start_metrics_server(0)  # The one already running
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=10) as response:  # noqa: S310
+                assert "goes_vfi_cache_hit_ratio" in response.read().decode()
+        finally:
+            stop_metrics_server()
+
+
+class TestApplicationMetrics:
+    def test_cache_hit_ratio(self) -> None:
+        cache = CacheManager(max_cache_size=4)
+        cache.put("a", 1)
+        hits = CACHE_REQUESTS.value(cache="image_processing", result="hit")
+        misses = CACHE_REQUESTS.value(cache="image_processing", result="miss")
+
+        cache.get("a")
+        cache.get("missing")
+
+        text = REGISTRY.render()
+        assert sample(text, 'goes_vfi_cache_requests_total{cache="image_processing",result="hit"}') == hits + 1
+        assert sample(text, 'goes_vfi_cache_hit_ratio{cache="image_processing"}') == (hits + 1) / (hits + misses + 2)
+
+    def test_components_report_their_stats(self, tmp_path: Path) -> None:
+        tracker = DownloadStatsTracker()
+        tracker.update_attempt(success=True, download_time=2.0, file_size=4000)
+        tracker.update_attempt(success=False, error_type="timeout", error_message="slow")
+        queue = BatchQueue(
+            lambda job: None,
+            job_store=JobStore(":memory:"),
+            memory_pressure=MemoryPressureBus(proc_cgroup=tmp_path / "missing"),
+        )
+        queue.add_job(BatchJob("job", "job", tmp_path, tmp_path / "out.mp4", {}, created_at=datetime(2024, 1, 1)))
+        try:
+            text = REGISTRY.render()
+        finally:
+            queue.close()
+
+        assert sample(text, "goes_vfi_download_bytes_total") >= 4000
+        assert sample(text, 'goes_vfi_download_errors_total{type="timeout"}') >= 1
+        assert sample(text, "goes_vfi_processing_queue_size") >= 1
+        assert "process_resident_memory_bytes" in text
+
+    def test_worker_metrics_reach_the_pool_process(self) -> None:
+        GlobalProcessPool._instance = None  # noqa: SLF001
+        pool = GlobalProcessPool()
+        counter = REGISTRY.counter("goes_vfi_test_worker_frames_total", "Frames counted in a worker")
+        before = counter.value()
+        try:
+            assert pool.submit(record_frames, 3).result(timeout=60) == 3
+            assert list(pool.map(record_frames, [1, 1])) == [1, 1]
+            assert counter.value() == before + 5
+            assert sample(REGISTRY.render(), "goes_vfi_process_pool_tasks_total") >= 2
+        finally:
+            pool.cleanup()
+            GlobalProcessPool._instance = None  # noqa: SLF001
@@ -0,0 +1,186 @@
+"""Tests for reading run_vfi frames directly from NetCDF files."""
+
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import io
+import pathlib
+import pickle
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image
+import pytest
+import xarray as xr
+
+from goesvfi.integrity_check.render.netcdf import render_array
+from goesvfi.pipeline import run_vfi as run_vfi_mod
+from goesvfi.pipeline.netcdf_frame_source import NetCDFFrameSource, find_netcdf_inputs
+
+from tests.utils.mocks import create_mock_popen
+
+
+def write_netcdf(path: pathlib.Path, rad: np.ndarray) -> pathlib.Path:
+    xr.Dataset({"Rad": (["y", "x"], rad.astype(np.float32)), "band_id": np.int8(13)}).to_netcdf(path)
+    return path
+
+
+def radiance(rows: int = 48, cols: int = 64, seed: int = 0) -> np.ndarray:
+    """Brightness temperatures (no Planck attributes) spanning more than the default range."""
+    return np.random.default_rng(seed).uniform(150, 350, size=(rows, cols)).astype(np.float32)
+
+
+@pytest.fixture()
+def netcdf_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    folder = tmp_path / "nc"
+    folder.mkdir()
+    for i in range(3):
+        write_netcdf(folder / f"frame_{i}.nc", radiance(seed=i))
+    return folder
+
+
+@contextlib.contextmanager
+def thread_executor(_kind: str, max_workers: int | None = None):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        yield executor
+
+
+def test_window_read_matches_crop_of_full_frame(tmp_path: pathlib.Path) -> None:
+    path = write_netcdf(tmp_path / "full.nc", radiance())
+
+    full = render_array(path)
+    assert full.shape == (48, 64, 3)
+    np.testing.assert_array_equal(render_array(path, window=(10, 5, 30, 20)), full[5:25, 10:40])
+
+
+def test_stride_downscales_after_crop(tmp_path: pathlib.Path) -> None:
+    path = write_netcdf(tmp_path / "full.nc", radiance())
+
+    assert render_array(path, stride=4).shape == (12, 16, 3)
+    assert render_array(path, window=(0, 0, 32, 24), stride=2).shape == (12, 16, 3)
+    with pytest.raises(ValueError, match="stride"):
+        render_array(path, stride=0)
+
+
+def test_window_outside_image_is_rejected(tmp_path: pathlib.Path) -> None:
+    path = write_netcdf(tmp_path / "full.nc", radiance())
+
+    with pytest.raises(ValueError, match="outside"):
+        render_array(path, window=(60, 0, 10, 10))
+
+
+def test_find_netcdf_inputs(tmp_path: pathlib.Path, netcdf_dir: pathlib.Path) -> None:
+    assert find_netcdf_inputs(netcdf_dir) == [netcdf_dir / f"frame_{i}.nc" for i in range(3)]
+
+    # PNG folders keep the existing path
+    Image.new("RGB", (4, 4)).save(netcdf_dir / "frame.png")
+    assert find_netcdf_inputs(netcdf_dir) is None
+    assert find_netcdf_inputs(tmp_path / "empty") is None
+
+    files = [tmp_path / "b.nc", tmp_path / "a.nc"]
+    assert find_netcdf_inputs(files) == files
+    with pytest.raises(ValueError, match="Not a NetCDF file"):
+        find_netcdf_inputs([tmp_path / "a.png"])
+
+
+def test_source_decodes_on_access(netcdf_dir: pathlib.Path) -> None:
+    paths = sorted(netcdf_dir.glob("*.nc"))
+    source = NetCDFFrameSource(paths, crop_rect_xywh=(8, 8, 32, 16), stride=2, colormap="viridis")
+
+    assert len(source) == 3
+    tail = source[1:]
+    assert isinstance(tail, NetCDFFrameSource)
+    assert tail.paths == tuple(paths[1:])
+    np.testing.assert_array_equal(tail[0], source[1])
+    assert source[0].shape == (8, 16, 3)
+    assert [frame.shape for frame in pickle.loads(pickle.dumps(source))] == [(8, 16, 3)] * 3
+
+
+def test_run_vfi_streams_netcdf_frames_without_model(tmp_path: pathlib.Path, netcdf_dir: pathlib.Path) -> None:
+    output = tmp_path / "out.mp4"
+    popen = create_mock_popen(output_file_to_create=output.with_suffix(".raw.mp4"))
+    processes = []
+
+    def start(*args, **kwargs):
+        processes.append(popen(*args, **kwargs))
+        return processes[-1]
+
+    with (
+        patch.object(run_vfi_mod.subprocess, "Popen", side_effect=start),
+        patch.object(run_vfi_mod.VFIImageProcessor, "process_single_image") as process_png,
+    ):
+        results = list(
+            run_vfi_mod.run_vfi(
+                folder=netcdf_dir,
+                output_mp4_path=output,
+                rife_exe_path=tmp_path / "rife",
+                fps=10,
+                num_intermediate_frames=1,
+                max_workers=1,
+                crop_rect_xywh=(0, 0, 32, 24),
+                skip_model=True,
+                netcdf_stride=2,
+            )
+        )
+
+    assert results[-1] == output.with_suffix(".raw.mp4")
+    assert results[-2] == (3, 3, 0.0)
+    process_png.assert_not_called()
+    frames = [Image.open(io.BytesIO(call.args[0])) for call in processes[0].stdin.write.call_args_list]
+    assert [frame.size for frame in frames] == [(16, 12)] * 3
+    expected = render_array(netcdf_dir / "frame_1.nc", window=(0, 0, 32, 24), stride=2)
+    np.testing.assert_array_equal(np.asarray(frames[1]), expected)
+
+
+def test_run_vfi_interpolates_netcdf_file_list(tmp_path: pathlib.Path, netcdf_dir: pathlib.Path) -> None:
+    output = tmp_path / "out.mp4"
+    paths = [netcdf_dir / "frame_2.nc", netcdf_dir / "frame_0.nc"]
+    popen = create_mock_popen(output_file_to_create=output.with_suffix(".raw.mp4"))
+    processes = []
+    pairs = []
+
+    def start(*args, **kwargs):
+        processes.append(popen(*args, **kwargs))
+        return processes[-1]
+
+    def rife_pair(p1_path, p2_path, rife_exe_path, rife_config):
+        pairs.append((np.asarray(Image.open(p1_path)), np.asarray(Image.open(p2_path))))
+        interpolated = tmp_path / "interpolated.png"
+        Image.open(p1_path).save(interpolated)
+        return interpolated
+
+    with (
+        patch.object(run_vfi_mod.subprocess, "Popen", side_effect=start),
+        patch.object(run_vfi_mod, "managed_executor", thread_executor),
+        patch.object(run_vfi_mod, "run_rife_pair", side_effect=rife_pair),
+    ):
+        results = list(
+            run_vfi_mod.run_vfi(
+                folder=paths,
+                output_mp4_path=output,
+                rife_exe_path=tmp_path / "rife",
+                fps=10,
+                num_intermediate_frames=1,
+                max_workers=1,
+            )
+        )
+
+    assert results[-1] == output.with_suffix(".raw.mp4")
+    # The list order is kept
+    np.testing.assert_array_equal(pairs[0][0], render_array(paths[0]))
+    np.testing.assert_array_equal(pairs[0][1], render_array(paths[1]))
+    # First frame, interpolated frame, second frame
+    assert processes[0].stdin.write.call_count == 3
+
+
+def test_run_vfi_requires_two_netcdf_files_to_interpolate(tmp_path: pathlib.Path, netcdf_dir: pathlib.Path) -> None:
+    with pytest.raises(ValueError, match="At least 2 NetCDF files required for interpolation"):
+        list(
+            run_vfi_mod.run_vfi(
+                folder=[netcdf_dir / "frame_0.nc"],
+                output_mp4_path=tmp_path / "out.mp4",
+                rife_exe_path=tmp_path / "rife",
+                fps=10,
+                num_intermediate_frames=1,
+                max_workers=1,
+            )
+        )
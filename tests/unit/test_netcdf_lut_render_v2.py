@@ -0,0 +1,195 @@
+"""Tests for the lookup-table NetCDF renderer."""
+
+from pathlib import Path
+import warnings
+
+import numpy as np
+from PIL import Image
+import pytest
+import xarray as xr
+
+from goesvfi.integrity_check.render import netcdf
+from goesvfi.integrity_check.render.netcdf import (
+    INVALID_RGB,
+    LUT_SIZE,
+    _colormap_lut,  # noqa: PLC2701
+    _get_colormap,  # noqa: PLC2701
+    _lut_indices,  # noqa: PLC2701
+    render_png,
+)
+
+PLANCK = {"planck_fk1": 10803.3, "planck_fk2": 1392.74, "planck_bc1": 0.0755, "planck_bc2": 0.99975}
+
+
+def write_band13(path: Path, height: int = 120, width: int = 160, seed: int = 0) -> Path:
+    """Write a small packed Band 13 file with a block of fill values."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    rad = 40 + 60 * (np.sin(x / 19.0) * np.cos(y / 13.0) + 1) + rng.normal(0, 2, (height, width))
+    rad = rad.astype(np.float32)
+    rad[10:20, 30:50] = np.nan
+    ds = xr.Dataset({"Rad": (["y", "x"], rad), "band_id": np.int8(13)}, attrs=PLANCK)
+    ds.to_netcdf(
+        path, encoding={"Rad": {"dtype": "int16", "scale_factor": 0.0354, "add_offset": -1.0, "_FillValue": -1}}
+    )
+    return path
+
+
+def matplotlib_reference(path: Path, colormap: str) -> np.ndarray:
+    """Render ``path`` as the matplotlib figure pipeline did."""
+    import matplotlib as mpl
+
+    mpl.use("Agg")
+    import matplotlib.pyplot as plt
+
+    with xr.open_dataset(path) as ds:
+        data = netcdf._convert_radiance_to_temperature(  # noqa: SLF001
+            ds["Rad"].values, ds, netcdf.DEFAULT_MIN_TEMP_K, netcdf.DEFAULT_MAX_TEMP_K
+        )
+    data = np.ma.masked_invalid(data)
+    out = path.with_suffix(".mpl.png")
+    fig = plt.figure(figsize=(data.shape[1] / 100, data.shape[0] / 100), dpi=100)
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.axis("off")
+    ax.imshow(data, cmap=_get_colormap(colormap), aspect="auto")
+    plt.savefig(out, dpi=100, bbox_inches="tight", pad_inches=0)
+    plt.close(fig)
+    return np.asarray(Image.open(out).convert("RGB")).astype(int)
+
+
+@pytest.mark.parametrize("colormap", ["gray", "viridis"])
+def test_matches_matplotlib_rendering(tmp_path: Path, colormap: str) -> None:
+    nc_path = write_band13(tmp_path / "band13.nc")
+    expected = matplotlib_reference(nc_path, colormap)
+
+    rendered = np.asarray(Image.open(render_png(nc_path, tmp_path / "out.png", colormap=colormap))).astype(int)
+
+    assert rendered.shape == expected.shape
+    # Float rounding may move a value at a bin edge into the neighbouring entry
+    diff = np.abs(rendered - expected)
+    assert diff.max() <= 8
+    assert (diff > 0).mean() < 0.01
+
+
+def test_invalid_pixels_are_white(tmp_path: Path) -> None:
+    nc_path = write_band13(tmp_path / "band13.nc")
+
+    pixels = np.asarray(Image.open(render_png(nc_path, tmp_path / "out.png", colormap="viridis")))
+
+    assert (pixels[10:20, 30:50] == INVALID_RGB).all()
+    assert not (pixels[:10] == INVALID_RGB).all(axis=-1).any()
+
+
+def test_invalid_values_map_to_no_data_index_without_warnings() -> None:
+    data = np.array([[np.nan, 0.0], [0.5, 1.0]], dtype=np.float32)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        indices = _lut_indices(data)
+
+    assert indices.tolist() == [[LUT_SIZE, 0], [LUT_SIZE // 2, LUT_SIZE - 1]]
+
+
+def test_lut_is_cached_and_read_only() -> None:
+    lut = _colormap_lut("gray")
+
+    assert _colormap_lut("gray") is lut
+    assert lut.shape == (LUT_SIZE + 1, 3)
+    assert not lut.flags.writeable
+    assert tuple(lut[0]) == (0, 0, 0)
+    assert tuple(lut[LUT_SIZE - 1]) == (255, 255, 255)
+
+
+def test_gray_table_matches_matplotlib_colormap() -> None:
+    expected = (_get_colormap("gray")(np.linspace(0, 1, LUT_SIZE))[:, :3] * 255).astype(np.uint8)
+
+    assert np.array_equal(_colormap_lut("gray")[:LUT_SIZE], expected)
+
+
+def test_downsampled_render_keeps_full_resolution_colour_scale(tmp_path: Path) -> None:
+    nc_path = write_band13(tmp_path / "band13.nc", height=240, width=320)
+    full = Image.open(render_png(nc_path, tmp_path / "full.png")).resize((80, 60), Image.Resampling.LANCZOS)
+
+    small = Image.open(render_png(nc_path, tmp_path / "small.png", resolution=(80, 60)))
+
+    assert small.size == (80, 60)
+    diff = np.abs(np.asarray(small).astype(int) - np.asarray(full).astype(int))
+    assert np.median(diff) <= 2
+
+
+def test_downsampling_reads_blocks(tmp_path: Path) -> None:
+    nc_path = write_band13(tmp_path / "band13.nc", height=240, width=320)
+
+    with xr.open_dataset(nc_path, cache=False) as ds:
+        data, extremes = netcdf._read_radiance(ds, (80, 60))  # noqa: SLF001
+        full, no_extremes = netcdf._read_radiance(ds, None)  # noqa: SLF001
+
+    assert data.shape == (120, 160)
+    assert data.dtype == np.float32
+    assert no_extremes is None
+    assert extremes[0] == np.nanmin(full)
+    assert extremes[1] == np.nanmax(full)
+    assert data[0, 0] == pytest.approx(full[:2, :2].mean(), rel=1e-6)
+
+
+def write_temperatures(path: Path, height: int = 120, width: int = 160, **encoding) -> Path:
+    """Write brightness temperatures (no Planck attributes) spanning more than the default range."""
+    rng = np.random.default_rng(0)
+    rad = rng.uniform(150, 350, size=(height, width)).astype(np.float32)
+    xr.Dataset({"Rad": (["y", "x"], rad), "band_id": np.int8(13)}).to_netcdf(path, encoding={"Rad": encoding})
+    return path
+
+
+def test_window_reads_only_the_crop(tmp_path: Path) -> None:
+    nc_path = write_band13(tmp_path / "band13.nc")
+
+    with xr.open_dataset(nc_path, cache=False) as ds:
+        full, _ = netcdf._read_radiance(ds, None)  # noqa: SLF001
+        window, _ = netcdf._read_radiance(ds, None, (30, 10, 40, 20))  # noqa: SLF001
+        small, _ = netcdf._read_radiance(ds, (10, 5), (30, 10, 40, 20))  # noqa: SLF001
+
+    assert window.shape == (20, 40)
+    np.testing.assert_array_equal(window, full[10:30, 30:70])
+    assert small.shape == (10, 20)
+
+
+def test_window_render_matches_crop_of_full_render(tmp_path: Path) -> None:
+    nc_path = write_temperatures(tmp_path / "band13.nc")
+    full = np.asarray(Image.open(render_png(nc_path, tmp_path / "full.png")))
+
+    cropped = Image.open(render_png(nc_path, tmp_path / "crop.png", window=(30, 10, 40, 20)))
+
+    assert cropped.size == (40, 20)
+    np.testing.assert_array_equal(np.asarray(cropped), full[10:30, 30:70])
+
+
+def test_window_render_of_chunked_file_matches_crop(tmp_path: Path) -> None:
+    # Chunked and compressed like GOES L1b files, with the window straddling chunks
+    nc_path = write_temperatures(
+        tmp_path / "band13.nc", height=600, width=600, zlib=True, complevel=1, chunksizes=(226, 226)
+    )
+    full = np.asarray(Image.open(render_png(nc_path, tmp_path / "full.png")))
+
+    cropped = Image.open(render_png(nc_path, tmp_path / "crop.png", window=(200, 200, 100, 100)))
+
+    np.testing.assert_array_equal(np.asarray(cropped), full[200:300, 200:300])
+
+
+def test_window_colours_span_the_temperature_range(tmp_path: Path) -> None:
+    # A uniform 250 K window sits in the middle of the grey scale, not at its end
+    rad = np.full((20, 20), 250.0, dtype=np.float32)
+    nc_path = tmp_path / "uniform.nc"
+    xr.Dataset({"Rad": (["y", "x"], rad)}).to_netcdf(nc_path)
+
+    rgb = np.asarray(Image.open(render_png(nc_path, tmp_path / "out.png", window=(0, 0, 10, 10))))
+
+    assert rgb.shape == (10, 10, 3)
+    assert np.all(rgb == rgb[0, 0])
+    assert 100 < rgb[0, 0, 0] < 155
+
+
+def test_window_outside_image_is_rejected(tmp_path: Path) -> None:
+    nc_path = write_band13(tmp_path / "band13.nc")
+
+    with pytest.raises(ValueError, match="outside"):
+        render_png(nc_path, tmp_path / "out.png", window=(150, 0, 20, 20))
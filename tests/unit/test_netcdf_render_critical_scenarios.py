@@ -199,17 +199,16 @@ class TestNetCDFRenderCritical:
                 gc.collect()
 
                 # Test rendering with large file
-                with patch("goesvfi.integrity_check.render.netcdf._create_figure") as mock_create:
-                    start_time = time.time()
-                    result_path = render_png(nc_path, png_path)
-                    end_time = time.time()
+                start_time = time.time()
+                result_path = render_png(nc_path, png_path)
+                end_time = time.time()
 
-                    # Verify rendering completed
-                    assert result_path == png_path
-                    mock_create.assert_called_once()
+                # Verify rendering completed
+                assert result_path == png_path
+                assert png_path.stat().st_size > 0
 
-                    # Performance check - should complete within reasonable time
-                    assert end_time - start_time < 30.0, "Large file rendering took too long"
+                # Performance check - should complete within reasonable time
+                assert end_time - start_time < 30.0, "Large file rendering took too long"
 
                 # Force garbage collection
                 gc.collect()
@@ -358,15 +357,13 @@ class TestNetCDFRenderCritical:
 
             dataset.to_netcdf(nc_path)
 
-            # Mock figure creation to avoid actual file I/O
-            with patch("goesvfi.integrity_check.render.netcdf._create_figure"):
-                start_time = time.time()
-                result_path = render_png(nc_path, png_path)
-                end_time = time.time()
+            start_time = time.time()
+            result_path = render_png(nc_path, png_path)
+            end_time = time.time()
 
-                # Verify basic functionality
-                assert result_path == png_path
-                assert end_time - start_time < 10.0
+            # Verify basic functionality
+            assert result_path == png_path
+            assert end_time - start_time < 10.0
 
     def test_planck_function_numerical_stability(self) -> None:
         """Test numerical stability of Planck function with edge cases."""
@@ -456,9 +453,9 @@ class TestNetCDFRenderCritical:
 
                 output_path = readonly_dir / "output.png"
 
-                # Should handle permission error gracefully
-                with patch("goesvfi.integrity_check.render.netcdf._create_figure") as mock_create:
-                    mock_create.side_effect = PermissionError("Permission denied")
+                # Should handle permission error gracefully (root ignores the mode bits)
+                with patch("PIL.Image.Image.save") as mock_save:
+                    mock_save.side_effect = PermissionError("Permission denied")
 
                     with pytest.raises(PermissionError):
                         render_png(nc_path, output_path)
@@ -479,8 +476,7 @@ class TestNetCDFRenderCritical:
 
             dataset.to_netcdf(nc_path)
 
-            with patch("goesvfi.integrity_check.render.netcdf._create_figure"):
-                render_png(nc_path, png_path)
+            render_png(nc_path, png_path)
 
             # Extract metadata once
             metadata = extract_metadata(nc_path)
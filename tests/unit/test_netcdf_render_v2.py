@@ -8,6 +8,7 @@ from typing import Any
 from unittest.mock import MagicMock, patch
 
 import numpy as np
+from PIL import Image
 import pytest
 import xarray as xr
 
@@ -250,12 +251,10 @@ class TestNetCDFRenderV2:  # noqa: PLR0904
             extract_metadata(Path("/nonexistent/file.nc"))
 
     @patch("xarray.open_dataset")
-    @patch("goesvfi.integrity_check.render.netcdf._create_figure")
     @patch("pathlib.Path.exists", return_value=True)
     def test_render_png_success_comprehensive(
         self,
         mock_exists: Any,  # noqa: ARG002
-        mock_create_figure: Any,
         mock_open_dataset: Any,
         temp_dir: Any,
         mock_dataset: Any,
@@ -270,7 +269,9 @@ class TestNetCDFRenderV2:  # noqa: PLR0904
         render_png(nc_path, png_path)
 
         mock_open_dataset.assert_called_once()
-        mock_create_figure.assert_called_once()
+        with Image.open(png_path) as image:
+            assert image.mode == "RGB"
+            assert image.size == (500, 500)
 
         # Test with custom parameters
         render_png(nc_path, png_path, min_temp_k=200.0, max_temp_k=300.0)
@@ -286,8 +287,7 @@ class TestNetCDFRenderV2:  # noqa: PLR0904
 
         mock_open_dataset.return_value.__enter__.return_value = mock_dataset
 
-        with patch("goesvfi.integrity_check.render.netcdf._create_figure"):
-            render_png(temp_dir / "test.nc", temp_dir / "test.png")
+        render_png(temp_dir / "test.nc", temp_dir / "test.png")
 
     def test_render_png_error_scenarios(self, temp_dir: Any, mock_dataset: Any) -> None:
         """Test various error scenarios in render_png."""
@@ -300,8 +300,8 @@ class TestNetCDFRenderV2:  # noqa: PLR0904
             mock_open.return_value.__enter__.return_value = mock_dataset
 
             # Should handle invalid output path
-            with patch("goesvfi.integrity_check.render.netcdf._create_figure") as mock_fig:
-                mock_fig.side_effect = OSError("Cannot write file")
+            with patch("PIL.Image.Image.save") as mock_save:
+                mock_save.side_effect = OSError("Cannot write file")
 
                 # Use a valid but non-writable path within temp_dir
                 bad_path = temp_dir / "nonexistent_dir" / "test.png"
@@ -329,8 +329,7 @@ class TestNetCDFRenderV2:  # noqa: PLR0904
         mock_ds.attrs = {}  # No Planck constants
 
         # This should succeed now since band validation is skipped when band_id is missing
-        with patch("goesvfi.integrity_check.render.netcdf._create_figure"):
-            render_png(temp_dir / "test.nc", temp_dir / "test.png")
+        render_png(temp_dir / "test.nc", temp_dir / "test.png")
 
     @patch("xarray.open_dataset")
     @patch("pathlib.Path.exists", return_value=True)
@@ -359,7 +358,7 @@ class TestNetCDFRenderV2:  # noqa: PLR0904
 
     def test_concurrent_rendering(self, temp_dir: Any, mock_dataset: Any) -> None:
         """Test concurrent rendering operations."""
-        with patch("xarray.open_dataset") as mock_open, patch("goesvfi.integrity_check.render.netcdf._create_figure"):
+        with patch("xarray.open_dataset") as mock_open:
             mock_open.return_value.__enter__.return_value = mock_dataset
 
             # Create test files
@@ -400,9 +399,11 @@ class TestNetCDFRenderV2:  # noqa: PLR0904
 
             mock_open.return_value.__enter__.return_value = mock_dataset
 
-            with patch("goesvfi.integrity_check.render.netcdf._create_figure"):
-                # Should handle large data without memory errors
-                render_png(temp_dir / "large.nc", temp_dir / "large.png")
+            # Should handle large data without memory errors
+            render_png(temp_dir / "large.nc", temp_dir / "large.png", resolution=(1000, 1000))
+
+        with Image.open(temp_dir / "large.png") as image:
+            assert image.size == (1000, 1000)
 
     def test_planck_constants_validation(self, mock_dataset: Any) -> None:  # noqa: PLR6301
         """Test validation of Planck constants."""
@@ -450,21 +451,20 @@ class TestNetCDFRenderV2:  # noqa: PLR0904
             assert isinstance(temps_data, np.ndarray)
             assert not np.any(np.isnan(temps_data))
 
-    @patch("matplotlib.pyplot.savefig")
     @patch("xarray.open_dataset")
     @patch("pathlib.Path.exists", return_value=True)
     def test_figure_creation_options(
-        self, mock_exists: Any, mock_open_dataset: Any, mock_savefig: Any, temp_dir: Any, mock_dataset: Any
+        self, mock_exists: Any, mock_open_dataset: Any, temp_dir: Any, mock_dataset: Any
     ) -> None:  # noqa: ARG002
-        """Test figure creation with various options."""
+        """Test image output with various options."""
         mock_open_dataset.return_value.__enter__.return_value = mock_dataset
 
-        # Test with different DPI settings
-        with patch("goesvfi.integrity_check.render.netcdf._create_figure") as mock_create:
-            render_png(temp_dir / "test.nc", temp_dir / "test.png")
+        # Test with different DPI settings and a resize
+        render_png(temp_dir / "test.nc", temp_dir / "test.png", dpi=150, resolution=(200, 100))
 
-            # Verify figure creation parameters
-            mock_create.assert_called_once()
+        with Image.open(temp_dir / "test.png") as image:
+            assert image.size == (200, 100)
+            assert round(image.info["dpi"][0]) == 150
 
     def test_edge_cases(self) -> None:  # noqa: PLR6301
         """Test various edge cases."""
@@ -532,8 +532,8 @@ class TestNetCDFRenderV2:  # noqa: PLR0904
 
             # Test rendering
             png_path = temp_dir / "realistic.png"
-            with patch("goesvfi.integrity_check.render.netcdf._create_figure"):
-                render_png(nc_path, png_path)
+            render_png(nc_path, png_path)
+            assert png_path.exists()
         finally:
             # Clean up
             if nc_path.exists():
@@ -567,8 +567,7 @@ class TestNetCDFRenderV2:  # noqa: PLR0904
 
         mock_open_dataset.return_value = mock_context
 
-        with patch("goesvfi.integrity_check.render.netcdf._create_figure"):
-            render_png(temp_dir / "test.nc", temp_dir / "test.png")
+        render_png(temp_dir / "test.nc", temp_dir / "test.png")
 
         # Verify context manager was properly used
         mock_enter.assert_called_once()
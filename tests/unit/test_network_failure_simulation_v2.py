@@ -29,6 +29,8 @@ from goesvfi.integrity_check.remote.composite_store import CompositeStore
 from goesvfi.integrity_check.remote.s3_store import S3Store, create_error_from_code
 from goesvfi.integrity_check.time_index import SatellitePattern
 
+from tests.utils.mocks import mock_s3_client_pool
+
 
 def retry_with_exponential_backoff(
     max_retries: int = 3, initial_backoff: float = 1.0, jitter_factor: float = 0.0
@@ -217,7 +219,7 @@ class TestNetworkFailureSimulationOptimizedV2:
         mock_s3_client = AsyncMock()
         mock_s3_client.head_object = AsyncMock(side_effect=TimeoutError("Connection timeout"))
 
-        with patch.object(s3_store, "_get_s3_client", return_value=mock_s3_client):
+        with patch.object(s3_store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_s3_client)):
             with pytest.raises(asyncio.TimeoutError) as exc_info:
                 await s3_store.check_file_exists(timestamp=timestamp, satellite=SatellitePattern.GOES_16)
             assert "Connection timeout" in str(exc_info.value)
@@ -230,7 +232,7 @@ class TestNetworkFailureSimulationOptimizedV2:
         mock_s3_client.head_object = AsyncMock(side_effect=dns_error)
 
         with (
-            patch.object(s3_store, "_get_s3_client", return_value=mock_s3_client),
+            patch.object(s3_store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_s3_client)),
             pytest.raises(aiohttp.ClientConnectorError),
         ):
             await s3_store.check_file_exists(timestamp=timestamp, satellite=SatellitePattern.GOES_16)
@@ -239,7 +241,7 @@ class TestNetworkFailureSimulationOptimizedV2:
         pool_error = aiohttp.ClientError("Connection pool is full")
         mock_s3_client.head_object = AsyncMock(side_effect=pool_error)
 
-        with patch.object(s3_store, "_get_s3_client", return_value=mock_s3_client):
+        with patch.object(s3_store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_s3_client)):
             with pytest.raises(aiohttp.ClientError) as exc_info:
                 await s3_store.check_file_exists(timestamp=timestamp, satellite=SatellitePattern.GOES_16)
             assert "Connection pool" in str(exc_info.value)
@@ -261,7 +263,7 @@ class TestNetworkFailureSimulationOptimizedV2:
 
         mock_s3_client.head_object = AsyncMock(side_effect=rate_limit_error)
 
-        with patch.object(s3_store, "_get_s3_client", return_value=mock_s3_client):
+        with patch.object(s3_store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_s3_client)):
             timestamp = datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC)
 
             # Should log the error and return False
@@ -410,7 +412,7 @@ class TestNetworkFailureSimulationOptimizedV2:
         mock_s3_client.head_object = AsyncMock(return_value={"ContentLength": 1000})
 
         with (
-            patch.object(s3_store, "_get_s3_client", return_value=mock_s3_client),
+            patch.object(s3_store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_s3_client)),
             patch("pathlib.Path.exists", return_value=True),
             patch("pathlib.Path.unlink"),
         ):
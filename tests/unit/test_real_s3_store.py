@@ -11,6 +11,8 @@ from goesvfi.integrity_check.time_index import (
     SatellitePattern,
 )
 
+from tests.utils.mocks import mock_s3_client_pool
+
 
 class TestRealS3Store(unittest.IsolatedAsyncioTestCase):
     """Test S3Store with mocked NOAA GOES data patterns.
@@ -38,11 +40,8 @@ class TestRealS3Store(unittest.IsolatedAsyncioTestCase):
         self.s3_client_mock = AsyncMock()
         self.s3_client_mock.get_paginator = MagicMock()
 
-        # Patch _get_s3_client on the instance to return our mock
-        async def mock_get_s3_client():
-            return self.s3_client_mock
-
-        self.store._get_s3_client = mock_get_s3_client
+        # Patch _get_s3_client_from_pool on the instance to yield our mock
+        self.store._get_s3_client_from_pool = mock_s3_client_pool(self.s3_client_mock)
 
     async def asyncTearDown(self) -> None:
         """Tear down test fixtures."""
@@ -173,13 +172,9 @@ class TestMockedRealS3Store(unittest.IsolatedAsyncioTestCase):
         # get_paginator is a synchronous method that returns a paginator object
         self.s3_client_mock.get_paginator = MagicMock()
 
-        # Patch _get_s3_client on the instance to return our mock
-        # Note: _get_s3_client is an async method, so we need to make it return the mock directly
-        async def mock_get_s3_client():
-            return self.s3_client_mock
-
-        # Patch the method on the instance, not the class
-        self.store._get_s3_client = mock_get_s3_client
+        # Patch _get_s3_client_from_pool on the instance, not the class
+        # Note: it is an async context manager, so it must yield the mock
+        self.store._get_s3_client_from_pool = mock_s3_client_pool(self.s3_client_mock)
 
     async def asyncTearDown(self) -> None:
         """Tear down test fixtures."""
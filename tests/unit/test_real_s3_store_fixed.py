@@ -9,6 +9,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from goesvfi.integrity_check.remote.s3_store import S3Store
 from goesvfi.integrity_check.time_index import SatellitePattern
 
+from tests.utils.mocks import mock_s3_client_pool
+
 
 # Mock tests that simulate real S3 responses but don't actually access S3
 class TestMockedRealS3StoreFixed(unittest.IsolatedAsyncioTestCase):
@@ -31,8 +33,8 @@ class TestMockedRealS3StoreFixed(unittest.IsolatedAsyncioTestCase):
         # get_paginator is a synchronous method that returns a paginator object
         self.s3_client_mock.get_paginator = MagicMock()
 
-        # Patch _get_s3_client to return our mock
-        patcher = patch.object(S3Store, "_get_s3_client", return_value=self.s3_client_mock)
+        # Patch _get_s3_client_from_pool to yield our mock
+        patcher = patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(self.s3_client_mock))
         self.mock_get_s3_client = patcher.start()
 
         async def _stop_patcher() -> None:
@@ -0,0 +1,86 @@
+"""Tests for ReconcileManager.scan_directory's listing-based existence checks."""
+
+from datetime import UTC, datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from goesvfi.integrity_check.reconcile_manager import ReconcileManager
+from goesvfi.integrity_check.time_index import SatellitePattern
+
+START = datetime(2023, 3, 1, 0, 0)
+END = START + timedelta(hours=1)
+
+
+@pytest.fixture()
+def manager(tmp_path: Path) -> ReconcileManager:
+    cache_db = MagicMock()
+    cache_db.add_timestamps = AsyncMock(return_value=0)
+    return ReconcileManager(cache_db=cache_db, base_dir=tmp_path)
+
+
+def touch_local(manager: ReconcileManager, directory: Path, ts: datetime) -> Path:
+    path = manager._get_local_path(ts, SatellitePattern.GOES_16, directory)  # noqa: SLF001
+    path.write_bytes(b"")
+    return path
+
+
+@pytest.mark.asyncio()
+async def test_split_matches_files_on_disk(manager: ReconcileManager, tmp_path: Path) -> None:
+    present = [START, START + timedelta(minutes=20), END]
+    for ts in present:
+        touch_local(manager, tmp_path, ts)
+    # Other satellites, off-grid times and malformed names are ignored
+    (tmp_path / "GOES_18_20230301_001000.png").write_bytes(b"")
+    touch_local(manager, tmp_path, START + timedelta(minutes=5))
+    (tmp_path / "GOES_16_20231301_000000.png").write_bytes(b"")
+
+    existing, missing = await manager.scan_directory(tmp_path, SatellitePattern.GOES_16, START, END, 10)
+
+    assert existing.timestamps() == present
+    assert missing.timestamps() == [START + timedelta(minutes=m) for m in (10, 30, 40, 50)]
+
+
+@pytest.mark.asyncio()
+async def test_does_not_stat_each_expected_path(manager: ReconcileManager, tmp_path: Path) -> None:
+    touch_local(manager, tmp_path, START)
+
+    with patch.object(Path, "exists", side_effect=AssertionError("per-slot stat")):
+        existing, _ = await manager.scan_directory(tmp_path, SatellitePattern.GOES_16, START, END, 10)
+
+    assert len(existing) == 1
+
+
+@pytest.mark.asyncio()
+async def test_found_entries_written_in_one_bulk_call(manager: ReconcileManager, tmp_path: Path) -> None:
+    paths = [touch_local(manager, tmp_path, START + timedelta(minutes=10 * i)) for i in range(3)]
+
+    await manager.scan_directory(tmp_path, SatellitePattern.GOES_16, START, END, 10)
+
+    manager.cache_db.add_timestamps.assert_awaited_once()
+    entries = manager.cache_db.add_timestamps.await_args.args[1]
+    assert [path for _, path in entries] == [str(path) for path in paths]
+
+
+@pytest.mark.asyncio()
+async def test_missing_directory_reports_everything_missing(manager: ReconcileManager, tmp_path: Path) -> None:
+    existing, missing = await manager.scan_directory(tmp_path / "nope", SatellitePattern.GOES_16, START, END, 10)
+
+    assert len(existing) == 0
+    assert len(missing) == 7
+    manager.cache_db.add_timestamps.assert_not_awaited()
+
+
+@pytest.mark.asyncio()
+async def test_aware_range_matches_wall_clock_names(manager: ReconcileManager, tmp_path: Path) -> None:
+    tz = timezone(timedelta(hours=2))
+    start = START.replace(tzinfo=tz)
+    touch_local(manager, tmp_path, start + timedelta(minutes=10))
+
+    existing, _ = await manager.scan_directory(
+        tmp_path, SatellitePattern.GOES_16, start, start + timedelta(hours=1), 10
+    )
+
+    assert existing.timestamps() == [start + timedelta(minutes=10)]
+    assert existing.timestamps()[0].astimezone(UTC).hour == 22
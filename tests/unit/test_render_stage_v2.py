@@ -0,0 +1,240 @@
+"""Tests for the download-fed NetCDF render stage."""
+
+import asyncio
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from datetime import datetime
+import os
+from pathlib import Path
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+import pytest
+import xarray as xr
+
+from goesvfi.integrity_check.goes_imagery import ChannelType, GOESImageryManager, ImageryMode, ProductType
+from goesvfi.integrity_check.reconcile_manager import ReconcileManager
+from goesvfi.integrity_check.render.batch import RenderStage, is_up_to_date
+from goesvfi.integrity_check.time_index import SatellitePattern
+from goesvfi.pipeline.resource_manager import ResourceLimits, ResourceManager
+
+
+def write_file(path: Path, content: bytes = b"netcdf") -> Path:
+    path.write_bytes(content)
+    return path
+
+
+def copy_renderer(source: Path, output: Path, **options) -> None:
+    """Stand-in renderer that copies the source."""
+    output.write_bytes(Path(source).read_bytes() + repr(sorted(options.items())).encode())
+
+
+def failing_renderer(source: Path, output: Path) -> None:
+    msg = f"cannot render {source}"
+    raise ValueError(msg)
+
+
+def resources(available_mb: int = 8192, max_memory_mb: int = 4096) -> MagicMock:
+    manager = MagicMock()
+    manager.get_config.side_effect = lambda key, default=None: {"max_memory_mb": max_memory_mb}.get(key, default)
+    manager.memory_monitor.get_memory_stats.return_value = MagicMock(available_mb=available_mb)
+    return manager
+
+
+@pytest.fixture()
+def pool():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def test_renders_submitted_files(tmp_path: Path, pool) -> None:
+    rendered = []
+    sources = [write_file(tmp_path / f"{i}.nc") for i in range(5)]
+
+    with RenderStage(
+        renderer=copy_renderer,
+        render_options={"colormap": "gray"},
+        executor=pool,
+        max_workers=4,
+        on_rendered=lambda source, output: rendered.append(source),
+    ) as stage:
+        futures = [stage.submit(source, downloaded_bytes=6) for source in sources]
+        stats = stage.wait()
+
+    assert [future.result() for future in futures] == [source.with_suffix(".png") for source in sources]
+    assert sorted(rendered) == sorted(sources)
+    assert sources[0].with_suffix(".png").read_bytes() == b"netcdf[('colormap', 'gray')]"
+    assert (stats.downloaded, stats.downloaded_bytes, stats.rendered, stats.failed) == (5, 30, 5, 0)
+    assert "5 rendered" in stats.summary()
+
+
+def test_up_to_date_outputs_are_skipped(tmp_path: Path, pool) -> None:
+    source = write_file(tmp_path / "a.nc")
+    output = write_file(tmp_path / "a.png", b"old render")
+    os.utime(source, (1, 1))
+
+    with RenderStage(renderer=copy_renderer, executor=pool) as stage:
+        future = stage.submit(source)
+        stats = stage.wait()
+
+    assert future.done()
+    assert future.result() == output
+    assert output.read_bytes() == b"old render"
+    assert (stats.rendered, stats.skipped) == (0, 1)
+
+    # A newer download is rendered again
+    os.utime(output, (0, 0))
+    assert not is_up_to_date(source, output)
+
+
+def test_in_flight_limit_follows_memory_budget(tmp_path: Path, pool) -> None:
+    release = threading.Event()
+
+    def blocking_renderer(source: Path, output: Path) -> None:
+        release.wait(5)
+        output.write_bytes(b"")
+
+    # 1536 MB available, 512 MB per render: three files at a time
+    stage = RenderStage(
+        renderer=blocking_renderer, executor=pool, max_workers=4, resource_manager=resources(available_mb=1536)
+    )
+    try:
+        for i in range(3):
+            stage.submit(write_file(tmp_path / f"{i}.nc"))
+        assert stage.max_in_flight == 3
+
+        with pytest.raises(TimeoutError):
+            stage.submit(write_file(tmp_path / "3.nc"), timeout=0.05)
+    finally:
+        release.set()
+        stage.close()
+
+    assert stage.stats().rendered == 3
+
+
+def test_failures_are_reported(tmp_path: Path, pool) -> None:
+    errors = []
+    source = write_file(tmp_path / "bad.nc")
+
+    with RenderStage(
+        renderer=failing_renderer, executor=pool, on_error=lambda path, error: errors.append((path, error))
+    ) as stage:
+        future = stage.submit(source)
+        stats = stage.wait()
+
+    with pytest.raises(ValueError, match="cannot render"):
+        future.result()
+    assert errors[0][0] == source
+    assert stats.failed == 1
+
+
+def test_cancelled_renders_resolve_their_futures(tmp_path: Path) -> None:
+    release = threading.Event()
+
+    def blocking_renderer(source: Path, output: Path) -> None:
+        release.wait(5)
+        output.write_bytes(b"")
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    stage = RenderStage(renderer=blocking_renderer, executor=executor, max_workers=1)
+    try:
+        running = stage.submit(write_file(tmp_path / "a.nc"))
+        queued = stage.submit(write_file(tmp_path / "b.nc"))
+        executor.shutdown(wait=False, cancel_futures=True)
+    finally:
+        release.set()
+
+    stats = stage.close()
+
+    assert running.result(timeout=5) == tmp_path / "a.png"
+    with pytest.raises(CancelledError):
+        queued.result(timeout=5)
+    assert not stage._pending  # noqa: SLF001
+    assert (stats.rendered, stats.failed) == (1, 0)
+
+
+def test_submit_async_does_not_block_the_loop(tmp_path: Path, pool) -> None:
+    source = write_file(tmp_path / "a.nc")
+
+    async def run(stage: RenderStage) -> Path:
+        future = await stage.submit_async(source, tmp_path / "out.png")
+        return await asyncio.wrap_future(future)
+
+    with RenderStage(renderer=copy_renderer, executor=pool) as stage:
+        assert asyncio.run(run(stage)) == tmp_path / "out.png"
+
+
+def test_cancelled_submit_async_does_not_take_a_slot(tmp_path: Path, pool) -> None:
+    source = write_file(tmp_path / "a.nc")
+
+    async def cancel_while_waiting(stage: RenderStage) -> None:
+        task = asyncio.create_task(stage.submit_async(source, tmp_path / "out.png"))
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with RenderStage(renderer=copy_renderer, executor=pool, max_workers=1) as stage:
+        held = [stage._slots.acquire(blocking=False) for _ in range(stage.max_in_flight)]  # noqa: SLF001
+        asyncio.run(cancel_while_waiting(stage))
+        for _ in held:
+            stage._slots.release()  # noqa: SLF001
+
+        stage.submit(source, tmp_path / "out.png", timeout=1)
+        stage.wait()
+        assert all(stage._slots.acquire(blocking=False) for _ in range(stage.max_in_flight))  # noqa: SLF001
+
+
+def test_closed_stage_rejects_files(tmp_path: Path, pool) -> None:
+    stage = RenderStage(renderer=copy_renderer, executor=pool)
+    stage.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        stage.submit(write_file(tmp_path / "a.nc"))
+
+
+def test_process_pool_renders_netcdf(tmp_path: Path) -> None:
+    rad = np.linspace(20, 120, 64 * 48, dtype=np.float32).reshape(48, 64)
+    source = tmp_path / "band13.nc"
+    xr.Dataset({"Rad": (["y", "x"], rad), "band_id": np.int8(13)}).to_netcdf(source)
+    manager = ResourceManager(ResourceLimits(max_workers=2))
+
+    try:
+        with RenderStage(resource_manager=manager) as stage:
+            output = stage.render(source)
+    finally:
+        manager.cleanup()
+
+    with Image.open(output) as image:
+        assert image.size == (64, 48)
+
+
+@pytest.mark.asyncio()
+async def test_reconcile_manager_renders_downloads(tmp_path: Path, pool) -> None:
+    source = write_file(tmp_path / "download.nc")
+    stage = RenderStage(renderer=copy_renderer, executor=pool)
+    manager = ReconcileManager(base_dir=tmp_path, render_stage=stage)
+    timestamp = datetime(2023, 6, 15, 12)
+
+    await manager.file_downloaded(timestamp, source, SatellitePattern.GOES_16, tmp_path)
+    # Only NetCDF paths are rendered
+    await manager.file_downloaded(timestamp, ValueError("failed"), SatellitePattern.GOES_16, tmp_path)
+    stats = stage.close()
+
+    expected = manager._get_local_path(timestamp, SatellitePattern.GOES_16, tmp_path)  # noqa: SLF001
+    assert expected.read_bytes().startswith(b"netcdf")
+    assert (stats.downloaded, stats.rendered) == (1, 1)
+
+
+def test_imagery_manager_uses_render_stage(tmp_path: Path) -> None:
+    stage = MagicMock()
+    stage.render.return_value = tmp_path / "raw.png"
+    manager = GOESImageryManager(base_dir=tmp_path, render_stage=stage)
+
+    with patch.object(manager.downloader, "download_raw_data", return_value=tmp_path / "raw.nc"):
+        result = manager.get_imagery(ChannelType.CH13, ProductType.FULL_DISK, mode=ImageryMode.RAW)
+
+    assert result == tmp_path / "raw.png"
+    stage.render.assert_called_once_with(tmp_path / "raw.nc", tmp_path / "raw.png")
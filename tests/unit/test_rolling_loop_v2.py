@@ -0,0 +1,179 @@
+"""Tests for incremental rolling-window loop builds."""
+
+import os
+from pathlib import Path
+import re
+import subprocess
+import time
+from unittest.mock import patch
+
+from PIL import Image
+import pytest
+
+from goesvfi import cli
+from goesvfi.pipeline.exceptions import FFmpegError
+from goesvfi.pipeline.rolling_loop import LoopSettings, RollingLoopBuilder
+
+PNG_SIGNATURE = b"\x89PNG"
+
+
+class FakeFFmpeg:
+    """Stands in for ``subprocess.run`` of FFmpeg.
+
+    A segment file holds the number of frames piped to it, and a joined loop
+    holds its segments' contents, one per line.
+    """
+
+    def __init__(self) -> None:
+        self.commands: list[list[str]] = []
+        self.fail = False
+
+    def __call__(self, cmd: list[str], input: bytes | None = None, **kwargs: object) -> subprocess.CompletedProcess:  # noqa: A002
+        self.commands.append(cmd)
+        if self.fail:
+            return subprocess.CompletedProcess(cmd, 1, b"", b"encoder error")
+        output = Path(cmd[-1])
+        if "concat" in cmd:
+            listed = re.findall(r"^file '(.+)'$", Path(cmd[cmd.index("-i") + 1]).read_text(), re.MULTILINE)
+            output.write_text("\n".join(Path(segment).read_text() for segment in listed))
+        else:
+            assert input is not None
+            output.write_text(str(input.count(PNG_SIGNATURE)))
+        return subprocess.CompletedProcess(cmd, 0, b"", b"")
+
+    def segments_encoded(self) -> int:
+        return sum("concat" not in cmd for cmd in self.commands)
+
+
+class FakeRife:
+    def __init__(self) -> None:
+        self.pairs: list[tuple[Path, Path]] = []
+
+    def __call__(self, p1: Path, p2: Path, rife_exe_path: Path, rife_config: dict) -> Path:
+        self.pairs.append((p1, p2))
+        output = p1.parent / f"interp_{time.monotonic_ns()}.png"
+        with Image.open(p1) as im1, Image.open(p2) as im2:
+            Image.blend(im1.convert("RGB"), im2.convert("RGB"), 0.5).save(output)
+        return output
+
+
+def write_frames(folder: Path, start: int, stop: int) -> list[Path]:
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(start, stop):
+        path = folder / f"frame_{index:04d}.png"
+        if not path.exists():
+            Image.new("RGB", (9, 6), (index * 7 % 256, 0, 0)).save(path)
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture()
+def ffmpeg() -> FakeFFmpeg:
+    fake = FakeFFmpeg()
+    with patch("goesvfi.pipeline.rolling_loop.subprocess.run", side_effect=fake):
+        yield fake
+
+
+@pytest.fixture()
+def rife() -> FakeRife:
+    fake = FakeRife()
+    with patch("goesvfi.pipeline.rolling_loop.run_rife_pair", side_effect=fake):
+        yield fake
+
+
+def make_builder(tmp_path: Path, **settings: object) -> RollingLoopBuilder:
+    return RollingLoopBuilder(tmp_path / "cache", LoopSettings(**settings), rife_exe_path=Path("rife"))  # type: ignore[arg-type]
+
+
+def test_first_build_renders_every_segment(tmp_path: Path, ffmpeg: FakeFFmpeg, rife: FakeRife) -> None:
+    frames = write_frames(tmp_path / "in", 0, 4)
+    output = tmp_path / "loop.mp4"
+
+    result = make_builder(tmp_path).build(frames, output)
+
+    assert (result.segments, result.rendered, result.reused, result.expired) == (4, 4, 0, 0)
+    # Each pair is a frame and the frame interpolated after it; the loop ends on the last frame
+    assert output.read_text().splitlines() == ["2", "2", "2", "1"]
+    assert len(rife.pairs) == 3
+    concat = ffmpeg.commands[-1]
+    assert concat[concat.index("-c") + 1] == "copy"
+    assert not list(tmp_path.glob(".loop.mp4.partial"))
+
+
+@pytest.mark.parametrize("window", [6, 30])
+def test_rebuild_only_renders_new_frame(tmp_path: Path, ffmpeg: FakeFFmpeg, rife: FakeRife, window: int) -> None:
+    builder = make_builder(tmp_path)
+    output = tmp_path / "loop.mp4"
+    builder.build(write_frames(tmp_path / "in", 0, window), output)
+    ffmpeg.commands.clear()
+    rife.pairs.clear()
+
+    result = builder.build(write_frames(tmp_path / "in", 1, window + 1), output)
+
+    # The pair ending on the new frame and the new last frame, whatever the window length
+    assert (result.rendered, result.reused, result.expired) == (2, window - 2, 2)
+    assert ffmpeg.segments_encoded() == 2
+    assert len(rife.pairs) == 1
+    assert output.read_text().splitlines() == ["2"] * (window - 1) + ["1"]
+    assert len(list(builder.segments_dir.glob("*.mp4"))) == window
+    assert len(list(builder.frames_dir.glob("*.png"))) == window
+
+
+def test_changed_frame_and_settings_are_rendered_again(tmp_path: Path, ffmpeg: FakeFFmpeg, rife: FakeRife) -> None:
+    frames = write_frames(tmp_path / "in", 0, 6)
+    make_builder(tmp_path).build(frames, tmp_path / "loop.mp4")
+
+    # A frame downloaded again invalidates the two segments it is part of
+    Image.new("RGB", (9, 6), (0, 255, 0)).save(frames[3])
+    stat = frames[3].stat()
+    os.utime(frames[3], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert make_builder(tmp_path).build(frames, tmp_path / "loop.mp4").rendered == 2
+
+    result = make_builder(tmp_path, crf=28).build(frames, tmp_path / "loop.mp4")
+    assert (result.rendered, result.expired) == (6, 6)
+
+
+def test_skip_model_encodes_frames_only(tmp_path: Path, ffmpeg: FakeFFmpeg, rife: FakeRife) -> None:
+    frames = write_frames(tmp_path / "in", 0, 3)
+    builder = RollingLoopBuilder(tmp_path / "cache", LoopSettings(fps=10, skip_model=True))
+
+    builder.build(frames, tmp_path / "loop.mp4")
+
+    assert (tmp_path / "loop.mp4").read_text().splitlines() == ["1", "1", "1"]
+    assert not rife.pairs
+    segment = ffmpeg.commands[0]
+    assert segment[segment.index("-framerate") + 1] == "10"
+
+
+def test_failed_encode_caches_nothing(tmp_path: Path, ffmpeg: FakeFFmpeg, rife: FakeRife) -> None:
+    frames = write_frames(tmp_path / "in", 0, 3)
+    builder = make_builder(tmp_path)
+    ffmpeg.fail = True
+
+    with pytest.raises(FFmpegError, match="segment") as excinfo:
+        builder.build(frames, tmp_path / "loop.mp4")
+
+    assert excinfo.value.stderr == "encoder error"
+    assert not list(builder.segments_dir.iterdir())
+    assert not list(builder.frames_dir.glob("interp_*"))
+    ffmpeg.fail = False
+    assert builder.build(frames, tmp_path / "loop.mp4").rendered == 3
+
+
+def test_window_needs_two_frames(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="at least 2 frames"):
+        make_builder(tmp_path).build(write_frames(tmp_path / "in", 0, 1), tmp_path / "loop.mp4")
+    with pytest.raises(ValueError, match="RIFE executable"):
+        RollingLoopBuilder(tmp_path / "cache", LoopSettings())
+
+
+def test_cli_loop_uses_newest_frames(tmp_path: Path, ffmpeg: FakeFFmpeg) -> None:
+    write_frames(tmp_path / "in", 0, 5)
+    args = ["loop", str(tmp_path / "in"), "-o", str(tmp_path / "loop.mp4"), "--window", "3", "--skip-model"]
+
+    assert cli.main([*args, "--cache-dir", str(tmp_path / "cache")]) == 0
+
+    assert (tmp_path / "loop.mp4").read_text().splitlines() == ["1", "1", "1"]
+    listed = (tmp_path / "cache" / "segments.txt").read_text()
+    assert listed.count("file '") == 3
@@ -1,5 +1,6 @@
 """Tests for S3 connection pooling."""
 
+import asyncio
 import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -8,6 +9,7 @@ import pytest
 # Import the module directly to avoid circular imports
 sys.path.insert(0, "goesvfi/integrity_check/remote")
 from s3_connection_pool import (
+    PoolTimeoutError,
     S3ConnectionPool,
     get_global_pool,
     reset_global_pool,
@@ -95,21 +97,37 @@ class TestS3ConnectionPool:
     async def test_connection_health_check(self, connection_pool, mock_s3_client) -> None:
         """Test connection health checking."""
         # Healthy connection
-        mock_s3_client.list_buckets.return_value = {"Buckets": []}
+        mock_s3_client.head_bucket.return_value = {}
         assert await connection_pool._check_connection_health(mock_s3_client) is True
 
         # Unhealthy connection
-        mock_s3_client.list_buckets.side_effect = Exception("Connection error")
+        mock_s3_client.head_bucket.side_effect = Exception("Connection error")
         assert await connection_pool._check_connection_health(mock_s3_client) is False
 
+        # ListBuckets is never used: it fails for unsigned access
+        mock_s3_client.list_buckets.assert_not_called()
+
+    @pytest.mark.asyncio()
+    async def test_no_health_check_on_clean_release(self, connection_pool, mock_session, mock_s3_client) -> None:
+        """Test that releasing a connection after success does not probe it."""
+        with patch("s3_connection_pool.aioboto3.Session", return_value=mock_session):
+            async with connection_pool.acquire():
+                pass
+
+        mock_s3_client.head_bucket.assert_not_called()
+        assert connection_pool._stats["health_checks"] == 0
+        assert len(connection_pool._available_connections) == 1
+
     @pytest.mark.asyncio()
     async def test_unhealthy_connection_closed(self, connection_pool, mock_session, mock_s3_client) -> None:
         """Test that unhealthy connections are closed instead of returned to pool."""
         with patch("s3_connection_pool.aioboto3.Session", return_value=mock_session):
-            # Acquire connection
-            async with connection_pool.acquire():
-                # Make connection unhealthy for when it's returned
-                mock_s3_client.list_buckets.side_effect = Exception("Connection lost")
+            # Acquire connection and fail with a transport error
+            with pytest.raises(ConnectionResetError):
+                async with connection_pool.acquire():
+                    # Make connection unhealthy for when it's probed
+                    mock_s3_client.head_bucket.side_effect = Exception("Connection lost")
+                    raise ConnectionResetError
 
             # Connection should be closed, not returned to pool
             assert len(connection_pool._available_connections) == 0
@@ -152,13 +170,66 @@ class TestS3ConnectionPool:
                     assert client1 is not None
                     assert client2 is not None
 
-                    # Try to acquire third (should still work but log warning)
-                    async with pool.acquire() as client3:
-                        assert client3 is not None
+                    # Third acquisition waits for a free connection and times out
+                    with pytest.raises(PoolTimeoutError):
+                        async with pool.acquire(timeout=0.05):
+                            pass
+
+        assert pool._stats["connections_created"] == 2
+        assert pool._stats["acquire_timeouts"] == 1
 
         # Cleanup
         await pool.close_all()
 
+    @pytest.mark.asyncio()
+    async def test_waiter_receives_released_connection(self, mock_session, mock_s3_client) -> None:
+        """Test that a waiting caller gets the connection released by another."""
+        pool = S3ConnectionPool(max_connections=1)
+
+        with patch("s3_connection_pool.aioboto3.Session", return_value=mock_session):
+            release = asyncio.Event()
+
+            async def holder() -> None:
+                async with pool.acquire():
+                    await release.wait()
+
+            holder_task = asyncio.create_task(holder())
+            await asyncio.sleep(0)
+
+            async def waiter() -> object:
+                async with pool.acquire(timeout=1.0) as client:
+                    return client
+
+            waiter_task = asyncio.create_task(waiter())
+            await asyncio.sleep(0.01)
+            assert not waiter_task.done()
+
+            release.set()
+            assert await waiter_task is mock_s3_client
+            await holder_task
+
+        stats = pool.get_stats()
+        assert stats["connections_created"] == 1
+        assert stats["waits"] == 1
+        assert stats["wait_time_max"] > 0
+        await pool.close_all()
+
+    @pytest.mark.asyncio()
+    async def test_idle_connections_reaped(self, connection_pool, mock_session) -> None:
+        """Test that idle connections are closed by the reaper."""
+        import time
+
+        with patch("s3_connection_pool.aioboto3.Session", return_value=mock_session):
+            async with connection_pool.acquire():
+                pass
+
+        client, _ = connection_pool._available_connections.pop()
+        connection_pool._available_connections.append((client, time.time() - connection_pool.idle_timeout))
+
+        assert await connection_pool.reap_idle() == 1
+        assert len(connection_pool._available_connections) == 0
+        assert connection_pool.get_stats()["connections_reaped"] == 1
+
     @pytest.mark.asyncio()
     async def test_connection_age_limit(self, connection_pool, mock_session, mock_s3_client) -> None:
         """Test that old connections are not reused."""
@@ -180,6 +251,37 @@ class TestS3ConnectionPool:
                 assert connection_pool._stats["connections_closed"] >= 1
                 assert connection_pool._stats["connections_created"] >= 2
 
+    @pytest.mark.asyncio()
+    async def test_cancel_while_closing_stale_keeps_capacity(
+        self, connection_pool, mock_session, mock_s3_client
+    ) -> None:
+        """Test that cancelling an acquire while it closes stale connections frees its slot."""
+        import time
+
+        with patch("s3_connection_pool.aioboto3.Session", return_value=mock_session):
+            async with connection_pool.acquire():
+                pass
+
+            client, _ = connection_pool._available_connections.popleft()
+            connection_pool._available_connections.append((client, time.time() - 360))
+
+            closing = asyncio.Event()
+
+            async def blocking_exit(*_args) -> None:
+                closing.set()
+                await asyncio.Event().wait()
+
+            mock_s3_client.__aexit__ = blocking_exit
+
+            task = asyncio.create_task(connection_pool.acquire().__aenter__())
+            await closing.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            assert connection_pool._pending_creations == 0
+            assert connection_pool._total_connections == 0
+
     @pytest.mark.asyncio()
     async def test_close_all_connections(self, connection_pool, mock_session, mock_s3_client) -> None:
         """Test closing all connections in pool."""
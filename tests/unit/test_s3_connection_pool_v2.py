@@ -17,6 +17,7 @@ import pytest
 # Import the module directly to avoid circular imports
 sys.path.insert(0, "goesvfi/integrity_check/remote")
 from s3_connection_pool import (
+    PoolTimeoutError,
     S3ConnectionPool,
     get_global_pool,
     reset_global_pool,
@@ -220,12 +221,11 @@ class TestS3ConnectionPoolOptimizedV2:
                                 assert client1 is not client2
                                 assert len(pool._in_use_connections) >= 2  # noqa: SLF001
 
-                                # The pool creates new connections even when full
-                                # So just verify we can still acquire
-                                async with pool.acquire() as client3:
-                                    assert client3 is not None
-                                    # Pool may have more than max connections during high load
-                                    assert len(pool._in_use_connections) >= 2  # noqa: SLF001
+                                # The pool is full, so a third caller waits and times out
+                                with pytest.raises(PoolTimeoutError):
+                                    async with pool.acquire(timeout=0.05):
+                                        pass
+                                assert len(pool._in_use_connections) == 2  # noqa: SLF001
 
                                 results["max_connections_enforced"] = True
 
@@ -349,7 +349,7 @@ class TestS3ConnectionPoolOptimizedV2:
                     mock_client = self.mock_factory.create_mock_s3_client()
 
                     # Test unhealthy connection
-                    mock_client.list_buckets.side_effect = Exception("Connection lost")
+                    mock_client.head_bucket.side_effect = Exception("Connection lost")
                     is_healthy = await pool._check_connection_health(mock_client)  # noqa: SLF001
                     assert is_healthy is False
                     results["unhealthy_check_passed"] = True
@@ -376,10 +376,12 @@ class TestS3ConnectionPoolOptimizedV2:
                     mock_session.client.return_value = client_context
 
                     with patch("s3_connection_pool.aioboto3.Session", return_value=mock_session):
-                        # First acquisition - get client1
-                        async with pool.acquire() as client1:
-                            # Make this client unhealthy for when it's returned
-                            client1.list_buckets.side_effect = Exception("Stale")
+                        # First acquisition - get client1 and fail with a transport error
+                        with pytest.raises(TimeoutError):
+                            async with pool.acquire() as client1:
+                                # Make this client unhealthy for when it's probed
+                                client1.head_bucket.side_effect = Exception("Stale")
+                                raise TimeoutError
 
                         # After release, client1 should be discarded due to health check failure
                         # Pool should be empty now
@@ -424,9 +426,9 @@ class TestS3ConnectionPoolOptimizedV2:
                         # Acquire the only connection
                         async with pool.acquire():
                             # Try to acquire another with short timeout
-                            # Since pool creates new connections even when full,
-                            # we can't test timeout. Just verify pool behavior.
-                            pass
+                            with pytest.raises(PoolTimeoutError):
+                                async with pool.acquire(timeout=0.05):
+                                    pass
 
                         # Verify pool statistics show expected behavior
                         stats = pool.get_stats()
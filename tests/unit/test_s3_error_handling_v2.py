@@ -25,6 +25,8 @@ from goesvfi.integrity_check.remote.base import (
 from goesvfi.integrity_check.remote.s3_store import S3Store
 from goesvfi.integrity_check.time_index import SatellitePattern
 
+from tests.utils.mocks import mock_s3_client_pool
+
 
 class TestS3ErrorHandlingOptimizedV2:
     """Optimized S3 error handling tests with full coverage."""
@@ -166,7 +168,7 @@ class TestS3ErrorHandlingOptimizedV2:
 
                     mock_client = self.create_mock_s3_client(head_object_error=client_error, empty_paginator=True)
 
-                    with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         result = await store.check_file_exists(test_timestamp, test_satellite)
 
                         # Should return False, not raise exception
@@ -184,7 +186,7 @@ class TestS3ErrorHandlingOptimizedV2:
                     for satellite in self.test_satellites:
                         mock_client = self.create_mock_s3_client(head_object_error=client_error, empty_paginator=True)
 
-                        with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                        with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                             result = await store.check_file_exists(test_timestamp, satellite)
                             satellite_results.append(result)
 
@@ -209,7 +211,7 @@ class TestS3ErrorHandlingOptimizedV2:
 
                     mock_client = self.create_mock_s3_client(head_object_error=client_error)
 
-                    with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         with pytest.raises(AuthenticationError) as exc_info:
                             await store.download_file(test_timestamp, test_satellite, test_dest_path)
 
@@ -227,7 +229,7 @@ class TestS3ErrorHandlingOptimizedV2:
                         download_file_error=TimeoutError("Connection timed out"),
                     )
 
-                    with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         with pytest.raises(ConnectionError) as exc_info:
                             await store.download_file(test_timestamp, test_satellite, test_dest_path)
 
@@ -245,7 +247,7 @@ class TestS3ErrorHandlingOptimizedV2:
                         download_file_error=PermissionError("Permission denied"),
                     )
 
-                    with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         with pytest.raises(AuthenticationError) as exc_info:
                             await store.download_file(test_timestamp, test_satellite, test_dest_path)
 
@@ -278,7 +280,7 @@ class TestS3ErrorHandlingOptimizedV2:
                         paginator_pages=[],  # Empty pages
                     )
 
-                    with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         with pytest.raises(RemoteStoreError) as exc_info:
                             await store.download_file(test_timestamp, test_satellite, test_dest_path)
 
@@ -306,7 +308,7 @@ class TestS3ErrorHandlingOptimizedV2:
                         head_object_error=head_error, paginator_pages=[test_page], download_file_error=download_error
                     )
 
-                    with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         with pytest.raises(RemoteStoreError) as exc_info:
                             await store.download_file(test_timestamp, test_satellite, test_dest_path)
 
@@ -337,7 +339,7 @@ class TestS3ErrorHandlingOptimizedV2:
                                 self.error_configs["server_error"]
                             )
 
-                        with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                        with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                             try:
                                 await store.download_file(test_timestamp, test_satellite, test_dest_path)
                                 scenario_results.append((description, "success"))
@@ -375,7 +377,7 @@ class TestS3ErrorHandlingOptimizedV2:
                                 download_file_error=error_type(error_message),
                             )
 
-                            with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                            with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                                 try:
                                     await store.download_file(test_timestamp, satellite, test_dest_path)
                                     permission_results.append((error_type.__name__, "unexpected_success"))
@@ -409,7 +411,7 @@ class TestS3ErrorHandlingOptimizedV2:
                             head_object_result={"ContentLength": 1000}, download_file_error=error_type(error_message)
                         )
 
-                        with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                        with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                             with pytest.raises((ConnectionError, RemoteStoreError)):
                                 await store.download_file(test_timestamp, test_satellite, test_dest_path)
 
@@ -443,7 +445,7 @@ class TestS3ErrorHandlingOptimizedV2:
                             head_object_result={"ContentLength": 1000}, download_file_error=client_error
                         )
 
-                        with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                        with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                             with pytest.raises(RemoteStoreError):
                                 await store.download_file(test_timestamp, test_satellite, test_dest_path)
 
@@ -486,7 +488,7 @@ class TestS3ErrorHandlingOptimizedV2:
                                     head_object_error=client_error, paginator_pages=[]
                                 )
 
-                        with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                        with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                             try:
                                 await store.download_file(test_timestamp, test_satellite, test_dest_path)
                                 message_validation_results.append((error_config["description"], "no_exception"))
@@ -535,7 +537,7 @@ class TestS3ErrorHandlingOptimizedV2:
                                     download_file_error=error_type(error_message),
                                 )
 
-                            with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                            with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                                 try:
                                     await store.download_file(timestamp, satellite, test_dest_path)
                                     edge_cases.append((i, j, "unexpected_success"))
@@ -582,7 +584,7 @@ class TestS3ErrorHandlingOptimizedV2:
                                 download_file_error=error_type(error_message),
                             )
 
-                        with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                        with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                             try:
                                 await store.download_file(test_timestamp, test_satellite, test_dest_path)
                             except (AuthenticationError, ConnectionError, RemoteStoreError):
@@ -728,7 +730,7 @@ class TestS3ErrorHandlingOptimizedV2:
                 head_object_result={"ContentLength": 1000}, download_file_error=error_type(error_message)
             )
 
-        with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+        with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
             with pytest.raises(expected_exception):
                 await store.download_file(test_timestamp, test_satellite, test_dest_path)
 
@@ -760,7 +762,7 @@ class TestS3ErrorHandlingOptimizedV2:
                         head_object_result={"ContentLength": 1000}, download_file_error=error_type(error_message)
                     )
 
-                with patch.object(S3Store, "_get_s3_client", return_value=mock_client):
+                with patch.object(S3Store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                     try:
                         await store.download_file(test_timestamp, test_satellite, test_dest_path)
                         total_errors_tested += 1
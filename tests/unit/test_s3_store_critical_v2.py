@@ -22,6 +22,8 @@ from goesvfi.integrity_check.remote.base import ResourceNotFoundError
 from goesvfi.integrity_check.remote.s3_store import S3Store
 from goesvfi.integrity_check.time_index import SatellitePattern
 
+from tests.utils.mocks import mock_s3_client_pool
+
 
 class TestS3StoreCriticalOptimizedV2:
     """Optimized S3Store critical functionality tests with full coverage."""
@@ -222,7 +224,7 @@ class TestS3StoreCriticalOptimizedV2:
 
                     path_patches = self.create_path_patches(path_exists=True, file_size=9)
 
-                    with patch.object(store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         with path_patches["path_exists"], path_patches["path_stat"], path_patches["path_mkdir"]:
                             local_path = Path(temp_dir.name) / "test_file.nc"
                             ts = self.test_configs["timestamps"][0]
@@ -249,7 +251,7 @@ class TestS3StoreCriticalOptimizedV2:
 
                         path_patches = self.create_path_patches(path_exists=True, file_size=file_size)
 
-                        with patch.object(store, "_get_s3_client", return_value=mock_client):
+                        with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                             with path_patches["path_exists"], path_patches["path_stat"], path_patches["path_mkdir"]:
                                 local_path = Path(temp_dir.name) / f"test_file_{i}.nc"
                                 ts = self.test_configs["timestamps"][0]
@@ -273,7 +275,7 @@ class TestS3StoreCriticalOptimizedV2:
                         paginator_pages=[self.wildcard_scenarios["empty_contents"]],
                     )
 
-                    with patch.object(store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         local_path = Path(temp_dir.name) / "missing_file.nc"
                         ts = self.test_configs["timestamps"][0]
 
@@ -296,7 +298,7 @@ class TestS3StoreCriticalOptimizedV2:
                     # Test checking if file exists (success)
                     mock_client = self.create_mock_s3_client(head_object_response=self.s3_responses["success"])
 
-                    with patch.object(store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         ts = self.test_configs["timestamps"][0]
 
                         result = await store.check_file_exists(ts, self.test_configs["satellites"][0])
@@ -310,7 +312,7 @@ class TestS3StoreCriticalOptimizedV2:
                     # Test exists returns False for missing files
                     mock_client = self.create_mock_s3_client(head_object_error=self.s3_responses["not_found_error"])
 
-                    with patch.object(store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         ts = self.test_configs["timestamps"][0]
 
                         result = await store.check_file_exists(ts, self.test_configs["satellites"][0])
@@ -325,7 +327,7 @@ class TestS3StoreCriticalOptimizedV2:
                     for satellite in self.test_configs["satellites"]:
                         mock_client = self.create_mock_s3_client(head_object_response=self.s3_responses["success"])
 
-                        with patch.object(store, "_get_s3_client", return_value=mock_client):
+                        with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                             ts = self.test_configs["timestamps"][0]
 
                             result = await store.check_file_exists(ts, satellite)
@@ -351,7 +353,7 @@ class TestS3StoreCriticalOptimizedV2:
 
                     path_patches = self.create_path_patches(path_exists=True, file_size=1000)
 
-                    with patch.object(store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         with path_patches["path_exists"], path_patches["path_stat"], path_patches["path_mkdir"]:
                             local_path = Path(temp_dir.name) / "wildcard_test.nc"
                             ts = self.test_configs["timestamps"][0]
@@ -377,7 +379,7 @@ class TestS3StoreCriticalOptimizedV2:
 
                     path_patches = self.create_path_patches(path_exists=True, file_size=1000)
 
-                    with patch.object(store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         with path_patches["path_exists"], path_patches["path_stat"], path_patches["path_mkdir"]:
                             local_path = Path(temp_dir.name) / "wildcard_multiple.nc"
                             ts = self.test_configs["timestamps"][0]
@@ -398,7 +400,7 @@ class TestS3StoreCriticalOptimizedV2:
                         paginator_pages=[self.wildcard_scenarios["empty_contents"]],
                     )
 
-                    with patch.object(store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         local_path = Path(temp_dir.name) / "wildcard_none.nc"
                         ts = self.test_configs["timestamps"][0]
 
@@ -424,7 +426,7 @@ class TestS3StoreCriticalOptimizedV2:
 
                     path_patches = self.create_path_patches(path_exists=True, file_size=9)
 
-                    with patch.object(store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         with path_patches["path_exists"], path_patches["path_stat"], path_patches["path_mkdir"]:
                             # Download multiple files concurrently
                             tasks = []
@@ -450,7 +452,7 @@ class TestS3StoreCriticalOptimizedV2:
                     # Test concurrent existence checks
                     mock_client = self.create_mock_s3_client(head_object_response=self.s3_responses["success"])
 
-                    with patch.object(store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         # Check existence of multiple files concurrently
                         tasks = []
                         for i in range(self.test_configs["concurrent_count"]):
@@ -492,7 +494,7 @@ class TestS3StoreCriticalOptimizedV2:
                     for error in s3_errors:
                         mock_client = self.create_mock_s3_client(head_object_error=error)
 
-                        with patch.object(store, "_get_s3_client", return_value=mock_client):
+                        with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                             local_path = Path(temp_dir.name) / "error_test.nc"
                             ts = self.test_configs["timestamps"][0]
 
@@ -530,7 +532,7 @@ class TestS3StoreCriticalOptimizedV2:
                     for ts in edge_timestamps:
                         mock_client = self.create_mock_s3_client(head_object_response=self.s3_responses["success"])
 
-                        with patch.object(store, "_get_s3_client", return_value=mock_client):
+                        with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                             try:
                                 result = await store.check_file_exists(ts, self.test_configs["satellites"][0])
                                 edge_results.append(result)
@@ -555,7 +557,7 @@ class TestS3StoreCriticalOptimizedV2:
                     mock_client = self.create_mock_s3_client(head_object_response=self.s3_responses["success"])
 
                     operation_count = 50
-                    with patch.object(store, "_get_s3_client", return_value=mock_client):
+                    with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
                         # Perform many existence checks
                         tasks = []
                         for i in range(operation_count):
@@ -690,7 +692,7 @@ class TestS3StoreCriticalOptimizedV2:
 
         path_patches = manager.create_path_patches(path_exists=True, file_size=9)
 
-        with patch.object(store, "_get_s3_client", return_value=mock_client):
+        with patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(mock_client)):
             with path_patches["path_exists"], path_patches["path_stat"], path_patches["path_mkdir"]:
                 local_path = Path(temp_directory.name) / f"satellite_{satellite.name}.nc"
                 ts = manager.test_configs["timestamps"][0]
@@ -291,38 +291,38 @@ class TestSanchezProcessorCritical:
                 processor = SanchezProcessor(proc_temp_dir)
                 image_data = image_test_generator.create_test_image_data(50, 50, 1, np.uint8)
 
-                with patch("goesvfi.pipeline.sanchez_processor.colourise"), \
-             patch("goesvfi.pipeline.sanchez_processor.SanchezProcessor._is_valid_satellite_image", return_value=True):
-                    fake_output = proc_temp_dir / f"output_{processor_id}.png"
-                    fake_output.touch()
-
-                    with patch("PIL.Image.open") as mock_pil_open:
-                        mock_result_img = Mock()
-                        mock_result_img.size = (50, 50)
-                        mock_pil_open.return_value = mock_result_img
-
-                        result_array = np.random.randint(0, 256, (50, 50, 3), dtype=np.uint8)
+                fake_output = proc_temp_dir / f"output_{processor_id}.png"
+                fake_output.touch()
 
-                        with patch("numpy.array", return_value=result_array):
-                            start_time = time.time()
-                            result = processor.process(image_data)
-                            end_time = time.time()
+                start_time = time.time()
+                result = processor.process(image_data)
+                end_time = time.time()
 
-                            with lock:
-                                results.append({
-                                    "processor_id": processor_id,
-                                    "processing_time": end_time - start_time,
-                                    "success": isinstance(result, ImageData),
-                                })
+                with lock:
+                    results.append({
+                        "processor_id": processor_id,
+                        "processing_time": end_time - start_time,
+                        "success": isinstance(result, ImageData),
+                    })
 
             except Exception as e:
                 with lock:
                     errors.append((processor_id, str(e)))
 
-        # Process images concurrently
-        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-            futures = [executor.submit(process_image, i) for i in range(6)]
-            concurrent.futures.wait(futures)
+        result_array = np.random.randint(0, 256, (50, 50, 3), dtype=np.uint8)
+        mock_result_img = Mock()
+        mock_result_img.size = (50, 50)
+
+        # Patch once around the pool: patches entered and exited from several
+        # threads can restore each other's mocks and leave numpy.array replaced
+        with patch("goesvfi.pipeline.sanchez_processor.colourise"), \
+             patch("goesvfi.pipeline.sanchez_processor.SanchezProcessor._is_valid_satellite_image", return_value=True), \
+             patch("PIL.Image.open", return_value=mock_result_img), \
+             patch("numpy.array", return_value=result_array):
+            # Process images concurrently
+            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [executor.submit(process_image, i) for i in range(6)]
+                concurrent.futures.wait(futures)
 
         # Verify results
         assert len(errors) == 0, f"Concurrent processing errors: {errors}"
@@ -0,0 +1,172 @@
+"""Tests for startup cost measurement and what the GUI loads before its first paint.
+
+Timings depend on the machine, so the tests report them with ``record_property``
+and assert only which modules were loaded and the order of startup events.
+"""
+
+from collections.abc import Callable
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from goesvfi.utils import startup_profile
+from goesvfi.utils.lazy_import import lazy_import
+from goesvfi.utils.startup_profile import (
+    DEFERRED_PACKAGES,
+    ImportAudit,
+    audit_imports,
+    parse_importtime,
+    process_uptime,
+    record_startup_metric,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        900 |     json.decoder
+import time:       600 |       1500 |   json
+import time:     2_000 |       2000 | broken line
+import time:      4000 |       5500 | goesvfi.example
+"""
+
+
+def gui_env(home: Path) -> dict[str, str]:
+    """Environment for a GUI subprocess with its settings and caches under ``home``."""
+    return {
+        **os.environ,
+        "HOME": str(home),
+        "XDG_CONFIG_HOME": str(home / ".config"),
+        "XDG_CACHE_HOME": str(home / ".cache"),
+        "QT_QPA_PLATFORM": "offscreen",
+        "PYTHONPATH": str(Path(startup_profile.__file__).parents[2]),
+    }
+
+
+def loaded_packages(modules: list[str] | set[str]) -> list[str]:
+    """Deferred packages that were really imported; a lazy module has no submodules yet."""
+    return [package for package in DEFERRED_PACKAGES if any(name.startswith(f"{package}.") for name in modules)]
+
+
+class TestImportAudit:
+    def test_parse_importtime(self) -> None:
+        records = parse_importtime(IMPORTTIME_OUTPUT)
+
+        assert [record.module for record in records] == ["_io", "json.decoder", "json", "goesvfi.example"]
+        assert (records[1].self_us, records[1].cumulative_us, records[1].depth) == (300, 900, 2)
+        assert records[3].cumulative_seconds == pytest.approx(0.0055)
+
+    def test_audit_queries(self) -> None:
+        audit = ImportAudit("import json", parse_importtime(IMPORTTIME_OUTPUT))
+
+        assert audit.loaded("json") and not audit.loaded("goesvfi.ex")
+        assert audit.cumulative_seconds("json") == pytest.approx(0.0015)
+        assert audit.cumulative_seconds("xarray") == 0.0
+        assert audit.total_seconds == pytest.approx(0.00502)
+        assert [record.module for record in audit.top(2)] == ["goesvfi.example", "json"]
+        assert "goesvfi.example" in audit.report(1).splitlines()[1]
+        assert json.loads(json.dumps(audit.to_dict()))["modules"][0]["module"] == "_io"
+
+    def test_audit_runs_a_fresh_interpreter(self) -> None:
+        audit = audit_imports("import json", repeat=2)
+
+        assert audit.loaded("json")
+        assert audit.cumulative_seconds("json") > 0
+
+    def test_gui_import_defers_heavy_modules(
+        self, tmp_path: Path, record_property: Callable[[str, object], None]
+    ) -> None:
+        audit = audit_imports("import goesvfi.gui", repeat=3, env=gui_env(tmp_path))
+        record_property("gui_import_seconds", audit.cumulative_seconds("goesvfi.gui"))
+
+        assert not loaded_packages(audit.modules), audit.report()
+        # The pipeline and the remote stores are imported when first used
+        assert not audit.loaded("goesvfi.pipeline.run_vfi")
+        assert not audit.loaded("goesvfi.integrity_check.remote.s3_store")
+
+
+class TestLazyImport:
+    def test_module_runs_on_first_attribute_access(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        (tmp_path / "lazy_probe_module.py").write_text("import sys\nsys.lazy_probe_ran = True\nVALUE = 42\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "lazy_probe_module", raising=False)
+        monkeypatch.setattr(sys, "lazy_probe_ran", False, raising=False)
+
+        module = lazy_import("lazy_probe_module")
+        assert not sys.lazy_probe_ran  # type: ignore[attr-defined]
+        assert module.VALUE == 42
+        assert sys.lazy_probe_ran  # type: ignore[attr-defined]
+        assert lazy_import("lazy_probe_module") is module
+
+    def test_missing_module_fails_immediately(self) -> None:
+        with pytest.raises(ModuleNotFoundError):
+            lazy_import("goesvfi_no_such_module")
+
+
+def test_record_startup_metric_appends_json_lines(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    metrics_file = tmp_path / "startup.jsonl"
+    monkeypatch.setenv(startup_profile.METRICS_FILE_ENV, str(metrics_file))
+
+    record_startup_metric("first_paint_seconds", 1.23456)
+    record_startup_metric("first_paint_seconds", 0.5)
+
+    entries = [json.loads(line) for line in metrics_file.read_text().splitlines()]
+    assert [entry["seconds"] for entry in entries] == [1.2346, 0.5]
+    assert 0 < process_uptime() < 24 * 3600
+
+
+def test_cold_start_to_first_paint(tmp_path: Path, record_property: Callable[[str, object], None]) -> None:
+    script = textwrap.dedent(
+        """
+        import json, sys
+        from unittest.mock import patch
+
+        from PyQt6.QtCore import QTimer
+        from PyQt6.QtWidgets import QApplication
+
+        from goesvfi.gui import MainWindow
+
+        events = []
+        result = {}
+
+        def probe(exe):
+            events.append("probe")
+            return {"version": "test", "capabilities": {}, "supported_args": [], "help_text": ""}
+
+        def on_first_paint(seconds):
+            events.append("paint")
+            result["first_paint_seconds"] = seconds
+            result["modules"] = sorted(sys.modules)
+            QTimer.singleShot(200, app.quit)
+
+        app = QApplication(sys.argv)
+        app.setOrganizationName("goesvfi-test")
+        app.setApplicationName("startup")
+        with patch("goesvfi.utils.rife_analyzer.analyze_rife_executable", side_effect=probe):
+            window = MainWindow()
+            window.first_painted.connect(on_first_paint)
+            window.show()
+            QTimer.singleShot(60000, app.quit)
+            app.exec()
+        result["events"] = events
+        window.close()
+        print(json.dumps(result))
+        """
+    )
+    metrics_file = tmp_path / "startup.jsonl"
+    env = {**gui_env(tmp_path), startup_profile.METRICS_FILE_ENV: str(metrics_file)}
+
+    completed = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env=env, timeout=120, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    record_property("first_paint_seconds", result["first_paint_seconds"])
+
+    # No RIFE probe or client library before the window is painted
+    assert result["events"][0] == "paint"
+    assert not loaded_packages(result["modules"])
+    assert json.loads(metrics_file.read_text())["metric"] == "first_paint_seconds"
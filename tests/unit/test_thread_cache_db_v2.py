@@ -100,21 +100,20 @@ class TestThreadLocalCacheDB:
         try:
             # Verify basic initialization
             assert db is not None
-            assert hasattr(db, "_connections")
-            assert len(db._connections) > 0  # noqa: SLF001
+            assert db.conn is not None
 
             # Verify database file exists
             assert temp_db_path.exists()
 
             # Test connection retrieval
             conn = db._get_connection()  # noqa: SLF001
-            assert conn is not None
+            assert conn is db
 
         finally:
             db.close()
 
         # Verify cleanup
-        assert len(db._connections) == 0  # noqa: SLF001
+        assert db.conn is None
 
     @pytest.mark.parametrize("thread_count", [2, 3, 5])
     def test_multithread_access_patterns(  # noqa: PLR6301
@@ -133,13 +132,12 @@ class TestThreadLocalCacheDB:
             """Function that runs in worker threads."""
             thread_id = threading.get_ident()
             try:
-                # This should create a new connection for this thread
+                # Every thread shares the one database
                 conn = db._get_connection()  # noqa: SLF001
                 thread_references[thread_id] = conn
 
                 # Verify the connection is valid
                 assert conn is not None
-                assert thread_id in db._connections  # noqa: SLF001
 
                 # Perform a simple database operation using CacheDB methods
                 # Test adding and retrieving an entry
@@ -171,10 +169,10 @@ class TestThreadLocalCacheDB:
             for t in threads:
                 t.join()
 
-            # Verify that each thread got its own connection
+            # Verify that every thread got the same shared database
             assert len(thread_references) == thread_count
             assert test_result["success"], f"Thread errors: {test_result['errors']}"
-            assert len(db._connections) >= thread_count  # noqa: SLF001
+            assert all(conn is db for conn in thread_references.values())
 
         finally:
             db.close()
@@ -294,32 +292,22 @@ class TestThreadLocalCacheDB:
         for t in threads:
             t.join()
 
-        # Verify all threads created connections successfully
+        # Verify all threads used the shared database successfully
         assert len(connection_info) == 3
-        assert len(db._connections) >= 3  # noqa: SLF001
+        assert all(info["connection"] is db for info in connection_info.values())
 
         for thread_id, info in connection_info.items():
             assert info["operations_successful"], f"Thread {thread_id} operations failed"
 
-        # Test closing individual thread connections
-        threading.get_ident()
-
-        # Get initial connection count
-        len(db._connections)  # noqa: SLF001
-
-        # Check if main thread has a connection already by accessing it
-        _ = db.get_db()  # This will create a connection for main thread if not exists
-        updated_connection_count = len(db._connections)  # noqa: SLF001
-
-        # Close current thread connection
+        # Closing the current thread's connection leaves the shared one open
+        assert db.get_db() is db
         db.close_current_thread()
-
-        # Should have one fewer connection after closing
-        assert len(db._connections) == updated_connection_count - 1  # noqa: SLF001
+        assert db.conn is not None
+        assert db.get_entry("missing.nc") is None
 
         # Close all connections
         db.close()
-        assert len(db._connections) == 0  # noqa: SLF001
+        assert db.conn is None
 
     @pytest.mark.parametrize("operation_count", [3, 5, 8])
     def test_concurrent_database_operations(self, thread_cache_db: Any, operation_count: int) -> None:
@@ -2,6 +2,7 @@
 
 from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 import unittest
 from unittest.mock import patch
 
@@ -222,10 +223,13 @@ class TestScanDirectoryForTimestamps(unittest.TestCase):
     def test_scan_files_for_timestamps(self, mock_filter, mock_extract) -> None:
         """Test the _scan_files_for_timestamps helper function."""
         # Setup mock files
-        mock_files = [Path(f"/tmp/file{i}.png") for i in range(3)]
+        mock_files = [SimpleNamespace(name=f"file{i}.png", path=f"/tmp/file{i}.png") for i in range(3)]
 
-        # Mock glob to return our mock files
-        with patch("pathlib.Path.glob", return_value=mock_files):
+        # Mock the directory walker to return our mock files
+        with patch(
+            "goesvfi.integrity_check.time_index_refactored.walk_files",
+            side_effect=lambda *_args, **_kwargs: iter(mock_files),
+        ):
             # Test with no timestamp matches
             mock_extract.side_effect = [None, None, None]
 
@@ -447,8 +447,8 @@ class TestDirectoryScannerV2(SharedTimeUtilsTestCase):
 
     @patch("pathlib.Path.exists")
     @patch("pathlib.Path.is_dir")
-    @patch("pathlib.Path.glob")
-    def test_scan_directory_for_timestamps(self, mock_glob, mock_is_dir, mock_exists) -> None:
+    @patch("goesvfi.integrity_check.time_utils.scanner.walk_files")
+    def test_scan_directory_for_timestamps(self, mock_walk, mock_is_dir, mock_exists) -> None:
         """Test scanning directory for timestamps with mocked filesystem."""
         # Setup mocks
         mock_exists.return_value = True
@@ -462,12 +462,13 @@ class TestDirectoryScannerV2(SharedTimeUtilsTestCase):
             dt = self.test_dates[time_key]
             filename = f"image_G16_{dt.strftime('%Y%m%dT%H%M%S')}Z.png"
 
-            mock_file = MagicMock()
-            mock_file.name = filename
-            mock_files.append(mock_file)
+            mock_entry = MagicMock()
+            mock_entry.name = filename
+            mock_entry.path = f"/test/{filename}"
+            mock_files.append(mock_entry)
             expected_timestamps.append(dt)
 
-        mock_glob.return_value = mock_files
+        mock_walk.return_value = iter(mock_files)
 
         # Test scanning
         directory = Path("/test")
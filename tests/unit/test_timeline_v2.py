@@ -0,0 +1,102 @@
+"""Tests for the bitmap-backed Timeline."""
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from goesvfi.utils.timeline import Timeline
+
+START = datetime(2023, 6, 1, 0, 0, tzinfo=UTC)
+CADENCE = timedelta(minutes=10)
+END = START + CADENCE * 9
+
+
+def at(*slots: int) -> list[datetime]:
+    return [START + CADENCE * slot for slot in slots]
+
+
+class TestTimelineConstruction:
+    def test_full_and_empty_cover_inclusive_range(self) -> None:
+        full = Timeline.full(START, END, CADENCE)
+        empty = Timeline.empty(START, END, CADENCE)
+
+        assert full.slot_count == empty.slot_count == 10
+        assert len(full) == 10
+        assert len(empty) == 0
+        assert not empty
+        assert full.end == END
+
+    def test_from_timestamps_ignores_off_grid_and_out_of_range(self) -> None:
+        values = [*at(0, 4, 9), START + timedelta(minutes=13), START - CADENCE, END + CADENCE]
+
+        timeline = Timeline.from_timestamps(START, END, CADENCE, values)
+
+        assert timeline.timestamps() == at(0, 4, 9)
+
+    def test_from_datetime64_matches_from_timestamps(self) -> None:
+        values = np.array([np.datetime64(ts.replace(tzinfo=None), "us") for ts in at(1, 2, 7)])
+
+        assert Timeline.from_datetime64(START, END, CADENCE, values) == Timeline.from_timestamps(
+            START, END, CADENCE, at(1, 2, 7)
+        )
+
+    def test_bits_are_read_only(self) -> None:
+        timeline = Timeline.full(START, END, CADENCE)
+
+        with pytest.raises(ValueError, match="read-only"):
+            timeline.bits[0] = False
+
+    def test_non_positive_cadence_is_rejected(self) -> None:
+        with pytest.raises(ValueError, match="positive"):
+            Timeline(START, timedelta(0), [True])
+
+
+class TestTimelineAlgebra:
+    def test_set_operations_match_python_sets(self) -> None:
+        a = Timeline.from_timestamps(START, END, CADENCE, at(0, 1, 2, 5))
+        b = Timeline.from_timestamps(START, END, CADENCE, at(2, 5, 8))
+        set_a, set_b = set(at(0, 1, 2, 5)), set(at(2, 5, 8))
+
+        assert set(a & b) == set_a & set_b
+        assert set(a | b) == set_a | set_b
+        assert set(a - b) == set_a - set_b
+        assert set(a ^ b) == set_a ^ set_b
+        assert set(~a) == set(at(*range(10))) - set_a
+
+    def test_mismatched_grids_raise(self) -> None:
+        a = Timeline.full(START, END, CADENCE)
+        b = Timeline.full(START, END, timedelta(minutes=5))
+
+        with pytest.raises(ValueError, match="share start"):
+            _ = a - b
+
+    def test_contains_checks_grid_alignment(self) -> None:
+        timeline = Timeline.from_timestamps(START, END, CADENCE, at(3))
+
+        assert at(3)[0] in timeline
+        assert at(4)[0] not in timeline
+        assert START + timedelta(minutes=31) not in timeline
+        assert "2023-06-01" not in timeline
+
+
+class TestTimelineRanges:
+    def test_ranges_are_run_length_encoded(self) -> None:
+        timeline = Timeline.from_timestamps(START, END, CADENCE, at(0, 1, 2, 5, 8, 9))
+
+        assert timeline.ranges().tolist() == [[0, 3], [5, 6], [8, 10]]
+        assert timeline.intervals() == [(at(0)[0], at(2)[0]), (at(5)[0], at(5)[0]), (at(8)[0], at(9)[0])]
+
+    def test_ranges_round_trip(self) -> None:
+        rng = np.random.default_rng(0)
+        original = Timeline(START, CADENCE, rng.random(5000) > 0.3)
+
+        rebuilt = Timeline.from_ranges(START, CADENCE, original.slot_count, original.ranges())
+
+        assert rebuilt == original
+
+    def test_to_datetime64_lists_members(self) -> None:
+        timeline = Timeline.from_timestamps(START, END, CADENCE, at(2, 6))
+
+        expected = [np.datetime64(ts.replace(tzinfo=None), "us") for ts in at(2, 6)]
+        assert timeline.to_datetime64().tolist() == [value.item() for value in expected]
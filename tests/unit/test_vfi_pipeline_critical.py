@@ -183,7 +183,7 @@ class TestVFIPipelineCritical:
 
             mock_popen.side_effect = create_output_file
 
-            with patch("goesvfi.pipeline.run_vfi._run_rife_pair") as mock_rife:
+            with patch("goesvfi.pipeline.run_vfi.run_rife_pair") as mock_rife:
                 # Mock RIFE interpolation
                 def mock_rife_func(p1, p2, exe, config):
                     interp_path = p1.parent / f"interp_{time.monotonic_ns()}.png"
@@ -267,7 +267,7 @@ class TestVFIPipelineCritical:
                     msg = "Processing cancelled"
                     raise ProcessingError(msg)
 
-                with patch("goesvfi.pipeline.run_vfi._run_rife_pair", side_effect=failing_rife_mock):
+                with patch("goesvfi.pipeline.run_vfi.run_rife_pair", side_effect=failing_rife_mock):
                     with patch("subprocess.Popen") as mock_popen:
                         mock_ffmpeg = Mock()
                         mock_ffmpeg.stdin = Mock()
@@ -352,7 +352,7 @@ class TestVFIPipelineCritical:
                         # Mock glob to return our test images
                         mock_glob.return_value = image_paths
 
-                        with patch("goesvfi.pipeline.run_vfi._run_rife_pair") as mock_rife:
+                        with patch("goesvfi.pipeline.run_vfi.run_rife_pair") as mock_rife:
                             # Create dummy output
                             def mock_rife_func(p1, p2, exe, config):
                                 interp_path = p1.parent / f"interp_{time.monotonic_ns()}.png"
@@ -474,7 +474,7 @@ class TestVFIPipelineCritical:
             assert img_path.exists(), f"Test image {img_path} does not exist"
 
         # Mock processing to avoid actual heavy computation
-        with patch("goesvfi.pipeline.run_vfi._run_rife_pair") as mock_rife:
+        with patch("goesvfi.pipeline.run_vfi.run_rife_pair") as mock_rife:
             mock_rife.return_value = large_sequence[0]  # Return dummy path
 
             with patch("subprocess.Popen") as mock_popen:
@@ -606,7 +606,7 @@ class TestVFIPipelineCritical:
             return mock_proc
 
         with patch("subprocess.Popen", side_effect=track_popen):
-            with patch("goesvfi.pipeline.run_vfi._run_rife_pair") as mock_rife:
+            with patch("goesvfi.pipeline.run_vfi.run_rife_pair") as mock_rife:
                 # Make RIFE fail after some processing
                 call_count = 0
 
@@ -657,7 +657,7 @@ class TestVFIPipelineCritical:
             time.sleep(2)  # Reduced timeout for testing
             return args[0]  # Never reached
 
-        with patch("goesvfi.pipeline.run_vfi._run_rife_pair", side_effect=timeout_rife):
+        with patch("goesvfi.pipeline.run_vfi.run_rife_pair", side_effect=timeout_rife):
             with patch("subprocess.Popen") as mock_popen:
                 mock_ffmpeg = Mock()
                 mock_ffmpeg.stdin = Mock()
@@ -728,7 +728,7 @@ class TestVFIPipelineCritical:
             img.save(interp_path)
             return interp_path
 
-        with patch("goesvfi.pipeline.run_vfi._run_rife_pair", side_effect=mock_rife_with_signal_check):
+        with patch("goesvfi.pipeline.run_vfi.run_rife_pair", side_effect=mock_rife_with_signal_check):
             with patch("subprocess.Popen") as mock_popen:
                 mock_ffmpeg = Mock()
                 mock_ffmpeg.stdin = Mock()
@@ -811,7 +811,7 @@ class TestVFIPipelineCritical:
                 img.save(interp_path)
                 return interp_path
 
-            with patch("goesvfi.pipeline.run_vfi._run_rife_pair", side_effect=resource_exhaustion_rife):
+            with patch("goesvfi.pipeline.run_vfi.run_rife_pair", side_effect=resource_exhaustion_rife):
                 with patch("subprocess.Popen") as mock_popen:
                     mock_ffmpeg = Mock()
                     mock_ffmpeg.stdin = Mock()
@@ -397,6 +397,30 @@ def create_mock_colourise(
     return mock_colourise
 
 
+# --- S3 connection pool helpers ---
+
+
+class MockPooledS3Client:
+    """Async context manager standing in for ``S3Store._get_s3_client_from_pool()``."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def __aenter__(self):
+        return self.client
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        return False
+
+
+def mock_s3_client_pool(client) -> MagicMock:
+    """Create a replacement for ``S3Store._get_s3_client_from_pool`` that yields ``client``.
+
+    Use with ``patch.object(store, "_get_s3_client_from_pool", mock_s3_client_pool(client))``.
+    """
+    return MagicMock(return_value=MockPooledS3Client(client))
+
+
 # --- S3Store Mock ---
 
 